@@ -0,0 +1,60 @@
+"""add SLA clock escalation state
+
+Revision ID: ac2026101601
+Revises: ab2026072401
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "ac2026101601"
+down_revision = "ab2026072401"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("sla_clocks"):
+        return
+    columns = {column["name"] for column in inspector.get_columns("sla_clocks")}
+    if "escalated_at" not in columns:
+        op.add_column("sla_clocks", sa.Column("escalated_at", sa.DateTime(timezone=True), nullable=True))
+
+    indexes = {index["name"] for index in inspector.get_indexes("sla_clocks")}
+    if "ix_sla_clocks_status_due_at" not in indexes:
+        op.create_index("ix_sla_clocks_status_due_at", "sla_clocks", ["status", "due_at"])
+    if "ix_sla_clocks_status_escalated_at" not in indexes:
+        op.create_index("ix_sla_clocks_status_escalated_at", "sla_clocks", ["status", "escalated_at"])
+
+    # Breached clocks that were already escalated must not be picked up again.
+    # Non-ticket clocks were notified when the detector breached them; ticket
+    # clocks carry the ``sla_breach_notified`` flag on the ticket.
+    op.execute(
+        "UPDATE sla_clocks SET escalated_at = COALESCE(breached_at, updated_at) "
+        "WHERE status = 'breached' AND escalated_at IS NULL AND entity_type <> 'ticket'"
+    )
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "UPDATE sla_clocks AS c SET escalated_at = COALESCE(c.breached_at, c.updated_at) "
+            "FROM tickets AS t "
+            "WHERE c.entity_type = 'ticket' AND c.status = 'breached' AND c.escalated_at IS NULL "
+            "AND t.id = c.entity_id AND (t.metadata ->> 'sla_breach_notified') = 'true'"
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("sla_clocks"):
+        return
+    indexes = {index["name"] for index in inspector.get_indexes("sla_clocks")}
+    if "ix_sla_clocks_status_escalated_at" in indexes:
+        op.drop_index("ix_sla_clocks_status_escalated_at", table_name="sla_clocks")
+    if "ix_sla_clocks_status_due_at" in indexes:
+        op.drop_index("ix_sla_clocks_status_due_at", table_name="sla_clocks")
+    columns = {column["name"] for column in inspector.get_columns("sla_clocks")}
+    if "escalated_at" in columns:
+        op.drop_column("sla_clocks", "escalated_at")
@@ -0,0 +1,97 @@
+"""add crm conversation counters
+
+Revision ID: ad2026101602
+Revises: ac2026101601
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "ad2026101602"
+down_revision = "ac2026101601"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if inspector.has_table("crm_conversation_counters"):
+        return
+
+    uuid_type = postgresql.UUID(as_uuid=True) if bind.dialect.name == "postgresql" else sa.String(length=36)
+    enum_factory = postgresql.ENUM if bind.dialect.name == "postgresql" else sa.Enum
+    status_type = enum_factory(
+        "open",
+        "pending",
+        "snoozed",
+        "resolved",
+        "resolved_to_ticket",
+        name="conversationstatus",
+        create_type=False,
+    )
+
+    op.create_table(
+        "crm_conversation_counters",
+        sa.Column("bucket_key", sa.String(length=120), primary_key=True),
+        sa.Column("status", status_type, nullable=False),
+        sa.Column("assignment_bucket", sa.String(length=20), nullable=False),
+        sa.Column("agent_id", uuid_type, nullable=True),
+        sa.Column("team_id", uuid_type, nullable=True),
+        sa.Column("needs_attention", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("unreplied", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("idx_crm_conv_counters_agent", "crm_conversation_counters", ["agent_id"])
+    op.create_index("idx_crm_conv_counters_team", "crm_conversation_counters", ["team_id"])
+
+    if bind.dialect.name == "postgresql":
+        # Key format must match app.services.crm.inbox.counters.bucket_key.
+        op.execute(
+            """
+            insert into crm_conversation_counters (
+                bucket_key,
+                status,
+                assignment_bucket,
+                agent_id,
+                team_id,
+                needs_attention,
+                unreplied,
+                count,
+                updated_at
+            )
+            select
+                s.status::text
+                    || ':' || coalesce(s.active_assignment_agent_id::text, '-')
+                    || ':' || coalesce(s.active_assignment_team_id::text, '-')
+                    || ':' || (case when s.needs_attention then '1' else '0' end)
+                    || (case when s.unreplied then '1' else '0' end),
+                s.status,
+                case
+                    when s.active_assignment_agent_id is not null then 'agent'
+                    when s.active_assignment_team_id is not null then 'team'
+                    else 'unassigned'
+                end,
+                s.active_assignment_agent_id,
+                s.active_assignment_team_id,
+                s.needs_attention,
+                s.unreplied,
+                count(*),
+                now()
+            from crm_conversation_summaries s
+            where s.is_active is true
+            group by
+                s.status,
+                s.active_assignment_agent_id,
+                s.active_assignment_team_id,
+                s.needs_attention,
+                s.unreplied
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("crm_conversation_counters")
@@ -0,0 +1,120 @@
+"""add crm metric rollups
+
+Revision ID: ae2026101603
+Revises: ad2026101602
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "ae2026101603"
+down_revision = "ad2026101602"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    uuid_type = postgresql.UUID(as_uuid=True) if bind.dialect.name == "postgresql" else sa.String(length=36)
+    enum_factory = postgresql.ENUM if bind.dialect.name == "postgresql" else sa.Enum
+    channel_type = enum_factory(
+        "email",
+        "whatsapp",
+        "facebook_messenger",
+        "instagram_dm",
+        "note",
+        "chat_widget",
+        name="channeltype",
+        create_type=False,
+    )
+
+    if not inspector.has_table("crm_metric_rollups"):
+        op.create_table(
+            "crm_metric_rollups",
+            sa.Column("id", uuid_type, primary_key=True),
+            sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("channel_type", channel_type, nullable=True),
+            sa.Column("channel_target_id", uuid_type, nullable=True),
+            sa.Column("team_id", uuid_type, nullable=True),
+            sa.Column("agent_id", uuid_type, nullable=True),
+            sa.Column("inbound_messages", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("outbound_messages", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("active_conversations", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("channel_active_conversations", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("assignments", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("first_responses", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("first_response_seconds_sum", sa.BigInteger(), nullable=False, server_default="0"),
+            sa.Column("first_response_sketch", sa.JSON(), nullable=True),
+            sa.Column("resolutions", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("queue_waits", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("queue_wait_seconds_sum", sa.BigInteger(), nullable=False, server_default="0"),
+            sa.Column("queue_wait_sketch", sa.JSON(), nullable=True),
+        )
+        op.create_index("idx_crm_metric_rollups_bucket", "crm_metric_rollups", ["bucket_start"])
+        op.create_index("idx_crm_metric_rollups_agent_bucket", "crm_metric_rollups", ["agent_id", "bucket_start"])
+        op.create_index("idx_crm_metric_rollups_team_bucket", "crm_metric_rollups", ["team_id", "bucket_start"])
+
+    rollup_indexes = {index["name"] for index in sa.inspect(bind).get_indexes("crm_metric_rollups")}
+    if "uq_crm_metric_rollups_bucket_key" not in rollup_indexes:
+        op.create_index(
+            "uq_crm_metric_rollups_bucket_key",
+            "crm_metric_rollups",
+            [
+                "bucket_start",
+                sa.text("coalesce(CAST(channel_type AS VARCHAR), '')"),
+                sa.text("coalesce(CAST(channel_target_id AS VARCHAR), '')"),
+                sa.text("coalesce(CAST(team_id AS VARCHAR), '')"),
+                sa.text("coalesce(CAST(agent_id AS VARCHAR), '')"),
+            ],
+            unique=True,
+        )
+
+    if not inspector.has_table("crm_metric_rollup_hours"):
+        op.create_table(
+            "crm_metric_rollup_hours",
+            sa.Column("bucket_start", sa.DateTime(timezone=True), primary_key=True),
+            sa.Column("dirty_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("computed_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index("idx_crm_metric_rollup_hours_dirty", "crm_metric_rollup_hours", ["dirty_at"])
+
+    # Hour rebuilds select source rows by these columns and expressions. They
+    # are on the busiest CRM tables, so Postgres builds them without blocking writes.
+    source_indexes = (
+        ("crm_messages", "idx_crm_messages_activity_time", "(coalesce(received_at, sent_at, created_at))"),
+        ("crm_conversations", "idx_crm_conversations_resolution_time", "(coalesce(resolved_at, updated_at))"),
+        ("crm_conversations", "ix_crm_conversations_last_queue_assigned_at", "last_queue_assigned_at"),
+        ("crm_conversation_assignments", "ix_crm_assignments_assigned_at", "assigned_at"),
+    )
+    if bind.dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for table, name, columns in source_indexes:
+                op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns});")
+        return
+    for table, name, columns in source_indexes:
+        existing = {index["name"] for index in inspector.get_indexes(table)}
+        if name not in existing:
+            op.create_index(name, table, [sa.text(columns)])
+
+
+def downgrade() -> None:
+    source_indexes = (
+        ("crm_conversation_assignments", "ix_crm_assignments_assigned_at"),
+        ("crm_conversations", "ix_crm_conversations_last_queue_assigned_at"),
+        ("crm_conversations", "idx_crm_conversations_resolution_time"),
+        ("crm_messages", "idx_crm_messages_activity_time"),
+    )
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for _table, name in source_indexes:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name};")
+    else:
+        for table, name in source_indexes:
+            op.drop_index(name, table_name=table)
+    op.drop_table("crm_metric_rollup_hours")
+    op.drop_table("crm_metric_rollups")
@@ -0,0 +1,37 @@
+"""add fiber segment route bounds
+
+Revision ID: af2026101604
+Revises: ae2026101603
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "af2026101604"
+down_revision = "ae2026101603"
+branch_labels = None
+depends_on = None
+
+_BOUND_COLUMNS = ("route_min_longitude", "route_min_latitude", "route_max_longitude", "route_max_latitude")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {col["name"] for col in inspector.get_columns("fiber_segments")}
+    for name in _BOUND_COLUMNS:
+        if name not in columns:
+            op.add_column("fiber_segments", sa.Column(name, sa.Float(), nullable=True))
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "UPDATE fiber_segments SET "
+            "route_min_longitude = ST_XMin(route_geom), route_min_latitude = ST_YMin(route_geom), "
+            "route_max_longitude = ST_XMax(route_geom), route_max_latitude = ST_YMax(route_geom) "
+            "WHERE route_geom IS NOT NULL"
+        )
+
+
+def downgrade() -> None:
+    for name in reversed(_BOUND_COLUMNS):
+        op.drop_column("fiber_segments", name)
@@ -336,3 +336,14 @@ def nearest_techs(
     from app.services.field.routing import nearest_techs_for_job
 
     return nearest_techs_for_job(db, work_order_id, limit=limit, max_km=max_km)
+
+
+@router.get("/day-routes", tags=["work-orders"], dependencies=[_read])
+def day_routes(
+    person_id: list[str] = Query(min_length=1, max_length=100),
+    db: Session = Depends(get_db),
+):
+    """Optimised day routes for several technicians, starting from their live positions."""
+    from app.services.field.routing import plan_day_routes
+
+    return {"routes": plan_day_routes(db, person_id)}
@@ -1,9 +1,11 @@
 """Fiber plant GeoJSON API for map visualization."""
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.db import get_db
+from app.services import fiber_graph, fiber_plant_tiles
+from app.services.common import coerce_uuid
 from app.services.fiber_plant import fiber_plant
 
 router = APIRouter(prefix="/fiber-plant", tags=["fiber-plant"])
@@ -29,6 +31,50 @@ def get_fiber_plant_geojson(
     )
 
 
+@router.get("/tiles/{z}/{x}/{y}")
+def get_fiber_plant_tile(
+    z: int,
+    x: int,
+    y: int,
+    layers: str | None = Query(None, description="Comma-separated layer names (default: all)"),
+    db: Session = Depends(get_db),
+):
+    """Return fiber plant assets in tile z/x/y as a Mapbox Vector Tile."""
+    requested = [name.strip() for name in layers.split(",") if name.strip()] if layers else None
+    try:
+        data = fiber_plant_tiles.get_tile(db, z, x, y, requested)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if not data:
+        return Response(status_code=204)
+    return Response(
+        content=data,
+        media_type=fiber_plant_tiles.MVT_MEDIA_TYPE,
+        headers={"Cache-Control": f"private, max-age={fiber_plant_tiles.TILE_MAX_AGE_SECONDS}"},
+    )
+
+
+@router.get("/trace/{asset_type}/{asset_id}")
+def trace_fiber_asset(asset_type: str, asset_id: str, db: Session = Depends(get_db)):
+    """Trace an asset through the fiber plant and list what a fault there would affect."""
+    try:
+        asset_uuid = coerce_uuid(asset_id)
+        graph = fiber_graph.get_fiber_graph(db)
+        trace = graph.trace(asset_type, asset_uuid)
+        impact = graph.impact(asset_type, asset_uuid)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {
+        **trace,
+        "impact": {
+            "ont_unit_ids": [str(i) for i in impact.ont_unit_ids],
+            "subscriber_ids": [str(i) for i in impact.subscriber_ids],
+            "pon_port_ids": [str(i) for i in impact.pon_port_ids],
+            "unassigned_ont_count": impact.unassigned_ont_count,
+        },
+    }
+
+
 @router.get("/fdh-cabinets/{fdh_id}/splitters")
 def get_fdh_splitters(fdh_id: str, db: Session = Depends(get_db)):
     """Get splitters for a specific FDH cabinet."""
@@ -67,7 +67,7 @@ def my_day_route(
     auth=Depends(require_user_auth),
     db: Session = Depends(get_db),
 ):
-    """Greedy nearest-neighbour order of the authed tech's open jobs (task #47)."""
+    """Optimised drive order of the authed tech's open jobs (task #47)."""
     from app.services.field.routing import order_day_route
 
     return {"route": order_day_route(db, auth["person_id"], start_latitude=start_lat, start_longitude=start_lng)}
@@ -61,6 +61,11 @@ def list_infrastructure_assets(q: str | None = Query(default=None), db: Session
     return {"items": selfcare.fetch_infrastructure_assets(db, q=q)}
 
 
+def _require_fiber_asset_pair(fiber_asset_type: str | None, fiber_asset_id: object | None) -> None:
+    if bool(fiber_asset_type) != bool(fiber_asset_id):
+        raise HTTPException(status_code=400, detail="fiber_asset_type and fiber_asset_id must be given together")
+
+
 @router.get(
     "/tickets/infrastructure/impact-preview",
     tags=["tickets"],
@@ -71,13 +76,22 @@ def preview_infrastructure_impact(
     basestation_id: str | None = Query(default=None),
     olt_id: str | None = Query(default=None),
     pon_port_id: str | None = Query(default=None),
+    fiber_asset_type: str | None = Query(default=None),
+    fiber_asset_id: str | None = Query(default=None),
     db: Session = Depends(get_db),
 ):
     """Who would be notified for an asset — plus topology coverage — before creating."""
-    if not any([node_id, basestation_id, olt_id, pon_port_id]):
+    _require_fiber_asset_pair(fiber_asset_type, fiber_asset_id)
+    if not any([node_id, basestation_id, olt_id, pon_port_id, fiber_asset_id]):
         raise HTTPException(status_code=400, detail="An infrastructure asset id is required")
     affected = infrastructure_tickets.resolve_affected(
-        db, node_id=node_id, basestation_id=basestation_id, olt_id=olt_id, pon_port_id=pon_port_id
+        db,
+        node_id=node_id,
+        basestation_id=basestation_id,
+        olt_id=olt_id,
+        pon_port_id=pon_port_id,
+        fiber_asset_type=fiber_asset_type,
+        fiber_asset_id=fiber_asset_id,
     )
     return _impact_summary(affected)
 
@@ -94,16 +108,18 @@ def create_infrastructure_ticket(
     auth=Depends(get_current_user),
 ):
     """Create one ticket for an infrastructure asset and notify every affected customer."""
+    _require_fiber_asset_pair(payload.fiber_asset_type, payload.fiber_asset_id)
     if not (
         payload.node_id
         or payload.basestation_id
         or payload.olt_id
         or payload.pon_port_id
+        or payload.fiber_asset_id
         or payload.manual_subscriber_ids
     ):
         raise HTTPException(
             status_code=400,
-            detail="Provide an infrastructure asset (OLT / PON port / device / basestation) or manual subscribers.",
+            detail="Provide an infrastructure asset (OLT / PON port / device / basestation / fiber asset) or manual subscribers.",
         )
     actor_id = str(auth.get("person_id")) if auth else None
     result = infrastructure_tickets.create(
@@ -114,6 +130,8 @@ def create_infrastructure_ticket(
         basestation_id=payload.basestation_id,
         olt_id=payload.olt_id,
         pon_port_id=payload.pon_port_id,
+        fiber_asset_type=payload.fiber_asset_type,
+        fiber_asset_id=payload.fiber_asset_id,
         manual_subscriber_ids=[str(s) for s in payload.manual_subscriber_ids],
         confirm_large=payload.confirm_large,
         asset_label=payload.asset_label,
@@ -107,7 +107,7 @@ from app.models.domain_settings import DomainSetting, SettingDomain
 from app.monitoring import is_bearer_token_authorized, setup_monitoring
 from app.observability import ObservabilityMiddleware
 from app.services import audit as audit_service
-from app.services import branding_state
+from app.services import audit_writer, branding_state
 from app.services.ai.security import validate_deepseek_startup_env
 from app.services.crm import smtp_inbound as smtp_inbound_service
 from app.services.settings_seed import (
@@ -219,16 +219,24 @@ async def audit_middleware(request: Request, call_next):
             response = await call_next(request)
         except Exception:
             if should_log:
-                audit_service.audit_events.log_request(db, request, Response(status_code=500))
+                _record_audit_request(db, request, Response(status_code=500))
             raise
         if should_log:
-            audit_service.audit_events.log_request(db, request, response)
+            _record_audit_request(db, request, response)
         return response
     finally:
         if owns_db:
             db.close()
 
 
+def _record_audit_request(db: Session, request: Request, response: Response) -> None:
+    """Hand the audit row to the batched writer; write inline only when it is not running."""
+    if audit_writer.is_running():
+        audit_writer.enqueue_request(request, response)
+        return
+    audit_service.audit_events.log_request(db, request, response)
+
+
 @app.middleware("http")
 async def branding_middleware(request: Request, call_next):
     """Attach branding settings to request state for templates.
@@ -698,6 +706,7 @@ def _start_jobs():
         logger.info("app_startup_seed_completed")
     finally:
         db.close()
+    audit_writer.start_audit_writer()
     logger.info("app_startup_smtp_begin")
     smtp_inbound_service.start_smtp_inbound_server()
     logger.info("app_startup_smtp_completed")
@@ -710,6 +719,7 @@ def _stop_background_jobs():
     from app.services import customer_uptime as customer_uptime_service
 
     customer_uptime_service.stop_uptime_poller()
+    audit_writer.stop_audit_writer()
 
 
 def _ensure_storage():
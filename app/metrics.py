@@ -410,6 +410,77 @@ def set_ai_intake_last_success_age(*, age_seconds: float | None) -> None:
     AI_INTAKE_LAST_SUCCESS_AGE.set(max(float(age_seconds or 0.0), 0.0))
 
 
+# ---------------------------------------------------------------------------
+# AI response cache metrics
+# ---------------------------------------------------------------------------
+
+AI_RESPONSE_CACHE_LOOKUPS = Counter(
+    "ai_response_cache_lookups_total",
+    "AI response cache lookups by tier (local/shared/inflight) and outcome (hit/miss).",
+    ["tier", "outcome"],
+)
+
+AI_RESPONSE_CACHE_TOKENS_SAVED = Counter(
+    "ai_response_cache_tokens_saved_total",
+    "Provider tokens not spent because a cached or in-flight response was reused.",
+    [],
+)
+
+
+def observe_ai_response_cache_lookup(*, tier: str, outcome: str) -> None:
+    AI_RESPONSE_CACHE_LOOKUPS.labels(tier=tier, outcome=outcome).inc()
+
+
+def observe_ai_response_cache_tokens_saved(*, tokens: int) -> None:
+    if tokens <= 0:
+        return
+    AI_RESPONSE_CACHE_TOKENS_SAVED.inc(tokens)
+
+
+# ---------------------------------------------------------------------------
+# Inbox cache metrics
+# ---------------------------------------------------------------------------
+
+INBOX_CACHE_LOOKUPS = Counter(
+    "inbox_cache_lookups_total",
+    "Inbox cache lookups by key namespace, tier (local/shared) and outcome (hit/miss).",
+    ["namespace", "tier", "outcome"],
+)
+
+INBOX_CACHE_EVICTIONS = Counter(
+    "inbox_cache_evictions_total",
+    "Inbox cache local-tier evictions by reason (entries/bytes/expired).",
+    ["reason"],
+)
+
+INBOX_CACHE_BYTES = Gauge(
+    "inbox_cache_bytes",
+    "Approximate bytes held by this process's local inbox cache tier.",
+    [],
+)
+
+INBOX_CACHE_ENTRIES = Gauge(
+    "inbox_cache_entries",
+    "Entries held by this process's local inbox cache tier.",
+    [],
+)
+
+
+def observe_inbox_cache_lookup(*, namespace: str, tier: str, outcome: str) -> None:
+    INBOX_CACHE_LOOKUPS.labels(namespace=namespace, tier=tier, outcome=outcome).inc()
+
+
+def observe_inbox_cache_eviction(*, reason: str, count: int = 1) -> None:
+    if count <= 0:
+        return
+    INBOX_CACHE_EVICTIONS.labels(reason=reason).inc(count)
+
+
+def set_inbox_cache_size(*, entries: int, bytes_held: int) -> None:
+    INBOX_CACHE_ENTRIES.set(max(int(entries), 0))
+    INBOX_CACHE_BYTES.set(max(int(bytes_held), 0))
+
+
 # ---------------------------------------------------------------------------
 # Workqueue metrics
 # ---------------------------------------------------------------------------
@@ -446,3 +517,29 @@ def observe_workqueue_ws_event(*, kind: str, change: str, count: int = 1) -> Non
     if count <= 0:
         return
     WORKQUEUE_WS_EVENT_TOTAL.labels(kind=kind, change=change).inc(count)
+
+
+# ---------------------------------------------------------------------------
+# Event handler metrics
+# ---------------------------------------------------------------------------
+
+EVENT_HANDLER_DURATION = Histogram(
+    "event_handler_duration_seconds",
+    "Event handler execution time by handler and outcome (success/error).",
+    ["handler", "outcome"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+EVENT_HANDLER_TIMEOUTS = Counter(
+    "event_handler_timeouts_total",
+    "Concurrent event handlers that missed the dispatcher's per-handler deadline.",
+    ["handler"],
+)
+
+
+def observe_event_handler(*, handler: str, outcome: str, duration: float) -> None:
+    EVENT_HANDLER_DURATION.labels(handler=handler, outcome=outcome).observe(max(float(duration), 0.0))
+
+
+def observe_event_handler_timeout(*, handler: str) -> None:
+    EVENT_HANDLER_TIMEOUTS.labels(handler=handler).inc()
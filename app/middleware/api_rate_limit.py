@@ -1,29 +1,27 @@
 """Global API rate limiting middleware.
 
-Provides configurable rate limiting for API endpoints using Redis
-with fallback to in-memory storage.
+Provides configurable rate limiting for API endpoints using the shared
+sliding-window limiter in ``app.services.rate_limiter`` (one async Lua call
+per request against Redis, with fallback to in-memory storage).
 """
 
 from __future__ import annotations
 
 import os
-import time
-from collections import defaultdict
 from collections.abc import Callable
-from threading import Lock
 from typing import TYPE_CHECKING, ClassVar
 
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
 from app.logging import get_logger
+from app.services.rate_limiter import SlidingWindowLimiter
 
 if TYPE_CHECKING:
     from starlette.types import ASGIApp, Receive, Scope, Send
 
 logger = get_logger(__name__)
 
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 RATE_LIMIT_PREFIX = "api_rate:"
 WEBHOOK_RATE_LIMIT_PREFIX = "webhook_rate:"
 
@@ -32,18 +30,17 @@ DEFAULT_LIMIT = int(os.getenv("API_RATE_LIMIT", "100"))  # requests per window
 DEFAULT_WINDOW = int(os.getenv("API_RATE_WINDOW", "60"))  # seconds
 DEFAULT_WEBHOOK_LIMIT = int(os.getenv("WEBHOOK_RATE_LIMIT", "60"))  # requests per window
 DEFAULT_WEBHOOK_WINDOW = int(os.getenv("WEBHOOK_RATE_WINDOW", "60"))  # seconds
-
-# In-memory fallback storage
-_memory_store: dict[str, list[float]] = defaultdict(list)
-_memory_lock = Lock()
+# Tokens each process leases from Redis per round trip (0 = check every request)
+DEFAULT_LEASE_SIZE = int(os.getenv("API_RATE_LEASE_SIZE", "0"))
 
 
 class APIRateLimitMiddleware:
     """
     Rate limiting middleware for API endpoints.
 
-    Uses sliding window algorithm with Redis for distributed rate limiting.
-    Falls back to in-memory storage if Redis is unavailable.
+    Uses a sliding window counter with Redis for distributed rate limiting,
+    checked without blocking the event loop. Falls back to in-memory storage
+    if Redis is unavailable. ``lease_size`` enables local token leases.
 
     Rate limit headers are added to responses:
     - X-RateLimit-Limit: Maximum requests per window
@@ -83,14 +80,14 @@ class APIRateLimitMiddleware:
         window_seconds: int = DEFAULT_WINDOW,
         key_func: Callable[[Request], str] | None = None,
         rate_limit_prefix: str = RATE_LIMIT_PREFIX,
+        lease_size: int = DEFAULT_LEASE_SIZE,
     ):
         self.app = app
         self.limit = limit
         self.window_seconds = window_seconds
         self.key_func = key_func or self._default_key_func
         self.rate_limit_prefix = rate_limit_prefix
-        self._redis = None
-        self._redis_available = None
+        self._limiter = SlidingWindowLimiter(rate_limit_prefix, lease_size=lease_size)
 
     def _default_key_func(self, request: Request) -> str:
         """Generate rate limit key from request.
@@ -106,26 +103,6 @@ class APIRateLimitMiddleware:
         ip = _get_client_ip(request)
         return f"ip:{ip}"
 
-    def _get_redis(self):
-        """Get Redis client lazily."""
-        if self._redis_available is False:
-            return None
-
-        if self._redis is None:
-            try:
-                import redis
-
-                self._redis = redis.from_url(REDIS_URL, decode_responses=True)
-                self._redis.ping()
-                self._redis_available = True
-                logger.info("api_rate_limiter_redis_connected")
-            except Exception as e:
-                logger.warning("api_rate_limiter_redis_unavailable error=%s", e)
-                self._redis_available = False
-                self._redis = None
-
-        return self._redis
-
     def _should_skip(self, path: str) -> bool:
         """Check if path should skip rate limiting."""
         if path in self.EXEMPT_PATHS:
@@ -154,7 +131,7 @@ class APIRateLimitMiddleware:
         key = self.key_func(request)
 
         # Check rate limit
-        allowed, remaining, reset_in = self._check_rate(key)
+        allowed, remaining, reset_in = await self._check_rate(key)
 
         if not allowed:
             response = JSONResponse(
@@ -189,72 +166,17 @@ class APIRateLimitMiddleware:
 
         await self.app(scope, receive, send_with_headers)
 
-    def _check_rate(self, key: str) -> tuple[bool, int, int]:
+    async def _check_rate(self, key: str) -> tuple[bool, int, int]:
         """
-        Check rate limit using sliding window algorithm.
+        Check rate limit using the sliding window counter.
 
         Returns:
             Tuple of (allowed, remaining, reset_in_seconds)
         """
-        redis = self._get_redis()
-        if redis:
-            return self._check_rate_redis(redis, key)
-        else:
-            return self._check_rate_memory(key)
-
-    def _check_rate_redis(self, redis, key: str) -> tuple[bool, int, int]:
-        """Check rate limit using Redis sorted set for sliding window."""
-        full_key = f"{self.rate_limit_prefix}{key}"
-        now = time.time()
-        window_start = now - self.window_seconds
-
-        try:
-            pipe = redis.pipeline()
-            pipe.zremrangebyscore(full_key, 0, window_start)
-            pipe.zcard(full_key)
-            pipe.zadd(full_key, {str(now): now})
-            pipe.expire(full_key, self.window_seconds + 1)
-            results = pipe.execute()
-
-            current_count = results[1]
-
-            if current_count >= self.limit:
-                redis.zrem(full_key, str(now))
-                # Calculate reset time
-                oldest = redis.zrange(full_key, 0, 0, withscores=True)
-                if oldest:
-                    reset_in = int(oldest[0][1] + self.window_seconds - now) + 1
-                else:
-                    reset_in = self.window_seconds
-                return False, 0, reset_in
-
-            remaining = self.limit - current_count - 1
-            return True, max(0, remaining), self.window_seconds
-
-        except Exception as e:
-            logger.warning("api_rate_limit_redis_error key=%s error=%s", key, e)
-            return True, self.limit - 1, self.window_seconds
-
-    def _check_rate_memory(self, key: str) -> tuple[bool, int, int]:
-        """Check rate limit using in-memory storage (fallback)."""
-        full_key = f"{self.rate_limit_prefix}{key}"
-        now = time.time()
-        window_start = now - self.window_seconds
-
-        with _memory_lock:
-            _memory_store[full_key] = [t for t in _memory_store[full_key] if t > window_start]
-            current_count = len(_memory_store[full_key])
-
-            if current_count >= self.limit:
-                if _memory_store[full_key]:
-                    reset_in = int(_memory_store[full_key][0] + self.window_seconds - now) + 1
-                else:
-                    reset_in = self.window_seconds
-                return False, 0, reset_in
-
-            _memory_store[full_key].append(now)
-            remaining = self.limit - current_count - 1
-            return True, max(0, remaining), self.window_seconds
+        result = await self._limiter.hit_async(key, self.limit, self.window_seconds)
+        if not result.allowed:
+            return False, 0, result.retry_after
+        return True, result.remaining, result.reset_in
 
 
 def _get_client_ip(request: Request) -> str:
@@ -43,7 +43,10 @@ from app.models.crm import (  # noqa: F401
     ChannelType,
     Conversation,
     ConversationAssignment,
+    ConversationCounter,
     ConversationLabel,
+    ConversationMetricRollup,
+    ConversationMetricRollupHour,
     ConversationQueueDispatchState,
     ConversationQueueEntry,
     ConversationQueueEvent,
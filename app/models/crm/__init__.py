@@ -7,6 +7,9 @@ from app.models.crm.comments import SocialComment, SocialCommentPlatform, Social
 from app.models.crm.conversation import (
     Conversation,
     ConversationAssignment,
+    ConversationCounter,
+    ConversationMetricRollup,
+    ConversationMetricRollupHour,
     ConversationSummary,
     ConversationTag,
     Message,
@@ -66,7 +69,10 @@ __all__ = [
     "ChatWidgetConfig",
     "Conversation",
     "ConversationAssignment",
+    "ConversationCounter",
     "ConversationLabel",
+    "ConversationMetricRollup",
+    "ConversationMetricRollupHour",
     "ConversationPriority",
     "ConversationQueueDispatchState",
     "ConversationQueueEntry",
@@ -3,6 +3,7 @@ from datetime import UTC, datetime
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Boolean,
     CheckConstraint,
     DateTime,
@@ -33,6 +34,9 @@ class Conversation(Base):
     __table_args__ = (
         Index("ix_crm_conversations_queued_at", "queued_at"),
         Index("ix_crm_conversations_first_assigned_at", "first_assigned_at"),
+        Index("ix_crm_conversations_last_queue_assigned_at", "last_queue_assigned_at"),
+        # Reporting rollups select resolutions by this expression.
+        Index("idx_crm_conversations_resolution_time", text("coalesce(resolved_at, updated_at)")),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -101,6 +105,7 @@ class ConversationAssignment(Base):
         ),
         Index("ix_crm_assignments_agent_assigned_at", "agent_id", "assigned_at"),
         Index("ix_crm_assignments_conversation_assigned_at", "conversation_id", "assigned_at"),
+        Index("ix_crm_assignments_assigned_at", "assigned_at"),
         CheckConstraint(
             "team_id IS NOT NULL OR agent_id IS NOT NULL",
             name="ck_crm_conversation_assignments_team_or_agent",
@@ -196,6 +201,98 @@ class ConversationSummary(Base):
     )
 
 
+class ConversationCounter(Base):
+    """Active conversation counts per inbox bucket, maintained by summary deltas.
+
+    One row per (status, assignment, needs_attention, unreplied) combination
+    seen in ``crm_conversation_summaries``; ``bucket_key`` encodes the tuple so
+    rows can be upserted by primary key.
+    """
+
+    __tablename__ = "crm_conversation_counters"
+    __table_args__ = (
+        Index("idx_crm_conv_counters_agent", "agent_id"),
+        Index("idx_crm_conv_counters_team", "team_id"),
+    )
+
+    bucket_key: Mapped[str] = mapped_column(String(120), primary_key=True)
+    status: Mapped[ConversationStatus] = mapped_column(Enum(ConversationStatus), nullable=False)
+    assignment_bucket: Mapped[str] = mapped_column(String(20), nullable=False)
+    agent_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    team_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    needs_attention: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    unreplied: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        onupdate=lambda: datetime.now(UTC),
+    )
+
+
+class ConversationMetricRollup(Base):
+    """Hourly reporting aggregates per (channel, inbox, team, agent).
+
+    Rows for an hour are rebuilt together from messages, assignments and
+    conversations by ``app.services.crm.metric_rollups``; the ``*_sketch``
+    columns hold mergeable quantile sketches of the matching ``*_seconds_sum``.
+    """
+
+    __tablename__ = "crm_metric_rollups"
+    __table_args__ = (
+        Index("idx_crm_metric_rollups_bucket", "bucket_start"),
+        Index("idx_crm_metric_rollups_agent_bucket", "agent_id", "bucket_start"),
+        Index("idx_crm_metric_rollups_team_bucket", "team_id", "bucket_start"),
+        # One row per bucket key; NULL dimensions compare equal through coalesce.
+        Index(
+            "uq_crm_metric_rollups_bucket_key",
+            "bucket_start",
+            text("coalesce(CAST(channel_type AS VARCHAR), '')"),
+            text("coalesce(CAST(channel_target_id AS VARCHAR), '')"),
+            text("coalesce(CAST(team_id AS VARCHAR), '')"),
+            text("coalesce(CAST(agent_id AS VARCHAR), '')"),
+            unique=True,
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    channel_type: Mapped[ChannelType | None] = mapped_column(Enum(ChannelType))
+    channel_target_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    team_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    agent_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    inbound_messages: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    outbound_messages: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    active_conversations: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    channel_active_conversations: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    assignments: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    first_responses: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    first_response_seconds_sum: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    first_response_sketch: Mapped[dict | None] = mapped_column(JSON)
+    resolutions: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    queue_waits: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    queue_wait_seconds_sum: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    queue_wait_sketch: Mapped[dict | None] = mapped_column(JSON)
+
+
+class ConversationMetricRollupHour(Base):
+    """Per-hour bookkeeping for ``crm_metric_rollups``.
+
+    ``dirty_at`` is set when a committed change touches the hour and cleared
+    once a rebuild that started after it finishes; ``claimed_at`` is when the
+    latest rebuild started; ``computed_at`` marks hours the rollup covers,
+    including hours with no activity.
+    """
+
+    __tablename__ = "crm_metric_rollup_hours"
+    __table_args__ = (Index("idx_crm_metric_rollup_hours_dirty", "dirty_at"),)
+
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    dirty_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    claimed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    computed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+
 class Message(Base):
     __tablename__ = "crm_messages"
     __table_args__ = (
@@ -224,6 +321,8 @@ class Message(Base):
                 "AND channel_type IN ('email', 'facebook_messenger', 'instagram_dm')"
             ),
         ),
+        # Reporting rollups select messages by their activity time.
+        Index("idx_crm_messages_activity_time", text("coalesce(received_at, sent_at, created_at)")),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
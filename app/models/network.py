@@ -528,6 +528,11 @@ class FiberSegment(Base):
     fiber_strand_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("fiber_strands.id"))
     length_m: Mapped[float | None] = mapped_column(Float)
     route_geom = mapped_column(Geometry("LINESTRING", srid=4326), nullable=True)
+    # Bounding box of route_geom, so tiles can be filtered without PostGIS.
+    route_min_longitude: Mapped[float | None] = mapped_column(Float)
+    route_min_latitude: Mapped[float | None] = mapped_column(Float)
+    route_max_longitude: Mapped[float | None] = mapped_column(Float)
+    route_max_latitude: Mapped[float | None] = mapped_column(Float)
     notes: Mapped[str | None] = mapped_column(Text)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     # Set when an endpoint asset is relocated: route_geom/length_m may no longer
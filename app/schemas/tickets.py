@@ -182,6 +182,10 @@ class InfrastructureTicketCreate(BaseModel):
     basestation_id: str | None = None
     olt_id: str | None = None
     pon_port_id: str | None = None
+    # Or a fiber plant asset in this CRM (e.g. a cut fiber_segment or a
+    # splice_closure); its impact comes from the local fiber graph.
+    fiber_asset_type: str | None = None
+    fiber_asset_id: str | None = None
     manual_subscriber_ids: list[UUID] = Field(default_factory=list)
     asset_label: str | None = Field(default=None, max_length=200)
     region: str | None = Field(default=None, max_length=80)
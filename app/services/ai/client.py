@@ -58,6 +58,7 @@ class AIResponse:
     tokens_out: int | None
     model: str
     provider: str
+    cached: bool = False
 
 
 def _coerce_int(value: object | None, default: int, minimum: int = 0) -> int:
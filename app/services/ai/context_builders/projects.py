@@ -10,6 +10,22 @@ from app.services.ai.redaction import redact_text
 from app.services.common import coerce_uuid
 
 
+def prefetch_project_context(db: Session, params_list: list[dict[str, Any]]) -> list[Any]:
+    """Load a batch's projects and their owners/managers in two queries (see ``prefetch_ticket_context``)."""
+    project_ids = {coerce_uuid(params["project_id"]) for params in params_list if params.get("project_id")}
+    if not project_ids:
+        return []
+    projects = db.query(Project).filter(Project.id.in_(project_ids)).all()
+    person_ids = {
+        person_id
+        for project in projects
+        for person_id in (project.owner_person_id, project.project_manager_person_id, project.manager_person_id)
+        if person_id
+    }
+    people = db.query(Person).filter(Person.id.in_(person_ids)).all() if person_ids else []
+    return [*projects, *people]
+
+
 def gather_project_context(db: Session, params: dict[str, Any]) -> str:
     project_id = params.get("project_id")
     if not project_id:
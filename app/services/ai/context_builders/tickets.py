@@ -10,6 +10,27 @@ from app.services.ai.redaction import redact_text
 from app.services.common import coerce_uuid
 
 
+def prefetch_ticket_context(db: Session, params_list: list[dict[str, Any]]) -> list[Any]:
+    """Load a batch's tickets and their people in two queries.
+
+    The rows land in the session identity map, so the per-ticket ``db.get``
+    calls in the scorer and ``gather_ticket_context`` are served from memory.
+    The caller keeps the returned list alive for the duration of the batch.
+    """
+    ticket_ids = {coerce_uuid(params["ticket_id"]) for params in params_list if params.get("ticket_id")}
+    if not ticket_ids:
+        return []
+    tickets = db.query(Ticket).filter(Ticket.id.in_(ticket_ids)).all()
+    person_ids = {
+        person_id
+        for ticket in tickets
+        for person_id in (ticket.customer_person_id, ticket.assigned_to_person_id)
+        if person_id
+    }
+    people = db.query(Person).filter(Person.id.in_(person_ids)).all() if person_ids else []
+    return [*tickets, *people]
+
+
 def gather_ticket_context(db: Session, params: dict[str, Any]) -> str:
     ticket_id = params.get("ticket_id")
     if not ticket_id:
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import logging
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
 from typing import Any, Literal
 
@@ -8,16 +10,19 @@ from sqlalchemy.orm import Session
 
 from app.models.ai_insight import AIInsight, AIInsightStatus, InsightSeverity
 from app.models.domain_settings import SettingDomain
-from app.services.ai.client import AIClientError
-from app.services.ai.gateway import ai_gateway
+from app.services.ai.client import AIClientError, AIResponse
+from app.services.ai.gateway import AIRoute, ai_gateway
 from app.services.ai.insights import ai_insights
 from app.services.ai.output_parsers import parse_json_object, require_keys
 from app.services.ai.personas import persona_registry
+from app.services.ai.personas._base import ContextQualityResult, PersonaSpec
 from app.services.audit_helpers import log_audit_event
 from app.services.common import coerce_uuid
 from app.services.settings_spec import resolve_value
 from app.telemetry import get_tracer
 
+logger = logging.getLogger(__name__)
+
 
 def _bool_value(value: object | None, default: bool = False) -> bool:
     if isinstance(value, bool):
@@ -129,34 +134,14 @@ class IntelligenceEngine:
         if spec.min_context_quality > 0 and quality.score < spec.min_context_quality and spec.skip_on_low_quality:
             span.set_attribute("ai.status", "skipped")
             span.set_attribute("ai.quality_score", quality_score)
-            missing_str = ", ".join(quality.missing_fields[:5])
-            insight = AIInsight(
-                persona_key=spec.key,
-                domain=spec.domain,
-                severity=InsightSeverity.info,
-                status=AIInsightStatus.skipped,
+            insight = _skipped_insight(
+                spec,
+                quality,
+                quality_score,
                 entity_type=entity_type,
                 entity_id=entity_id,
-                title=f"{spec.name}: insufficient data",
-                summary=(
-                    f"Skipped — context quality {quality.score:.0%} "
-                    f"below threshold {spec.min_context_quality:.0%}. "
-                    f"Missing: {missing_str}."
-                ),
-                structured_output={"quality": quality.field_scores, "missing": quality.missing_fields},
-                context_quality_score=quality_score,
-                confidence_score=None,
-                recommendations=None,
-                llm_provider="n/a",
-                llm_model="n/a",
-                llm_tokens_in=0,
-                llm_tokens_out=0,
-                generation_time_ms=0,
                 trigger=trigger,
-                triggered_by_person_id=coerce_uuid(triggered_by_person_id) if triggered_by_person_id else None,
-                acknowledged_at=None,
-                acknowledged_by_person_id=None,
-                expires_at=None,
+                triggered_by_person_id=triggered_by_person_id,
             )
             db.add(insight)
             db.commit()
@@ -165,19 +150,14 @@ class IntelligenceEngine:
 
         started = time.monotonic()
         context = spec.context_builder(db, params or {})
-        output_instructions = spec.output_schema.to_instruction()
-        system = spec.system_prompt.format(output_instructions=output_instructions)
 
         # Call the gateway using the persona's preferred endpoint, with global fallback policy.
         # We still allow the gateway to route primary->secondary on failures.
-        primary_endpoint: Literal["primary", "secondary"] = (
-            "secondary" if spec.default_endpoint == "secondary" else "primary"
-        )
         result, routing = ai_gateway.generate_with_fallback(
             db,
-            primary=primary_endpoint,
+            primary=_primary_endpoint(spec),
             fallback="secondary",
-            system=system,
+            system=_system_prompt(spec),
             prompt=context,
             max_tokens=spec.default_max_tokens,
         )
@@ -186,88 +166,290 @@ class IntelligenceEngine:
         span.set_attribute("ai.model", result.model or "unknown")
         span.set_attribute("ai.tokens_in", result.tokens_in or 0)
         span.set_attribute("ai.tokens_out", result.tokens_out or 0)
+        span.set_attribute("ai.cached", bool(result.cached))
         span.set_attribute("ai.quality_score", quality_score)
         span.set_attribute("ai.status", "completed")
 
-        parsed = parse_json_object(result.content)
-        require_keys(parsed, spec.output_schema.required_keys())
-
-        title = str(parsed.get("title") or spec.name).strip()[:300]
-        summary = str(parsed.get("summary") or "").strip()[:5000]
-        recommendations = parsed.get("recommended_actions") or parsed.get("recommendations") or []
-        if not isinstance(recommendations, list):
-            recommendations = []
-
-        confidence = parsed.get("confidence")
-        try:
-            confidence_score = max(0.0, min(1.0, float(confidence))) if confidence is not None else None
-        except (TypeError, ValueError):
-            confidence_score = None
-
-        severity_value = "info"
-        if spec.severity_classifier:
-            try:
-                severity_value = str(spec.severity_classifier(parsed) or "info").strip().lower()
-            except Exception:
-                severity_value = "info"
-        severity = InsightSeverity.info
-        if severity_value in {s.value for s in InsightSeverity}:
-            severity = InsightSeverity(severity_value)
-
-        expires_at = (
-            datetime.now(UTC) + timedelta(hours=max(int(spec.insight_ttl_hours or 0), 0))
-            if spec.insight_ttl_hours
-            else None
-        )
-
-        insight = AIInsight(
-            persona_key=spec.key,
-            domain=spec.domain,
-            severity=severity,
-            status=AIInsightStatus.completed,
+        insight = _completed_insight(
+            spec,
+            result,
+            routing,
+            quality_score,
+            generation_time_ms=int((time.monotonic() - started) * 1000),
             entity_type=entity_type,
             entity_id=entity_id,
-            title=title or spec.name,
-            summary=summary or "No summary generated.",
-            structured_output=parsed,
-            confidence_score=confidence_score,
-            context_quality_score=quality_score,
-            recommendations=recommendations[:10] if isinstance(recommendations, list) else None,
-            llm_provider=result.provider,
-            llm_model=result.model,
-            llm_tokens_in=result.tokens_in,
-            llm_tokens_out=result.tokens_out,
-            llm_endpoint=str(routing.get("endpoint")) if isinstance(routing, dict) else None,
-            generation_time_ms=int((time.monotonic() - started) * 1000),
             trigger=trigger,
-            triggered_by_person_id=coerce_uuid(triggered_by_person_id) if triggered_by_person_id else None,
-            acknowledged_at=None,
-            acknowledged_by_person_id=None,
-            expires_at=expires_at,
+            triggered_by_person_id=triggered_by_person_id,
         )
         db.add(insight)
         db.commit()
         db.refresh(insight)
+        _audit_generated(db, spec, insight, result, routing, triggered_by_person_id)
+        return insight
 
-        # Audit without storing prompt/context.
-        log_audit_event(
-            db,
-            request=None,
-            action="ai_insight_generated",
-            entity_type=entity_type,
-            entity_id=str(entity_id) if entity_id else None,
-            actor_id=triggered_by_person_id,
-            metadata={
-                "persona_key": spec.key,
-                "domain": spec.domain.value,
-                "llm_provider": result.provider,
-                "llm_model": result.model,
-                "llm_endpoint": str(routing.get("endpoint")) if isinstance(routing, dict) else None,
-            },
-            status_code=200,
-            is_success=True,
+    def invoke_batch(
+        self,
+        db: Session,
+        *,
+        persona_key: str,
+        items: list[tuple[str, str | None, dict[str, Any]]],
+        trigger: str,
+        concurrency: int = 4,
+        chunk_size: int = 25,
+    ) -> dict[str, int]:
+        """Analyse many entities for one persona with bounded concurrency.
+
+        Each chunk is prepared on the caller's session (bulk prefetch, quality
+        gate, context building), the provider calls run on a thread pool whose
+        requests the gateway further limits per endpoint, and the chunk's
+        insights are committed together. A failing entity is logged and counted
+        instead of aborting the rest of the batch. The token budget is checked
+        before every chunk.
+        """
+        tracer = get_tracer(__name__)
+        with tracer.start_as_current_span(
+            "ai.invoke_batch",
+            attributes={"ai.persona_key": persona_key, "ai.trigger": trigger, "ai.batch_size": len(items)},
+        ) as span:
+            if not self.enabled(db, trigger=trigger):
+                raise AIClientError("Intelligence Engine is disabled")
+            spec = persona_registry.get(persona_key)
+            if not self._persona_enabled(db, spec.setting_key):
+                raise AIClientError(f"Persona disabled: {persona_key}")
+
+            route = ai_gateway.resolve_route(db, primary=_primary_endpoint(spec), fallback="secondary")
+            system = _system_prompt(spec)
+            stats = {"generated": 0, "skipped": 0, "failed": 0, "budget_exhausted": 0}
+            chunk_size = max(int(chunk_size), 1)
+            with ThreadPoolExecutor(max_workers=max(int(concurrency), 1), thread_name_prefix="ai-batch") as pool:
+                for start in range(0, len(items), chunk_size):
+                    if not self._within_budget(db):
+                        stats["budget_exhausted"] = len(items) - start
+                        break
+                    self._run_chunk(db, spec, route, system, items[start : start + chunk_size], trigger, pool, stats)
+            span.set_attribute("ai.generated", stats["generated"])
+            span.set_attribute("ai.failed", stats["failed"])
+            return stats
+
+    def _run_chunk(
+        self,
+        db: Session,
+        spec: PersonaSpec,
+        route: AIRoute,
+        system: str,
+        chunk: list[tuple[str, str | None, dict[str, Any]]],
+        trigger: str,
+        pool: ThreadPoolExecutor,
+        stats: dict[str, int],
+    ) -> None:
+        # Held until the chunk is persisted so the identity map keeps the prefetched rows.
+        prefetched = (
+            spec.context_prefetcher(db, [params or {} for _, _, params in chunk]) if spec.context_prefetcher else []
         )
-        return insight
+        pending: list[tuple[str, str | None, float, float, Future]] = []
+        insights: list[AIInsight] = []
+        for entity_type, entity_id, params in chunk:
+            try:
+                quality = spec.context_quality_scorer(db, params or {})
+                quality_score = round(max(0.0, min(1.0, quality.score)), 2)
+                if (
+                    spec.min_context_quality > 0
+                    and quality.score < spec.min_context_quality
+                    and spec.skip_on_low_quality
+                ):
+                    insights.append(
+                        _skipped_insight(
+                            spec, quality, quality_score, entity_type=entity_type, entity_id=entity_id, trigger=trigger
+                        )
+                    )
+                    stats["skipped"] += 1
+                    continue
+                started = time.monotonic()
+                context = spec.context_builder(db, params or {})
+            except Exception:
+                logger.exception("Batch context failed persona=%s entity=%s:%s", spec.key, entity_type, entity_id)
+                stats["failed"] += 1
+                continue
+            future = pool.submit(
+                ai_gateway.generate_routed, route, system=system, prompt=context, max_tokens=spec.default_max_tokens
+            )
+            pending.append((entity_type, entity_id, quality_score, started, future))
+
+        generated: list[tuple[AIInsight, AIResponse, dict[str, Any]]] = []
+        for entity_type, entity_id, quality_score, started, future in pending:
+            try:
+                result, routing = future.result()
+                insight = _completed_insight(
+                    spec,
+                    result,
+                    routing,
+                    quality_score,
+                    generation_time_ms=int((time.monotonic() - started) * 1000),
+                    entity_type=entity_type,
+                    entity_id=entity_id,
+                    trigger=trigger,
+                )
+            except Exception:
+                logger.exception("Batch analysis failed persona=%s entity=%s:%s", spec.key, entity_type, entity_id)
+                stats["failed"] += 1
+                continue
+            insights.append(insight)
+            generated.append((insight, result, routing))
+
+        db.add_all(insights)
+        db.flush()
+        for insight, result, routing in generated:
+            _audit_generated(db, spec, insight, result, routing, None)
+        db.commit()
+        stats["generated"] += len(generated)
+        del prefetched
+
+
+def _primary_endpoint(spec: PersonaSpec) -> Literal["primary", "secondary"]:
+    return "secondary" if spec.default_endpoint == "secondary" else "primary"
+
+
+def _system_prompt(spec: PersonaSpec) -> str:
+    return spec.system_prompt.format(output_instructions=spec.output_schema.to_instruction())
+
+
+def _skipped_insight(
+    spec: PersonaSpec,
+    quality: ContextQualityResult,
+    quality_score: float,
+    *,
+    entity_type: str,
+    entity_id: str | None,
+    trigger: str,
+    triggered_by_person_id: str | None = None,
+) -> AIInsight:
+    missing_str = ", ".join(quality.missing_fields[:5])
+    return AIInsight(
+        persona_key=spec.key,
+        domain=spec.domain,
+        severity=InsightSeverity.info,
+        status=AIInsightStatus.skipped,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        title=f"{spec.name}: insufficient data",
+        summary=(
+            f"Skipped — context quality {quality.score:.0%} "
+            f"below threshold {spec.min_context_quality:.0%}. "
+            f"Missing: {missing_str}."
+        ),
+        structured_output={"quality": quality.field_scores, "missing": quality.missing_fields},
+        context_quality_score=quality_score,
+        confidence_score=None,
+        recommendations=None,
+        llm_provider="n/a",
+        llm_model="n/a",
+        llm_tokens_in=0,
+        llm_tokens_out=0,
+        generation_time_ms=0,
+        trigger=trigger,
+        triggered_by_person_id=coerce_uuid(triggered_by_person_id) if triggered_by_person_id else None,
+        acknowledged_at=None,
+        acknowledged_by_person_id=None,
+        expires_at=None,
+    )
+
+
+def _completed_insight(
+    spec: PersonaSpec,
+    result: AIResponse,
+    routing: dict[str, Any],
+    quality_score: float,
+    *,
+    generation_time_ms: int,
+    entity_type: str,
+    entity_id: str | None,
+    trigger: str,
+    triggered_by_person_id: str | None = None,
+) -> AIInsight:
+    parsed = parse_json_object(result.content)
+    require_keys(parsed, spec.output_schema.required_keys())
+
+    title = str(parsed.get("title") or spec.name).strip()[:300]
+    summary = str(parsed.get("summary") or "").strip()[:5000]
+    recommendations = parsed.get("recommended_actions") or parsed.get("recommendations") or []
+    if not isinstance(recommendations, list):
+        recommendations = []
+
+    confidence = parsed.get("confidence")
+    try:
+        confidence_score = max(0.0, min(1.0, float(confidence))) if confidence is not None else None
+    except (TypeError, ValueError):
+        confidence_score = None
+
+    severity_value = "info"
+    if spec.severity_classifier:
+        try:
+            severity_value = str(spec.severity_classifier(parsed) or "info").strip().lower()
+        except Exception:
+            severity_value = "info"
+    severity = InsightSeverity.info
+    if severity_value in {s.value for s in InsightSeverity}:
+        severity = InsightSeverity(severity_value)
+
+    expires_at = (
+        datetime.now(UTC) + timedelta(hours=max(int(spec.insight_ttl_hours or 0), 0))
+        if spec.insight_ttl_hours
+        else None
+    )
+
+    return AIInsight(
+        persona_key=spec.key,
+        domain=spec.domain,
+        severity=severity,
+        status=AIInsightStatus.completed,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        title=title or spec.name,
+        summary=summary or "No summary generated.",
+        structured_output=parsed,
+        confidence_score=confidence_score,
+        context_quality_score=quality_score,
+        recommendations=recommendations[:10] if isinstance(recommendations, list) else None,
+        llm_provider=result.provider,
+        llm_model=result.model,
+        llm_tokens_in=result.tokens_in,
+        llm_tokens_out=result.tokens_out,
+        llm_endpoint=str(routing.get("endpoint")) if isinstance(routing, dict) else None,
+        generation_time_ms=generation_time_ms,
+        trigger=trigger,
+        triggered_by_person_id=coerce_uuid(triggered_by_person_id) if triggered_by_person_id else None,
+        acknowledged_at=None,
+        acknowledged_by_person_id=None,
+        expires_at=expires_at,
+    )
+
+
+def _audit_generated(
+    db: Session,
+    spec: PersonaSpec,
+    insight: AIInsight,
+    result: AIResponse,
+    routing: dict[str, Any],
+    triggered_by_person_id: str | None,
+) -> None:
+    # Audit without storing prompt/context.
+    log_audit_event(
+        db,
+        request=None,
+        action="ai_insight_generated",
+        entity_type=insight.entity_type,
+        entity_id=str(insight.entity_id) if insight.entity_id else None,
+        actor_id=triggered_by_person_id,
+        metadata={
+            "persona_key": spec.key,
+            "domain": spec.domain.value,
+            "llm_provider": result.provider,
+            "llm_model": result.model,
+            "llm_endpoint": str(routing.get("endpoint")) if isinstance(routing, dict) else None,
+        },
+        status_code=200,
+        is_success=True,
+    )
 
 
 intelligence_engine = IntelligenceEngine()
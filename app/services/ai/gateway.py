@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Any, Literal
@@ -15,6 +16,7 @@ from app.metrics import (
 )
 from app.models.domain_settings import SettingDomain
 from app.services.ai.client import AIClientError, AIResponse, VllmClient, _coerce_float, _coerce_int
+from app.services.ai.response_cache import AIResponseCache, cache_key
 from app.services.ai.security import ai_enabled, redact_secret_text, resolve_provider_api_key
 from app.services.settings_spec import resolve_value
 
@@ -35,6 +37,18 @@ class AIEndpointConfig:
     timeout_seconds: float
     max_retries: int
     max_tokens: int
+    max_concurrency: int = 4
+
+
+@dataclass(frozen=True)
+class AIRoute:
+    """Endpoint settings resolved up front so worker threads can call the gateway without a session."""
+
+    primary: AIEndpoint
+    primary_cfg: AIEndpointConfig
+    fallback: AIEndpoint
+    fallback_cfg: AIEndpointConfig | None
+    cache_ttl_seconds: int
 
 
 @dataclass
@@ -70,6 +84,9 @@ def _load_primary_config(db: Session) -> AIEndpointConfig:
     )
     max_retries = _coerce_int(resolve_value(db, SettingDomain.integration, "vllm_max_retries"), default=2, minimum=0)
     max_tokens = _coerce_int(resolve_value(db, SettingDomain.integration, "vllm_max_tokens"), default=2048, minimum=1)
+    max_concurrency = _coerce_int(
+        resolve_value(db, SettingDomain.integration, "vllm_max_concurrency"), default=4, minimum=1
+    )
     return AIEndpointConfig(
         label=label,
         base_url=base_url,
@@ -79,6 +96,7 @@ def _load_primary_config(db: Session) -> AIEndpointConfig:
         timeout_seconds=timeout_seconds,
         max_retries=max_retries,
         max_tokens=max_tokens,
+        max_concurrency=max_concurrency,
     )
 
 
@@ -105,6 +123,9 @@ def _load_secondary_config(db: Session) -> AIEndpointConfig:
     max_tokens = _coerce_int(
         resolve_value(db, SettingDomain.integration, "vllm_secondary_max_tokens"), default=2048, minimum=1
     )
+    max_concurrency = _coerce_int(
+        resolve_value(db, SettingDomain.integration, "vllm_secondary_max_concurrency"), default=2, minimum=1
+    )
     return AIEndpointConfig(
         label=label,
         base_url=base_url,
@@ -114,6 +135,7 @@ def _load_secondary_config(db: Session) -> AIEndpointConfig:
         timeout_seconds=timeout_seconds,
         max_retries=max_retries,
         max_tokens=max_tokens,
+        max_concurrency=max_concurrency,
     )
 
 
@@ -123,10 +145,15 @@ class AIGateway:
 
     - Keeps all provider settings + retries + max token policy in one place.
     - Supports two endpoints (primary + secondary) so you can combine DeepSeek + self-hosted Llama.
+    - Reuses identical completions from a content-addressed cache and coalesces identical in-flight calls.
+    - Bounds concurrent requests per endpoint so batch callers cannot flood a provider.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, response_cache: AIResponseCache | None = None) -> None:
         self._circuit_states: dict[str, _CircuitBreakerState] = {}
+        self._circuit_guard = threading.RLock()
+        self._endpoint_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._response_cache = response_cache or AIResponseCache()
 
     @staticmethod
     def _now() -> datetime:
@@ -140,56 +167,44 @@ class AIGateway:
         return self._circuit_states.setdefault(key, _CircuitBreakerState())
 
     def _before_request(self, cfg: AIEndpointConfig, endpoint: AIEndpoint) -> None:
-        state = self._get_state(cfg, endpoint)
-        now = self._now()
-        if state.cooldown_until and now < state.cooldown_until:
-            set_ai_provider_circuit_open(provider=cfg.label, model=cfg.model, endpoint=endpoint, is_open=True)
-            raise AIClientError(
-                f"AI circuit open provider={cfg.label} endpoint={endpoint} until={state.cooldown_until.isoformat()}",
-                provider=cfg.label,
-                model=cfg.model,
-                endpoint=endpoint,
-                failure_type="circuit_open",
-                transient=True,
-            )
-        if state.cooldown_until and now >= state.cooldown_until:
-            open_duration_seconds = 0.0
-            if state.opened_at is not None:
-                open_duration_seconds = max((now - state.opened_at).total_seconds(), 0.0)
-            state.cooldown_until = None
-            state.consecutive_failures = 0
-            state.opened_at = None
-            set_ai_provider_circuit_open(provider=cfg.label, model=cfg.model, endpoint=endpoint, is_open=False)
-            set_ai_provider_circuit_open_duration(
-                provider=cfg.label,
-                model=cfg.model,
-                endpoint=endpoint,
-                duration_seconds=0.0,
-            )
-            logger.info(
-                "ai_provider_circuit_recovered provider=%s model=%s endpoint=%s previous_open_duration_seconds=%.1f",
-                cfg.label,
-                cfg.model,
-                endpoint,
-                open_duration_seconds,
-            )
+        with self._circuit_guard:
+            state = self._get_state(cfg, endpoint)
+            now = self._now()
+            if state.cooldown_until and now < state.cooldown_until:
+                set_ai_provider_circuit_open(provider=cfg.label, model=cfg.model, endpoint=endpoint, is_open=True)
+                raise AIClientError(
+                    f"AI circuit open provider={cfg.label} endpoint={endpoint} until={state.cooldown_until.isoformat()}",
+                    provider=cfg.label,
+                    model=cfg.model,
+                    endpoint=endpoint,
+                    failure_type="circuit_open",
+                    transient=True,
+                )
+            if state.cooldown_until and now >= state.cooldown_until:
+                open_duration_seconds = 0.0
+                if state.opened_at is not None:
+                    open_duration_seconds = max((now - state.opened_at).total_seconds(), 0.0)
+                state.cooldown_until = None
+                state.consecutive_failures = 0
+                state.opened_at = None
+                set_ai_provider_circuit_open(provider=cfg.label, model=cfg.model, endpoint=endpoint, is_open=False)
+                set_ai_provider_circuit_open_duration(
+                    provider=cfg.label,
+                    model=cfg.model,
+                    endpoint=endpoint,
+                    duration_seconds=0.0,
+                )
+                logger.info(
+                    "ai_provider_circuit_recovered provider=%s model=%s endpoint=%s previous_open_duration_seconds=%.1f",
+                    cfg.label,
+                    cfg.model,
+                    endpoint,
+                    open_duration_seconds,
+                )
 
     def _record_success(self, cfg: AIEndpointConfig, endpoint: AIEndpoint) -> None:
-        state = self._get_state(cfg, endpoint)
-        state.consecutive_failures = 0
-        state.cooldown_until = None
-        state.opened_at = None
-        set_ai_provider_circuit_open(provider=cfg.label, model=cfg.model, endpoint=endpoint, is_open=False)
-        set_ai_provider_circuit_open_duration(
-            provider=cfg.label,
-            model=cfg.model,
-            endpoint=endpoint,
-            duration_seconds=0.0,
-        )
-
-    def _record_failure(self, cfg: AIEndpointConfig, endpoint: AIEndpoint, error: AIClientError) -> None:
-        state = self._get_state(cfg, endpoint)
-        if not error.transient:
+        with self._circuit_guard:
+            state = self._get_state(cfg, endpoint)
             state.consecutive_failures = 0
             state.cooldown_until = None
             state.opened_at = None
@@ -200,35 +215,50 @@ class AIGateway:
                 endpoint=endpoint,
                 duration_seconds=0.0,
             )
-            return
-        state.consecutive_failures += 1
-        if state.consecutive_failures < _CIRCUIT_BREAKER_FAILURE_THRESHOLD:
-            set_ai_provider_circuit_open(provider=cfg.label, model=cfg.model, endpoint=endpoint, is_open=False)
+
+    def _record_failure(self, cfg: AIEndpointConfig, endpoint: AIEndpoint, error: AIClientError) -> None:
+        with self._circuit_guard:
+            state = self._get_state(cfg, endpoint)
+            if not error.transient:
+                state.consecutive_failures = 0
+                state.cooldown_until = None
+                state.opened_at = None
+                set_ai_provider_circuit_open(provider=cfg.label, model=cfg.model, endpoint=endpoint, is_open=False)
+                set_ai_provider_circuit_open_duration(
+                    provider=cfg.label,
+                    model=cfg.model,
+                    endpoint=endpoint,
+                    duration_seconds=0.0,
+                )
+                return
+            state.consecutive_failures += 1
+            if state.consecutive_failures < _CIRCUIT_BREAKER_FAILURE_THRESHOLD:
+                set_ai_provider_circuit_open(provider=cfg.label, model=cfg.model, endpoint=endpoint, is_open=False)
+                set_ai_provider_circuit_open_duration(
+                    provider=cfg.label,
+                    model=cfg.model,
+                    endpoint=endpoint,
+                    duration_seconds=0.0,
+                )
+                return
+            state.opened_at = state.opened_at or self._now()
+            state.cooldown_until = self._now() + timedelta(seconds=_CIRCUIT_BREAKER_COOLDOWN_SECONDS)
+            set_ai_provider_circuit_open(provider=cfg.label, model=cfg.model, endpoint=endpoint, is_open=True)
             set_ai_provider_circuit_open_duration(
                 provider=cfg.label,
                 model=cfg.model,
                 endpoint=endpoint,
-                duration_seconds=0.0,
+                duration_seconds=max((self._now() - state.opened_at).total_seconds(), 0.0),
+            )
+            logger.warning(
+                "ai_provider_circuit_opened provider=%s model=%s endpoint=%s failure_type=%s consecutive_failures=%s cooldown_seconds=%s",
+                cfg.label,
+                cfg.model,
+                endpoint,
+                error.failure_type,
+                state.consecutive_failures,
+                _CIRCUIT_BREAKER_COOLDOWN_SECONDS,
             )
-            return
-        state.opened_at = state.opened_at or self._now()
-        state.cooldown_until = self._now() + timedelta(seconds=_CIRCUIT_BREAKER_COOLDOWN_SECONDS)
-        set_ai_provider_circuit_open(provider=cfg.label, model=cfg.model, endpoint=endpoint, is_open=True)
-        set_ai_provider_circuit_open_duration(
-            provider=cfg.label,
-            model=cfg.model,
-            endpoint=endpoint,
-            duration_seconds=max((self._now() - state.opened_at).total_seconds(), 0.0),
-        )
-        logger.warning(
-            "ai_provider_circuit_opened provider=%s model=%s endpoint=%s failure_type=%s consecutive_failures=%s cooldown_seconds=%s",
-            cfg.label,
-            cfg.model,
-            endpoint,
-            error.failure_type,
-            state.consecutive_failures,
-            _CIRCUIT_BREAKER_COOLDOWN_SECONDS,
-        )
 
     def enabled(self, db: Session) -> bool:
         return ai_enabled(db)
@@ -280,6 +310,13 @@ class AIGateway:
             max_retries=cfg.max_retries,
         )
 
+    def _cache_ttl_seconds(self, db: Session, use_cache: bool) -> int:
+        if not use_cache:
+            return 0
+        return _coerce_int(
+            resolve_value(db, SettingDomain.integration, "ai_response_cache_ttl_seconds"), default=600, minimum=0
+        )
+
     def generate(
         self,
         db: Session,
@@ -288,6 +325,7 @@ class AIGateway:
         system: str,
         prompt: str,
         max_tokens: int | None = None,
+        use_cache: bool = True,
     ) -> AIResponse:
         if not self.enabled(db):
             raise AIClientError(
@@ -296,50 +334,119 @@ class AIGateway:
             )
 
         cfg = _load_primary_config(db) if endpoint == "primary" else _load_secondary_config(db)
+        return self._generate_configured(
+            cfg,
+            endpoint,
+            system=system,
+            prompt=prompt,
+            max_tokens=max_tokens,
+            cache_ttl_seconds=self._cache_ttl_seconds(db, use_cache),
+        )
+
+    def _generate_configured(
+        self,
+        cfg: AIEndpointConfig,
+        endpoint: AIEndpoint,
+        *,
+        system: str,
+        prompt: str,
+        max_tokens: int | None,
+        cache_ttl_seconds: int,
+    ) -> AIResponse:
         if not (cfg.base_url and cfg.model):
             raise AIClientError(f"AI endpoint not configured: {endpoint}")
         if cfg.require_api_key and not cfg.api_key:
             raise AIClientError(f"AI endpoint requires an API key: {endpoint}")
 
-        self._before_request(cfg, endpoint)
         effective_max_tokens = min(int(max_tokens or cfg.max_tokens), int(cfg.max_tokens))
-        client = self._client_for(cfg)
-        try:
-            result = client.generate(system, prompt, max_tokens=effective_max_tokens)
-        except AIClientError as exc:
-            self._record_failure(cfg, endpoint, exc)
-            raise
+        if cache_ttl_seconds <= 0:
+            return self._call_provider(cfg, endpoint, system, prompt, effective_max_tokens)
+        key = cache_key(
+            provider=f"{cfg.label}:{cfg.base_url}",
+            model=cfg.model,
+            system=system,
+            prompt=prompt,
+            max_tokens=effective_max_tokens,
+        )
+        return self._response_cache.get_or_generate(
+            key,
+            cache_ttl_seconds,
+            lambda: self._call_provider(cfg, endpoint, system, prompt, effective_max_tokens),
+        )
+
+    def _endpoint_slot(self, cfg: AIEndpointConfig, endpoint: AIEndpoint) -> threading.BoundedSemaphore:
+        key = f"{self._circuit_key(cfg, endpoint)}:{cfg.max_concurrency}"
+        with self._circuit_guard:
+            slot = self._endpoint_slots.get(key)
+            if slot is None:
+                slot = self._endpoint_slots[key] = threading.BoundedSemaphore(max(int(cfg.max_concurrency), 1))
+            return slot
+
+    def _call_provider(
+        self,
+        cfg: AIEndpointConfig,
+        endpoint: AIEndpoint,
+        system: str,
+        prompt: str,
+        max_tokens: int,
+    ) -> AIResponse:
+        with self._endpoint_slot(cfg, endpoint):
+            # Checked after waiting for a slot so queued callers fail fast once the circuit opens.
+            self._before_request(cfg, endpoint)
+            client = self._client_for(cfg)
+            try:
+                result = client.generate(system, prompt, max_tokens=max_tokens)
+            except AIClientError as exc:
+                self._record_failure(cfg, endpoint, exc)
+                raise
         self._record_success(cfg, endpoint)
         return result
 
-    def generate_with_fallback(
+    def resolve_route(
         self,
         db: Session,
         *,
         primary: AIEndpoint = "primary",
         fallback: AIEndpoint = "secondary",
-        system: str,
-        prompt: str,
-        max_tokens: int | None = None,
-    ) -> tuple[AIResponse, dict[str, Any]]:
-        """
-        Try primary; if it fails and fallback is configured, try fallback.
-        Returns (result, metadata) where metadata indicates whether fallback was used.
-        """
+        use_cache: bool = True,
+    ) -> AIRoute:
+        """Resolve everything ``generate_routed`` needs from settings, once per batch."""
         if not self.enabled(db):
             raise AIClientError(
                 "AI features are disabled (AI_ENABLED=false or integration.ai_enabled=false)",
                 failure_type="ai_disabled",
             )
+        return AIRoute(
+            primary=primary,
+            primary_cfg=self.get_endpoint_config(db, primary),
+            fallback=fallback,
+            fallback_cfg=self.get_endpoint_config(db, fallback) if self.endpoint_ready(db, fallback) else None,
+            cache_ttl_seconds=self._cache_ttl_seconds(db, use_cache),
+        )
+
+    def generate_routed(
+        self,
+        route: AIRoute,
+        *,
+        system: str,
+        prompt: str,
+        max_tokens: int | None = None,
+    ) -> tuple[AIResponse, dict[str, Any]]:
+        """``generate_with_fallback`` over a pre-resolved route; safe to call from worker threads."""
         try:
-            result = self.generate(db, endpoint=primary, system=system, prompt=prompt, max_tokens=max_tokens)
-            return result, {"endpoint": primary, "fallback_used": False}
+            result = self._generate_configured(
+                route.primary_cfg,
+                route.primary,
+                system=system,
+                prompt=prompt,
+                max_tokens=max_tokens,
+                cache_ttl_seconds=route.cache_ttl_seconds,
+            )
+            return result, {"endpoint": route.primary, "fallback_used": False}
         except AIClientError as exc:
-            if exc.failure_type == "ai_disabled":
-                raise
             logger.warning(
                 "AI primary endpoint failed (%s). Trying fallback. provider=%s model=%s failure_type=%s status=%s timeout_type=%s retry_count=%s request_id=%s",
-                primary,
+                route.primary,
                 exc.provider,
                 exc.model,
                 exc.failure_type,
@@ -348,17 +455,48 @@ class AIGateway:
                 exc.retry_count,
                 exc.request_id,
             )
-            if not self.endpoint_ready(db, fallback):
+            if route.fallback_cfg is None:
                 logger.warning(
                     "AI fallback endpoint unavailable primary=%s fallback=%s primary_failure_type=%s",
-                    primary,
-                    fallback,
+                    route.primary,
+                    route.fallback,
                     exc.failure_type,
                 )
                 raise
-            observe_ai_provider_fallback(from_endpoint=primary, to_endpoint=fallback, reason=exc.failure_type)
-            result = self.generate(db, endpoint=fallback, system=system, prompt=prompt, max_tokens=max_tokens)
-            return result, {"endpoint": fallback, "fallback_used": True, "primary_error": redact_secret_text(exc)}
+            observe_ai_provider_fallback(
+                from_endpoint=route.primary, to_endpoint=route.fallback, reason=exc.failure_type
+            )
+            result = self._generate_configured(
+                route.fallback_cfg,
+                route.fallback,
+                system=system,
+                prompt=prompt,
+                max_tokens=max_tokens,
+                cache_ttl_seconds=route.cache_ttl_seconds,
+            )
+            return result, {
+                "endpoint": route.fallback,
+                "fallback_used": True,
+                "primary_error": redact_secret_text(exc),
+            }
+
+    def generate_with_fallback(
+        self,
+        db: Session,
+        *,
+        primary: AIEndpoint = "primary",
+        fallback: AIEndpoint = "secondary",
+        system: str,
+        prompt: str,
+        max_tokens: int | None = None,
+        use_cache: bool = True,
+    ) -> tuple[AIResponse, dict[str, Any]]:
+        """
+        Try primary; if it fails and fallback is configured, try fallback.
+        Returns (result, metadata) where metadata indicates whether fallback was used.
+        """
+        route = self.resolve_route(db, primary=primary, fallback=fallback, use_cache=use_cache)
+        return self.generate_routed(route, system=system, prompt=prompt, max_tokens=max_tokens)
 
 
 ai_gateway = AIGateway()
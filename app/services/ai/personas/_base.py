@@ -74,6 +74,8 @@ class PersonaSpec:
     system_prompt: str
     output_schema: OutputSchema
     context_builder: Callable[[Session, dict[str, Any]], str]
+    # Optional bulk loader for batch runs; returns the rows it loaded so the caller can keep them alive.
+    context_prefetcher: Callable[[Session, list[dict[str, Any]]], list[Any]] | None = None
     default_max_tokens: int = 1200
     default_endpoint: str = "primary"  # primary|secondary (ai gateway endpoint name)
     supports_scheduled: bool = False
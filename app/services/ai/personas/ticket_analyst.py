@@ -66,6 +66,12 @@ def _context(db: Session, params: dict[str, Any]) -> str:
     return gather_ticket_context(db, params)
 
 
+def _prefetch(db: Session, params_list: list[dict[str, Any]]) -> list[Any]:
+    from app.services.ai.context_builders.tickets import prefetch_ticket_context
+
+    return prefetch_ticket_context(db, params_list)
+
+
 persona_registry.register(
     PersonaSpec(
         key="ticket_analyst",
@@ -75,6 +81,7 @@ persona_registry.register(
         system_prompt=_SYSTEM,
         output_schema=_OUTPUT_SCHEMA,
         context_builder=_context,
+        context_prefetcher=_prefetch,
         default_max_tokens=1200,
         supports_scheduled=True,
         default_schedule_seconds=3600,
@@ -0,0 +1,202 @@
+"""Content-addressed cache for AI gateway responses.
+
+Entries are keyed on a hash of everything that determines the completion
+(provider, model, system prompt, prompt and max_tokens), so an unchanged
+ticket picked up by a scheduled scan, or the same ``crm_reply`` suggestion
+opened by several agents, is answered without calling the provider.
+
+Lookups go to a per-process LRU first and then to a shared Redis tier so a
+completion produced by a Celery worker is reusable by the web workers.
+Identical requests that are already in flight in this process are coalesced:
+the first caller asks the provider and the others wait for its result.
+
+Cached and coalesced responses report zero tokens, so they do not count
+towards ``intelligence_daily_token_budget``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import asdict, replace
+
+import redis
+
+from app.metrics import observe_ai_response_cache_lookup, observe_ai_response_cache_tokens_saved
+from app.services.ai.client import AIResponse
+
+logger = logging.getLogger(__name__)
+
+LOCAL_MAX_ENTRIES = 1024
+
+_SHARED_KEY_PREFIX = "ai_response_cache:"
+_REDIS_TIMEOUT_SECONDS = 0.25
+_REDIS_RETRY_SECONDS = 30.0
+
+
+def cache_key(*, provider: str, model: str, system: str, prompt: str, max_tokens: int) -> str:
+    payload = json.dumps([provider, model, system, prompt, int(max_tokens)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _as_cached(response: AIResponse) -> AIResponse:
+    return replace(response, tokens_in=0, tokens_out=0, cached=True)
+
+
+def _tokens(response: AIResponse) -> int:
+    return int(response.tokens_in or 0) + int(response.tokens_out or 0)
+
+
+class AIResponseCache:
+    def __init__(
+        self,
+        *,
+        max_entries: int = LOCAL_MAX_ENTRIES,
+        client_factory: Callable[[], redis.Redis | None] | None = None,
+    ) -> None:
+        self._max_entries = max(int(max_entries), 1)
+        self._entries: OrderedDict[str, tuple[float, AIResponse]] = OrderedDict()
+        self._inflight: dict[str, Future] = {}
+        self._guard = threading.Lock()
+        self._client_factory = client_factory
+        self._client: redis.Redis | None = None
+        self._retry_at = 0.0
+
+    # -- shared tier ---------------------------------------------------------
+
+    def _get_client(self) -> redis.Redis | None:
+        if self._client is not None:
+            return self._client
+        if time.monotonic() < self._retry_at:
+            return None
+        try:
+            if self._client_factory is not None:
+                client = self._client_factory()
+            else:
+                client = redis.Redis.from_url(
+                    os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+                    decode_responses=True,
+                    socket_connect_timeout=_REDIS_TIMEOUT_SECONDS,
+                    socket_timeout=_REDIS_TIMEOUT_SECONDS,
+                )
+                client.ping()
+        except redis.RedisError as exc:
+            self._retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+            logger.debug("ai_response_cache_redis_unavailable error=%s", exc)
+            return None
+        self._client = client
+        return client
+
+    def _drop_client(self, exc: Exception) -> None:
+        self._client = None
+        self._retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+        logger.debug("ai_response_cache_redis_error error=%s", exc)
+
+    def _shared_get(self, key: str) -> AIResponse | None:
+        client = self._get_client()
+        if client is None:
+            return None
+        try:
+            raw = client.get(f"{_SHARED_KEY_PREFIX}{key}")
+        except redis.RedisError as exc:
+            self._drop_client(exc)
+            return None
+        if not raw:
+            return None
+        try:
+            return AIResponse(**json.loads(raw))
+        except (TypeError, ValueError):
+            return None
+
+    def _shared_set(self, key: str, response: AIResponse, ttl_seconds: int) -> None:
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            client.setex(f"{_SHARED_KEY_PREFIX}{key}", ttl_seconds, json.dumps(asdict(response)))
+        except redis.RedisError as exc:
+            self._drop_client(exc)
+
+    # -- local tier ----------------------------------------------------------
+
+    def _local_get(self, key: str) -> AIResponse | None:
+        with self._guard:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def _local_set(self, key: str, response: AIResponse, ttl_seconds: int) -> None:
+        with self._guard:
+            self._entries[key] = (time.monotonic() + ttl_seconds, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    # -- public API ----------------------------------------------------------
+
+    def get(self, key: str) -> AIResponse | None:
+        response = self._local_get(key)
+        if response is not None:
+            observe_ai_response_cache_lookup(tier="local", outcome="hit")
+            return response
+        observe_ai_response_cache_lookup(tier="local", outcome="miss")
+        response = self._shared_get(key)
+        if response is None:
+            return None
+        observe_ai_response_cache_lookup(tier="shared", outcome="hit")
+        # The remaining shared TTL is unknown here; keep the local copy short.
+        self._local_set(key, response, 30)
+        return response
+
+    def set(self, key: str, response: AIResponse, ttl_seconds: int) -> None:
+        stored = replace(response, cached=False)
+        self._local_set(key, stored, ttl_seconds)
+        self._shared_set(key, stored, ttl_seconds)
+
+    def get_or_generate(self, key: str, ttl_seconds: int, loader: Callable[[], AIResponse]) -> AIResponse:
+        """Return a cached response, join an identical in-flight call, or run ``loader``."""
+        cached = self.get(key)
+        if cached is not None:
+            observe_ai_response_cache_tokens_saved(tokens=_tokens(cached))
+            return _as_cached(cached)
+
+        with self._guard:
+            pending = self._inflight.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._inflight[key] = Future()
+        if not leader:
+            observe_ai_response_cache_lookup(tier="inflight", outcome="hit")
+            response = pending.result()
+            observe_ai_response_cache_tokens_saved(tokens=_tokens(response))
+            return _as_cached(response)
+
+        try:
+            response = loader()
+        except BaseException as exc:
+            pending.set_exception(exc)
+            raise
+        else:
+            self.set(key, response, ttl_seconds)
+            pending.set_result(response)
+            return response
+        finally:
+            with self._guard:
+                self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        with self._guard:
+            self._entries.clear()
@@ -1,3 +1,8 @@
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime
+
 from fastapi import HTTPException, Request, Response
 from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.orm import Session
@@ -106,7 +111,12 @@ class AuditEvents(ListResponseMixin):
         return apply_pagination(query, limit, offset).all()
 
     @staticmethod
-    def log_request(db: Session, request: Request, response: Response):
+    def build_request_event(request: Request, response: Response) -> dict:
+        """Capture the audit row for a request without touching the database.
+
+        Actor display name/email are resolved later by ``attach_actor_details``
+        so callers can defer the write (see ``app.services.audit_writer``).
+        """
         actor_type = request.headers.get("x-actor-type")
         actor_id = request.headers.get("x-actor-id")
         state_person = getattr(request.state, "user", None)
@@ -134,19 +144,9 @@ class AuditEvents(ListResponseMixin):
             "path": request.url.path,
             "query": query_params,
         }
-        actor_id_value = str(actor_id) if actor_id else None
-        person = None
-        if actor_id_value and resolved_actor_type == AuditActorType.user:
-            person = db.get(Person, actor_id_value)
-        if person:
-            display_name = person.display_name or f"{person.first_name} {person.last_name}".strip()
-            if display_name:
-                metadata["actor_name"] = display_name
-            if getattr(person, "email", None):
-                metadata["actor_email"] = person.email
         payload = AuditEventCreate(
             actor_type=resolved_actor_type,
-            actor_id=actor_id_value,
+            actor_id=str(actor_id) if actor_id else None,
             action=request.method,
             entity_type=request.url.path,
             entity_id=entity_id,
@@ -156,8 +156,42 @@ class AuditEvents(ListResponseMixin):
             user_agent=user_agent,
             request_id=request_id,
             metadata_=metadata,
+            occurred_at=datetime.now(UTC),
         )
-        event = AuditEvent(**payload.model_dump())
+        return payload.model_dump()
+
+    @staticmethod
+    def attach_actor_details(db: Session, events: list[dict]) -> None:
+        """Add actor_name/actor_email metadata for user actors with one query."""
+        actor_ids = set()
+        for event in events:
+            if event.get("actor_type") == AuditActorType.user and event.get("actor_id"):
+                try:
+                    actor_ids.add(uuid.UUID(str(event["actor_id"])))
+                except ValueError:
+                    continue
+        if not actor_ids:
+            return
+        people = {str(person.id): person for person in db.query(Person).filter(Person.id.in_(actor_ids)).all()}
+        for event in events:
+            if event.get("actor_type") != AuditActorType.user:
+                continue
+            person = people.get(str(event.get("actor_id")))
+            if not person:
+                continue
+            metadata = event.setdefault("metadata_", {}) or {}
+            display_name = person.display_name or f"{person.first_name} {person.last_name}".strip()
+            if display_name:
+                metadata["actor_name"] = display_name
+            if getattr(person, "email", None):
+                metadata["actor_email"] = person.email
+            event["metadata_"] = metadata
+
+    @staticmethod
+    def log_request(db: Session, request: Request, response: Response):
+        data = AuditEvents.build_request_event(request, response)
+        AuditEvents.attach_actor_details(db, [data])
+        event = AuditEvent(**data)
         db.add(event)
         db.commit()
 
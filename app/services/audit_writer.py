@@ -0,0 +1,381 @@
+"""Asynchronous, batched writer for request audit events.
+
+``audit_middleware`` captures each audit row in memory and hands it to this
+module instead of inserting and committing on the request's critical path.  A
+background thread groups queued rows into multi-row INSERTs, flushing every
+``AUDIT_WRITER_FLUSH_MS`` milliseconds or as soon as a batch is full.
+
+Rows are never dropped: when the queue is full, or a flush fails, they are
+appended to a JSONL spill file under ``AUDIT_WRITER_SPILL_DIR``.  Spill files
+are claimed by rename and replayed into the database on the next start and
+as soon as the database accepts writes again.  A process only claims its own
+spill file, files left by processes that have exited, and files nobody has
+appended to for ``AUDIT_WRITER_SPILL_STALE_SECONDS``, so it never takes over
+a file another live worker is still writing.  A claimed file whose replay was
+cut short by the claiming process exiting is re-claimed the same way.  On shutdown the queue is drained, and whatever
+cannot be written is spilled.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from fastapi import Request, Response
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.db import SessionLocal
+from app.logging import get_logger
+from app.models.audit import AuditActorType, AuditEvent
+from app.services.audit import audit_events
+
+logger = get_logger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_FLUSH_MS = 250
+DEFAULT_QUEUE_SIZE = 10_000
+SHUTDOWN_TIMEOUT_SECONDS = 10.0
+DEFAULT_SPILL_STALE_SECONDS = 300
+SPILL_FILE_PREFIX = "audit-spill-"
+
+_queue: queue.Queue[dict] | None = None
+_writer_thread: threading.Thread | None = None
+_writer_stop = threading.Event()
+_writer_lock = threading.Lock()
+_spill_lock = threading.Lock()
+_replaying: set[Path] = set()
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+def _batch_size() -> int:
+    return max(_env_int("AUDIT_WRITER_BATCH_SIZE", DEFAULT_BATCH_SIZE), 1)
+
+
+def _flush_interval_seconds() -> float:
+    return max(_env_int("AUDIT_WRITER_FLUSH_MS", DEFAULT_FLUSH_MS), 10) / 1000.0
+
+
+def _spill_dir() -> Path:
+    return Path(os.getenv("AUDIT_WRITER_SPILL_DIR") or Path(tempfile.gettempdir()) / "dotmac_audit_spill")
+
+
+def _spill_path() -> Path:
+    return _spill_dir() / f"{SPILL_FILE_PREFIX}{os.getpid()}.jsonl"
+
+
+def _spill_stale_seconds() -> int:
+    return max(_env_int("AUDIT_WRITER_SPILL_STALE_SECONDS", DEFAULT_SPILL_STALE_SECONDS), 1)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists, but owned by another user
+    return True
+
+
+def _claimable(path: Path) -> bool:
+    """Whether ``path`` may be replayed without racing the process writing it."""
+    if path == _spill_path():
+        return True
+    owner = path.name[len(SPILL_FILE_PREFIX) : -len(".jsonl")]
+    if owner.isdigit() and not _pid_alive(int(owner)):
+        return True
+    # The PID may be live in another container sharing the directory, or
+    # reused; a file nobody has appended to for a while is abandoned either way.
+    try:
+        idle = time.time() - path.stat().st_mtime
+    except OSError:
+        return False
+    return idle >= _spill_stale_seconds()
+
+
+def _replay_claimable(path: Path) -> bool:
+    """Whether the interrupted replay claimed as ``path`` may be taken over."""
+    claimer = path.name.rsplit(".", 2)[-2]
+    if claimer == str(os.getpid()):
+        return path not in _replaying
+    return claimer.isdigit() and not _pid_alive(int(claimer))
+
+
+def is_running() -> bool:
+    return _writer_thread is not None and _writer_thread.is_alive() and not _writer_stop.is_set()
+
+
+def enqueue_request(request: Request, response: Response) -> None:
+    """Capture an audit row for ``request`` and queue it for the writer.
+
+    Never blocks the event loop: if the queue is full the row is spilled to
+    disk and picked up on a later replay.
+    """
+    event = audit_events.build_request_event(request, response)
+    event["id"] = uuid.uuid4()
+    enqueue(event)
+
+
+def enqueue(event: dict) -> None:
+    active_queue = _queue
+    if active_queue is None or not is_running():
+        _spill([event])
+        return
+    try:
+        active_queue.put_nowait(event)
+    except queue.Full:
+        logger.warning("audit_writer_queue_full spilling=1")
+        _spill([event])
+
+
+def _encode_event(event: dict) -> dict:
+    encoded = dict(event)
+    actor_type = encoded.get("actor_type")
+    encoded["actor_type"] = getattr(actor_type, "value", actor_type)
+    occurred_at = encoded.get("occurred_at")
+    if isinstance(occurred_at, datetime):
+        encoded["occurred_at"] = occurred_at.isoformat()
+    if encoded.get("id") is not None:
+        encoded["id"] = str(encoded["id"])
+    return encoded
+
+
+def _decode_event(payload: dict) -> dict:
+    event = dict(payload)
+    try:
+        event["actor_type"] = AuditActorType(event.get("actor_type"))
+    except ValueError:
+        event["actor_type"] = AuditActorType.system
+    if isinstance(event.get("occurred_at"), str):
+        event["occurred_at"] = datetime.fromisoformat(event["occurred_at"])
+    if event.get("id"):
+        event["id"] = uuid.UUID(str(event["id"]))
+    return event
+
+
+def _spill(events: list[dict]) -> None:
+    if not events:
+        return
+    path = _spill_path()
+    try:
+        with _spill_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as handle:
+                for event in events:
+                    handle.write(json.dumps(_encode_event(event), default=str) + "\n")
+    except OSError as exc:
+        logger.error("audit_writer_spill_failed count=%s error=%s", len(events), exc)
+        return
+    logger.warning("audit_writer_spilled count=%s path=%s", len(events), path)
+
+
+def _insert_batch(events: list[dict]) -> None:
+    db = SessionLocal()
+    try:
+        audit_events.attach_actor_details(db, events)
+        db.execute(insert(AuditEvent), events)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _insert_individually(events: list[dict]) -> list[dict]:
+    """Insert rows one by one, skipping duplicates; return rows that still failed."""
+    failed: list[dict] = []
+    for event in events:
+        try:
+            _insert_batch([event])
+        except IntegrityError:
+            # Already written by an earlier, partially reported flush.
+            logger.info("audit_writer_duplicate_skipped id=%s", event.get("id"))
+        except SQLAlchemyError:
+            failed.append(event)
+    return failed
+
+
+def flush(events: list[dict]) -> bool:
+    """Write one batch; spill it if the database rejects it."""
+    if not events:
+        return True
+    try:
+        _insert_batch(events)
+        return True
+    except IntegrityError:
+        failed = _insert_individually(events)
+    except SQLAlchemyError as exc:
+        logger.warning("audit_writer_flush_failed count=%s error=%s", len(events), exc)
+        failed = events
+    _spill(failed)
+    return not failed
+
+
+def replay_spilled() -> int:
+    """Claim this process's and abandoned spill files and write their rows to the database."""
+    directory = _spill_dir()
+    if not directory.is_dir():
+        return 0
+    candidates = [
+        (path, path.name) for path in sorted(directory.glob(f"{SPILL_FILE_PREFIX}*.jsonl")) if _claimable(path)
+    ]
+    candidates.extend(
+        (path, path.name.rsplit(".", 2)[0])
+        for path in sorted(directory.glob(f"{SPILL_FILE_PREFIX}*.jsonl.*.replaying"))
+        if _replay_claimable(path)
+    )
+    replayed = 0
+    for path, spill_name in candidates:
+        claimed = path.with_name(f"{spill_name}.{os.getpid()}.replaying")
+        try:
+            with _spill_lock:
+                if claimed in _replaying:
+                    continue
+                path.rename(claimed)
+                _replaying.add(claimed)
+        except OSError:
+            continue  # another process claimed it first
+        try:
+            replayed += _replay_file(claimed)
+        finally:
+            with _spill_lock:
+                _replaying.discard(claimed)
+    if replayed:
+        logger.info("audit_writer_replayed count=%s", replayed)
+    return replayed
+
+
+def _replay_file(claimed: Path) -> int:
+    events: list[dict] = []
+    with claimed.open(encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append(_decode_event(json.loads(line)))
+            except (json.JSONDecodeError, TypeError, ValueError):
+                logger.warning("audit_writer_spill_line_invalid path=%s", claimed)
+    replayed = 0
+    size = _batch_size()
+    for start in range(0, len(events), size):
+        chunk = events[start : start + size]
+        if flush(chunk):
+            replayed += len(chunk)
+    claimed.unlink(missing_ok=True)
+    return replayed
+
+
+def _drain_batch(active_queue: queue.Queue[dict], *, wait: bool) -> list[dict]:
+    size = _batch_size()
+    batch: list[dict] = []
+    try:
+        batch.append(active_queue.get(timeout=_flush_interval_seconds()) if wait else active_queue.get_nowait())
+    except queue.Empty:
+        return batch
+    deadline = time.monotonic() + _flush_interval_seconds()
+    while len(batch) < size:
+        remaining = deadline - time.monotonic()
+        try:
+            batch.append(active_queue.get(timeout=remaining) if wait and remaining > 0 else active_queue.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+def _writer_loop(active_queue: queue.Queue[dict]) -> None:
+    try:
+        replay_spilled()
+    except Exception as exc:
+        logger.warning("audit_writer_replay_failed error=%s", exc)
+    has_spill = False
+    while not _writer_stop.is_set():
+        batch = _drain_batch(active_queue, wait=True)
+        if not batch:
+            continue
+        try:
+            ok = flush(batch)
+        except Exception as exc:
+            logger.error("audit_writer_flush_error count=%s error=%s", len(batch), exc)
+            _spill(batch)
+            ok = False
+        if not ok:
+            has_spill = True
+        elif has_spill:
+            has_spill = False
+            try:
+                replay_spilled()
+            except Exception as exc:
+                logger.warning("audit_writer_replay_failed error=%s", exc)
+    # Shutdown: write what is left, spill anything the database will not take.
+    while True:
+        batch = _drain_batch(active_queue, wait=False)
+        if not batch:
+            break
+        try:
+            flush(batch)
+        except Exception:
+            _spill(batch)
+
+
+def start_audit_writer() -> None:
+    global _queue, _writer_thread
+    if not _env_bool("AUDIT_WRITER_ENABLED", True):
+        logger.info("audit_writer_disabled")
+        return
+    with _writer_lock:
+        if _writer_thread and _writer_thread.is_alive():
+            return
+        _writer_stop.clear()
+        _queue = queue.Queue(maxsize=max(_env_int("AUDIT_WRITER_QUEUE_SIZE", DEFAULT_QUEUE_SIZE), 1))
+        _writer_thread = threading.Thread(target=_writer_loop, args=(_queue,), name="audit-writer", daemon=True)
+        _writer_thread.start()
+        logger.info("audit_writer_started")
+
+
+def stop_audit_writer(timeout: float = SHUTDOWN_TIMEOUT_SECONDS) -> None:
+    """Stop the writer, flushing queued rows (or spilling them) before returning."""
+    global _writer_thread, _queue
+    with _writer_lock:
+        thread = _writer_thread
+        _writer_stop.set()
+        if thread is not None:
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.warning("audit_writer_stop_timeout")
+        remaining: list[dict] = []
+        if _queue is not None and (thread is None or not thread.is_alive()):
+            while True:
+                try:
+                    remaining.append(_queue.get_nowait())
+                except queue.Empty:
+                    break
+        _spill(remaining)
+        _writer_thread = None
+        _queue = None
+    logger.info("audit_writer_stopped")
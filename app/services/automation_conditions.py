@@ -1,36 +1,104 @@
 """Pure-logic condition evaluator for automation rules.
 
 Evaluates JSON condition arrays against event context dictionaries.
+``compile_conditions`` turns a condition array into a single predicate once,
+so rules evaluated on every event do not re-parse their field paths.
 No database or SQLAlchemy imports — easy to unit test.
 """
 
 import logging
+import math
+from collections.abc import Callable, Hashable
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
 _MISSING = object()
 
+Predicate = Callable[[dict], bool]
+
 
 def evaluate_conditions(conditions: list[dict], context: dict) -> bool:
     """Evaluate all conditions against context (AND logic).
 
     Returns True if all conditions pass, or if conditions list is empty.
     """
+    return compile_conditions(conditions)(context)
+
+
+def _always_true(_context: dict) -> bool:
+    return True
+
+
+def compile_conditions(conditions: list[dict] | None) -> Predicate:
+    """Compile a condition array into one predicate over a context dict.
+
+    Field paths are split and condition values normalized here, once; the
+    returned callable applies the same AND semantics as ``evaluate_conditions``.
+    """
     if not conditions:
-        return True
+        return _always_true
+    predicates = tuple(compile_condition(condition) for condition in conditions)
+    if len(predicates) == 1:
+        return predicates[0]
 
-    for condition in conditions:
-        field = str(condition.get("field", "")).strip()
-        op = str(condition.get("op", "")).strip()
-        value = _normalize_condition_value(condition.get("value"))
+    def _all(context: dict) -> bool:
+        return all(predicate(context) for predicate in predicates)
 
-        field_value = _resolve_field(context, field)
+    return _all
 
-        if not _evaluate_single(field_value, op, value):
-            return False
 
-    return True
+def compile_condition(condition: dict) -> Predicate:
+    """Compile a single ``{"field", "op", "value"}`` condition."""
+    field = str(condition.get("field", "")).strip()
+    op = str(condition.get("op", "")).strip()
+    expected = _normalize_condition_value(condition.get("value"))
+    resolve = compile_field_resolver(field)
+
+    def _predicate(context: dict) -> bool:
+        return _evaluate_single(resolve(context), op, expected)
+
+    return _predicate
+
+
+def compile_field_resolver(field_path: str) -> Callable[[dict], Any]:
+    """Pre-split a dotted field path; the resolver returns ``_MISSING`` like ``_resolve_field``."""
+    if not field_path:
+        return lambda _context: _MISSING
+    parts = tuple(field_path.split("."))
+
+    def _resolve(context: dict) -> Any:
+        current: Any = context
+        for part in parts:
+            if isinstance(current, dict) and part in current:
+                current = current[part]
+            else:
+                return _MISSING
+        return current
+
+    return _resolve
+
+
+def equality_key(value: Any) -> Hashable | None:
+    """Bucket key under which values that ``eq`` treats as equal collide.
+
+    Numeric-looking values share a float key (``"5"`` and ``5`` compare equal
+    via ``_loose_equals``); other hashable values key on themselves. Keys may
+    over-match (``"5"`` and ``"5.0"``), so callers must still evaluate the
+    condition. Returns None for values that cannot be keyed.
+    """
+    value = _normalize_compare_value(value)
+    try:
+        number = float(value)
+    except (TypeError, ValueError, OverflowError):
+        number = None
+    if number is not None and not math.isnan(number):
+        return ("n", number)
+    try:
+        hash(value)
+    except TypeError:
+        return None
+    return ("v", value)
 
 
 def _resolve_field(context: dict, field_path: str) -> Any:
@@ -0,0 +1,199 @@
+"""Compiled, cached automation rule sets.
+
+The active rules for an event type are loaded once, their conditions compiled
+into predicates, and each rule is indexed on one of its ``eq`` conditions.
+Evaluating an event then resolves each indexed field once and only runs the
+predicates of rules whose bucket matches (plus the rules with no usable
+``eq`` condition).
+
+``automation_rules_service`` calls ``invalidate`` whenever it changes a rule.
+That clears this process's cache and bumps a Redis generation counter, which
+other processes check at most every ``GENERATION_CHECK_SECONDS``. Entries also
+expire after ``CACHE_TTL_SECONDS`` as a bound when Redis is unreachable.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.services.automation_conditions import (
+    Predicate,
+    compile_conditions,
+    compile_field_resolver,
+    equality_key,
+)
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL_SECONDS = 300.0
+GENERATION_CHECK_SECONDS = 2.0
+_GENERATION_KEY = "automation_rules:generation"
+_REDIS_RETRY_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    id: UUID
+    name: str
+    position: int
+    predicate: Predicate
+
+
+@dataclass
+class CompiledRuleSet:
+    """Compiled rules for one event type, in priority order."""
+
+    rules: tuple[CompiledRule, ...] = ()
+    unindexed: tuple[int, ...] = ()
+    eq_index: dict[str, tuple[Callable[[dict], Any], dict[Hashable, tuple[int, ...]]]] = field(default_factory=dict)
+    loaded_at: float = 0.0
+
+    def candidates(self, context: dict) -> list[CompiledRule]:
+        """Rules that may match ``context``; rules failing an indexed ``eq`` are skipped."""
+        positions = list(self.unindexed)
+        for resolve, buckets in self.eq_index.values():
+            key = equality_key(resolve(context))
+            if key is not None:
+                positions.extend(buckets.get(key, ()))
+        positions.sort()
+        return [self.rules[position] for position in positions]
+
+    def matching(self, context: dict) -> list[CompiledRule]:
+        """Rules whose conditions all hold for ``context``, in priority order."""
+        return [rule for rule in self.candidates(context) if rule.predicate(context)]
+
+
+def _index_key(conditions: list[dict] | None) -> tuple[str, Hashable] | None:
+    """The first ``eq`` condition usable as an index key, as (field, key)."""
+    for condition in conditions or []:
+        if str(condition.get("op", "")).strip() != "eq":
+            continue
+        field_path = str(condition.get("field", "")).strip()
+        key = equality_key(condition.get("value"))
+        if field_path and key is not None:
+            return field_path, key
+    return None
+
+
+def compile_rule_set(rules: list[Any]) -> CompiledRuleSet:
+    """Compile ORM rules (already in priority order) into a rule set."""
+    compiled: list[CompiledRule] = []
+    unindexed: list[int] = []
+    buckets_by_field: dict[str, dict[Hashable, list[int]]] = {}
+    for position, rule in enumerate(rules):
+        conditions = rule.conditions or []
+        compiled.append(
+            CompiledRule(id=rule.id, name=rule.name, position=position, predicate=compile_conditions(conditions))
+        )
+        index_key = _index_key(conditions)
+        if index_key is None:
+            unindexed.append(position)
+            continue
+        field_path, key = index_key
+        buckets_by_field.setdefault(field_path, {}).setdefault(key, []).append(position)
+
+    eq_index = {
+        field_path: (
+            compile_field_resolver(field_path),
+            {key: tuple(positions) for key, positions in buckets.items()},
+        )
+        for field_path, buckets in buckets_by_field.items()
+    }
+    return CompiledRuleSet(
+        rules=tuple(compiled),
+        unindexed=tuple(unindexed),
+        eq_index=eq_index,
+        loaded_at=time.monotonic(),
+    )
+
+
+_cache: dict[str, CompiledRuleSet] = {}
+_cache_lock = threading.Lock()
+_epoch = 0
+_shared_generation: int | None = None
+_generation_checked_at = 0.0
+_redis_retry_at = 0.0
+
+
+def _get_redis():
+    global _redis_retry_at
+    if time.monotonic() < _redis_retry_at:
+        return None
+    try:
+        from app.services.settings_cache import get_settings_redis
+
+        return get_settings_redis()
+    except Exception as exc:
+        _redis_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+        logger.debug("automation_rule_cache_redis_unavailable error=%s", exc)
+        return None
+
+
+def _clear_locked() -> None:
+    global _epoch
+    _cache.clear()
+    _epoch += 1
+
+
+def _sync_generation() -> None:
+    """Drop the local cache if another process invalidated it since the last check."""
+    global _shared_generation, _generation_checked_at, _redis_retry_at
+    now = time.monotonic()
+    if now - _generation_checked_at < GENERATION_CHECK_SECONDS:
+        return
+    _generation_checked_at = now
+    client = _get_redis()
+    if client is None:
+        return
+    try:
+        generation = int(client.get(_GENERATION_KEY) or 0)
+    except Exception as exc:
+        _redis_retry_at = now + _REDIS_RETRY_SECONDS
+        logger.debug("automation_rule_cache_generation_check_failed error=%s", exc)
+        return
+    with _cache_lock:
+        if _shared_generation is not None and generation != _shared_generation:
+            _clear_locked()
+        _shared_generation = generation
+
+
+def get_rule_set(db: Session, event_type_value: str) -> CompiledRuleSet:
+    """Compiled active rules for an event type, loading them on a cache miss."""
+    from app.services.automation_rules import automation_rules_service
+
+    _sync_generation()
+    with _cache_lock:
+        cached = _cache.get(event_type_value)
+        epoch = _epoch
+    if cached is not None and time.monotonic() - cached.loaded_at < CACHE_TTL_SECONDS:
+        return cached
+
+    rule_set = compile_rule_set(automation_rules_service.get_active_rules_for_event(db, event_type_value))
+    with _cache_lock:
+        # Don't store a set loaded before a concurrent invalidation.
+        if epoch == _epoch:
+            _cache[event_type_value] = rule_set
+    return rule_set
+
+
+def invalidate() -> None:
+    """Forget compiled rules here and tell other processes to do the same."""
+    global _redis_retry_at
+    with _cache_lock:
+        _clear_locked()
+    client = _get_redis()
+    if client is None:
+        return
+    try:
+        client.incr(_GENERATION_KEY)
+    except Exception as exc:
+        _redis_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+        logger.warning("automation_rule_cache_invalidation_publish_failed error=%s", exc)
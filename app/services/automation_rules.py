@@ -27,6 +27,12 @@ from app.services.response import ListResponseMixin
 logger = logging.getLogger(__name__)
 
 
+def _invalidate_compiled_rules() -> None:
+    from app.services import automation_engine
+
+    automation_engine.invalidate()
+
+
 class AutomationRulesManager(ListResponseMixin):
     @staticmethod
     def list(
@@ -97,6 +103,7 @@ class AutomationRulesManager(ListResponseMixin):
         rule = AutomationRule(**data)
         db.add(rule)
         db.commit()
+        _invalidate_compiled_rules()
         db.refresh(rule)
         return rule
 
@@ -113,6 +120,7 @@ class AutomationRulesManager(ListResponseMixin):
         for key, value in data.items():
             setattr(rule, key, value)
         db.commit()
+        _invalidate_compiled_rules()
         db.refresh(rule)
         return rule
 
@@ -125,6 +133,7 @@ class AutomationRulesManager(ListResponseMixin):
         rule.is_active = False
         rule.status = AutomationRuleStatus.archived
         db.commit()
+        _invalidate_compiled_rules()
 
     @staticmethod
     def toggle_status(db: Session, rule_id: str, status: AutomationRuleStatus) -> AutomationRule:
@@ -135,6 +144,7 @@ class AutomationRulesManager(ListResponseMixin):
         if status == AutomationRuleStatus.active:
             rule.is_active = True
         db.commit()
+        _invalidate_compiled_rules()
         db.refresh(rule)
         return rule
 
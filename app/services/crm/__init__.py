@@ -16,6 +16,7 @@ Submodule Structure:
     ├── sales/         - Pipelines, leads, quotes
     ├── inbox/         - Email/message ingestion
     ├── widget/        - Chat widget
+    ├── metric_rollups.py - Hourly reporting rollups
     └── reports.py     - CRM analytics and reporting
 """
 
@@ -23,7 +24,8 @@ from collections.abc import Callable
 from typing import Any
 
 # Inbox submodule (keep as namespace import for complex operations)
-from app.services.crm import inbox, smtp_inbound
+# (metric_rollups also registers the listeners that mark rollup hours dirty)
+from app.services.crm import inbox, metric_rollups, smtp_inbound
 
 # Contacts submodule
 # Campaigns submodule
@@ -169,6 +171,7 @@ __all__ = [
     "leads",
     "message_attachments",
     "messages",
+    "metric_rollups",
     "pipeline_stages",
     "pipelines",
     "private_notes",
@@ -1,83 +1,491 @@
-"""Lightweight in-memory cache for CRM inbox services.
-
-NOTE: This is a per-process cache. Cross-worker invalidation relies on short
-TTLs (30s for inbox list).  A Redis pubsub layer could be added later for
-instant invalidation across workers, but the short TTLs are sufficient for now.
+"""Two-tier cache for CRM inbox services.
+
+Reads go to a per-process LRU first, then to a shared Redis tier so that every
+worker can reuse an entry built by any other worker.  Keys are versioned by a
+per-namespace generation (the text before the first ``:``) plus a global
+generation.  Invalidation bumps the generation in Redis and broadcasts it on
+``CACHE_INVALIDATION_CHANNEL``; every worker's listener thread then drops its
+stale local entries immediately, and stale Redis entries become unreachable and
+age out on their own TTL.
+
+The local tier is an LRU bounded both by entry count and by an approximate
+byte budget, with a two-level prefix index (``ns:`` and ``ns:segment:``) so
+prefix invalidation only touches the matching keys, and a periodic sweep of
+expired entries so keys that are never read again do not pin memory.
+
+When Redis is unavailable the cache degrades to the per-process tier with the
+same semantics as before (local invalidation only).
 """
 
 from __future__ import annotations
 
+import builtins
+import contextlib
+import hashlib
+import heapq
 import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
-from datetime import UTC, datetime, timedelta
 from threading import Lock
 from typing import Any
 
+import redis
+
+from app.metrics import observe_inbox_cache_eviction, observe_inbox_cache_lookup, set_inbox_cache_size
+
+logger = logging.getLogger(__name__)
+
 INBOX_LIST_TTL_SECONDS = 30
 SUMMARY_COUNTS_TTL_SECONDS = 30
 COMMENTS_LIST_TTL_SECONDS = 60
 COMMENTS_THREAD_TTL_SECONDS = 60
 
+LOCAL_MAX_ENTRIES = 4096
+LOCAL_MAX_BYTES = 64 * 1024 * 1024
+SWEEP_INTERVAL_SECONDS = 15.0
+
+# Generation bumps are broadcast here. Deliberately outside the WebSocket
+# ``inbox_ws:`` prefix so WebSocket listeners never receive them.
+CACHE_INVALIDATION_CHANNEL = "inbox_cache:invalidate"
+
+_SHARED_KEY_PREFIX = "inbox_cache:"
+_GENERATIONS_KEY = "inbox_cache:generations"
+_GLOBAL_NAMESPACE = "*"
+_REDIS_TIMEOUT_SECONDS = 0.25
+_REDIS_RETRY_SECONDS = 30.0
+
 
 @dataclass
 class _CacheEntry:
     value: Any
-    expires_at: datetime
+    expires_at: float
+    version: tuple[int, int]
+    size: int
 
 
-_cache: dict[str, _CacheEntry] = {}
-_cache_locks: dict[str, Lock] = {}
+@dataclass
+class _KeyLock:
+    lock: Lock
+    waiters: int = 0
+
+
+_cache: OrderedDict[str, _CacheEntry] = OrderedDict()
+_prefix_index: dict[str, builtins.set[str]] = {}
+_expiry_heap: list[tuple[float, str]] = []
+_bytes_held = 0
+_next_sweep_at = 0.0
+_cache_guard = Lock()
+_cache_locks: dict[str, _KeyLock] = {}
 _cache_locks_guard = Lock()
 
+_generations: dict[str, int] = {}
+_redis_client: redis.Redis | None = None
+_redis_retry_at = 0.0
+_redis_guard = Lock()
+_listener_thread: threading.Thread | None = None
+
+
+def _namespace(key: str) -> str:
+    return key.partition(":")[0]
+
+
+def _version(key: str) -> tuple[int, int]:
+    return (_generations.get(_GLOBAL_NAMESPACE, 0), _generations.get(_namespace(key), 0))
+
+
+def _shared_key(key: str, version: tuple[int, int]) -> str:
+    digest = hashlib.sha1(key.encode("utf-8"), usedforsecurity=False).hexdigest()
+    return f"{_SHARED_KEY_PREFIX}{_namespace(key)}:{version[0]}.{version[1]}:{digest}"
+
+
+# ---------------------------------------------------------------------------
+# Shared (Redis) tier
+# ---------------------------------------------------------------------------
 
-def _now() -> datetime:
-    return datetime.now(UTC)
 
+def _get_redis() -> redis.Redis | None:
+    """Return the shared-tier client, or None while Redis is unreachable.
+
+    A failed connection is retried at most every ``_REDIS_RETRY_SECONDS`` so a
+    missing Redis never adds a connect attempt to every cache read.
+    """
+    global _redis_client, _redis_retry_at
+    if _redis_client is not None:
+        return _redis_client
+    if time.monotonic() < _redis_retry_at:
+        return None
+    with _redis_guard:
+        if _redis_client is not None:
+            return _redis_client
+        try:
+            client = redis.Redis.from_url(
+                os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+                decode_responses=True,
+                socket_connect_timeout=_REDIS_TIMEOUT_SECONDS,
+                socket_timeout=_REDIS_TIMEOUT_SECONDS,
+            )
+            _sync_generations(client)
+        except redis.RedisError as exc:
+            _redis_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+            logger.debug("inbox_cache_redis_unavailable error=%s", exc)
+            return None
+        _redis_client = client
+        _start_listener()
+        return client
+
+
+def _sync_generations(client: redis.Redis) -> None:
+    """Adopt the shared generations, dropping local entries that went stale."""
+    raw: Any = client.hgetall(_GENERATIONS_KEY)
+    changed = []
+    for namespace, value in (raw or {}).items():
+        try:
+            generation = int(value)
+        except (TypeError, ValueError):
+            continue
+        if _apply_generation(namespace, generation):
+            changed.append(namespace)
+    if changed:
+        logger.debug("inbox_cache_generations_synced namespaces=%s", ",".join(sorted(changed)))
+
+
+def _shared_get(key: str, version: tuple[int, int]) -> tuple[bool, Any, float, int]:
+    client = _get_redis()
+    if client is None:
+        return False, None, 0.0, 0
+    try:
+        raw: Any = client.get(_shared_key(key, version))
+        if not raw:
+            return False, None, 0.0, 0
+        payload = json.loads(raw)
+        return True, payload["v"], float(payload["exp"]), len(raw)
+    except redis.RedisError as exc:
+        logger.debug("inbox_cache_shared_get_failed key=%s error=%s", _namespace(key), exc)
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+        logger.debug("inbox_cache_shared_decode_failed key=%s", _namespace(key))
+    return False, None, 0.0, 0
+
+
+def _shared_set(key: str, encoded_value: str, expires_at: float, ttl_seconds: int, version: tuple[int, int]) -> None:
+    client = _get_redis()
+    if client is None or ttl_seconds <= 0:
+        return
+    encoded = f'{{"v":{encoded_value},"exp":{expires_at}}}'
+    try:
+        client.set(_shared_key(key, version), encoded, ex=ttl_seconds)
+    except redis.RedisError as exc:
+        logger.debug("inbox_cache_shared_set_failed key=%s error=%s", _namespace(key), exc)
+
+
+def _publish_generation(namespace: str) -> int | None:
+    client = _get_redis()
+    if client is None:
+        return None
+    try:
+        generation = int(client.hincrby(_GENERATIONS_KEY, namespace, 1))
+        client.publish(
+            CACHE_INVALIDATION_CHANNEL,
+            json.dumps({"namespace": namespace, "generation": generation}),
+        )
+        return generation
+    except redis.RedisError as exc:
+        logger.warning("inbox_cache_invalidation_publish_failed namespace=%s error=%s", namespace, exc)
+        return None
+
+
+def _handle_invalidation_message(data: Any) -> None:
+    try:
+        payload = json.loads(data)
+        namespace = str(payload["namespace"])
+        generation = int(payload["generation"])
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+        logger.debug("inbox_cache_invalidation_message_invalid")
+        return
+    _apply_generation(namespace, generation)
+
+
+def _listen_for_invalidations() -> None:
+    backoff = 1.0
+    while True:
+        client = _redis_client
+        if client is None:
+            return
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+            # Anything published while we were disconnected is picked up here.
+            _sync_generations(client)
+            backoff = 1.0
+            while True:
+                message = pubsub.get_message(timeout=1.0)
+                if message and message.get("type") == "message":
+                    _handle_invalidation_message(message.get("data"))
+        except redis.RedisError as exc:
+            logger.warning("inbox_cache_invalidation_listener_error error=%s", exc)
+        finally:
+            with contextlib.suppress(redis.RedisError):
+                pubsub.close()
+        time.sleep(backoff)
+        backoff = min(backoff * 2, 30.0)
+
+
+def _start_listener() -> None:
+    global _listener_thread
+    if _listener_thread is not None and _listener_thread.is_alive():
+        return
+    _listener_thread = threading.Thread(
+        target=_listen_for_invalidations,
+        name="inbox-cache-invalidation",
+        daemon=True,
+    )
+    _listener_thread.start()
+
+
+# ---------------------------------------------------------------------------
+# Local tier
+# ---------------------------------------------------------------------------
+
+
+def _index_prefixes(key: str) -> tuple[str, ...]:
+    """Return the ``ns:`` and ``ns:segment:`` prefixes a key is indexed under."""
+    first, sep, rest = key.partition(":")
+    if not sep:
+        return ()
+    second, sep, _ = rest.partition(":")
+    if not sep:
+        return (f"{first}:",)
+    return (f"{first}:", f"{first}:{second}:")
+
+
+def _approximate_size(value: Any, depth: int = 0) -> int:
+    size = sys.getsizeof(value)
+    if depth >= 4:
+        return size
+    if isinstance(value, dict):
+        size += sum(
+            _approximate_size(item_key, depth + 1) + _approximate_size(item, depth + 1)
+            for item_key, item in value.items()
+        )
+    elif isinstance(value, (list, tuple)):
+        size += sum(_approximate_size(item, depth + 1) for item in value)
+    return size
+
+
+def _encode(value: Any) -> str | None:
+    try:
+        return json.dumps(value, separators=(",", ":"))
+    except (TypeError, ValueError):
+        # Values that are not plain JSON (ORM rows, enums) stay process-local.
+        return None
 
-def _expired(entry: _CacheEntry) -> bool:
-    return entry.expires_at <= _now()
+
+def _publish_size() -> None:
+    set_inbox_cache_size(entries=len(_cache), bytes_held=_bytes_held)
+
+
+def _remove_locked(key: str) -> _CacheEntry | None:
+    global _bytes_held
+    entry = _cache.pop(key, None)
+    if entry is None:
+        return None
+    _bytes_held -= entry.size
+    for prefix in _index_prefixes(key):
+        bucket = _prefix_index.get(prefix)
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del _prefix_index[prefix]
+    return entry
+
+
+def _sweep_expired_locked(now: float) -> int:
+    global _next_sweep_at
+    _next_sweep_at = now + SWEEP_INTERVAL_SECONDS
+    removed = 0
+    while _expiry_heap and _expiry_heap[0][0] <= now:
+        _, key = heapq.heappop(_expiry_heap)
+        entry = _cache.get(key)
+        if entry is not None and entry.expires_at <= now:
+            _remove_locked(key)
+            removed += 1
+    if len(_expiry_heap) > 4 * max(len(_cache), 64):
+        # Re-set and evicted keys leave stale heap items behind; rebuild occasionally.
+        _expiry_heap[:] = [(entry.expires_at, key) for key, entry in _cache.items()]
+        heapq.heapify(_expiry_heap)
+    return removed
+
+
+def _local_get(key: str) -> tuple[bool, Any]:
+    with _cache_guard:
+        entry = _cache.get(key)
+        if entry is None:
+            return False, None
+        if entry.expires_at <= time.time():
+            _remove_locked(key)
+            observe_inbox_cache_eviction(reason="expired")
+            _publish_size()
+            return False, None
+        if entry.version != _version(key):
+            _remove_locked(key)
+            _publish_size()
+            return False, None
+        _cache.move_to_end(key)
+        return True, entry.value
+
+
+def _local_set(key: str, value: Any, expires_at: float, version: tuple[int, int], size: int) -> None:
+    global _bytes_held
+    size += len(key)
+    if size > LOCAL_MAX_BYTES:
+        return
+    evicted: dict[str, int] = {}
+    with _cache_guard:
+        now = time.time()
+        if now >= _next_sweep_at:
+            evicted["expired"] = _sweep_expired_locked(now)
+        _remove_locked(key)
+        _cache[key] = _CacheEntry(value=value, expires_at=expires_at, version=version, size=size)
+        _bytes_held += size
+        for prefix in _index_prefixes(key):
+            _prefix_index.setdefault(prefix, builtins.set()).add(key)
+        heapq.heappush(_expiry_heap, (expires_at, key))
+        while len(_cache) > LOCAL_MAX_ENTRIES or _bytes_held > LOCAL_MAX_BYTES:
+            reason = "entries" if len(_cache) > LOCAL_MAX_ENTRIES else "bytes"
+            _remove_locked(next(iter(_cache)))
+            evicted[reason] = evicted.get(reason, 0) + 1
+        _publish_size()
+    for reason, count in evicted.items():
+        observe_inbox_cache_eviction(reason=reason, count=count)
+
+
+def _drop_local(prefix: str) -> None:
+    global _bytes_held
+    with _cache_guard:
+        if not prefix:
+            _cache.clear()
+            _prefix_index.clear()
+            _expiry_heap.clear()
+            _bytes_held = 0
+            _publish_size()
+            return
+        # Only the indexed bucket is scanned, so the cost is O(k) in the keys
+        # under that prefix rather than O(n) in the whole cache.
+        indexed = _index_prefixes(prefix)
+        candidates: Iterable[str] = _prefix_index.get(indexed[-1], ()) if indexed else _cache
+        keys = [key for key in candidates if key.startswith(prefix)]
+        for key in keys:
+            _remove_locked(key)
+        _publish_size()
+
+
+def _apply_generation(namespace: str, generation: int) -> bool:
+    """Move a namespace to ``generation`` if it is newer than the local one."""
+    with _cache_guard:
+        if generation <= _generations.get(namespace, 0):
+            return False
+        _generations[namespace] = generation
+    _drop_local("" if namespace == _GLOBAL_NAMESPACE else f"{namespace}:")
+    return True
+
+
+def _bump_generation(namespace: str) -> None:
+    shared = _publish_generation(namespace)
+    with _cache_guard:
+        local = _generations.get(namespace, 0) + 1
+    _apply_generation(namespace, max(local, shared or 0))
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
 
 
 def get(key: str) -> Any | None:
-    entry = _cache.get(key)
-    if not entry:
+    namespace = _namespace(key)
+    found, value = _local_get(key)
+    observe_inbox_cache_lookup(namespace=namespace, tier="local", outcome="hit" if found else "miss")
+    if found:
+        return value
+    if _get_redis() is None:
         return None
-    if _expired(entry):
-        _cache.pop(key, None)
+    version = _version(key)
+    found, value, expires_at, size = _shared_get(key, version)
+    found = found and expires_at > time.time()
+    observe_inbox_cache_lookup(namespace=namespace, tier="shared", outcome="hit" if found else "miss")
+    if not found:
         return None
-    return entry.value
+    _local_set(key, value, expires_at, version, size)
+    return value
 
 
 def set(key: str, value: Any, ttl_seconds: int) -> None:
-    _cache[key] = _CacheEntry(
-        value=value,
-        expires_at=_now() + timedelta(seconds=ttl_seconds),
-    )
+    _store(key, value, ttl_seconds, _version(key))
+
+
+def _store(key: str, value: Any, ttl_seconds: int, version: tuple[int, int]) -> None:
+    """Store ``value`` as of ``version``; dropped if the key was invalidated since."""
+    if _version(key) != version:
+        return
+    expires_at = time.time() + ttl_seconds
+    encoded = _encode(value)
+    size = len(encoded) if encoded is not None else _approximate_size(value)
+    _local_set(key, value, expires_at, version, size)
+    if encoded is not None:
+        _shared_set(key, encoded, expires_at, ttl_seconds, version)
 
 
-def _lock_for_key(key: str) -> Lock:
+@contextlib.contextmanager
+def _key_lock(key: str) -> Iterator[None]:
+    """Per-key loader lock, dropped once nobody is waiting on it."""
     with _cache_locks_guard:
-        return _cache_locks.setdefault(key, Lock())
+        key_lock = _cache_locks.get(key)
+        if key_lock is None:
+            key_lock = _cache_locks[key] = _KeyLock(lock=Lock())
+        key_lock.waiters += 1
+    try:
+        with key_lock.lock:
+            yield
+    finally:
+        with _cache_locks_guard:
+            key_lock.waiters -= 1
+            if key_lock.waiters == 0:
+                _cache_locks.pop(key, None)
 
 
 def get_or_set(key: str, ttl_seconds: int, loader) -> Any:
     cached = get(key)
     if cached is not None:
         return cached
-    lock = _lock_for_key(key)
-    with lock:
+    with _key_lock(key):
         cached = get(key)
         if cached is not None:
             return cached
+        # Captured before loading: if an invalidation lands while the loader
+        # runs, what it read may predate it and must not be cached.
+        version = _version(key)
         value = loader()
-        set(key, value, ttl_seconds)
+        _store(key, value, ttl_seconds, version)
         return value
 
 
 def invalidate_prefix(prefix: str) -> None:
-    keys = [key for key in _cache if key.startswith(prefix)]
-    for key in keys:
-        _cache.pop(key, None)
+    """Invalidate every entry under ``prefix`` in all workers.
+
+    Invalidation is namespace-granular across workers: clearing
+    ``inbox_list:`` or ``inbox_list:foo`` both retire the whole ``inbox_list``
+    namespace, and an empty prefix retires everything.
+    """
+    if not prefix:
+        _bump_generation(_GLOBAL_NAMESPACE)
+        return
+    _drop_local(prefix)
+    _bump_generation(_namespace(prefix))
 
 
 def invalidate_inbox_list() -> None:
@@ -0,0 +1,287 @@
+"""Incrementally maintained inbox counters.
+
+``crm_conversation_counters`` holds the number of active conversation
+summaries per (status, assignment, needs_attention, unreplied) bucket, so the
+inbox sidebar reads a handful of rows instead of counting the summary table.
+
+``recompute_conversation_summary`` reports each summary's bucket before and
+after it changes; the deltas collect in ``db.info`` and are upserted just
+before the caller commits, so the hot bucket rows are locked only for the
+commit rather than the whole request. Reads in the same session add the
+still-pending deltas. ``reconcile_counters`` rebuilds the table from the
+summaries to correct drift (cascade deletes, raw SQL, lost races) and runs on
+a beat schedule.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from datetime import UTC, datetime
+from typing import NamedTuple
+from uuid import UUID
+
+from sqlalchemy import delete, event, func, select, text, update
+from sqlalchemy.orm import Session
+
+from app.models.crm.conversation import ConversationCounter, ConversationSummary
+from app.models.crm.enums import ConversationStatus
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "_inbox_counter_deltas"
+_SAVEPOINTS_KEY = "_inbox_counter_savepoints"
+_LOCK_KEY = "crm_conversation_counters"
+
+
+class CounterKey(NamedTuple):
+    status: ConversationStatus
+    agent_id: UUID | None
+    team_id: UUID | None
+    needs_attention: bool
+    unreplied: bool
+
+    @property
+    def assignment_bucket(self) -> str:
+        if self.agent_id is not None:
+            return "agent"
+        if self.team_id is not None:
+            return "team"
+        return "unassigned"
+
+    @property
+    def bucket_key(self) -> str:
+        # The backfill migration builds the same string in SQL.
+        return ":".join(
+            (
+                self.status.value,
+                str(self.agent_id) if self.agent_id else "-",
+                str(self.team_id) if self.team_id else "-",
+                f"{int(self.needs_attention)}{int(self.unreplied)}",
+            )
+        )
+
+
+def summary_counter_key(summary: ConversationSummary | None) -> CounterKey | None:
+    """The bucket a summary counts towards, or None if it is not counted."""
+    if summary is None or not summary.is_active or summary.status is None:
+        return None
+    return CounterKey(
+        status=summary.status,
+        agent_id=summary.active_assignment_agent_id,
+        team_id=summary.active_assignment_team_id,
+        needs_attention=bool(summary.needs_attention),
+        unreplied=bool(summary.unreplied),
+    )
+
+
+def record_transition(db: Session, before: CounterKey | None, after: CounterKey | None) -> None:
+    """Queue a -1/+1 for a summary moving between buckets in this transaction."""
+    if before == after:
+        return
+    pending = db.info.setdefault(_PENDING_KEY, Counter())
+    if before is not None:
+        pending[before] -= 1
+    if after is not None:
+        pending[after] += 1
+
+
+def pending_deltas(db: Session) -> Counter:
+    return Counter(db.info.get(_PENDING_KEY) or {})
+
+
+def _lock_counters(db: Session, *, exclusive: bool) -> None:
+    """Transaction-scoped lock between delta commits (shared) and reconcile.
+
+    Reconcile holds it exclusively from reading the summaries until it
+    commits, so no delta lands between its read and its absolute write.
+    No-op off PostgreSQL (SQLite test harness).
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    function = "pg_advisory_xact_lock" if exclusive else "pg_advisory_xact_lock_shared"
+    db.execute(text(f"SELECT {function}(hashtext(:key))"), {"key": _LOCK_KEY})
+
+
+@event.listens_for(Session, "before_commit")
+def _apply_pending(session: Session) -> None:
+    deltas = session.info.pop(_PENDING_KEY, None)
+    if deltas and any(deltas.values()):
+        _lock_counters(session, exclusive=False)
+        apply_deltas(session, deltas)
+
+
+@event.listens_for(Session, "after_transaction_create")
+def _snapshot_for_savepoint(session: Session, transaction) -> None:
+    if transaction.nested:
+        session.info.setdefault(_SAVEPOINTS_KEY, {})[transaction] = pending_deltas(session)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _reset_pending(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+        session.info.pop(_SAVEPOINTS_KEY, None)
+        return
+    if not previous_transaction.nested:
+        # A failed flush's subtransaction; whatever encloses it decides.
+        return
+    # Deltas recorded inside a rolled-back savepoint never happened.
+    snapshot = session.info.get(_SAVEPOINTS_KEY, {}).pop(previous_transaction, None)
+    if snapshot is not None:
+        session.info[_PENDING_KEY] = snapshot
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_savepoint_snapshots(session: Session, transaction) -> None:
+    # Savepoint ends fire before their soft rollback, so snapshots are kept
+    # until the root transaction ends (flushes end subtransactions too).
+    if transaction.parent is None:
+        session.info.pop(_SAVEPOINTS_KEY, None)
+
+
+def _insert(db: Session):
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def apply_deltas(db: Session, deltas: Counter) -> None:
+    """Upsert bucket deltas; buckets are locked in key order to avoid deadlocks."""
+    insert = _insert(db)
+    now = datetime.now(UTC)
+    for key in sorted(deltas, key=lambda item: item.bucket_key):
+        delta = int(deltas[key])
+        if not delta:
+            continue
+        stmt = insert(ConversationCounter).values(
+            bucket_key=key.bucket_key,
+            status=key.status,
+            assignment_bucket=key.assignment_bucket,
+            agent_id=key.agent_id,
+            team_id=key.team_id,
+            needs_attention=key.needs_attention,
+            unreplied=key.unreplied,
+            count=max(delta, 0),
+            updated_at=now,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ConversationCounter.bucket_key],
+            set_={"count": ConversationCounter.count + delta, "updated_at": now},
+        )
+        db.execute(stmt)
+
+
+def counter_snapshot(db: Session) -> dict[CounterKey, int]:
+    """Current bucket counts, including this session's uncommitted deltas."""
+    counts: Counter = Counter()
+    rows = db.execute(
+        select(
+            ConversationCounter.status,
+            ConversationCounter.agent_id,
+            ConversationCounter.team_id,
+            ConversationCounter.needs_attention,
+            ConversationCounter.unreplied,
+            ConversationCounter.count,
+        )
+    ).all()
+    for status, agent_id, team_id, needs_attention, unreplied, count in rows:
+        counts[CounterKey(status, agent_id, team_id, bool(needs_attention), bool(unreplied))] += int(count or 0)
+    counts.update(pending_deltas(db))
+    return {key: count for key, count in counts.items() if count > 0}
+
+
+def _expected_counts(db: Session) -> Counter:
+    rows = db.execute(
+        select(
+            ConversationSummary.status,
+            ConversationSummary.active_assignment_agent_id,
+            ConversationSummary.active_assignment_team_id,
+            ConversationSummary.needs_attention,
+            ConversationSummary.unreplied,
+            func.count(ConversationSummary.conversation_id),
+        )
+        .where(ConversationSummary.is_active.is_(True))
+        .group_by(
+            ConversationSummary.status,
+            ConversationSummary.active_assignment_agent_id,
+            ConversationSummary.active_assignment_team_id,
+            ConversationSummary.needs_attention,
+            ConversationSummary.unreplied,
+        )
+    ).all()
+    expected: Counter = Counter()
+    for status, agent_id, team_id, needs_attention, unreplied, count in rows:
+        expected[CounterKey(status, agent_id, team_id, bool(needs_attention), bool(unreplied))] += int(count)
+    return expected
+
+
+def reconcile_counters(db: Session) -> dict[str, int]:
+    """Rewrite counter rows that disagree with the summary table.
+
+    Runs in the caller's transaction (the caller commits) and holds the
+    counter lock until then. Pending deltas of this session are dropped
+    because the rebuilt counts already include them.
+    """
+    db.flush()
+    db.info.pop(_PENDING_KEY, None)
+    _lock_counters(db, exclusive=True)
+    expected = _expected_counts(db)
+    current = {
+        row.bucket_key: int(row.count or 0)
+        for row in db.execute(select(ConversationCounter.bucket_key, ConversationCounter.count)).all()
+    }
+    now = datetime.now(UTC)
+    corrected = inserted = 0
+    for key in sorted(expected, key=lambda item: item.bucket_key):
+        count = expected[key]
+        existing = current.pop(key.bucket_key, None)
+        if existing is None:
+            db.add(
+                ConversationCounter(
+                    bucket_key=key.bucket_key,
+                    status=key.status,
+                    assignment_bucket=key.assignment_bucket,
+                    agent_id=key.agent_id,
+                    team_id=key.team_id,
+                    needs_attention=key.needs_attention,
+                    unreplied=key.unreplied,
+                    count=count,
+                    updated_at=now,
+                )
+            )
+            inserted += 1
+        elif existing != count:
+            db.execute(
+                update(ConversationCounter)
+                .where(ConversationCounter.bucket_key == key.bucket_key)
+                .values(count=count, updated_at=now)
+            )
+            corrected += 1
+    removed = len(current)
+    if current:
+        db.execute(delete(ConversationCounter).where(ConversationCounter.bucket_key.in_(list(current))))
+    db.flush()
+    if corrected or removed:
+        logger.info("inbox_counters_drift_corrected corrected=%s removed=%s", corrected, removed)
+    return {"buckets": len(expected), "inserted": inserted, "corrected": corrected, "removed": removed}
+
+
+def ensure_counter_rows(db: Session) -> None:
+    """Build the counters in-process when the table is empty but summaries exist.
+
+    The migration seeds this table in production; this keeps tests and fresh
+    databases correct, mirroring ``_ensure_summary_rows``.
+    """
+    if db.execute(select(ConversationCounter.bucket_key).limit(1)).first() is not None:
+        return
+    has_summaries = (
+        db.execute(
+            select(ConversationSummary.conversation_id).where(ConversationSummary.is_active.is_(True)).limit(1)
+        ).first()
+        is not None
+    )
+    if has_summaries:
+        reconcile_counters(db)
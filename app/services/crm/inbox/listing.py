@@ -21,7 +21,7 @@ from app.services.crm.inbox.conversation_status import reopen_due_snoozed_conver
 from app.services.crm.inbox.queries import list_inbox_conversations
 from app.services.crm.inbox.search import normalize_search
 
-INBOX_LIST_CACHE_SCHEMA = 3
+INBOX_LIST_CACHE_SCHEMA = 4
 DEFAULT_INBOX_PAGE_SIZE = 50
 
 
@@ -39,6 +39,67 @@ class InboxListResult:
     next_offset: int | None
 
 
+_LATEST_MESSAGE_DATETIME_FIELDS = ("received_at", "sent_at", "created_at", "last_message_at")
+
+
+def _encode_datetime(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _decode_datetime(value: Any) -> Any:
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return value
+
+
+def _serialize_latest_message(latest_message: Any) -> dict | None:
+    """Encode the latest-message row as plain JSON so it can live in the shared cache tier."""
+    if not isinstance(latest_message, dict):
+        return None
+    encoded = dict(latest_message)
+    channel_type = encoded.get("channel_type")
+    encoded["channel_type"] = getattr(channel_type, "value", channel_type)
+    if encoded.get("channel_target_id") is not None:
+        encoded["channel_target_id"] = str(encoded["channel_target_id"])
+    for field in _LATEST_MESSAGE_DATETIME_FIELDS:
+        encoded[field] = _encode_datetime(encoded.get(field))
+    return encoded
+
+
+def _hydrate_latest_message(payload: Any) -> dict | None:
+    if not isinstance(payload, dict):
+        return None
+    decoded = dict(payload)
+    channel_type = decoded.get("channel_type")
+    if isinstance(channel_type, str):
+        try:
+            decoded["channel_type"] = ChannelType(channel_type)
+        except ValueError:
+            decoded["channel_type"] = None
+    for field in _LATEST_MESSAGE_DATETIME_FIELDS:
+        decoded[field] = _decode_datetime(decoded.get(field))
+    return decoded
+
+
+def _serialize_failed_outbox(failed_outbox: dict | None) -> dict | None:
+    if not isinstance(failed_outbox, dict):
+        return None
+    encoded = dict(failed_outbox)
+    encoded["last_attempt_at"] = _encode_datetime(encoded.get("last_attempt_at"))
+    return encoded
+
+
+def _hydrate_failed_outbox(payload: Any) -> dict | None:
+    if not isinstance(payload, dict):
+        return None
+    decoded = dict(payload)
+    decoded["last_attempt_at"] = _decode_datetime(decoded.get("last_attempt_at"))
+    return decoded
+
+
 def _serialize_conversations_raw(conversations_raw: list[tuple[Any, Any, int, dict | None]]) -> list[dict]:
     serialized: list[dict] = []
     for conv, latest_message, unread_count, failed_outbox in conversations_raw:
@@ -48,9 +109,9 @@ def _serialize_conversations_raw(conversations_raw: list[tuple[Any, Any, int, di
         serialized.append(
             {
                 "conversation_id": str(conv_id),
-                "latest_message": latest_message,
+                "latest_message": _serialize_latest_message(latest_message),
                 "unread_count": int(unread_count or 0),
-                "failed_outbox": failed_outbox,
+                "failed_outbox": _serialize_failed_outbox(failed_outbox),
             }
         )
     return serialized
@@ -91,9 +152,9 @@ def _hydrate_conversations_raw(db: Session, payload: list[dict]) -> list[tuple[A
         hydrated.append(
             (
                 conv,
-                item.get("latest_message"),
+                _hydrate_latest_message(item.get("latest_message")),
                 int(item.get("unread_count") or 0),
-                item.get("failed_outbox") if isinstance(item.get("failed_outbox"), dict) else None,
+                _hydrate_failed_outbox(item.get("failed_outbox")),
             )
         )
     return hydrated
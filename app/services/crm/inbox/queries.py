@@ -611,30 +611,26 @@ def list_inbox_conversations(
     return result
 
 
+def _counter_snapshot(db: Session) -> dict:
+    """Bucket counts from the incrementally maintained counters table."""
+    from app.services.crm.inbox.counters import counter_snapshot, ensure_counter_rows
+
+    _ensure_summary_rows(db)
+    ensure_counter_rows(db)
+    return counter_snapshot(db)
+
+
 def get_inbox_stats(db: Session) -> dict:
     """Get inbox statistics efficiently.
 
     Returns: {total, open, pending, snoozed, resolved_to_ticket, resolved, unread}
-    Uses single GROUP BY query instead of loading all conversations.
+    Reads the per-bucket counters instead of counting conversation summaries.
     """
     cache = db.info.setdefault("_inbox_query_cache", {})
     cached = cache.get(("inbox_stats",))
     if isinstance(cached, dict):
         return dict(cached)
 
-    _ensure_summary_rows(db)
-    # Single query with GROUP BY for status counts
-    status_counts = (
-        db.query(
-            ConversationSummary.status,
-            func.count(ConversationSummary.conversation_id).label("count"),
-        )
-        .filter(ConversationSummary.is_active.is_(True))
-        .group_by(ConversationSummary.status)
-        .all()
-    )
-
-    # Build stats dict from results
     stats = {
         "all": 0,
         "open": 0,
@@ -645,26 +641,12 @@ def get_inbox_stats(db: Session) -> dict:
         "unread": 0,
     }
 
-    for status, count in status_counts:
+    for key, count in _counter_snapshot(db).items():
         stats["all"] += count
-        if status == ConversationStatus.open:
-            stats["open"] = count
-        elif status == ConversationStatus.pending:
-            stats["pending"] = count
-        elif status == ConversationStatus.snoozed:
-            stats["snoozed"] = count
-        elif status == ConversationStatus.resolved_to_ticket:
-            stats["resolved_to_ticket"] = count
-        elif status == ConversationStatus.resolved:
-            stats["resolved"] = count
-
-    stats["unread"] = int(
-        db.query(func.count(ConversationSummary.conversation_id))
-        .filter(ConversationSummary.is_active.is_(True))
-        .filter(or_(ConversationSummary.needs_attention.is_(True), ConversationSummary.unreplied.is_(True)))
-        .scalar()
-        or 0
-    )
+        if key.status.value in stats:
+            stats[key.status.value] += count
+        if key.needs_attention or key.unreplied:
+            stats["unread"] += count
 
     cache[("inbox_stats",)] = dict(stats)
     return stats
@@ -676,14 +658,29 @@ def _count_active_conversations_for_filter(
     assignment_filter: str,
     assigned_person_id: str | None = None,
 ) -> int:
-    _ensure_summary_rows(db)
-    query = db.query(ConversationSummary.conversation_id).filter(ConversationSummary.is_active.is_(True))
     filter_key = (assignment_filter or "").strip().lower()
 
+    if filter_key == "ai_handling":
+        # AI intake state lives in conversation metadata, outside the counter buckets.
+        _ensure_summary_rows(db)
+        query = (
+            db.query(ConversationSummary.conversation_id)
+            .filter(ConversationSummary.is_active.is_(True))
+            .filter(ConversationSummary.status == ConversationStatus.pending)
+            .filter(
+                ConversationSummary.conversation_id.in_(
+                    db.query(Conversation.id)
+                    .filter(Conversation.metadata_["ai_intake"]["status"].as_string().in_(AI_INTAKE_ACTIVE_STATUSES))
+                    .distinct()
+                )
+            )
+        )
+        return int(query.count() or 0)
+
     if filter_key in ("assigned", "assigned_to_me", "mine"):
         if not assigned_person_id:
             return 0
-        agent_ids = [
+        agent_ids = {
             row[0]
             for row in (
                 db.query(CrmAgent.id)
@@ -691,77 +688,48 @@ def _count_active_conversations_for_filter(
                 .filter(CrmAgent.is_active.is_(True))
                 .all()
             )
-        ]
+        }
         if not agent_ids:
             return 0
-        assigned_conversation_subq = (
-            db.query(ConversationAssignment.conversation_id)
-            .filter(ConversationAssignment.is_active.is_(True))
-            .filter(ConversationAssignment.agent_id.in_(agent_ids))
-            .distinct()
-        )
-        query = query.filter(ConversationSummary.conversation_id.in_(assigned_conversation_subq))
-    elif filter_key == "unassigned":
-        assigned_conversation_subq = (
-            db.query(ConversationAssignment.conversation_id)
-            .filter(ConversationAssignment.is_active.is_(True))
-            .distinct()
-        )
-        query = query.filter(
-            ConversationSummary.status.in_([ConversationStatus.open, ConversationStatus.pending])
-        ).filter(~ConversationSummary.conversation_id.in_(assigned_conversation_subq))
-    elif filter_key == "unreplied":
-        query = query.filter(ConversationSummary.unreplied.is_(True))
-    elif filter_key == "needs_attention":
-        query = query.filter(ConversationSummary.needs_attention.is_(True))
-    elif filter_key == "my_team":
+        return sum(count for key, count in _counter_snapshot(db).items() if key.agent_id in agent_ids)
+    if filter_key == "my_team":
         crm_team_ids_subq = _crm_team_ids_for_person_subquery(db, assigned_person_id)
         if crm_team_ids_subq is None:
             return 0
-        team_conv_subq = (
-            db.query(ConversationAssignment.conversation_id)
-            .filter(ConversationAssignment.is_active.is_(True))
-            .filter(ConversationAssignment.team_id.in_(select(crm_team_ids_subq.c.id)))
-            .distinct()
-        )
-        query = query.filter(ConversationSummary.conversation_id.in_(team_conv_subq))
-    elif filter_key == "ai_handling":
-        query = query.filter(ConversationSummary.status == ConversationStatus.pending).filter(
-            ConversationSummary.conversation_id.in_(
-                db.query(Conversation.id)
-                .filter(Conversation.metadata_["ai_intake"]["status"].as_string().in_(AI_INTAKE_ACTIVE_STATUSES))
-                .distinct()
-            )
+        team_ids = {row[0] for row in db.execute(select(crm_team_ids_subq.c.id)).all()}
+        if not team_ids:
+            return 0
+        return sum(count for key, count in _counter_snapshot(db).items() if key.team_id in team_ids)
+
+    snapshot = _counter_snapshot(db)
+    if filter_key == "unassigned":
+        return sum(
+            count
+            for key, count in snapshot.items()
+            if key.assignment_bucket == "unassigned"
+            and key.status in (ConversationStatus.open, ConversationStatus.pending)
         )
-
-    return int(query.count() or 0)
+    if filter_key == "unreplied":
+        return sum(count for key, count in snapshot.items() if key.unreplied)
+    if filter_key == "needs_attention":
+        return sum(count for key, count in snapshot.items() if key.needs_attention)
+    return sum(snapshot.values())
 
 
 def _get_base_assignment_counts(db: Session) -> dict[str, int]:
-    _ensure_summary_rows(db)
-    base = select(func.count(ConversationSummary.conversation_id)).where(ConversationSummary.is_active.is_(True))
-    assigned_conversation_subq = (
-        select(ConversationAssignment.conversation_id).where(ConversationAssignment.is_active.is_(True)).distinct()
-    )
-    row = db.execute(
-        select(
-            base.scalar_subquery().label("all_count"),
-            base.where(
-                ConversationSummary.status.in_([ConversationStatus.open, ConversationStatus.pending]),
-                ~ConversationSummary.conversation_id.in_(assigned_conversation_subq),
-            )
-            .scalar_subquery()
-            .label("unassigned_count"),
-            base.where(ConversationSummary.unreplied.is_(True)).scalar_subquery().label("unreplied_count"),
-            base.where(ConversationSummary.needs_attention.is_(True)).scalar_subquery().label("needs_attention_count"),
-        )
-    ).one()
-    return {
-        "all": int(row.all_count or 0),
-        "unassigned": int(row.unassigned_count or 0),
-        "unreplied": int(row.unreplied_count or 0),
-        "needs_attention": int(row.needs_attention_count or 0),
-    }
+    counts = {"all": 0, "unassigned": 0, "unreplied": 0, "needs_attention": 0}
+    for key, count in _counter_snapshot(db).items():
+        counts["all"] += count
+        if key.assignment_bucket == "unassigned" and key.status in (
+            ConversationStatus.open,
+            ConversationStatus.pending,
+        ):
+            counts["unassigned"] += count
+        if key.unreplied:
+            counts["unreplied"] += count
+        if key.needs_attention:
+            counts["needs_attention"] += count
+    return counts
 
 
 def get_assignment_counts(
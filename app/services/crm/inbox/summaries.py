@@ -3,17 +3,32 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
+from dataclasses import dataclass
 from datetime import UTC, datetime
+from uuid import UUID
 
-from sqlalchemy import func
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
 from app.models.crm.conversation import Conversation, ConversationSummary, Message
 from app.models.crm.enums import ConversationStatus, MessageDirection, MessageStatus, ResponseObligationState
 from app.models.crm.outbox import OutboxMessage
 from app.services.common import coerce_uuid
+from app.services.crm.inbox.counters import record_transition, summary_counter_key
 
 RESOLVED_STATUSES = {ConversationStatus.resolved, ConversationStatus.resolved_to_ticket}
+# Bounds the IN lists and the window query of one batched recompute.
+BATCH_SIZE = 500
+
+
+@dataclass(frozen=True)
+class _LatestActivity:
+    message_id: UUID | None = None
+    channel_type: object = None
+    activity_at: datetime | None = None
+    inbound_at: datetime | None = None
+    outbound_at: datetime | None = None
+    unread_count: int = 0
 
 
 def _now() -> datetime:
@@ -31,6 +46,7 @@ def recompute_conversation_summary(db: Session, conversation_id: str) -> Convers
     if not conversation:
         summary = db.get(ConversationSummary, conversation_uuid)
         if summary:
+            record_transition(db, summary_counter_key(summary), None)
             db.delete(summary)
         return None
 
@@ -67,8 +83,6 @@ def recompute_conversation_summary(db: Session, conversation_id: str) -> Convers
         .scalar()
         or 0
     )
-    needs_attention = bool(obligation and obligation.state == ResponseObligationState.awaiting_follow_up)
-    unreplied = bool(obligation and obligation.state == ResponseObligationState.awaiting_first_response)
     has_failed_outbox = bool(
         db.query(OutboxMessage.id)
         .filter(OutboxMessage.conversation_id == conversation_uuid)
@@ -77,18 +91,48 @@ def recompute_conversation_summary(db: Session, conversation_id: str) -> Convers
     )
 
     summary = db.get(ConversationSummary, conversation_uuid)
+    return _write_summary(
+        db,
+        conversation,
+        summary,
+        obligation=obligation,
+        latest=_LatestActivity(
+            message_id=latest.id if latest else None,
+            channel_type=latest.channel_type if latest else None,
+            activity_at=latest.activity_at if latest else None,
+            inbound_at=latest_inbound_at,
+            outbound_at=latest_outbound_at,
+            unread_count=int(unread_count),
+        ),
+        has_failed_outbox=has_failed_outbox,
+    )
+
+
+def _write_summary(
+    db: Session,
+    conversation: Conversation,
+    summary: ConversationSummary | None,
+    *,
+    obligation,
+    latest: _LatestActivity,
+    has_failed_outbox: bool,
+) -> ConversationSummary:
+    counted_before = summary_counter_key(summary)
     if not summary:
-        summary = ConversationSummary(conversation_id=conversation_uuid, person_id=conversation.person_id)
+        summary = ConversationSummary(conversation_id=conversation.id, person_id=conversation.person_id)
         db.add(summary)
 
+    needs_attention = bool(obligation and obligation.state == ResponseObligationState.awaiting_follow_up)
+    unreplied = bool(obligation and obligation.state == ResponseObligationState.awaiting_first_response)
+
     summary.person_id = conversation.person_id
-    summary.latest_message_id = latest.id if latest else None
-    summary.latest_message_at = latest.activity_at if latest else conversation.last_message_at
-    summary.latest_inbound_at = latest_inbound_at
-    summary.latest_outbound_at = latest_outbound_at
-    summary.unread_count = int(unread_count)
+    summary.latest_message_id = latest.message_id
+    summary.latest_message_at = latest.activity_at if latest.message_id else conversation.last_message_at
+    summary.latest_inbound_at = latest.inbound_at
+    summary.latest_outbound_at = latest.outbound_at
+    summary.unread_count = latest.unread_count
     summary.has_failed_outbox = has_failed_outbox
-    summary.primary_channel_type = latest.channel_type if latest else None
+    summary.primary_channel_type = latest.channel_type
     summary.active_assignment_agent_id = obligation.owner_agent_id if obligation else None
     summary.active_assignment_team_id = obligation.owner_team_id if obligation else None
     summary.needs_attention = needs_attention
@@ -97,6 +141,7 @@ def recompute_conversation_summary(db: Session, conversation_id: str) -> Convers
     summary.priority = conversation.priority
     summary.is_active = bool(conversation.is_active)
     summary.updated_at = _now()
+    record_transition(db, counted_before, summary_counter_key(summary))
     return summary
 
 
@@ -112,9 +157,111 @@ def recompute_conversation_summary_and_invalidate_cache(
     return summary
 
 
-def recompute_conversation_summaries(db: Session, conversation_ids: Iterable[str]) -> int:
+def _latest_activity_by_conversation(db: Session, conversation_ids: list[UUID]) -> dict[UUID, _LatestActivity]:
+    """Latest message, per-direction maxima and unread count in one windowed pass."""
+    activity = _message_activity_ts()
+    partition = Message.conversation_id
+    unread = case(
+        (
+            (Message.direction == MessageDirection.inbound)
+            & (Message.status == MessageStatus.received)
+            & Message.read_at.is_(None),
+            1,
+        ),
+        else_=0,
+    )
+    ranked = (
+        select(
+            Message.conversation_id.label("conversation_id"),
+            Message.id.label("message_id"),
+            Message.channel_type.label("channel_type"),
+            activity.label("activity_at"),
+            func.row_number().over(partition_by=partition, order_by=activity.desc()).label("rn"),
+            func.max(case((Message.direction == MessageDirection.inbound, activity)))
+            .over(partition_by=partition)
+            .label("inbound_at"),
+            func.max(case((Message.direction == MessageDirection.outbound, activity)))
+            .over(partition_by=partition)
+            .label("outbound_at"),
+            func.sum(unread).over(partition_by=partition).label("unread_count"),
+        )
+        .where(Message.conversation_id.in_(conversation_ids))
+        .subquery()
+    )
+    rows = db.execute(select(ranked).where(ranked.c.rn == 1)).all()
+    return {
+        row.conversation_id: _LatestActivity(
+            message_id=row.message_id,
+            channel_type=row.channel_type,
+            activity_at=row.activity_at,
+            inbound_at=row.inbound_at,
+            outbound_at=row.outbound_at,
+            unread_count=int(row.unread_count or 0),
+        )
+        for row in rows
+    }
+
+
+def _recompute_batch(db: Session, conversation_ids: list[UUID]) -> int:
+    from app.services.crm.inbox.response_obligations import reconcile_response_obligation
+
+    conversations = {
+        conversation.id: conversation
+        for conversation in db.query(Conversation).filter(Conversation.id.in_(conversation_ids)).all()
+    }
+    summaries = {
+        summary.conversation_id: summary
+        for summary in db.query(ConversationSummary)
+        .filter(ConversationSummary.conversation_id.in_(conversation_ids))
+        .all()
+    }
+    for conversation_id, summary in summaries.items():
+        if conversation_id not in conversations:
+            record_transition(db, summary_counter_key(summary), None)
+            db.delete(summary)
+    if not conversations:
+        return 0
+
+    # The response-policy owner still reconciles each conversation on its own;
+    # only the message and outbox aggregates are set-based.
+    obligations = {
+        conversation_id: reconcile_response_obligation(db, str(conversation_id)) for conversation_id in conversations
+    }
+    activity = _latest_activity_by_conversation(db, list(conversations))
+    failed_outbox = set(
+        db.scalars(
+            select(OutboxMessage.conversation_id)
+            .where(OutboxMessage.conversation_id.in_(list(conversations)))
+            .where(OutboxMessage.status == "failed")
+            .distinct()
+        )
+    )
+    for conversation_id, conversation in conversations.items():
+        _write_summary(
+            db,
+            conversation,
+            summaries.get(conversation_id),
+            obligation=obligations[conversation_id],
+            latest=activity.get(conversation_id, _LatestActivity()),
+            has_failed_outbox=conversation_id in failed_outbox,
+        )
+    return len(conversations)
+
+
+def recompute_conversation_summaries(
+    db: Session,
+    conversation_ids: Iterable[str],
+    *,
+    batch_size: int = BATCH_SIZE,
+) -> int:
+    """Recompute many summaries with a few set-based queries per batch.
+
+    Produces the same rows as calling ``recompute_conversation_summary`` for
+    each id, inside the caller's transaction. Returns the number of summaries
+    written; ids without a conversation have their summary removed.
+    """
+    unique_ids = sorted({coerce_uuid(str(value)) for value in conversation_ids if value}, key=str)
     updated = 0
-    for conversation_id in {str(value) for value in conversation_ids if value}:
-        if recompute_conversation_summary(db, conversation_id) is not None:
-            updated += 1
+    for start in range(0, len(unique_ids), batch_size):
+        updated += _recompute_batch(db, unique_ids[start : start + batch_size])
     return updated
@@ -0,0 +1,832 @@
+"""Hourly CRM reporting rollups.
+
+``crm_metric_rollups`` holds, per hour and (channel, inbox, team, agent),
+message, assignment, first-response and resolution counts, first-response
+and queue wait sums and mergeable quantile sketches, so reports over long
+windows read a few thousand bucket rows instead of scanning messages and
+replies.
+
+Maintenance is by dirty hour rather than by delta. Committed changes to
+messages, assignments and conversations mark the hours they touch in
+``crm_metric_rollup_hours``; ``refresh_rollups`` (beat-scheduled) rebuilds
+each dirty hour from the raw rows, which keeps the buckets exact and
+idempotent however often an hour is touched. A rebuild commits a claim
+on its hour before reading it and then holds an advisory lock on the hour
+until it commits, so rebuilds of one hour never interleave. Commits only
+write the hour row when it is not already waiting for a rebuild that
+starts after them, so writers don't queue on the current hour's row. The same job extends coverage
+backwards a day per run until ``BACKFILL_DAYS`` are covered, and fills
+quiet hours so coverage has no gaps; ``backfill_rollups`` does a range on
+demand.
+
+Attribution is as of the event: a message counts toward the assignment
+that covered it when it was sent, a resolution toward the assignment that
+held the conversation when it was resolved, and assignment measures toward
+the hour the assignment started.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import and_, delete, event, func, inspect, or_, select, text, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.crm.conversation import (
+    Conversation,
+    ConversationAssignment,
+    ConversationMetricRollup,
+    ConversationMetricRollupHour,
+    ConversationSummary,
+    Message,
+)
+from app.models.crm.enums import ChannelType, ConversationStatus, MessageDirection
+from app.models.crm.team import CrmAgent
+from app.services.crm.metrics import ensure_aware, is_resolved_closing_message
+
+logger = logging.getLogger(__name__)
+
+HOUR = timedelta(hours=1)
+# Shorter windows keep reading raw rows: they are cheap and stay exact to
+# the second, while rollups round the window out to whole hours.
+ROLLUP_MIN_WINDOW = timedelta(days=7)
+BACKFILL_DAYS = 90
+BACKFILL_HOURS_PER_RUN = 24
+REFRESH_HOURS_PER_RUN = 48
+SKETCH_RELATIVE_ACCURACY = 0.01
+# Bounds the IN lists of one hour's rebuild.
+_BATCH_SIZE = 500
+_PENDING_KEY = "_crm_metric_rollup_hours"
+_RECHECK_KEY = "_crm_metric_rollup_recheck_hours"
+
+
+def hour_floor(value: datetime) -> datetime:
+    aware = ensure_aware(value) or value
+    return aware.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch (DDSketch style).
+
+    Every estimate is within ``SKETCH_RELATIVE_ACCURACY`` of a true sample
+    value, and two sketches merge by adding bin counts, so hourly sketches
+    combine into any window.
+    """
+
+    _gamma = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+    _log_gamma = math.log(_gamma)
+
+    def __init__(self, bins: dict[int, int] | None = None, zeros: int = 0) -> None:
+        self.bins: dict[int, int] = dict(bins or {})
+        self.zeros = zeros
+
+    @property
+    def count(self) -> int:
+        return self.zeros + sum(self.bins.values())
+
+    def add(self, value: float) -> None:
+        if value <= 0:
+            self.zeros += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[index] = self.bins.get(index, 0) + 1
+
+    def merge(self, other: QuantileSketch) -> None:
+        self.zeros += other.zeros
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+
+    def quantile(self, q: float) -> float | None:
+        """Nearest-rank estimate, matching ``reports._percentile``'s rank."""
+        total = self.count
+        if not total:
+            return None
+        rank = max(0, min(total - 1, round(q * (total - 1))))
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                return 2 * self._gamma**index / (self._gamma + 1)
+        return None
+
+    def to_dict(self) -> dict[str, Any] | None:
+        if not self.count:
+            return None
+        return {"zeros": self.zeros, "bins": {str(index): count for index, count in self.bins.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> QuantileSketch:
+        if not data:
+            return cls()
+        return cls({int(index): int(count) for index, count in (data.get("bins") or {}).items()}, int(data["zeros"]))
+
+
+def merged_sketch(rows: Iterable[ConversationMetricRollup], column: str) -> QuantileSketch:
+    sketch = QuantileSketch()
+    for row in rows:
+        sketch.merge(QuantileSketch.from_dict(getattr(row, column)))
+    return sketch
+
+
+# ---------------------------------------------------------------------------
+# Dirty-hour tracking
+# ---------------------------------------------------------------------------
+
+
+def mark_dirty(db: Session, *moments: datetime | None) -> None:
+    """Queue the hours of ``moments`` for a rebuild once this transaction commits."""
+    hours = {hour_floor(moment) for moment in moments if isinstance(moment, datetime)}
+    if hours:
+        db.info.setdefault(_PENDING_KEY, set()).update(hours)
+
+
+def _insert(db: Session):
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def _flag_hours(db: Session, hours: Iterable[datetime]) -> None:
+    insert = _insert(db)
+    now = datetime.now(UTC)
+    # Key order, so concurrent commits touching the same hours can't deadlock.
+    for bucket_start in sorted(hours):
+        stmt = insert(ConversationMetricRollupHour).values(bucket_start=bucket_start, dirty_at=now)
+        db.execute(stmt.on_conflict_do_update(index_elements=["bucket_start"], set_={"dirty_at": now}))
+
+
+def _hours_needing_mark(db: Session, hours: set[datetime]) -> set[datetime]:
+    """Hours not already waiting for a rebuild that will start after now.
+
+    An hour marked since its latest rebuild started will be rebuilt again,
+    and that rebuild sees this commit, so marking it again would only
+    serialize writers on the same row.
+    """
+    pending = set()
+    for bucket_start, dirty_at, claimed_at in db.execute(
+        select(
+            ConversationMetricRollupHour.bucket_start,
+            ConversationMetricRollupHour.dirty_at,
+            ConversationMetricRollupHour.claimed_at,
+        ).where(ConversationMetricRollupHour.bucket_start.in_(hours))
+    ):
+        if dirty_at is not None and (claimed_at is None or ensure_aware(claimed_at) < ensure_aware(dirty_at)):
+            pending.add(hour_floor(bucket_start))
+    return hours - pending
+
+
+@event.listens_for(Session, "before_commit")
+def _apply_pending(session: Session) -> None:
+    # Savepoint releases fire this too; marks wait for the real commit.
+    if session.in_nested_transaction():
+        return
+    # Flush first: the flush commit() would run next can still mark hours.
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    hours = session.info.pop(_PENDING_KEY, None)
+    if not hours:
+        return
+    needed = _hours_needing_mark(session, hours)
+    if needed:
+        _flag_hours(session, needed)
+    if hours - needed:
+        session.info[_RECHECK_KEY] = hours - needed
+
+
+@event.listens_for(Session, "after_commit")
+def _recheck_skipped(session: Session) -> None:
+    # A rebuild may have claimed a skipped hour between the check and the
+    # commit, and then its snapshot may predate this commit: mark again.
+    if session.in_nested_transaction():
+        return
+    hours = session.info.pop(_RECHECK_KEY, None)
+    if not hours:
+        return
+    try:
+        with Session(bind=session.get_bind()) as marker:
+            needed = _hours_needing_mark(marker, hours)
+            if needed:
+                _flag_hours(marker, needed)
+                marker.commit()
+    except SQLAlchemyError as exc:
+        logger.warning("crm_metric_rollups_mark_failed hours=%s error=%s", len(hours), exc)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _reset_pending(session: Session, previous_transaction) -> None:
+    # Only the root rollback discards marks; a savepoint or failed flush
+    # rolling back leaves at most an extra rebuild.
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+        session.info.pop(_RECHECK_KEY, None)
+
+
+def _changed(target: object, *names: str) -> bool:
+    state = inspect(target)
+    return any(state.attrs[name].history.has_changes() for name in names)
+
+
+def _previous(target: object, name: str) -> datetime | None:
+    deleted = inspect(target).attrs[name].history.deleted
+    return deleted[0] if deleted else None
+
+
+def _session_of(target: object) -> Session | None:
+    return inspect(target).session
+
+
+@event.listens_for(Message, "after_insert")
+@event.listens_for(Message, "after_delete")
+def _message_written(_mapper, _connection, target: Message) -> None:
+    session = _session_of(target)
+    if session is not None:
+        mark_dirty(session, target.received_at or target.sent_at or target.created_at)
+
+
+@event.listens_for(Message, "after_update")
+def _message_updated(_mapper, _connection, target: Message) -> None:
+    session = _session_of(target)
+    if session is None or not _changed(
+        target, "received_at", "sent_at", "created_at", "direction", "channel_type", "author_id", "metadata_"
+    ):
+        return
+    mark_dirty(
+        session,
+        target.received_at or target.sent_at or target.created_at,
+        _previous(target, "sent_at"),
+        _previous(target, "received_at"),
+        target.created_at,
+    )
+
+
+@event.listens_for(ConversationAssignment, "after_insert")
+@event.listens_for(ConversationAssignment, "after_delete")
+def _assignment_written(_mapper, _connection, target: ConversationAssignment) -> None:
+    session = _session_of(target)
+    if session is not None:
+        mark_dirty(session, target.assigned_at, target.ended_at, target.first_response_at)
+
+
+@event.listens_for(ConversationAssignment, "after_update")
+def _assignment_updated(_mapper, _connection, target: ConversationAssignment) -> None:
+    session = _session_of(target)
+    if session is None or not _changed(
+        target, "assigned_at", "ended_at", "first_response_at", "response_time_seconds", "agent_id", "team_id"
+    ):
+        return
+    mark_dirty(
+        session,
+        target.assigned_at,
+        target.ended_at,
+        target.first_response_at,
+        _previous(target, "assigned_at"),
+        _previous(target, "ended_at"),
+    )
+
+
+@event.listens_for(Conversation, "after_update")
+def _conversation_updated(_mapper, _connection, target: Conversation) -> None:
+    session = _session_of(target)
+    if session is None:
+        return
+    if _changed(target, "status", "resolved_at"):
+        mark_dirty(session, target.resolved_at, _previous(target, "resolved_at"))
+        if target.status == ConversationStatus.resolved and target.resolved_at is None:
+            mark_dirty(session, target.updated_at)
+    if _changed(target, "last_queue_assigned_at", "last_queue_wait_seconds", "first_assigned_at", "queued_at"):
+        mark_dirty(
+            session,
+            target.last_queue_assigned_at,
+            target.first_assigned_at,
+            _previous(target, "last_queue_assigned_at"),
+            _previous(target, "first_assigned_at"),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Rebuilding an hour
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _Bucket:
+    inbound_messages: int = 0
+    outbound_messages: int = 0
+    active_conversations: int = 0
+    channel_active_conversations: int = 0
+    assignments: int = 0
+    first_responses: int = 0
+    first_response_seconds_sum: int = 0
+    first_response_sketch: QuantileSketch = field(default_factory=QuantileSketch)
+    resolutions: int = 0
+    queue_waits: int = 0
+    queue_wait_seconds_sum: int = 0
+    queue_wait_sketch: QuantileSketch = field(default_factory=QuantileSketch)
+
+
+_BucketKey = tuple[ChannelType | None, UUID | None, UUID | None, UUID | None]
+
+
+def _chunks(values: Iterable[Any]) -> Iterator[list[Any]]:
+    items = list(values)
+    for index in range(0, len(items), _BATCH_SIZE):
+        yield items[index : index + _BATCH_SIZE]
+
+
+def _message_time():
+    return func.coalesce(Message.received_at, Message.sent_at, Message.created_at)
+
+
+def _stint_start(assignment: ConversationAssignment) -> datetime | None:
+    return ensure_aware(assignment.assigned_at) or ensure_aware(assignment.created_at)
+
+
+def _stint_at(
+    stints: list[ConversationAssignment], moment: datetime, *, open_ended: bool
+) -> ConversationAssignment | None:
+    """Latest assignment started by ``moment`` that had not ended by then."""
+    best: ConversationAssignment | None = None
+    best_start: datetime | None = None
+    for stint in stints:
+        start = _stint_start(stint)
+        if start is None or start > moment:
+            continue
+        end = ensure_aware(stint.ended_at)
+        if end is not None and (end < moment if open_ended else end <= moment):
+            continue
+        if best_start is None or start >= best_start:
+            best, best_start = stint, start
+    return best
+
+
+class _HourBuilder:
+    def __init__(self, db: Session, bucket_start: datetime) -> None:
+        self.db = db
+        self.start = bucket_start
+        self.end = bucket_start + HOUR
+        self.buckets: dict[_BucketKey, _Bucket] = defaultdict(_Bucket)
+        self.stints: dict[UUID, list[ConversationAssignment]] = {}
+        self.channels: dict[UUID, ChannelType | None] = {}
+        self.person_by_agent: dict[UUID, UUID] = {}
+
+    def _load_context(self, conversation_ids: set[UUID]) -> None:
+        missing = conversation_ids - self.stints.keys()
+        for chunk in _chunks(missing):
+            for conversation_id in chunk:
+                self.stints[conversation_id] = []
+                self.channels[conversation_id] = None
+            for stint in self.db.scalars(
+                select(ConversationAssignment).where(ConversationAssignment.conversation_id.in_(chunk))
+            ):
+                self.stints[stint.conversation_id].append(stint)
+            for conversation_id, channel in self.db.execute(
+                select(ConversationSummary.conversation_id, ConversationSummary.primary_channel_type).where(
+                    ConversationSummary.conversation_id.in_(chunk)
+                )
+            ):
+                self.channels[conversation_id] = channel
+            # No summary yet: use the latest message's channel, as the summary would.
+            unsummarized = [conversation_id for conversation_id in chunk if self.channels[conversation_id] is None]
+            if unsummarized:
+                for conversation_id, channel in self.db.execute(
+                    select(Message.conversation_id, Message.channel_type)
+                    .where(Message.conversation_id.in_(unsummarized))
+                    .order_by(_message_time().asc())
+                ):
+                    self.channels[conversation_id] = channel
+
+    def _bucket(
+        self,
+        conversation_id: UUID,
+        stint: ConversationAssignment | None,
+        *,
+        channel: ChannelType | None = None,
+        target_id: UUID | None = None,
+        use_conversation_channel: bool = True,
+    ) -> _Bucket:
+        if use_conversation_channel:
+            channel = self.channels.get(conversation_id)
+        return self.buckets[(channel, target_id, stint.team_id if stint else None, stint.agent_id if stint else None)]
+
+    def build(self) -> dict[_BucketKey, _Bucket]:
+        self._messages()
+        self._assignments()
+        self._resolutions()
+        self._queue_waits()
+        return self.buckets
+
+    def _messages(self) -> None:
+        message_time = _message_time()
+        rows = self.db.execute(
+            select(
+                Message.conversation_id,
+                Message.direction,
+                Message.channel_type,
+                Message.channel_target_id,
+                message_time,
+            )
+            .where(message_time >= self.start, message_time < self.end)
+            .order_by(message_time.asc())
+        ).all()
+        if not rows:
+            return
+        conversation_ids = {row[0] for row in rows}
+        self._load_context(conversation_ids)
+
+        day_start = self.start.replace(hour=0)
+        seen_today: set[tuple[UUID, ChannelType | None]] = set()
+        if day_start < self.start:
+            for chunk in _chunks(conversation_ids):
+                seen_today.update(
+                    (conversation_id, channel)
+                    for conversation_id, channel in self.db.execute(
+                        select(Message.conversation_id, Message.channel_type)
+                        .where(Message.conversation_id.in_(chunk))
+                        .where(message_time >= day_start, message_time < self.start)
+                        .distinct()
+                    )
+                )
+        seen_conversations = {conversation_id for conversation_id, _channel in seen_today}
+
+        for conversation_id, direction, channel, target_id, moment in rows:
+            moment = ensure_aware(moment)
+            stint = _stint_at(self.stints[conversation_id], moment, open_ended=False)
+            bucket = self._bucket(
+                conversation_id, stint, channel=channel, target_id=target_id, use_conversation_channel=False
+            )
+            if direction == MessageDirection.inbound:
+                bucket.inbound_messages += 1
+            elif direction == MessageDirection.outbound:
+                bucket.outbound_messages += 1
+            # Counted in the hour of its first activity that UTC day, overall
+            # and per channel, so a day's hours sum to that day's distinct
+            # active conversations with or without a channel filter.
+            if conversation_id not in seen_conversations:
+                seen_conversations.add(conversation_id)
+                bucket.active_conversations += 1
+            if (conversation_id, channel) not in seen_today:
+                seen_today.add((conversation_id, channel))
+                bucket.channel_active_conversations += 1
+
+    def _assignments(self) -> None:
+        started = list(
+            self.db.scalars(
+                select(ConversationAssignment).where(
+                    ConversationAssignment.assigned_at >= self.start,
+                    ConversationAssignment.assigned_at < self.end,
+                )
+            )
+        )
+        if not started:
+            return
+        self._load_context({stint.conversation_id for stint in started})
+
+        unanswered = [
+            stint for stint in started if stint.first_response_at is None or stint.response_time_seconds is None
+        ]
+        replies = self._agent_replies(unanswered)
+        for stint in started:
+            bucket = self._bucket(stint.conversation_id, stint)
+            bucket.assignments += 1
+            seconds = self._first_response_seconds(stint, replies)
+            if seconds is not None:
+                bucket.first_responses += 1
+                bucket.first_response_seconds_sum += seconds
+                bucket.first_response_sketch.add(seconds)
+
+    def _agent_replies(self, stints: list[ConversationAssignment]) -> dict[tuple[UUID, UUID], list[datetime]]:
+        """Qualifying outbound replies per (conversation, author) for stints without a stored response."""
+        agent_ids = {stint.agent_id for stint in stints if stint.agent_id is not None}
+        if not agent_ids:
+            return {}
+        self.person_by_agent = dict(
+            self.db.execute(select(CrmAgent.id, CrmAgent.person_id).where(CrmAgent.id.in_(agent_ids))).all()
+        )
+        conversation_ids = {stint.conversation_id for stint in stints if stint.agent_id in self.person_by_agent}
+        person_ids = set(self.person_by_agent.values())
+        replies: dict[tuple[UUID, UUID], list[datetime]] = defaultdict(list)
+        message_time = _message_time()
+        for chunk in _chunks(conversation_ids):
+            conversations = {
+                conversation.id: conversation
+                for conversation in self.db.scalars(select(Conversation).where(Conversation.id.in_(chunk)))
+            }
+            rows = self.db.execute(
+                select(Message, message_time)
+                .where(Message.conversation_id.in_(chunk))
+                .where(Message.direction == MessageDirection.outbound)
+                .where(Message.author_id.in_(person_ids))
+                .order_by(message_time.asc())
+            ).all()
+            for message, moment in rows:
+                metadata = message.metadata_ if isinstance(message.metadata_, dict) else {}
+                if metadata.get("ai_intake_generated"):
+                    continue
+                if is_resolved_closing_message(message, conversation=conversations.get(message.conversation_id)):
+                    continue
+                replies[(message.conversation_id, message.author_id)].append(ensure_aware(moment))
+        return replies
+
+    def _first_response_seconds(
+        self,
+        stint: ConversationAssignment,
+        replies: dict[tuple[UUID, UUID], list[datetime]],
+    ) -> int | None:
+        start = _stint_start(stint)
+        end = ensure_aware(stint.ended_at)
+        if start is None:
+            return None
+        response_at = ensure_aware(stint.first_response_at)
+        if (
+            response_at is not None
+            and stint.response_time_seconds is not None
+            and response_at >= start
+            and (end is None or response_at < end)
+        ):
+            return int(stint.response_time_seconds)
+        person_id = self.person_by_agent.get(stint.agent_id)
+        if person_id is None:
+            return None
+        for reply_at in replies.get((stint.conversation_id, person_id), []):
+            if reply_at < start or (end is not None and reply_at >= end):
+                continue
+            return int((reply_at - start).total_seconds())
+        return None
+
+    def _resolutions(self) -> None:
+        resolved_at = func.coalesce(Conversation.resolved_at, Conversation.updated_at)
+        conversations = list(
+            self.db.scalars(
+                select(Conversation)
+                .where(Conversation.status == ConversationStatus.resolved)
+                .where(resolved_at >= self.start, resolved_at < self.end)
+            )
+        )
+        if not conversations:
+            return
+        self._load_context({conversation.id for conversation in conversations})
+        for conversation in conversations:
+            moment = ensure_aware(conversation.resolved_at or conversation.updated_at)
+            if moment is None:
+                continue
+            stint = _stint_at(self.stints[conversation.id], moment, open_ended=True)
+            self._bucket(conversation.id, stint).resolutions += 1
+
+    def _queue_waits(self) -> None:
+        rows = self.db.execute(
+            select(
+                Conversation.id,
+                Conversation.queued_at,
+                Conversation.first_assigned_at,
+                Conversation.last_queue_assigned_at,
+                Conversation.last_queue_wait_seconds,
+            ).where(
+                or_(
+                    and_(
+                        Conversation.last_queue_assigned_at >= self.start,
+                        Conversation.last_queue_assigned_at < self.end,
+                    ),
+                    and_(
+                        Conversation.last_queue_assigned_at.is_(None),
+                        Conversation.queued_at.isnot(None),
+                        Conversation.first_assigned_at >= self.start,
+                        Conversation.first_assigned_at < self.end,
+                    ),
+                )
+            )
+        ).all()
+        if not rows:
+            return
+        self._load_context({row[0] for row in rows})
+        for conversation_id, queued_at, first_assigned_at, last_queue_assigned_at, last_wait in rows:
+            if last_queue_assigned_at is not None and last_wait is not None:
+                assigned_at = ensure_aware(last_queue_assigned_at)
+                wait = int(last_wait)
+            else:
+                queued_at, assigned_at = ensure_aware(queued_at), ensure_aware(first_assigned_at)
+                if queued_at is None or assigned_at is None:
+                    continue
+                wait = int((assigned_at - queued_at).total_seconds())
+            if wait < 0:
+                continue
+            stint = _stint_at(self.stints[conversation_id], assigned_at, open_ended=True)
+            bucket = self._bucket(conversation_id, stint)
+            bucket.queue_waits += 1
+            bucket.queue_wait_seconds_sum += wait
+            bucket.queue_wait_sketch.add(wait)
+
+
+def _claim_hour(db: Session, bucket_start: datetime) -> datetime | None:
+    """Record that a rebuild starts now; returns the ``dirty_at`` it covers.
+
+    Committed before the hour is read, so any commit that lands after the
+    rebuild's snapshot finds the claim and marks the hour again.
+    """
+    now = datetime.now(UTC)
+    insert = _insert(db)
+    db.execute(
+        insert(ConversationMetricRollupHour)
+        .values(bucket_start=bucket_start, claimed_at=now)
+        .on_conflict_do_update(index_elements=["bucket_start"], set_={"claimed_at": now})
+    )
+    dirty_at = db.scalar(
+        select(ConversationMetricRollupHour.dirty_at).where(ConversationMetricRollupHour.bucket_start == bucket_start)
+    )
+    db.commit()
+    return dirty_at
+
+
+def _lock_hour(db: Session, bucket_start: datetime) -> None:
+    """Serialize rebuilds of one hour until the rebuilding transaction ends.
+
+    Without it a second rebuild's DELETE waits on the first one's rows, can't
+    see the rows the first inserted, and adds a second set for the hour.
+    No-op off PostgreSQL (SQLite test harness).
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    db.execute(
+        text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+        {"key": f"crm_metric_rollups:{bucket_start.isoformat()}"},
+    )
+
+
+def rebuild_hour(db: Session, bucket_start: datetime) -> int:
+    """Replace one hour's rollup rows from the raw tables; returns the bucket count.
+
+    Commits a claim on the hour first, then holds the hour's advisory lock
+    while it reads and rewrites it. The hour stays dirty if a commit marked
+    it after the claim.
+    """
+    bucket_start = hour_floor(bucket_start)
+    seen_dirty_at = _claim_hour(db, bucket_start)
+    _lock_hour(db, bucket_start)
+    buckets = _HourBuilder(db, bucket_start).build()
+    db.execute(delete(ConversationMetricRollup).where(ConversationMetricRollup.bucket_start == bucket_start))
+    for (channel, target_id, team_id, agent_id), bucket in buckets.items():
+        db.add(
+            ConversationMetricRollup(
+                bucket_start=bucket_start,
+                channel_type=channel,
+                channel_target_id=target_id,
+                team_id=team_id,
+                agent_id=agent_id,
+                inbound_messages=bucket.inbound_messages,
+                outbound_messages=bucket.outbound_messages,
+                active_conversations=bucket.active_conversations,
+                channel_active_conversations=bucket.channel_active_conversations,
+                assignments=bucket.assignments,
+                first_responses=bucket.first_responses,
+                first_response_seconds_sum=bucket.first_response_seconds_sum,
+                first_response_sketch=bucket.first_response_sketch.to_dict(),
+                resolutions=bucket.resolutions,
+                queue_waits=bucket.queue_waits,
+                queue_wait_seconds_sum=bucket.queue_wait_seconds_sum,
+                queue_wait_sketch=bucket.queue_wait_sketch.to_dict(),
+            )
+        )
+    now = datetime.now(UTC)
+    insert = _insert(db)
+    db.execute(
+        insert(ConversationMetricRollupHour)
+        .values(bucket_start=bucket_start, computed_at=now)
+        .on_conflict_do_update(index_elements=["bucket_start"], set_={"computed_at": now})
+    )
+    if seen_dirty_at is not None:
+        db.execute(
+            update(ConversationMetricRollupHour)
+            .where(
+                ConversationMetricRollupHour.bucket_start == bucket_start,
+                ConversationMetricRollupHour.dirty_at == seen_dirty_at,
+            )
+            .values(dirty_at=None)
+        )
+    db.flush()
+    return len(buckets)
+
+
+def _commit_rebuild(db: Session, bucket_start: datetime) -> None:
+    rebuild_hour(db, bucket_start)
+    db.commit()
+
+
+def refresh_rollups(db: Session, *, now: datetime | None = None) -> dict[str, int]:
+    """Rebuild dirty hours, then build missing hours newest first.
+
+    Missing hours are quiet hours since the last run, hours lost while the
+    job was down and, until ``BACKFILL_DAYS`` are covered, history. Each hour
+    commits on its own, so catching up never holds locks for long.
+    """
+    current_hour = hour_floor(now or datetime.now(UTC))
+    dirty = db.scalars(
+        select(ConversationMetricRollupHour.bucket_start)
+        .where(ConversationMetricRollupHour.dirty_at.isnot(None))
+        .order_by(ConversationMetricRollupHour.bucket_start.desc())
+        .limit(REFRESH_HOURS_PER_RUN)
+    ).all()
+    for bucket_start in dirty:
+        _commit_rebuild(db, bucket_start)
+
+    horizon = current_hour - timedelta(days=BACKFILL_DAYS)
+    computed = {
+        hour_floor(bucket_start)
+        for bucket_start in db.scalars(
+            select(ConversationMetricRollupHour.bucket_start).where(
+                ConversationMetricRollupHour.bucket_start >= horizon,
+                ConversationMetricRollupHour.computed_at.isnot(None),
+            )
+        )
+    }
+    missing: list[datetime] = []
+    bucket_start = current_hour
+    while bucket_start >= horizon and len(missing) < BACKFILL_HOURS_PER_RUN:
+        if bucket_start not in computed:
+            missing.append(bucket_start)
+        bucket_start -= HOUR
+    for bucket_start in missing:
+        _commit_rebuild(db, bucket_start)
+
+    if dirty or len(missing) > 1:
+        logger.info("crm_metric_rollups_refreshed dirty=%s built=%s", len(dirty), len(missing))
+    return {"dirty": len(dirty), "built": len(missing)}
+
+
+def backfill_rollups(db: Session, start_at: datetime, end_at: datetime) -> int:
+    """Rebuild every hour in ``[start_at, end_at]``; returns the number of hours."""
+    bucket_start, last = hour_floor(start_at), hour_floor(end_at)
+    hours = 0
+    while bucket_start <= last:
+        _commit_rebuild(db, bucket_start)
+        bucket_start += HOUR
+        hours += 1
+    return hours
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+
+def covers(db: Session, start_at: datetime | None, end_at: datetime | None) -> bool:
+    """Whether a report over this window should be served from rollups.
+
+    Only UTC windows qualify: rollup days are UTC days, and hours are not
+    whole in every offset.
+    """
+    if start_at is None or end_at is None:
+        return False
+    start_at, end_at = ensure_aware(start_at), ensure_aware(end_at)
+    if start_at.utcoffset() or end_at.utcoffset():
+        return False
+    if end_at - start_at < ROLLUP_MIN_WINDOW:
+        return False
+    first = hour_floor(start_at)
+    last = min(hour_floor(end_at), hour_floor(datetime.now(UTC)))
+    if last < first:
+        return False
+    expected = int((last - first) / HOUR) + 1
+    present = db.scalar(
+        select(func.count())
+        .select_from(ConversationMetricRollupHour)
+        .where(
+            ConversationMetricRollupHour.bucket_start >= first,
+            ConversationMetricRollupHour.bucket_start <= last,
+            ConversationMetricRollupHour.computed_at.isnot(None),
+        )
+    )
+    return int(present or 0) == expected
+
+
+def load_buckets(
+    db: Session,
+    start_at: datetime,
+    end_at: datetime,
+    *,
+    channel_type: ChannelType | None = None,
+    agent_ids: Iterable[UUID] | None = None,
+    team_id: UUID | None = None,
+) -> list[ConversationMetricRollup]:
+    """Bucket rows for the hours overlapping ``[start_at, end_at]``."""
+    query = select(ConversationMetricRollup).where(
+        ConversationMetricRollup.bucket_start >= hour_floor(start_at),
+        ConversationMetricRollup.bucket_start <= hour_floor(end_at),
+    )
+    if channel_type is not None:
+        query = query.where(ConversationMetricRollup.channel_type == channel_type)
+    if agent_ids is not None:
+        query = query.where(ConversationMetricRollup.agent_id.in_(list(agent_ids)))
+    if team_id is not None:
+        query = query.where(ConversationMetricRollup.team_id == team_id)
+    return list(db.scalars(query))
@@ -17,6 +17,7 @@ from app.models.projects import Project, ProjectTask
 from app.models.tickets import Ticket, TicketSlaEvent, TicketStatus
 from app.models.workforce import WorkOrder
 from app.services.common import coerce_uuid
+from app.services.crm import metric_rollups
 from app.services.crm.metrics import ensure_aware
 from app.services.crm.metrics import is_resolved_closing_message as _is_resolved_closing_message
 
@@ -268,10 +269,60 @@ def inbox_kpis(
             }
         message_query = message_query.filter(Message.conversation_id.in_(conversation_ids))
 
+    conversation_kpis = _conversation_kpis(db, message_query, start_at, end_at, channel_value)
+    if metric_rollups.covers(db, start_at, end_at):
+        return {
+            "messages": _message_volumes_from_rollups(db, start_at, end_at, channel_value, agent_id, team_id),
+            **conversation_kpis,
+        }
+
     total_messages = message_query.count()
     inbound_messages = message_query.filter(Message.direction == MessageDirection.inbound).count()
     outbound_messages = message_query.filter(Message.direction == MessageDirection.outbound).count()
 
+    channel_volume = (
+        message_query.with_entities(Message.channel_type, func.count(Message.id)).group_by(Message.channel_type).all()
+    )
+    channel_volume_map = {str(channel): count for channel, count in channel_volume}
+
+    email_inbox_rows = (
+        message_query.filter(Message.channel_type == ChannelType.email)
+        .outerjoin(IntegrationTarget, IntegrationTarget.id == Message.channel_target_id)
+        .with_entities(Message.channel_target_id, IntegrationTarget.name, func.count(Message.id))
+        .group_by(Message.channel_target_id, IntegrationTarget.name)
+        .all()
+    )
+    email_inbox_map: dict[str, dict[str, Any]] = {}
+    for inbox_id, inbox_name, count in email_inbox_rows:
+        inbox_key = str(inbox_id) if inbox_id else "none"
+        label = inbox_name or "Unknown Inbox"
+        email_inbox_map[inbox_key] = {"label": label, "count": int(count or 0)}
+
+    return {
+        "messages": {
+            "total": total_messages,
+            "inbound": inbound_messages,
+            "outbound": outbound_messages,
+            "by_channel": channel_volume_map,
+            "by_email_inbox": email_inbox_map,
+        },
+        **conversation_kpis,
+    }
+
+
+def _conversation_kpis(
+    db: Session,
+    message_query,
+    start_at: datetime | None,
+    end_at: datetime | None,
+    channel_value: ChannelType | None,
+) -> dict:
+    """Active and resolved conversations and average response and resolution times.
+
+    Measured from each conversation's first inbound message inside the window,
+    so they are always read from the raw messages rather than hourly rollups.
+    """
+    message_time = _message_activity_time()
     active_conversation_ids = [row[0] for row in message_query.with_entities(Message.conversation_id).distinct().all()]
     conversations = (
         db.query(Conversation).filter(Conversation.id.in_(active_conversation_ids)).all()
@@ -353,32 +404,7 @@ def inbox_kpis(
     avg_response_minutes = sum(response_times) / len(response_times) if response_times else None
     avg_resolution_minutes = sum(resolution_times) / len(resolution_times) if resolution_times else None
 
-    channel_volume = (
-        message_query.with_entities(Message.channel_type, func.count(Message.id)).group_by(Message.channel_type).all()
-    )
-    channel_volume_map = {str(channel): count for channel, count in channel_volume}
-
-    email_inbox_rows = (
-        message_query.filter(Message.channel_type == ChannelType.email)
-        .outerjoin(IntegrationTarget, IntegrationTarget.id == Message.channel_target_id)
-        .with_entities(Message.channel_target_id, IntegrationTarget.name, func.count(Message.id))
-        .group_by(Message.channel_target_id, IntegrationTarget.name)
-        .all()
-    )
-    email_inbox_map: dict[str, dict[str, Any]] = {}
-    for inbox_id, inbox_name, count in email_inbox_rows:
-        inbox_key = str(inbox_id) if inbox_id else "none"
-        label = inbox_name or "Unknown Inbox"
-        email_inbox_map[inbox_key] = {"label": label, "count": int(count or 0)}
-
     return {
-        "messages": {
-            "total": total_messages,
-            "inbound": inbound_messages,
-            "outbound": outbound_messages,
-            "by_channel": channel_volume_map,
-            "by_email_inbox": email_inbox_map,
-        },
         "conversations": {
             "active": len(conversations),
             "resolved": sum(1 for convo in conversations if _is_resolved_in_window(convo, start_at, end_at)),
@@ -388,6 +414,60 @@ def inbox_kpis(
     }
 
 
+def _message_volumes_from_rollups(
+    db: Session,
+    start_at: datetime | None,
+    end_at: datetime | None,
+    channel_value: ChannelType | None,
+    agent_id: str | None,
+    team_id: str | None,
+) -> dict:
+    """``inbox_kpis`` message counts for long windows, from hourly rollups.
+
+    Messages count toward the agent/team assigned when they were sent.
+    """
+    from app.models.integration import IntegrationTarget
+
+    rows = metric_rollups.load_buckets(
+        db,
+        start_at,
+        end_at,
+        channel_type=channel_value,
+        agent_ids=[coerce_uuid(agent_id)] if agent_id else None,
+        team_id=coerce_uuid(team_id) if team_id else None,
+    )
+    inbound = sum(row.inbound_messages for row in rows)
+    outbound = sum(row.outbound_messages for row in rows)
+    channel_volume: dict[str, int] = {}
+    email_volume: dict[Any, int] = {}
+    for row in rows:
+        count = row.inbound_messages + row.outbound_messages
+        if not count:
+            continue
+        channel_volume[str(row.channel_type)] = channel_volume.get(str(row.channel_type), 0) + count
+        if row.channel_type == ChannelType.email:
+            email_volume[row.channel_target_id] = email_volume.get(row.channel_target_id, 0) + count
+    inbox_names = (
+        dict(
+            db.query(IntegrationTarget.id, IntegrationTarget.name)
+            .filter(IntegrationTarget.id.in_([target for target in email_volume if target]))
+            .all()
+        )
+        if any(email_volume)
+        else {}
+    )
+    return {
+        "total": inbound + outbound,
+        "inbound": inbound,
+        "outbound": outbound,
+        "by_channel": channel_volume,
+        "by_email_inbox": {
+            str(target) if target else "none": {"label": inbox_names.get(target) or "Unknown Inbox", "count": count}
+            for target, count in email_volume.items()
+        },
+    }
+
+
 def pipeline_stage_metrics(
     db: Session,
     pipeline_id: str,
@@ -503,6 +583,71 @@ def project_metrics(
     }
 
 
+def _scoped_agents(db: Session, agent_id: str | None, team_id: str | None) -> list[CrmAgent]:
+    agents_query = db.query(CrmAgent).filter(CrmAgent.is_active.is_(True))
+    if agent_id:
+        agents_query = agents_query.filter(CrmAgent.id == coerce_uuid(agent_id))
+    if team_id:
+        agents_query = (
+            agents_query.join(CrmAgentTeam, CrmAgentTeam.agent_id == CrmAgent.id)
+            .filter(CrmAgentTeam.team_id == coerce_uuid(team_id))
+            .filter(CrmAgentTeam.is_active.is_(True))
+        )
+    return agents_query.limit(100).all()
+
+
+def _agent_display_name(person: Person | None) -> str:
+    if not person:
+        return "Agent"
+    return person.display_name or f"{person.first_name or ''} {person.last_name or ''}".strip() or "Agent"
+
+
+def _active_hours(presence_seconds: dict[str, float], start_at: datetime | None, end_at: datetime | None) -> dict:
+    active_seconds = float(presence_seconds.get("online", 0.0) + presence_seconds.get("away", 0.0))
+    active_hours_display: str | None = None
+    if start_at and end_at:
+        total_minutes = round(active_seconds / 60.0)
+        active_hours_display = f"{total_minutes // 60}h {total_minutes % 60:02d}m"
+    return {
+        "active_seconds": int(active_seconds),
+        "active_hours": round(active_seconds / 3600.0 if active_seconds else 0.0, 2),
+        "active_hours_display": active_hours_display,
+    }
+
+
+def _agent_stats_row(
+    agent: CrmAgent,
+    person: Person | None,
+    presence_seconds: dict[str, float],
+    start_at: datetime | None,
+    end_at: datetime | None,
+    *,
+    total_conversations: int,
+    total_assignments: int,
+    resolved_conversations: int,
+    response_count: int,
+    response_minutes_sum: float,
+    resolution_count: int,
+    resolution_minutes_sum: float,
+) -> dict[str, Any]:
+    avg_frt = response_minutes_sum / response_count if response_count else None
+    avg_resolution = resolution_minutes_sum / resolution_count if resolution_count else None
+    return {
+        "agent_id": str(agent.id),
+        "name": _agent_display_name(person),
+        "total_conversations": total_conversations,
+        "total_assignments": total_assignments,
+        "resolved_conversations": resolved_conversations,
+        "avg_first_response_minutes": round(avg_frt, 1) if avg_frt is not None else None,
+        "avg_resolution_minutes": round(avg_resolution, 1) if avg_resolution is not None else None,
+        "first_response_count": response_count,
+        "unanswered_assignments": max(0, total_assignments - response_count),
+        "response_coverage_percent": (round(response_count / total_assignments * 100, 1) if total_assignments else 0.0),
+        "resolution_time_count": resolution_count,
+        **_active_hours(presence_seconds, start_at, end_at),
+    }
+
+
 def _scoped_agent_performance_cohort(
     db: Session,
     start_at: datetime | None,
@@ -510,19 +655,12 @@ def _scoped_agent_performance_cohort(
     agent_id: str | None,
     team_id: str | None,
     channel_type: str | None,
+    *,
+    include_replies: bool = True,
 ) -> dict[str, Any]:
     from app.models.person import Person
 
-    agents_query = db.query(CrmAgent).filter(CrmAgent.is_active.is_(True))
-    if agent_id:
-        agents_query = agents_query.filter(CrmAgent.id == coerce_uuid(agent_id))
-    if team_id:
-        agents_query = (
-            agents_query.join(CrmAgentTeam, CrmAgentTeam.agent_id == CrmAgent.id)
-            .filter(CrmAgentTeam.team_id == coerce_uuid(team_id))
-            .filter(CrmAgentTeam.is_active.is_(True))
-        )
-    agents = agents_query.limit(100).all()
+    agents = _scoped_agents(db, agent_id, team_id)
     if not agents:
         return {
             "agents": [],
@@ -574,18 +712,18 @@ def _scoped_agent_performance_cohort(
 
     channel_conversation_ids: set[Any] = set(all_conversation_ids) if not channel_value else set()
     outbound_candidates: dict[tuple[str, str], list[tuple[Any, Message]]] = {}
-    if all_conversation_ids:
-        message_time = _message_activity_time()
-        if channel_value:
-            channel_conversation_ids = {
-                row[0]
-                for row in db.query(Message.conversation_id)
-                .filter(Message.conversation_id.in_(all_conversation_ids))
-                .filter(Message.channel_type == channel_value)
-                .distinct()
-                .all()
-            }
+    if all_conversation_ids and channel_value:
+        channel_conversation_ids = {
+            row[0]
+            for row in db.query(Message.conversation_id)
+            .filter(Message.conversation_id.in_(all_conversation_ids))
+            .filter(Message.channel_type == channel_value)
+            .distinct()
+            .all()
+        }
 
+    if all_conversation_ids and include_replies:
+        message_time = _message_activity_time()
         outbound_rows = (
             db.query(Message.conversation_id, Message.author_id, message_time.label("msg_time"), Message)
             .filter(Message.conversation_id.in_(all_conversation_ids))
@@ -627,6 +765,48 @@ def _scoped_agent_performance_cohort(
     }
 
 
+def _agent_conversation_stats(
+    agent_assignments: list[ConversationAssignment],
+    conversations_by_id: dict[Any, Conversation],
+    start_at: datetime | None,
+    end_at: datetime | None,
+) -> tuple[int, int, list[float]]:
+    """Conversations, resolved conversations and resolution minutes for one agent's stints.
+
+    Resolution time runs from the agent's latest stint on the conversation
+    in the period, when the conversation was resolved during that stint.
+    """
+    conversation_ids = {assignment.conversation_id for assignment in agent_assignments}
+    agent_conversations = [
+        conversations_by_id[conversation_id]
+        for conversation_id in conversation_ids
+        if conversation_id in conversations_by_id
+    ]
+    resolved = sum(1 for conversation in agent_conversations if _is_resolved_in_window(conversation, start_at, end_at))
+
+    latest_assignment_by_conversation: dict[Any, ConversationAssignment] = {}
+    for assignment in agent_assignments:
+        if (ensure_aware(assignment.assigned_at) or ensure_aware(assignment.created_at)) is not None:
+            latest_assignment_by_conversation[assignment.conversation_id] = assignment
+
+    resolution_times: list[float] = []
+    for conversation_id, assignment in latest_assignment_by_conversation.items():
+        conversation = conversations_by_id.get(conversation_id)
+        if conversation is None or not _is_resolved_in_window(conversation, start_at, end_at):
+            continue
+        resolved_at = ensure_aware(_resolution_timestamp(conversation))
+        assignment_start = ensure_aware(assignment.assigned_at) or ensure_aware(assignment.created_at)
+        assignment_end = ensure_aware(assignment.ended_at)
+        if (
+            resolved_at is not None
+            and assignment_start is not None
+            and resolved_at >= assignment_start
+            and (assignment_end is None or resolved_at <= assignment_end)
+        ):
+            resolution_times.append((resolved_at - assignment_start).total_seconds() / 60)
+    return len(agent_conversations), resolved, resolution_times
+
+
 def agent_performance_metrics(
     db: Session,
     start_at: datetime | None,
@@ -639,7 +819,11 @@ def agent_performance_metrics(
 
     Agent FRT is always the stint's assigned_at to that same agent's first
     qualifying reply. Customer and AI time before assignment is not included.
+    Windows of a week or more are read from the hourly rollups.
     """
+    if metric_rollups.covers(db, start_at, end_at):
+        return _agent_performance_from_rollups(db, start_at, end_at, agent_id, team_id, channel_type)
+
     cohort = _scoped_agent_performance_cohort(
         db=db,
         start_at=start_at,
@@ -659,42 +843,18 @@ def agent_performance_metrics(
 
     agent_stats: list[dict[str, Any]] = []
     for agent in agents:
-        by_status = presence_seconds_by_agent.get(str(agent.id), {})
-        active_seconds = float(by_status.get("online", 0.0) + by_status.get("away", 0.0))
-        active_hours = active_seconds / 3600.0 if active_seconds else 0.0
-        active_hours_display: str | None
-        if start_at and end_at:
-            total_minutes = round(active_seconds / 60.0)
-            hours = total_minutes // 60
-            minutes = total_minutes % 60
-            active_hours_display = f"{hours}h {minutes:02d}m"
-        else:
-            active_hours_display = None
-
         agent_assignments = assignments_by_agent.get(agent.id, [])
-        conversation_ids = {assignment.conversation_id for assignment in agent_assignments}
-        agent_conversations = [
-            conversations_by_id[conversation_id]
-            for conversation_id in conversation_ids
-            if conversation_id in conversations_by_id
-        ]
         person = person_map.get(agent.person_id)
-
-        total = len(agent_conversations)
-        total_assignments = len(agent_assignments)
-        resolved = sum(
-            1 for conversation in agent_conversations if _is_resolved_in_window(conversation, start_at, end_at)
+        total, resolved, resolution_times = _agent_conversation_stats(
+            agent_assignments, conversations_by_id, start_at, end_at
         )
 
         response_times: list[float] = []
-        resolution_times: list[float] = []
-        latest_assignment_by_conversation: dict[Any, ConversationAssignment] = {}
         for assignment in agent_assignments:
             assignment_start = ensure_aware(assignment.assigned_at) or ensure_aware(assignment.created_at)
             assignment_end = ensure_aware(assignment.ended_at)
             if assignment_start is None:
                 continue
-            latest_assignment_by_conversation[assignment.conversation_id] = assignment
 
             response_at = ensure_aware(assignment.first_response_at)
             if (
@@ -718,49 +878,21 @@ def agent_performance_metrics(
                 response_times.append((outbound_at - assignment_start).total_seconds() / 60)
                 break
 
-        for conversation_id, assignment in latest_assignment_by_conversation.items():
-            conversation = conversations_by_id.get(conversation_id)
-            if conversation is None or not _is_resolved_in_window(conversation, start_at, end_at):
-                continue
-            resolved_at = ensure_aware(_resolution_timestamp(conversation))
-            assignment_start = ensure_aware(assignment.assigned_at) or ensure_aware(assignment.created_at)
-            assignment_end = ensure_aware(assignment.ended_at)
-            if (
-                resolved_at is not None
-                and assignment_start is not None
-                and resolved_at >= assignment_start
-                and (assignment_end is None or resolved_at <= assignment_end)
-            ):
-                resolution_times.append((resolved_at - assignment_start).total_seconds() / 60)
-
-        avg_frt = sum(response_times) / len(response_times) if response_times else None
-        avg_resolution = sum(resolution_times) / len(resolution_times) if resolution_times else None
-
-        name = (
-            (person.display_name or f"{person.first_name or ''} {person.last_name or ''}".strip() or "Agent")
-            if person
-            else "Agent"
-        )
-
         agent_stats.append(
-            {
-                "agent_id": str(agent.id),
-                "name": name,
-                "total_conversations": total,
-                "total_assignments": total_assignments,
-                "resolved_conversations": resolved,
-                "avg_first_response_minutes": round(avg_frt, 1) if avg_frt is not None else None,
-                "avg_resolution_minutes": round(avg_resolution, 1) if avg_resolution is not None else None,
-                "first_response_count": len(response_times),
-                "unanswered_assignments": max(0, total_assignments - len(response_times)),
-                "response_coverage_percent": (
-                    round(len(response_times) / total_assignments * 100, 1) if total_assignments else 0.0
-                ),
-                "resolution_time_count": len(resolution_times),
-                "active_seconds": int(active_seconds),
-                "active_hours": round(active_hours, 2),
-                "active_hours_display": active_hours_display,
-            }
+            _agent_stats_row(
+                agent,
+                person,
+                presence_seconds_by_agent.get(str(agent.id), {}),
+                start_at,
+                end_at,
+                total_conversations=total,
+                total_assignments=len(agent_assignments),
+                resolved_conversations=resolved,
+                response_count=len(response_times),
+                response_minutes_sum=sum(response_times),
+                resolution_count=len(resolution_times),
+                resolution_minutes_sum=sum(resolution_times),
+            )
         )
 
     agent_stats.sort(
@@ -770,6 +902,69 @@ def agent_performance_metrics(
     return agent_stats
 
 
+def _agent_performance_from_rollups(
+    db: Session,
+    start_at: datetime,
+    end_at: datetime,
+    agent_id: str | None,
+    team_id: str | None,
+    channel_type: str | None,
+) -> list[dict]:
+    """``agent_performance_metrics`` with first responses read from hourly rollups.
+
+    Conversation, assignment and resolution figures come from the same
+    assignment cohort as the raw report; only the outbound message scan for
+    first replies is replaced by the rollups' per-assignment first responses.
+    """
+    cohort = _scoped_agent_performance_cohort(
+        db=db,
+        start_at=start_at,
+        end_at=end_at,
+        agent_id=agent_id,
+        team_id=team_id,
+        channel_type=channel_type,
+        include_replies=False,
+    )
+    agents = cohort["agents"]
+    if not agents:
+        return []
+    rows_by_agent: dict[Any, list] = {}
+    for row in metric_rollups.load_buckets(
+        db,
+        start_at,
+        end_at,
+        channel_type=_resolve_channel_value(channel_type),
+        agent_ids=[agent.id for agent in agents],
+    ):
+        rows_by_agent.setdefault(row.agent_id, []).append(row)
+
+    agent_stats = []
+    for agent in agents:
+        agent_assignments = cohort["assignments_by_agent"].get(agent.id, [])
+        total, resolved, resolution_times = _agent_conversation_stats(
+            agent_assignments, cohort["conversations_by_id"], start_at, end_at
+        )
+        rows = rows_by_agent.get(agent.id, [])
+        agent_stats.append(
+            _agent_stats_row(
+                agent,
+                cohort["person_map"].get(agent.person_id),
+                cohort["presence_seconds_by_agent"].get(str(agent.id), {}),
+                start_at,
+                end_at,
+                total_conversations=total,
+                total_assignments=len(agent_assignments),
+                resolved_conversations=resolved,
+                response_count=sum(row.first_responses for row in rows),
+                response_minutes_sum=sum(row.first_response_seconds_sum for row in rows) / 60,
+                resolution_count=len(resolution_times),
+                resolution_minutes_sum=sum(resolution_times),
+            )
+        )
+    agent_stats.sort(key=lambda x: int(x.get("resolved_conversations") or 0), reverse=True)
+    return agent_stats
+
+
 def crm_performance_summary(
     db: Session,
     start_at: datetime | None,
@@ -791,6 +986,7 @@ def crm_performance_summary(
         agent_id=agent_id,
         team_id=team_id,
         channel_type=channel_type,
+        include_replies=False,
     )
     conversations_by_id = cohort["conversations_by_id"]
     unique_conversation_ids = {assignment.conversation_id for assignment in cohort["filtered_assignments"]}
@@ -821,9 +1017,17 @@ def conversation_trend(
     """Get daily conversation counts for trend chart.
 
     Returns a list of {date, total, resolved} for each day in the range.
+    UTC windows of a week or more are read from the hourly rollups, over the
+    whole first and last days, attributing activity to the agent/team
+    assigned at the time.
     """
     from datetime import timedelta
 
+    first_hour = ensure_aware(start_at).replace(hour=0, minute=0, second=0, microsecond=0)
+    last_hour = ensure_aware(end_at).replace(hour=23, minute=0, second=0, microsecond=0)
+    if metric_rollups.covers(db, first_hour, last_hour):
+        return _conversation_trend_from_rollups(db, first_hour, last_hour, agent_id, team_id, channel_type)
+
     # Get conversation IDs filtered by agent/team if specified
     conversation_ids = None
     if agent_id or team_id:
@@ -886,6 +1090,39 @@ def conversation_trend(
     return trend_data
 
 
+def _conversation_trend_from_rollups(
+    db: Session,
+    start_at: datetime,
+    end_at: datetime,
+    agent_id: str | None,
+    team_id: str | None,
+    channel_type: str | None,
+) -> list[dict]:
+    from datetime import timedelta
+
+    channel_value = _resolve_channel_value(channel_type)
+    totals: dict[Any, list[int]] = {}
+    for row in metric_rollups.load_buckets(
+        db,
+        start_at,
+        end_at,
+        channel_type=channel_value,
+        agent_ids=[coerce_uuid(agent_id)] if agent_id else None,
+        team_id=coerce_uuid(team_id) if team_id else None,
+    ):
+        day_totals = totals.setdefault(ensure_aware(row.bucket_start).date(), [0, 0])
+        day_totals[0] += row.channel_active_conversations if channel_value else row.active_conversations
+        day_totals[1] += row.resolutions
+
+    trend_data = []
+    current_date = start_at.date()
+    while current_date <= end_at.date():
+        total, resolved = totals.get(current_date, (0, 0))
+        trend_data.append({"date": current_date.strftime("%Y-%m-%d"), "total": total, "resolved": resolved})
+        current_date += timedelta(days=1)
+    return trend_data
+
+
 def sales_pipeline_metrics(
     db: Session,
     pipeline_id: str | None,
@@ -1357,10 +1594,14 @@ def queue_wait_metrics(
 
     Newer rows use last_queue_* fields so re-queued conversations are measured
     against their current queue cycle. Legacy rows fall back to
-    first_assigned_at - queued_at.
+    first_assigned_at - queued_at. Windows of a week or more are read from the
+    hourly rollups, with median and p90 estimated from merged sketches.
     """
     import statistics
 
+    if metric_rollups.covers(db, start_at, end_at):
+        return _queue_wait_metrics_from_rollups(db, start_at, end_at, team_id=team_id)
+
     query = db.query(
         Conversation.id,
         Conversation.queued_at,
@@ -1423,6 +1664,40 @@ def queue_wait_metrics(
     }
 
 
+def _queue_wait_metrics_from_rollups(
+    db: Session,
+    start_at: datetime,
+    end_at: datetime,
+    *,
+    team_id: str | None,
+) -> dict[str, Any]:
+    rows = [
+        row
+        for row in metric_rollups.load_buckets(db, start_at, end_at, team_id=coerce_uuid(team_id) if team_id else None)
+        if row.queue_waits
+    ]
+
+    def _summary(day_rows: list) -> dict[str, Any]:
+        count = sum(row.queue_waits for row in day_rows)
+        sketch = metric_rollups.merged_sketch(day_rows, "queue_wait_sketch")
+        median = sketch.quantile(0.5)
+        p90 = sketch.quantile(0.9)
+        return {
+            "count": count,
+            "avg_seconds": int(sum(row.queue_wait_seconds_sum for row in day_rows) / count) if count else None,
+            "median_seconds": int(median) if median is not None else None,
+            "p90_seconds": int(p90) if p90 is not None else None,
+        }
+
+    by_day: dict[str, list] = {}
+    for row in rows:
+        by_day.setdefault(ensure_aware(row.bucket_start).date().isoformat(), []).append(row)
+    return {
+        "overall": _summary(rows),
+        "by_day": [{"day": day, **_summary(day_rows)} for day, day_rows in sorted(by_day.items())],
+    }
+
+
 def issue_classification_breakdown(
     db: Session,
     start_at: datetime,
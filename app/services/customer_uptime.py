@@ -5,17 +5,19 @@ from __future__ import annotations
 import contextlib
 import os
 import threading
+import uuid
 from calendar import monthrange
 from datetime import UTC, datetime
 from decimal import Decimal
 from typing import Any
 
-from sqlalchemy import desc, or_, select
+from sqlalchemy import desc, insert, or_, select, update
 from sqlalchemy.orm import Session
 
 from app.db import SessionLocal
 from app.logging import get_logger
 from app.models.customer_uptime import CustomerUptimePeriod, CustomerUptimeSnapshot
+from app.models.domain_settings import SettingDomain
 from app.models.subscriber import Subscriber, SubscriberStatus
 from app.services import selfcare
 from app.services.external_systems import EXTERNAL_SUBSCRIBER_SYSTEMS
@@ -27,6 +29,15 @@ CONFIDENCE_OBSERVED = "observed"
 STATUS_ONLINE = "online"
 STATUS_OFFLINE = "offline"
 DEFAULT_POLL_INTERVAL_SECONDS = 300
+MIN_POLL_INTERVAL_SECONDS = 60
+DEFAULT_WRITE_BATCH_SIZE = 1000
+LEADER_LOCK_KEY = "customer_uptime:poll:leader"
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
 
 _poller_thread: threading.Thread | None = None
 _poller_stop = threading.Event()
@@ -126,148 +137,194 @@ def _active_service_pairs(
     return pairs
 
 
-def _latest_open_period(
-    db: Session,
-    *,
-    customer_id: str,
-    service_id: str | None,
-) -> CustomerUptimePeriod | None:
-    stmt = select(CustomerUptimePeriod).where(
-        CustomerUptimePeriod.customer_id == customer_id,
-        CustomerUptimePeriod.ended_at.is_(None),
-    )
-    if service_id is None:
-        stmt = stmt.where(CustomerUptimePeriod.service_id.is_(None))
-    else:
-        stmt = stmt.where(CustomerUptimePeriod.service_id == service_id)
-    return db.execute(stmt.order_by(desc(CustomerUptimePeriod.started_at)).limit(1)).scalar_one_or_none()
-
-
-def _record_snapshot(
-    db: Session,
+def _snapshot_row(
     *,
     observed_at: datetime,
     pair: dict[str, Any],
     is_online: bool,
     online_payload: dict[str, Any] | None,
-) -> None:
+) -> dict[str, Any]:
     raw_payload = online_payload or pair.get("raw_payload") or {}
-    db.add(
-        CustomerUptimeSnapshot(
-            customer_id=str(pair["customer_id"]),
-            service_id=str(pair["service_id"]) if pair.get("service_id") else None,
-            login=str(pair.get("login") or raw_payload.get("login") or "") or None,
-            is_online=is_online,
-            observed_at=observed_at,
-            start_session=_parse_selfcare_datetime(raw_payload.get("start_session")),
-            last_change=_parse_selfcare_datetime(raw_payload.get("last_change")),
-            time_on=_int_or_none(raw_payload.get("time_on")),
-            in_bytes=_int_or_none(raw_payload.get("in_bytes")),
-            out_bytes=_int_or_none(raw_payload.get("out_bytes")),
-            source=SOURCE_POLLING,
-            raw_payload=raw_payload,
-        )
-    )
+    return {
+        "id": uuid.uuid4(),
+        "customer_id": str(pair["customer_id"]),
+        "service_id": str(pair["service_id"]) if pair.get("service_id") else None,
+        "login": str(pair.get("login") or raw_payload.get("login") or "") or None,
+        "is_online": is_online,
+        "observed_at": observed_at,
+        "start_session": _parse_selfcare_datetime(raw_payload.get("start_session")),
+        "last_change": _parse_selfcare_datetime(raw_payload.get("last_change")),
+        "time_on": _int_or_none(raw_payload.get("time_on")),
+        "in_bytes": _int_or_none(raw_payload.get("in_bytes")),
+        "out_bytes": _int_or_none(raw_payload.get("out_bytes")),
+        "source": SOURCE_POLLING,
+        "raw_payload": raw_payload,
+        "created_at": observed_at,
+    }
 
 
-def _upsert_period(
-    db: Session,
-    *,
-    observed_at: datetime,
-    pair: dict[str, Any],
-    status: str,
-    raw_payload: dict[str, Any] | None,
-) -> bool:
-    customer_id = str(pair["customer_id"])
-    service_id = str(pair["service_id"]) if pair.get("service_id") else None
-    login = str(pair.get("login") or (raw_payload or {}).get("login") or "") or None
-    current = _latest_open_period(db, customer_id=customer_id, service_id=service_id)
-    if current is None:
-        db.add(
-            CustomerUptimePeriod(
-                customer_id=customer_id,
-                service_id=service_id,
-                login=login,
-                status=status,
-                started_at=observed_at,
-                source=SOURCE_POLLING,
-                confidence=CONFIDENCE_OBSERVED,
-                raw_payload=raw_payload,
-            )
-        )
-        return True
-
-    if current.status == status:
-        return False
-
-    current.ended_at = observed_at
-    current.duration_seconds = max(int((observed_at - current.started_at).total_seconds()), 0)
-    db.add(
-        CustomerUptimePeriod(
-            customer_id=customer_id,
-            service_id=service_id,
-            login=login or current.login,
-            status=status,
-            started_at=observed_at,
-            source=SOURCE_POLLING,
-            confidence=CONFIDENCE_OBSERVED,
-            raw_payload=raw_payload,
+def _open_periods(db: Session) -> dict[tuple[str, str | None], Any]:
+    """Every open period keyed by (customer_id, service_id), newest start winning."""
+    stmt = (
+        select(
+            CustomerUptimePeriod.id,
+            CustomerUptimePeriod.customer_id,
+            CustomerUptimePeriod.service_id,
+            CustomerUptimePeriod.login,
+            CustomerUptimePeriod.status,
+            CustomerUptimePeriod.started_at,
         )
+        .where(CustomerUptimePeriod.ended_at.is_(None))
+        .order_by(CustomerUptimePeriod.started_at)
     )
-    return True
+    return {_pair_key(row.customer_id, row.service_id): row for row in db.execute(stmt)}
+
+
+def _insert_chunked(db: Session, model: type, rows: list[dict[str, Any]]) -> None:
+    batch_size = _env_int("CUSTOMER_UPTIME_WRITE_BATCH_SIZE", DEFAULT_WRITE_BATCH_SIZE) or DEFAULT_WRITE_BATCH_SIZE
+    for start in range(0, len(rows), batch_size):
+        db.execute(insert(model), rows[start : start + batch_size])
 
 
 def poll_subscriber_uptime_once(db: Session, *, observed_at: datetime | None = None) -> dict[str, int]:
+    """Record one uptime observation for every tracked service pair.
+
+    The online set is diffed against all open periods loaded in one query;
+    snapshots and new periods are written with multi-row INSERTs and the
+    periods that changed state are closed with one bulk UPDATE.
+    """
     observed_at = observed_at or datetime.now(UTC)
     online_rows = selfcare.fetch_online_customers(db)
     online = _online_map(online_rows)
     active_pairs = _active_service_pairs(db, online)
+    open_periods = _open_periods(db)
 
-    snapshots = 0
-    changes = 0
+    snapshot_rows: list[dict[str, Any]] = []
+    closed_rows: list[dict[str, Any]] = []
+    opened_rows: list[dict[str, Any]] = []
     online_count = 0
-    offline_count = 0
     for key, pair in active_pairs.items():
         online_payload = online.get(key)
         is_online = online_payload is not None
         status = STATUS_ONLINE if is_online else STATUS_OFFLINE
         online_count += int(is_online)
-        offline_count += int(not is_online)
-        _record_snapshot(
-            db,
-            observed_at=observed_at,
-            pair=pair,
-            is_online=is_online,
-            online_payload=online_payload,
+        snapshot_rows.append(
+            _snapshot_row(observed_at=observed_at, pair=pair, is_online=is_online, online_payload=online_payload)
+        )
+
+        current = open_periods.get(key)
+        if current is not None and current.status == status:
+            continue
+        raw_payload = online_payload or pair.get("raw_payload")
+        login = str(pair.get("login") or (raw_payload or {}).get("login") or "") or None
+        if current is not None:
+            started_at = current.started_at
+            if started_at.tzinfo is None:
+                started_at = started_at.replace(tzinfo=UTC)
+            closed_rows.append(
+                {
+                    "id": current.id,
+                    "ended_at": observed_at,
+                    "duration_seconds": max(int((observed_at - started_at).total_seconds()), 0),
+                }
+            )
+            login = login or current.login
+        opened_rows.append(
+            {
+                "id": uuid.uuid4(),
+                "customer_id": key[0],
+                "service_id": key[1],
+                "login": login,
+                "status": status,
+                "started_at": observed_at,
+                "source": SOURCE_POLLING,
+                "confidence": CONFIDENCE_OBSERVED,
+                "raw_payload": raw_payload,
+                "created_at": observed_at,
+            }
         )
-        snapshots += 1
-        if _upsert_period(
-            db,
-            observed_at=observed_at,
-            pair=pair,
-            status=status,
-            raw_payload=online_payload or pair.get("raw_payload"),
-        ):
-            changes += 1
 
+    _insert_chunked(db, CustomerUptimeSnapshot, snapshot_rows)
+    if closed_rows:
+        db.execute(update(CustomerUptimePeriod), closed_rows)
+    _insert_chunked(db, CustomerUptimePeriod, opened_rows)
     db.commit()
     return {
-        "snapshots": snapshots,
+        "snapshots": len(snapshot_rows),
         "online": online_count,
-        "offline": offline_count,
-        "period_changes": changes,
+        "offline": len(snapshot_rows) - online_count,
+        "period_changes": len(opened_rows),
     }
 
 
-def _poller_loop() -> None:
-    interval = (
-        _env_int("CUSTOMER_UPTIME_POLL_INTERVAL_SECONDS", DEFAULT_POLL_INTERVAL_SECONDS)
-        or DEFAULT_POLL_INTERVAL_SECONDS
+def _leader_lock_redis():
+    try:
+        import redis
+
+        client = redis.Redis.from_url(
+            os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+            decode_responses=True,
+            socket_connect_timeout=1,
+            socket_timeout=1,
+        )
+        client.ping()
+        return client
+    except Exception as exc:
+        logger.debug("customer_uptime_leader_lock_redis_unavailable error=%s", exc)
+        return None
+
+
+def poll_interval_seconds(db: Session) -> int:
+    """The poll interval the beat schedule uses (see ``scheduler_config``)."""
+    from app.services.scheduler_config import _effective_int
+
+    interval = _effective_int(
+        db,
+        SettingDomain.integration,
+        "customer_uptime_poll_interval_seconds",
+        "CUSTOMER_UPTIME_POLL_INTERVAL_SECONDS",
+        DEFAULT_POLL_INTERVAL_SECONDS,
     )
+    return max(interval, MIN_POLL_INTERVAL_SECONDS)
+
+
+def run_uptime_poll(db: Session, *, observed_at: datetime | None = None) -> dict[str, Any]:
+    """Poll once unless another process already polled in this interval.
+
+    A Redis key taken with ``SET NX EX <interval>`` elects the poller: however
+    many web replicas or workers schedule the poll, one of them runs it per
+    interval. The key is kept after a successful poll (it is the interval
+    window) and released after a failure so the next attempt can retry. When
+    Redis is unreachable the poll runs unguarded.
+    """
+    client = _leader_lock_redis()
+    token = uuid.uuid4().hex
+    if client is not None:
+        try:
+            acquired = client.set(LEADER_LOCK_KEY, token, nx=True, ex=max(poll_interval_seconds(db) - 5, 30))
+        except Exception as exc:
+            logger.warning("customer_uptime_leader_lock_failed error=%s", exc)
+            acquired = True
+            client = None
+        if not acquired:
+            logger.info("customer_uptime_poll_skipped reason=not_leader")
+            return {"skipped": True}
+    try:
+        return poll_subscriber_uptime_once(db, observed_at=observed_at)
+    except Exception:
+        if client is not None:
+            with contextlib.suppress(Exception):
+                client.eval(_RELEASE_LOCK_SCRIPT, 1, LEADER_LOCK_KEY, token)
+        raise
+
+
+def _poller_loop() -> None:
     while not _poller_stop.is_set():
+        interval = DEFAULT_POLL_INTERVAL_SECONDS
         db = SessionLocal()
         try:
-            result = poll_subscriber_uptime_once(db)
+            interval = poll_interval_seconds(db)
+            result = run_uptime_poll(db)
             logger.info("customer_uptime_poll_complete result=%s", result)
         except Exception as exc:
             db.rollback()
@@ -278,10 +335,18 @@ def _poller_loop() -> None:
 
 
 def start_uptime_poller() -> None:
+    """Start the in-process poller thread when ``CUSTOMER_UPTIME_IN_PROCESS_POLLER`` is set.
+
+    Polling normally runs as the scheduled ``app.tasks.subscribers.poll_customer_uptime``
+    Celery job; the thread remains for deployments without a beat scheduler.
+    """
     global _poller_thread
     if not _env_bool("CUSTOMER_UPTIME_POLLING_ENABLED", True):
         logger.info("customer_uptime_poller_disabled")
         return
+    if not _env_bool("CUSTOMER_UPTIME_IN_PROCESS_POLLER", False):
+        logger.info("customer_uptime_poller_scheduled_externally")
+        return
     with _poller_lock:
         if _poller_thread and _poller_thread.is_alive():
             return
@@ -4,6 +4,10 @@ import logging
 import os
 import re
 import smtplib
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
 from email import encoders
 from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
@@ -126,6 +130,168 @@ def _create_smtp_client(host: str, port: int, use_ssl: bool, timeout: float | No
     return smtplib.SMTP(host, port, timeout=timeout_value)
 
 
+def _open_authenticated_smtp(config: dict):
+    """Open an SMTP connection for ``config`` and run STARTTLS/login once."""
+    server = _create_smtp_client(
+        str(config.get("host") or "localhost"),
+        int(config.get("port") or 587),
+        bool(config.get("use_ssl")),
+        timeout=config.get("timeout"),
+    )
+    try:
+        if config.get("use_tls") and not config.get("use_ssl"):
+            server.starttls()
+        username = config.get("username")
+        password = config.get("password")
+        if username and password:
+            server.login(username, password)
+    except Exception:
+        with contextlib.suppress(smtplib.SMTPException, OSError):
+            server.close()
+        raise
+    return server
+
+
+def _smtp_pool_key(config: dict) -> tuple:
+    return (
+        str(config.get("host") or "localhost"),
+        int(config.get("port") or 587),
+        config.get("username") or "",
+        bool(config.get("use_tls")),
+        bool(config.get("use_ssl")),
+    )
+
+
+@dataclass
+class _PooledSmtp:
+    server: smtplib.SMTP
+    opened_at: float
+    last_used: float
+    messages_sent: int = 0
+
+
+class SmtpConnectionPool:
+    """Reusable authenticated SMTP connections keyed by host/port/user.
+
+    Bulk senders (campaign and notification queues) check a connection out per
+    message instead of paying connect + STARTTLS + AUTH for every recipient.
+    Connections idle longer than ``idle_timeout`` are probed with NOOP before
+    reuse, and are retired after ``max_messages`` sends or ``max_age`` seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_idle_per_key: int = 4,
+        idle_timeout: float = 30.0,
+        max_age: float = 600.0,
+        max_messages: int = 500,
+    ) -> None:
+        self.max_idle_per_key = max_idle_per_key
+        self.idle_timeout = idle_timeout
+        self.max_age = max_age
+        self.max_messages = max_messages
+        self._idle: dict[tuple, list[_PooledSmtp]] = {}
+        self._lock = threading.Lock()
+
+    def _checkout(self, key: tuple) -> _PooledSmtp | None:
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                bucket = self._idle.get(key)
+                if not bucket:
+                    return None
+                pooled = bucket.pop()
+            if now - pooled.opened_at > self.max_age:
+                self._discard(pooled.server)
+                continue
+            if now - pooled.last_used > self.idle_timeout:
+                try:
+                    code, _ = pooled.server.noop()
+                except (smtplib.SMTPException, OSError):
+                    code = 0
+                if code != 250:
+                    self._discard(pooled.server)
+                    continue
+            return pooled
+
+    def _checkin(self, key: tuple, pooled: _PooledSmtp) -> None:
+        pooled.last_used = time.monotonic()
+        pooled.messages_sent += 1
+        if pooled.messages_sent >= self.max_messages:
+            self._quit(pooled.server)
+            return
+        with self._lock:
+            bucket = self._idle.setdefault(key, [])
+            if len(bucket) < self.max_idle_per_key:
+                bucket.append(pooled)
+                return
+        self._quit(pooled.server)
+
+    @staticmethod
+    def _quit(server) -> None:
+        with contextlib.suppress(smtplib.SMTPException, OSError):
+            server.quit()
+
+    @staticmethod
+    def _discard(server) -> None:
+        with contextlib.suppress(smtplib.SMTPException, OSError):
+            server.close()
+
+    @contextlib.contextmanager
+    def connection(self, config: dict) -> Iterator[smtplib.SMTP]:
+        """Yield an authenticated connection; it is returned to the pool on success.
+
+        Protocol-level rejections (refused sender/recipient, DATA errors) leave
+        the session usable and the connection is kept. Anything else, such as a
+        dropped connection, discards it.
+        """
+        key = _smtp_pool_key(config)
+        pooled = self._checkout(key)
+        if pooled is None:
+            now = time.monotonic()
+            pooled = _PooledSmtp(server=_open_authenticated_smtp(config), opened_at=now, last_used=now)
+        try:
+            yield pooled.server
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError):
+            with contextlib.suppress(smtplib.SMTPException, OSError):
+                pooled.server.rset()
+            self._checkin(key, pooled)
+            raise
+        except BaseException:
+            self._discard(pooled.server)
+            raise
+        else:
+            self._checkin(key, pooled)
+
+    def close(self) -> None:
+        with self._lock:
+            buckets = list(self._idle.values())
+            self._idle.clear()
+        for bucket in buckets:
+            for pooled in bucket:
+                self._quit(pooled.server)
+
+
+_smtp_pool: SmtpConnectionPool | None = None
+_smtp_pool_lock = threading.Lock()
+
+
+def get_smtp_pool() -> SmtpConnectionPool:
+    """Process-wide SMTP pool shared by the bulk delivery paths."""
+    global _smtp_pool
+    if _smtp_pool is None:
+        with _smtp_pool_lock:
+            if _smtp_pool is None:
+                _smtp_pool = SmtpConnectionPool(
+                    max_idle_per_key=_env_int("SMTP_POOL_MAX_IDLE_PER_HOST", 4),
+                    idle_timeout=float(_env_int("SMTP_POOL_IDLE_TIMEOUT_SECONDS", 30)),
+                    max_age=float(_env_int("SMTP_POOL_MAX_AGE_SECONDS", 600)),
+                    max_messages=_env_int("SMTP_POOL_MAX_MESSAGES_PER_CONNECTION", 500),
+                )
+    return _smtp_pool
+
+
 def _smtp_response_text(response: bytes | str) -> str:
     if isinstance(response, bytes):
         return response.decode("utf-8", errors="replace")
@@ -192,6 +358,7 @@ def send_email_with_config(
     in_reply_to: str | None = None,
     references: str | None = None,
     attachments: list[dict] | None = None,
+    pool: SmtpConnectionPool | None = None,
 ) -> tuple[bool, dict | None]:
     msg = _build_email_message(
         subject=subject,
@@ -208,27 +375,15 @@ def send_email_with_config(
         attachments=attachments,
     )
 
+    from_email = str(config.get("from_email") or "")
+    recipients = [to_email, *(cc_emails or []), *(bcc_emails or [])]
     try:
-        host = str(config.get("host") or "localhost")
-        port = int(config.get("port") or 587)
-        server = _create_smtp_client(
-            host,
-            port,
-            bool(config.get("use_ssl")),
-        )
-
-        if config.get("use_tls") and not config.get("use_ssl"):
-            server.starttls()
-
-        username = config.get("username")
-        password = config.get("password")
-        if username and password:
-            server.login(username, password)
-
-        from_email = str(config.get("from_email") or "")
-        recipients = [to_email, *(cc_emails or []), *(bcc_emails or [])]
-        send_result = server.sendmail(from_email, recipients, msg.as_string())
-        server.quit()
+        if pool is not None:
+            send_result = _sendmail_pooled(pool, config, from_email, recipients, msg.as_string())
+        else:
+            server = _open_authenticated_smtp(config)
+            send_result = server.sendmail(from_email, recipients, msg.as_string())
+            server.quit()
         debug = None
         if send_result:
             debug = {"refused": send_result}
@@ -242,6 +397,47 @@ def send_email_with_config(
         return False, {"error": str(e)}
 
 
+def _sendmail_pooled(
+    pool: SmtpConnectionPool,
+    config: dict,
+    from_email: str,
+    recipients: list[str],
+    message: str,
+) -> dict:
+    """Send over a pooled connection, reconnecting once if it was dropped before DATA.
+
+    A reused connection the server closed while idle fails on MAIL, before any
+    part of the message is committed, so that is retried on a fresh connection.
+    Once DATA has been issued the server may already have accepted the message;
+    a disconnect then is raised rather than risking a double send.
+    """
+    state = {"data_sent": False}
+    try:
+        with pool.connection(config) as server:
+            return _sendmail_tracking_data(server, from_email, recipients, message, state)
+    except (smtplib.SMTPServerDisconnected, ConnectionError):
+        if state["data_sent"]:
+            raise
+        logger.info("SMTP pooled connection dropped; reconnecting host=%s", config.get("host"))
+        with pool.connection(config) as server:
+            return server.sendmail(from_email, recipients, message)
+
+
+def _sendmail_tracking_data(server, from_email: str, recipients: list[str], message: str, state: dict) -> dict:
+    """``server.sendmail``, recording in ``state`` whether DATA was reached."""
+    send_data = server.data
+
+    def data(msg):
+        state["data_sent"] = True
+        return send_data(msg)
+
+    server.data = data
+    try:
+        return server.sendmail(from_email, recipients, message)
+    finally:
+        del server.data
+
+
 def send_email(
     db: Session | None,
     to_email: str,
@@ -5,35 +5,187 @@ the application. When an event is emitted, it is routed to all registered
 handlers (webhook, lifecycle, notification, audit).
 
 Events are persisted before dispatching to enable retry of failed handlers.
+
+With ``EVENT_OUTBOX_ENABLED`` set, ``dispatch`` only writes the event row in
+the caller's transaction (a transactional outbox); consumer workers claim
+pending rows with ``FOR UPDATE SKIP LOCKED`` and run the handlers via
+``EventDispatcher.process_outbox``.
 """
 
 import json
 import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from datetime import UTC, datetime
 from typing import Any
 from uuid import UUID
 
+from sqlalchemy import event as sa_event
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from app.db import SessionLocal
+from app.metrics import observe_event_handler, observe_event_handler_timeout
 from app.services.events.types import Event, EventType
 
 logger = logging.getLogger(__name__)
 
+OUTBOX_BATCH_SIZE = 100
+_OUTBOX_KICK_FLAG = "event_outbox_kick_registered"
+DEFAULT_HANDLER_POOL_SIZE = 4
+DEFAULT_HANDLER_TIMEOUT_SECONDS = 10.0
+
+_handler_pool: ThreadPoolExecutor | None = None
+_handler_pool_lock = threading.Lock()
+
+
+def outbox_enabled() -> bool:
+    return os.getenv("EVENT_OUTBOX_ENABLED", "false").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _handler_pool_size() -> int:
+    try:
+        return max(int(os.getenv("EVENT_HANDLER_POOL_SIZE", str(DEFAULT_HANDLER_POOL_SIZE))), 0)
+    except ValueError:
+        return DEFAULT_HANDLER_POOL_SIZE
+
+
+def _handler_timeout_seconds() -> float:
+    try:
+        return max(float(os.getenv("EVENT_HANDLER_TIMEOUT_SECONDS", str(DEFAULT_HANDLER_TIMEOUT_SECONDS))), 0.1)
+    except ValueError:
+        return DEFAULT_HANDLER_TIMEOUT_SECONDS
+
+
+def _get_handler_pool() -> ThreadPoolExecutor | None:
+    """Shared pool for concurrent handlers; None when EVENT_HANDLER_POOL_SIZE is 0."""
+    global _handler_pool
+    size = _handler_pool_size()
+    if size <= 0:
+        return None
+    if _handler_pool is None:
+        with _handler_pool_lock:
+            if _handler_pool is None:
+                _handler_pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix="event-handler")
+    return _handler_pool
+
+
+def _handler_name(handler: Any) -> str:
+    return handler.__class__.__name__
+
+
+def _subscribes_to(handler: Any, event_type: EventType) -> bool:
+    """Whether ``handler`` wants ``event_type``.
+
+    Handlers declare interest with an ``event_types`` collection; a handler
+    without one (or with ``None``) receives every event.
+    """
+    event_types = getattr(handler, "event_types", None)
+    return event_types is None or event_type in event_types
+
+
+def _run_handler_isolated(handler: Any, event: Event) -> None:
+    """Run a concurrent handler in its own session and commit its work."""
+    session = SessionLocal()
+    start = time.monotonic()
+    outcome = "success"
+    try:
+        handler.handle(session, event)
+        session.commit()
+    except Exception:
+        outcome = "error"
+        session.rollback()
+        raise
+    finally:
+        session.close()
+        observe_event_handler(handler=_handler_name(handler), outcome=outcome, duration=time.monotonic() - start)
+
+
+def _event_from_record(event_record: Any) -> Event:
+    """Reconstruct an Event from its stored EventStore row."""
+    return Event(
+        event_type=EventType(event_record.event_type),
+        payload=event_record.payload,
+        event_id=event_record.event_id,
+        actor=event_record.actor,
+        subscriber_id=event_record.subscriber_id,
+        account_id=event_record.account_id,
+        subscription_id=event_record.subscription_id,
+        invoice_id=event_record.invoice_id,
+        ticket_id=event_record.ticket_id,
+        project_id=getattr(event_record, "project_id", None),
+        work_order_id=getattr(event_record, "work_order_id", None),
+    )
+
+
+def _kick_outbox_consumer_after_commit(db: Session) -> None:
+    """Wake a consumer once the emitting transaction commits.
+
+    Flagged at most once per session transaction, so a request that emits
+    several events queues one consumer task. The beat-scheduled sweep picks
+    the rows up anyway if the broker is unavailable.
+    """
+    db.info[_OUTBOX_KICK_FLAG] = True
+
+
+def _queue_outbox_consumer() -> None:
+    try:
+        from app.tasks.events import process_event_outbox
+
+        process_event_outbox.delay()
+    except Exception as exc:
+        logger.warning(f"Failed to queue event outbox consumer: {exc}")
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _kick_outbox_consumer(session: Session) -> None:
+    # Savepoint releases fire after_commit too; the rows are not visible yet.
+    if session.in_nested_transaction():
+        return
+    if session.info.pop(_OUTBOX_KICK_FLAG, None):
+        _queue_outbox_consumer()
+
+
+@sa_event.listens_for(Session, "after_soft_rollback")
+def _reset_outbox_kick(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_OUTBOX_KICK_FLAG, None)
+
 
 class EventDispatcher:
     """Central dispatcher that routes events to all registered handlers.
 
     Events are persisted to the event_store table before dispatching,
     enabling retry of failed handlers and providing an audit trail.
+
+    Handlers may declare ``event_types`` (the events they act on) and
+    ``concurrent = True`` (safe to run on a worker thread with a session of
+    their own). Routing goes through an index built from those declarations,
+    so an event only reaches the handlers that subscribe to it.
     """
 
     def __init__(self) -> None:
         self._handlers: list[Any] = []
+        self._index: dict[EventType, list[Any]] | None = None
 
     def register_handler(self, handler: Any) -> None:
         """Register an event handler."""
         self._handlers.append(handler)
+        self._index = None
+
+    def handlers_for(self, event_type: EventType) -> list[Any]:
+        """Handlers subscribed to ``event_type``, in registration order."""
+        index = self._index
+        if index is None:
+            index = {
+                candidate: [handler for handler in self._handlers if _subscribes_to(handler, candidate)]
+                for candidate in EventType
+            }
+            self._index = index
+        return index[event_type]
 
     def dispatch(self, db: Session, event: Event) -> None:
         """Dispatch an event to all registered handlers.
@@ -42,12 +194,19 @@ class EventDispatcher:
         Each handler is called in sequence. Failed handlers are tracked
         for later retry.
 
+        In outbox mode the event row is added to ``db`` as pending and the
+        handlers run later in a consumer; see ``enqueue``.
+
         Args:
             db: Database session for handlers that need DB access
             event: The event to dispatch
         """
         from app.models.event_store import EventStatus, EventStore
 
+        if outbox_enabled():
+            self.enqueue(db, event)
+            return
+
         logger.debug(f"Dispatching event {event.event_type.value} (id={event.event_id})")
 
         # 1. Persist event before processing using an isolated session
@@ -79,12 +238,66 @@ class EventDispatcher:
             persist_session.close()
 
         # 2. Process all handlers, tracking failures
+        failed_handlers = self._run_handlers(db, event)
+
+        # 3. Update event status
+        if event_record_id:
+            update_session = SessionLocal()
+            try:
+                event_record = update_session.get(EventStore, event_record_id)
+                if not event_record:
+                    raise ValueError(f"EventStore record not found: {event_record_id}")
+                if failed_handlers:
+                    event_record.status = EventStatus.failed
+                    event_record.failed_handlers = {"handlers": failed_handlers}
+                    event_record.error = json.dumps([fh["error"] for fh in failed_handlers])
+                else:
+                    event_record.status = EventStatus.completed
+                event_record.processed_at = datetime.now(UTC)
+                update_session.commit()
+            except Exception as update_exc:
+                logger.warning(f"Failed to update event_store status for {event.event_id}: {update_exc}")
+                update_session.rollback()
+            finally:
+                update_session.close()
+
+    def _run_handlers(self, db: Session, event: Event, only: set[str] | None = None) -> list[dict]:
+        """Run the handlers subscribed to ``event`` and return the ones that failed.
+
+        Concurrent handlers are submitted to the shared pool first, then the
+        rest run in order on ``db`` in the calling thread, and finally the
+        pooled results are collected. A pooled handler that has not finished
+        within ``EVENT_HANDLER_TIMEOUT_SECONDS`` of submission is recorded as
+        failed; its thread is left to finish in the background.
+
+        Args:
+            only: Restrict to these handler names (used by retries). Falls
+                back to every subscribed handler when none of them match.
+        """
+        handlers = self.handlers_for(event.event_type)
+        if only:
+            handlers = [handler for handler in handlers if _handler_name(handler) in only] or handlers
+
+        pool = _get_handler_pool()
+        pooled: list[tuple[Any, Any]] = []
+        if pool is not None:
+            for handler in handlers:
+                if getattr(handler, "concurrent", False):
+                    pooled.append((handler, pool.submit(_run_handler_isolated, handler, event)))
+        deadline = time.monotonic() + _handler_timeout_seconds()
+        pooled_handlers = {id(handler) for handler, _future in pooled}
+
         failed_handlers: list[dict] = []
-        for handler in self._handlers:
+        for handler in handlers:
+            if id(handler) in pooled_handlers:
+                continue
+            handler_name = _handler_name(handler)
+            start = time.monotonic()
+            outcome = "success"
             try:
                 handler.handle(db, event)
             except Exception as exc:
-                handler_name = handler.__class__.__name__
+                outcome = "error"
                 logger.exception(f"Handler {handler_name} failed for event {event.event_type.value}: {exc}")
                 try:
                     db.rollback()
@@ -101,27 +314,130 @@ class EventDispatcher:
                         "error": str(exc),
                     }
                 )
+            finally:
+                observe_event_handler(handler=handler_name, outcome=outcome, duration=time.monotonic() - start)
 
-        # 3. Update event status
-        if event_record_id:
-            update_session = SessionLocal()
+        for handler, future in pooled:
+            handler_name = _handler_name(handler)
             try:
-                event_record = update_session.get(EventStore, event_record_id)
-                if not event_record:
-                    raise ValueError(f"EventStore record not found: {event_record_id}")
-                if failed_handlers:
-                    event_record.status = EventStatus.failed
-                    event_record.failed_handlers = {"handlers": failed_handlers}
-                    event_record.error = json.dumps([fh["error"] for fh in failed_handlers])
-                else:
-                    event_record.status = EventStatus.completed
-                event_record.processed_at = datetime.now(UTC)
-                update_session.commit()
-            except Exception as update_exc:
-                logger.warning(f"Failed to update event_store status for {event.event_id}: {update_exc}")
-                update_session.rollback()
-            finally:
-                update_session.close()
+                future.result(timeout=max(deadline - time.monotonic(), 0))
+            except FuturesTimeoutError:
+                observe_event_handler_timeout(handler=handler_name)
+                logger.warning(f"Handler {handler_name} timed out for event {event.event_type.value}")
+                failed_handlers.append({"handler": handler_name, "error": "handler timed out"})
+            except Exception as exc:
+                logger.exception(f"Handler {handler_name} failed for event {event.event_type.value}: {exc}")
+                failed_handlers.append({"handler": handler_name, "error": str(exc)})
+        return failed_handlers
+
+    def enqueue(self, db: Session, event: Event) -> None:
+        """Write the event to the outbox as part of the caller's transaction.
+
+        The row becomes visible to consumers only when the caller commits, and
+        is discarded with everything else if the caller rolls back. Committing
+        is always left to the caller.
+        """
+        from app.models.event_store import EventStatus, EventStore
+
+        db.add(
+            EventStore(
+                event_id=event.event_id,
+                event_type=event.event_type.value,
+                payload=event.payload,
+                status=EventStatus.pending,
+                actor=event.actor,
+                subscriber_id=event.subscriber_id,
+                account_id=event.account_id,
+                subscription_id=event.subscription_id,
+                invoice_id=event.invoice_id,
+                ticket_id=event.ticket_id,
+                project_id=event.project_id,
+                work_order_id=event.work_order_id,
+            )
+        )
+        _kick_outbox_consumer_after_commit(db)
+        logger.debug(f"Queued event {event.event_type.value} in outbox (id={event.event_id})")
+
+    def process_outbox(self, db: Session, *, batch_size: int = OUTBOX_BATCH_SIZE) -> dict[str, int]:
+        """Claim a batch of pending outbox events and run their handlers.
+
+        Rows are claimed with ``FOR UPDATE SKIP LOCKED`` and moved to
+        ``processing`` in one commit, so concurrent consumers never pick the
+        same event. Handler side effects are committed per event (as the
+        emitting request would have), and the final statuses are written for
+        the whole batch at the end. A consumer that dies mid-batch leaves its
+        rows in ``processing`` for ``mark_stale_processing_events`` to fail and
+        ``retry_failed_events`` to rerun, so delivery is at-least-once.
+
+        Returns:
+            Counts of claimed, completed and failed events.
+        """
+        from app.models.event_store import EventStatus, EventStore
+
+        claimed = (
+            db.execute(
+                select(EventStore)
+                .where(EventStore.status == EventStatus.pending)
+                .where(EventStore.is_active.is_(True))
+                .order_by(EventStore.created_at.asc())
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            .scalars()
+            .all()
+        )
+        if not claimed:
+            db.rollback()
+            return {"claimed": 0, "completed": 0, "failed": 0}
+
+        claimed_ids = [record.id for record in claimed]
+        events = [_event_from_record(record) for record in claimed]
+        now = datetime.now(UTC)
+        db.execute(
+            update(EventStore)
+            .where(EventStore.id.in_(claimed_ids))
+            .values(status=EventStatus.processing, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+        completed_ids: list[Any] = []
+        failed_rows: list[dict[str, Any]] = []
+        for record_id, event in zip(claimed_ids, events, strict=True):
+            failed_handlers = self._run_handlers(db, event)
+            try:
+                db.commit()
+            except Exception as exc:
+                db.rollback()
+                failed_handlers.append({"handler": "commit", "error": str(exc)})
+            if failed_handlers:
+                failed_rows.append(
+                    {
+                        "id": record_id,
+                        "status": EventStatus.failed,
+                        "failed_handlers": {"handlers": failed_handlers},
+                        "error": json.dumps([fh["error"] for fh in failed_handlers]),
+                    }
+                )
+            else:
+                completed_ids.append(record_id)
+
+        processed_at = datetime.now(UTC)
+        if completed_ids:
+            db.execute(
+                update(EventStore)
+                .where(EventStore.id.in_(completed_ids))
+                .values(status=EventStatus.completed, processed_at=processed_at, updated_at=processed_at)
+                .execution_options(synchronize_session=False)
+            )
+        if failed_rows:
+            for row in failed_rows:
+                row["processed_at"] = processed_at
+                row["updated_at"] = processed_at
+            db.execute(update(EventStore), failed_rows)
+        db.commit()
+
+        return {"claimed": len(claimed_ids), "completed": len(completed_ids), "failed": len(failed_rows)}
 
     def retry_event(self, db: Session, event_record: Any) -> bool:
         """Retry processing a failed event.
@@ -136,19 +452,7 @@ class EventDispatcher:
         from app.models.event_store import EventStatus
 
         # Reconstruct the Event from stored data
-        event = Event(
-            event_type=EventType(event_record.event_type),
-            payload=event_record.payload,
-            event_id=event_record.event_id,
-            actor=event_record.actor,
-            subscriber_id=event_record.subscriber_id,
-            account_id=event_record.account_id,
-            subscription_id=event_record.subscription_id,
-            invoice_id=event_record.invoice_id,
-            ticket_id=event_record.ticket_id,
-            project_id=getattr(event_record, "project_id", None),
-            work_order_id=getattr(event_record, "work_order_id", None),
-        )
+        event = _event_from_record(event_record)
 
         # Get handlers that failed previously
         failed_handler_names = set()
@@ -166,22 +470,7 @@ class EventDispatcher:
         db.commit()
 
         # Retry only failed handlers (or all if no specific failures recorded)
-        new_failures: list[dict] = []
-        for handler in self._handlers:
-            handler_name = handler.__class__.__name__
-            # Only retry failed handlers, or all if we don't know which failed
-            if failed_handler_names and handler_name not in failed_handler_names:
-                continue
-            try:
-                handler.handle(db, event)
-            except Exception as exc:
-                logger.exception(f"Handler {handler_name} failed on retry for event {event.event_type.value}: {exc}")
-                new_failures.append(
-                    {
-                        "handler": handler_name,
-                        "error": str(exc),
-                    }
-                )
+        new_failures = self._run_handlers(db, event, only=failed_handler_names)
 
         # Update final status
         if new_failures:
@@ -245,7 +534,8 @@ def emit_event(
     """Emit an event to all registered handlers.
 
     This is the main entry point for services to emit events. After calling
-    this function, the event will be:
+    this function (or, in outbox mode, once the caller commits and a consumer
+    claims it), the event will be:
     - Delivered to subscribed webhook endpoints (via Celery task)
     - Recorded as a lifecycle event (if applicable)
     - Queued as a notification (if template configured)
@@ -1,7 +1,8 @@
 """Automation handler for the event system.
 
 Evaluates database-configured automation rules against fired events
-and executes matching rule actions.
+and executes matching rule actions. Rule conditions are compiled and cached
+per event type by ``app.services.automation_engine``.
 """
 
 import logging
@@ -10,9 +11,9 @@ from datetime import UTC, datetime, timedelta
 
 from sqlalchemy.orm import Session
 
-from app.models.automation_rule import AutomationLogOutcome
+from app.models.automation_rule import AutomationLogOutcome, AutomationRule, AutomationRuleStatus
 from app.services.automation_actions import execute_actions
-from app.services.automation_conditions import evaluate_conditions
+from app.services.automation_engine import get_rule_set
 from app.services.automation_rules import automation_rules_service
 from app.services.events.types import Event
 
@@ -22,7 +23,11 @@ _MAX_AUTOMATION_DEPTH = 3
 
 
 class AutomationHandler:
-    """Handler that evaluates and executes automation rules."""
+    """Handler that evaluates and executes automation rules.
+
+    Rules are configured per event type in the database, so this handler
+    subscribes to every event.
+    """
 
     def handle(self, db: Session, event: Event) -> None:
         """Process an event against active automation rules."""
@@ -37,17 +42,30 @@ class AutomationHandler:
             )
             return
 
-        # Query matching rules
-        rules = automation_rules_service.get_active_rules_for_event(db, event.event_type.value)
-        if not rules:
+        # Compiled rules for this event type, pre-filtered by their equality index
+        rule_set = get_rule_set(db, event.event_type.value)
+        if not rule_set.rules:
             return
 
         # Build context for condition evaluation
         context = self._build_context(event)
+        matches = rule_set.matching(context)
+        if not matches:
+            return
+
+        # Cooldowns and actions come from the live rows, not the cached snapshot
+        live_rules = {
+            rule.id: rule
+            for rule in db.query(AutomationRule).filter(AutomationRule.id.in_([match.id for match in matches])).all()
+        }
 
         now = datetime.now(UTC)
 
-        for rule in rules:
+        for match in matches:
+            rule = live_rules.get(match.id)
+            if rule is None or not rule.is_active or rule.status != AutomationRuleStatus.active:
+                continue
+
             # Cooldown check
             if rule.cooldown_seconds and rule.cooldown_seconds > 0 and rule.last_triggered_at:
                 cooldown_until = rule.last_triggered_at + timedelta(seconds=rule.cooldown_seconds)
@@ -59,11 +77,6 @@ class AutomationHandler:
                     )
                     continue
 
-            # Evaluate conditions
-            conditions = rule.conditions or []
-            if not evaluate_conditions(conditions, context):
-                continue
-
             # Execute actions
             start = time.monotonic()
             actions = rule.actions or []
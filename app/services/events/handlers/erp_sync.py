@@ -51,8 +51,14 @@ class ERPSyncHandler:
 
     The sync is asynchronous to avoid blocking the main request, but provides
     near-real-time updates to ERP (typically within seconds).
+
+    It only reads settings and talks to Redis and the broker, so it runs on the
+    dispatcher's thread pool with its own session.
     """
 
+    event_types = frozenset(ERP_SYNC_EVENT_TYPES)
+    concurrent = True
+
     def handle(self, db: Session, event: Event) -> None:
         """Handle an event by queueing an ERP sync task if applicable.
 
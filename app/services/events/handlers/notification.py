@@ -63,6 +63,8 @@ TECHNICIAN_TEMPLATE_CODES = {
 class NotificationHandler:
     """Handler that queues customer notifications."""
 
+    event_types = frozenset(EVENT_TYPE_TO_TEMPLATE)
+
     def handle(self, db: Session, event: Event) -> None:
         """Process an event by creating notifications.
 
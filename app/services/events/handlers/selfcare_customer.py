@@ -31,6 +31,8 @@ logger = logging.getLogger(__name__)
 class SelfcareCustomerHandler:
     """Create selfcare customers when quote-driven projects are created."""
 
+    event_types = frozenset({EventType.project_created})
+
     def handle(self, db: Session, event: Event) -> None:
         if event.event_type != EventType.project_created:
             return
@@ -109,6 +109,8 @@ def _is_redundant_selfcare_chat_subscription(
 class WebhookHandler:
     """Handler that creates webhook deliveries for subscribed endpoints."""
 
+    event_types = frozenset(EVENT_TYPE_TO_WEBHOOK)
+
     def handle(self, db: Session, event: Event) -> None:
         """Process an event by creating webhook deliveries.
 
@@ -0,0 +1,423 @@
+"""In-memory connectivity graph of the fiber plant.
+
+The ODN tables already describe a directed light path (OLT → PON port →
+splitter → strands/splices → ONT), but answering "who is downstream of this
+cut" by walking relationships issues one query per hop. ``FiberGraph`` loads
+the topology once into integer-indexed adjacency lists so traces and outage
+impact are a breadth-first walk in memory.
+
+Edges point downstream:
+
+* olt_device → pon_port → ont_unit (active ONT assignments)
+* pon_port → splitter_port (active PON/splitter links)
+* fdh_cabinet → splitter; input splitter_port → splitter → output splitter_port
+* strand endpoints: upstream endpoint → fiber_strand → downstream endpoint
+* splices: from strand → to strand, and splice_closure → to strand
+* fiber_segment → the strands in its cable
+
+A committed insert/update/delete of any of these rows bumps a generation
+(shared through Redis); each process rebuilds its graph lazily on the next
+query after the generation moves.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+import redis
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+
+from app.models.network import (
+    FdhCabinet,
+    FiberEndpointType,
+    FiberSegment,
+    FiberSplice,
+    FiberSpliceClosure,
+    FiberStrand,
+    OLTDevice,
+    OntAssignment,
+    PonPort,
+    PonPortSplitterLink,
+    Splitter,
+    SplitterPort,
+    SplitterPortType,
+)
+
+logger = logging.getLogger(__name__)
+
+OLT_DEVICE = "olt_device"
+PON_PORT = "pon_port"
+FDH_CABINET = "fdh_cabinet"
+SPLITTER = "splitter"
+SPLITTER_PORT = "splitter_port"
+FIBER_STRAND = "fiber_strand"
+SPLICE_CLOSURE = "splice_closure"
+FIBER_SEGMENT = "fiber_segment"
+ONT_UNIT = "ont_unit"
+
+NODE_TYPES = frozenset(
+    {
+        OLT_DEVICE,
+        PON_PORT,
+        FDH_CABINET,
+        SPLITTER,
+        SPLITTER_PORT,
+        FIBER_STRAND,
+        SPLICE_CLOSURE,
+        FIBER_SEGMENT,
+        ONT_UNIT,
+    }
+)
+
+_ENDPOINT_NODE_TYPES = {
+    FiberEndpointType.olt_port: PON_PORT,
+    FiberEndpointType.splitter_port: SPLITTER_PORT,
+    FiberEndpointType.fdh: FDH_CABINET,
+    FiberEndpointType.ont: ONT_UNIT,
+    FiberEndpointType.splice_closure: SPLICE_CLOSURE,
+}
+
+_GENERATION_KEY = "fiber_graph:generation"
+_REDIS_TIMEOUT_SECONDS = 0.25
+_REDIS_RETRY_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class FiberImpact:
+    """What a fault at one asset takes down."""
+
+    ont_unit_ids: list[uuid.UUID] = field(default_factory=list)
+    subscriber_ids: list[uuid.UUID] = field(default_factory=list)
+    pon_port_ids: list[uuid.UUID] = field(default_factory=list)
+    # ONTs reached by the trace that have no subscriber on their assignment.
+    unassigned_ont_count: int = 0
+
+
+class FiberGraph:
+    def __init__(self) -> None:
+        self._nodes: list[tuple[str, uuid.UUID]] = []
+        self._index: dict[tuple[str, uuid.UUID], int] = {}
+        self._downstream: list[list[int]] = []
+        self._upstream: list[list[int]] = []
+        self._subscribers: dict[int, uuid.UUID] = {}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(targets) for targets in self._downstream)
+
+    def _node(self, node_type: str, node_id: uuid.UUID) -> int:
+        key = (node_type, node_id)
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self._nodes)
+            self._nodes.append(key)
+            self._downstream.append([])
+            self._upstream.append([])
+        return index
+
+    def add_edge(self, source: tuple[str, uuid.UUID | None], target: tuple[str, uuid.UUID | None]) -> None:
+        if source[1] is None or target[1] is None:
+            return
+        a, b = self._node(*source), self._node(*target)
+        if a != b:
+            self._downstream[a].append(b)
+            self._upstream[b].append(a)
+
+    def set_subscriber(self, ont_unit_id: uuid.UUID, subscriber_id: uuid.UUID) -> None:
+        self._subscribers[self._node(ONT_UNIT, ont_unit_id)] = subscriber_id
+
+    def _walk(self, start: int, adjacency: list[list[int]]) -> list[int]:
+        seen = {start}
+        order: list[int] = []
+        queue = deque(adjacency[start])
+        while queue:
+            index = queue.popleft()
+            if index in seen:
+                continue
+            seen.add(index)
+            order.append(index)
+            queue.extend(adjacency[index])
+        return order
+
+    def _start(self, node_type: str, node_id: uuid.UUID) -> int | None:
+        if node_type not in NODE_TYPES:
+            raise ValueError(f"Unknown fiber asset type: {node_type}")
+        return self._index.get((node_type, node_id))
+
+    def trace(self, node_type: str, node_id: uuid.UUID) -> dict[str, list[dict[str, str]]]:
+        """Assets upstream and downstream of one asset, nearest first."""
+        start = self._start(node_type, node_id)
+        if start is None:
+            return {"upstream": [], "downstream": []}
+        return {
+            direction: [{"type": self._nodes[i][0], "id": str(self._nodes[i][1])} for i in self._walk(start, adjacency)]
+            for direction, adjacency in (("upstream", self._upstream), ("downstream", self._downstream))
+        }
+
+    def impact(self, node_type: str, node_id: uuid.UUID) -> FiberImpact:
+        """ONTs, subscribers and PON ports downstream of (and including) one asset."""
+        start = self._start(node_type, node_id)
+        if start is None:
+            return FiberImpact()
+        ont_ids: list[uuid.UUID] = []
+        subscriber_ids: list[uuid.UUID] = []
+        pon_port_ids: list[uuid.UUID] = []
+        seen_subscribers: set[uuid.UUID] = set()
+        unassigned = 0
+        for index in [start, *self._walk(start, self._downstream)]:
+            kind, asset_id = self._nodes[index]
+            if kind == PON_PORT:
+                pon_port_ids.append(asset_id)
+            elif kind == ONT_UNIT:
+                ont_ids.append(asset_id)
+                subscriber_id = self._subscribers.get(index)
+                if subscriber_id is None:
+                    unassigned += 1
+                elif subscriber_id not in seen_subscribers:
+                    seen_subscribers.add(subscriber_id)
+                    subscriber_ids.append(subscriber_id)
+        return FiberImpact(
+            ont_unit_ids=ont_ids,
+            subscriber_ids=subscriber_ids,
+            pon_port_ids=pon_port_ids,
+            unassigned_ont_count=unassigned,
+        )
+
+
+def build_fiber_graph(db: Session) -> FiberGraph:
+    """Load the active ODN topology into a ``FiberGraph`` (one query per table)."""
+    graph = FiberGraph()
+
+    pon_by_card_port: dict[uuid.UUID, uuid.UUID] = {}
+    for pon_id, olt_id, card_port_id in db.execute(
+        select(PonPort.id, PonPort.olt_id, PonPort.olt_card_port_id).where(PonPort.is_active.is_(True))
+    ):
+        graph.add_edge((OLT_DEVICE, olt_id), (PON_PORT, pon_id))
+        if card_port_id is not None:
+            pon_by_card_port[card_port_id] = pon_id
+
+    for pon_id, splitter_port_id in db.execute(
+        select(PonPortSplitterLink.pon_port_id, PonPortSplitterLink.splitter_port_id).where(
+            PonPortSplitterLink.active.is_(True)
+        )
+    ):
+        graph.add_edge((PON_PORT, pon_id), (SPLITTER_PORT, splitter_port_id))
+
+    for splitter_id, fdh_id in db.execute(select(Splitter.id, Splitter.fdh_id).where(Splitter.is_active.is_(True))):
+        graph.add_edge((FDH_CABINET, fdh_id), (SPLITTER, splitter_id))
+
+    for port_id, splitter_id, port_type in db.execute(
+        select(SplitterPort.id, SplitterPort.splitter_id, SplitterPort.port_type).where(
+            SplitterPort.is_active.is_(True)
+        )
+    ):
+        if port_type == SplitterPortType.input:
+            graph.add_edge((SPLITTER_PORT, port_id), (SPLITTER, splitter_id))
+        else:
+            graph.add_edge((SPLITTER, splitter_id), (SPLITTER_PORT, port_id))
+
+    for ont_unit_id, pon_id, subscriber_id in db.execute(
+        select(OntAssignment.ont_unit_id, OntAssignment.pon_port_id, OntAssignment.subscriber_id).where(
+            OntAssignment.active.is_(True)
+        )
+    ):
+        graph.add_edge((PON_PORT, pon_id), (ONT_UNIT, ont_unit_id))
+        if subscriber_id is not None:
+            graph.set_subscriber(ont_unit_id, subscriber_id)
+
+    def _endpoint(endpoint_type, endpoint_id) -> tuple[str, uuid.UUID | None]:
+        node_type = _ENDPOINT_NODE_TYPES.get(endpoint_type)
+        if node_type is None:
+            return ("", None)
+        if node_type == PON_PORT:
+            # "olt_port" strands may reference the OLT card port rather than the PON port.
+            endpoint_id = pon_by_card_port.get(endpoint_id, endpoint_id)
+        return (node_type, endpoint_id)
+
+    strands_by_cable: dict[str, list[uuid.UUID]] = {}
+    for strand_id, cable_name, up_type, up_id, down_type, down_id in db.execute(
+        select(
+            FiberStrand.id,
+            FiberStrand.cable_name,
+            FiberStrand.upstream_type,
+            FiberStrand.upstream_id,
+            FiberStrand.downstream_type,
+            FiberStrand.downstream_id,
+        ).where(FiberStrand.is_active.is_(True))
+    ):
+        strands_by_cable.setdefault(cable_name, []).append(strand_id)
+        graph.add_edge(_endpoint(up_type, up_id), (FIBER_STRAND, strand_id))
+        # A strand ending in a closure only continues through its own splices,
+        # not through everything else spliced in that closure.
+        if down_type != FiberEndpointType.splice_closure:
+            graph.add_edge((FIBER_STRAND, strand_id), _endpoint(down_type, down_id))
+
+    for closure_id, from_strand_id, to_strand_id in db.execute(
+        select(FiberSplice.closure_id, FiberSplice.from_strand_id, FiberSplice.to_strand_id)
+    ):
+        graph.add_edge((FIBER_STRAND, from_strand_id), (FIBER_STRAND, to_strand_id))
+        graph.add_edge((SPLICE_CLOSURE, closure_id), (FIBER_STRAND, to_strand_id))
+
+    for segment_id, name, strand_id in db.execute(
+        select(FiberSegment.id, FiberSegment.name, FiberSegment.fiber_strand_id).where(FiberSegment.is_active.is_(True))
+    ):
+        cable = set(strands_by_cable.get(name, ()))
+        if strand_id is not None:
+            cable.add(strand_id)
+        for cable_strand_id in cable:
+            graph.add_edge((FIBER_SEGMENT, segment_id), (FIBER_STRAND, cable_strand_id))
+
+    return graph
+
+
+class FiberGraphCache:
+    """Per-process graph, rebuilt when the shared generation changes."""
+
+    def __init__(self, *, client_factory: Callable[[], redis.Redis | None] | None = None) -> None:
+        self._client_factory = client_factory
+        self._client: redis.Redis | None = None
+        self._retry_at = 0.0
+        self._local_generation = 0
+        self._graph: FiberGraph | None = None
+        self._graph_generation: str | None = None
+        self._guard = threading.Lock()
+
+    def _get_client(self) -> redis.Redis | None:
+        if self._client is not None:
+            return self._client
+        if time.monotonic() < self._retry_at:
+            return None
+        try:
+            if self._client_factory is not None:
+                client = self._client_factory()
+            else:
+                client = redis.Redis.from_url(
+                    os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+                    socket_connect_timeout=_REDIS_TIMEOUT_SECONDS,
+                    socket_timeout=_REDIS_TIMEOUT_SECONDS,
+                )
+                client.ping()
+        except redis.RedisError as exc:
+            self._retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+            logger.debug("fiber_graph_redis_unavailable error=%s", exc)
+            return None
+        self._client = client
+        return client
+
+    def _drop_client(self, exc: Exception) -> None:
+        self._client = None
+        self._retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+        logger.debug("fiber_graph_redis_error error=%s", exc)
+
+    def _generation(self) -> str:
+        client = self._get_client()
+        if client is not None:
+            try:
+                return f"{int(client.get(_GENERATION_KEY) or 0)}.{self._local_generation}"
+            except redis.RedisError as exc:
+                self._drop_client(exc)
+        return f"-.{self._local_generation}"
+
+    def get(self, db: Session) -> FiberGraph:
+        generation = self._generation()
+        with self._guard:
+            if self._graph is None or self._graph_generation != generation:
+                started = time.monotonic()
+                self._graph = build_fiber_graph(db)
+                self._graph_generation = generation
+                logger.info(
+                    "fiber_graph_built nodes=%d edges=%d duration_ms=%.1f",
+                    len(self._graph),
+                    self._graph.edge_count,
+                    (time.monotonic() - started) * 1000,
+                )
+            return self._graph
+
+    def invalidate(self) -> None:
+        with self._guard:
+            self._local_generation += 1
+            self._graph = None
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            client.incr(_GENERATION_KEY)
+        except redis.RedisError as exc:
+            self._drop_client(exc)
+
+
+_cache = FiberGraphCache()
+
+
+def get_fiber_graph(db: Session) -> FiberGraph:
+    return _cache.get(db)
+
+
+def invalidate_fiber_graph() -> None:
+    """Force every worker to rebuild the graph on its next query."""
+    _cache.invalidate()
+
+
+def trace_asset(db: Session, node_type: str, node_id: uuid.UUID) -> dict[str, list[dict[str, str]]]:
+    return get_fiber_graph(db).trace(node_type, node_id)
+
+
+def affected_by(db: Session, node_type: str, node_id: uuid.UUID) -> FiberImpact:
+    return get_fiber_graph(db).impact(node_type, node_id)
+
+
+# ---------------------------------------------------------------------------
+# Invalidation on edits
+# ---------------------------------------------------------------------------
+
+_DIRTY_KEY = "_fiber_graph_dirty"
+_GRAPH_MODELS: Iterable[type] = (
+    OLTDevice,
+    PonPort,
+    PonPortSplitterLink,
+    FdhCabinet,
+    Splitter,
+    SplitterPort,
+    OntAssignment,
+    FiberStrand,
+    FiberSplice,
+    FiberSpliceClosure,
+    FiberSegment,
+)
+
+
+def _mark_dirty(_mapper, _connection, target) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    # Savepoint releases fire after_commit too; the edit is not committed yet.
+    if session.in_nested_transaction():
+        return
+    if session.info.pop(_DIRTY_KEY, False):
+        invalidate_fiber_graph()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _reset_dirty(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_DIRTY_KEY, None)
+
+
+for _model in _GRAPH_MODELS:
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _mark_dirty)
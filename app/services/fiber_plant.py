@@ -29,6 +29,8 @@ from app.models.network import (
     Splitter,
 )
 from app.services.common import coerce_uuid
+from app.services.fiber_graph import invalidate_fiber_graph
+from app.services.fiber_plant_tiles import invalidate_tiles
 
 logger = logging.getLogger(__name__)
 
@@ -928,6 +930,9 @@ class FiberPlantManager:
         )
         db.add(merge_log)
         db.commit()
+        # Child moves above are bulk updates, which skip the mapper hooks.
+        invalidate_tiles()
+        invalidate_fiber_graph()
 
         logger.info(
             "Merged %s %s → %s (log=%s)",
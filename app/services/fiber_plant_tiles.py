@@ -0,0 +1,793 @@
+"""Mapbox Vector Tiles for the fiber plant map.
+
+``FiberPlantManager.get_geojson`` ships the whole plant in one document; the
+map instead requests ``/fiber-plant/tiles/{z}/{x}/{y}`` and only receives the
+assets inside each tile, one MVT layer per asset type (the layer names match
+the GeoJSON ``type`` property).
+
+With PostGIS the tile is built by ``ST_AsMVT``; otherwise a small pure-Python
+encoder (shapely for clipping and simplification) produces the same layers.
+Both paths simplify segment geometry to about one pixel at the tile's zoom,
+drop segments shorter than ``MIN_FEATURE_PIXELS``, and hide point layers below
+their ``min_zoom``.
+
+Encoded tiles are cached per process and in Redis under a generation number.
+Inserts, updates and deletes of plant rows (and ``merge_assets``, whose child
+moves are bulk updates) bump the generation after commit, so every worker
+stops serving the old tiles at once.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import redis
+import shapely
+from geoalchemy2.shape import to_shape
+from shapely.geometry import LineString, MultiLineString
+from sqlalchemy import String, and_, cast, event, func, inspect, literal, or_, select
+from sqlalchemy.orm import Session, aliased, object_session
+from sqlalchemy.sql.elements import ClauseElement
+
+from app.models.gis import ServiceBuilding
+from app.models.network import (
+    FdhCabinet,
+    FiberAccessPoint,
+    FiberSegment,
+    FiberSplice,
+    FiberSpliceClosure,
+    FiberSpliceTray,
+    FiberTerminationPoint,
+    OLTDevice,
+    Splitter,
+)
+
+logger = logging.getLogger(__name__)
+
+EXTENT = 4096
+BUFFER = 64
+MAX_ZOOM = 22
+# Tile units per screen pixel for a tile drawn at 256px.
+_UNITS_PER_PIXEL = EXTENT / 256
+SIMPLIFY_PIXELS = 1.0
+MIN_FEATURE_PIXELS = 2.0
+
+TILE_TTL_SECONDS = 600
+# Browser cache lifetime; short so edits show up on the next pan.
+TILE_MAX_AGE_SECONDS = 60
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+LOCAL_MAX_TILES = 2048
+
+_WEB_MERCATOR_HALF = 20037508.342789244
+_MAX_LAT = 85.0511287798066
+
+_SHARED_KEY_PREFIX = "fiber_tiles:"
+_GENERATION_KEY = "fiber_tiles:generation"
+_REDIS_TIMEOUT_SECONDS = 0.25
+_REDIS_RETRY_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class TileLayer:
+    name: str
+    min_zoom: int
+
+
+LAYERS: tuple[TileLayer, ...] = (
+    TileLayer("olt_device", 0),
+    TileLayer("fiber_segment", 0),
+    TileLayer("fdh_cabinet", 10),
+    TileLayer("splice_closure", 12),
+    TileLayer("access_point", 14),
+    TileLayer("service_building", 14),
+)
+LAYER_NAMES = tuple(layer.name for layer in LAYERS)
+
+
+# ---------------------------------------------------------------------------
+# Tile math
+# ---------------------------------------------------------------------------
+
+
+def validate_tile(z: int, x: int, y: int) -> None:
+    if not 0 <= z <= MAX_ZOOM:
+        raise ValueError(f"zoom must be between 0 and {MAX_ZOOM}")
+    if not (0 <= x < 2**z and 0 <= y < 2**z):
+        raise ValueError("tile coordinates out of range for zoom")
+
+
+def _lon_to_world(lon: float) -> float:
+    return (lon + 180.0) / 360.0
+
+
+def _lat_to_world(lat: float) -> float:
+    lat = max(min(lat, _MAX_LAT), -_MAX_LAT)
+    rad = math.radians(lat)
+    return (1.0 - math.log(math.tan(rad) + 1.0 / math.cos(rad)) / math.pi) / 2.0
+
+
+def _world_to_lon(wx: float) -> float:
+    return wx * 360.0 - 180.0
+
+
+def _world_to_lat(wy: float) -> float:
+    return math.degrees(math.atan(math.sinh(math.pi * (1.0 - 2.0 * wy))))
+
+
+def tile_bounds(z: int, x: int, y: int, buffer: int = 0) -> tuple[float, float, float, float]:
+    """(min_lon, min_lat, max_lon, max_lat) of a tile, optionally grown by ``buffer`` tile units."""
+    n = 2**z
+    pad = buffer / EXTENT
+    min_wx, max_wx = (x - pad) / n, (x + 1 + pad) / n
+    min_wy, max_wy = (y - pad) / n, (y + 1 + pad) / n
+    return (
+        _world_to_lon(max(min_wx, 0.0)),
+        _world_to_lat(min(max_wy, 1.0)),
+        _world_to_lon(min(max_wx, 1.0)),
+        _world_to_lat(max(min_wy, 0.0)),
+    )
+
+
+def _projector(z: int, x: int, y: int):
+    scale = (2**z) * EXTENT
+
+    def _project(lon: float, lat: float) -> tuple[float, float]:
+        return _lon_to_world(lon) * scale - x * EXTENT, _lat_to_world(lat) * scale - y * EXTENT
+
+    return _project
+
+
+def _meters_per_pixel(z: int) -> float:
+    return (2 * _WEB_MERCATOR_HALF) / (256 * 2**z)
+
+
+# ---------------------------------------------------------------------------
+# MVT encoding (protobuf, spec v2)
+# ---------------------------------------------------------------------------
+
+_POINT = 1
+_LINESTRING = 2
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    value &= (1 << 64) - 1
+    while True:
+        bits = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(bits | 0x80)
+        else:
+            out.append(bits)
+            return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _field(number: int, wire_type: int) -> bytes:
+    return _varint((number << 3) | wire_type)
+
+
+def _bytes_field(number: int, payload: bytes) -> bytes:
+    return _field(number, 2) + _varint(len(payload)) + payload
+
+
+def _uint_field(number: int, value: int) -> bytes:
+    return _field(number, 0) + _varint(value)
+
+
+def _packed(number: int, values: Iterable[int]) -> bytes:
+    return _bytes_field(number, b"".join(_varint(value) for value in values))
+
+
+def _encode_value(value: Any) -> bytes:
+    if isinstance(value, bool):
+        return _uint_field(7, int(value))
+    if isinstance(value, int):
+        return _uint_field(5, value) if value >= 0 else _uint_field(6, _zigzag(value))
+    if isinstance(value, float):
+        return _field(3, 1) + struct.pack("<d", value)
+    return _bytes_field(1, str(value).encode("utf-8"))
+
+
+def _command(command_id: int, count: int) -> int:
+    return (command_id & 0x7) | (count << 3)
+
+
+def _geometry_commands(geom_type: int, parts: list[list[tuple[int, int]]]) -> list[int]:
+    commands: list[int] = []
+    cursor_x = cursor_y = 0
+    if geom_type == _POINT:
+        commands.append(_command(1, len(parts)))
+        for ((px, py),) in parts:
+            commands += [_zigzag(px - cursor_x), _zigzag(py - cursor_y)]
+            cursor_x, cursor_y = px, py
+        return commands
+    for part in parts:
+        (start_x, start_y), rest = part[0], part[1:]
+        commands += [_command(1, 1), _zigzag(start_x - cursor_x), _zigzag(start_y - cursor_y)]
+        cursor_x, cursor_y = start_x, start_y
+        commands.append(_command(2, len(rest)))
+        for px, py in rest:
+            commands += [_zigzag(px - cursor_x), _zigzag(py - cursor_y)]
+            cursor_x, cursor_y = px, py
+    return commands
+
+
+class _LayerEncoder:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._features: list[bytes] = []
+        self._keys: dict[str, int] = {}
+        self._values: dict[tuple[type, Any], int] = {}
+
+    def _tags(self, properties: dict[str, Any]) -> list[int]:
+        tags: list[int] = []
+        for key, value in properties.items():
+            if value is None:
+                continue
+            key_index = self._keys.setdefault(key, len(self._keys))
+            value_index = self._values.setdefault((type(value), value), len(self._values))
+            tags += [key_index, value_index]
+        return tags
+
+    def add(self, geom_type: int, parts: list[list[tuple[int, int]]], properties: dict[str, Any]) -> None:
+        feature = _packed(2, self._tags(properties))
+        feature += _uint_field(3, geom_type)
+        feature += _packed(4, _geometry_commands(geom_type, parts))
+        self._features.append(feature)
+
+    def encode(self) -> bytes:
+        if not self._features:
+            return b""
+        layer = _uint_field(15, 2) + _bytes_field(1, self.name.encode("utf-8"))
+        layer += b"".join(_bytes_field(2, feature) for feature in self._features)
+        layer += b"".join(_bytes_field(3, key.encode("utf-8")) for key in self._keys)
+        layer += b"".join(_bytes_field(4, _encode_value(value)) for (_, value) in self._values)
+        layer += _uint_field(5, EXTENT)
+        return _bytes_field(3, layer)
+
+
+# ---------------------------------------------------------------------------
+# Pure-Python tile builder
+# ---------------------------------------------------------------------------
+
+
+def _quantize(coords: Iterable[tuple[float, float]]) -> list[tuple[int, int]]:
+    points: list[tuple[int, int]] = []
+    for cx, cy in coords:
+        point = (round(cx), round(cy))
+        if not points or points[-1] != point:
+            points.append(point)
+    return points
+
+
+def _line_parts(coords: list[tuple[float, float]]) -> list[list[tuple[int, int]]]:
+    """Clip, simplify and quantize a projected line; [] when it is too small or off-tile."""
+    line = LineString(coords)
+    if line.length < MIN_FEATURE_PIXELS * _UNITS_PER_PIXEL:
+        return []
+    clipped = shapely.clip_by_rect(line, -BUFFER, -BUFFER, EXTENT + BUFFER, EXTENT + BUFFER)
+    if clipped.is_empty:
+        return []
+    simplified = clipped.simplify(SIMPLIFY_PIXELS * _UNITS_PER_PIXEL, preserve_topology=False)
+    if isinstance(simplified, LineString):
+        lines = [simplified]
+    elif isinstance(simplified, MultiLineString):
+        lines = list(simplified.geoms)
+    else:
+        lines = [geom for geom in getattr(simplified, "geoms", []) if isinstance(geom, LineString)]
+    parts = [_quantize(part.coords) for part in lines]
+    return [part for part in parts if len(part) >= 2]
+
+
+def _counts(db: Session, column, ids: list) -> dict:
+    if not ids:
+        return {}
+    return dict(db.execute(select(column, func.count()).where(column.in_(ids)).group_by(column)).all())
+
+
+def _point_rows(db: Session, model, columns: list, bounds: tuple[float, float, float, float]) -> list:
+    min_lon, min_lat, max_lon, max_lat = bounds
+    return db.execute(
+        select(model.id, model.latitude, model.longitude, *columns).where(
+            model.is_active.is_(True),
+            model.latitude.between(min_lat, max_lat),
+            model.longitude.between(min_lon, max_lon),
+        )
+    ).all()
+
+
+def _python_point_features(db: Session, layer: str, bounds) -> list[tuple[float, float, Any, dict[str, Any]]]:
+    """(lon, lat, id, properties) for the active assets of a point layer inside ``bounds``."""
+    if layer == "olt_device":
+        rows = _point_rows(db, OLTDevice, [OLTDevice.name, OLTDevice.site_role], bounds)
+        return [(r.longitude, r.latitude, r.id, {"name": r.name, "site_role": r.site_role or "olt"}) for r in rows]
+    if layer == "fdh_cabinet":
+        rows = _point_rows(db, FdhCabinet, [FdhCabinet.name, FdhCabinet.code], bounds)
+        splitters = _counts(db, Splitter.fdh_id, [r.id for r in rows])
+        return [
+            (r.longitude, r.latitude, r.id, {"name": r.name, "code": r.code, "splitter_count": splitters.get(r.id, 0)})
+            for r in rows
+        ]
+    if layer == "splice_closure":
+        rows = _point_rows(db, FiberSpliceClosure, [FiberSpliceClosure.name], bounds)
+        ids = [r.id for r in rows]
+        splices = _counts(db, FiberSplice.closure_id, ids)
+        trays = _counts(db, FiberSpliceTray.closure_id, ids)
+        return [
+            (
+                r.longitude,
+                r.latitude,
+                r.id,
+                {"name": r.name, "splice_count": splices.get(r.id, 0), "tray_count": trays.get(r.id, 0)},
+            )
+            for r in rows
+        ]
+    if layer == "access_point":
+        rows = _point_rows(
+            db,
+            FiberAccessPoint,
+            [
+                FiberAccessPoint.name,
+                FiberAccessPoint.code,
+                FiberAccessPoint.access_point_type,
+                FiberAccessPoint.placement,
+            ],
+            bounds,
+        )
+        return [
+            (
+                r.longitude,
+                r.latitude,
+                r.id,
+                {"name": r.name, "code": r.code, "ap_type": r.access_point_type, "placement": r.placement},
+            )
+            for r in rows
+        ]
+    if layer == "service_building":
+        rows = _point_rows(
+            db, ServiceBuilding, [ServiceBuilding.name, ServiceBuilding.code, ServiceBuilding.city], bounds
+        )
+        return [(r.longitude, r.latitude, r.id, {"name": r.name, "code": r.code, "city": r.city}) for r in rows]
+    raise ValueError(f"Unknown point layer: {layer}")
+
+
+def _endpoint_bbox_filter(from_point, to_point, bounds: tuple[float, float, float, float]):
+    """Bounding box of the straight from/to line intersects ``bounds``."""
+    min_lon, min_lat, max_lon, max_lat = bounds
+    return and_(
+        or_(from_point.longitude <= max_lon, to_point.longitude <= max_lon),
+        or_(from_point.longitude >= min_lon, to_point.longitude >= min_lon),
+        or_(from_point.latitude <= max_lat, to_point.latitude <= max_lat),
+        or_(from_point.latitude >= min_lat, to_point.latitude >= min_lat),
+    )
+
+
+def _segment_properties(segment) -> dict[str, Any]:
+    return {
+        "name": segment.name,
+        "segment_type": segment.segment_type.value if segment.segment_type else None,
+        "cable_type": segment.cable_type.value if segment.cable_type else None,
+        "fiber_count": segment.fiber_count,
+        "length_m": float(segment.length_m) if segment.length_m is not None else None,
+    }
+
+
+def _route_bbox_filter(bounds: tuple[float, float, float, float]):
+    """Stored route bounds intersect ``bounds``; rows without stored bounds are kept."""
+    min_lon, min_lat, max_lon, max_lat = bounds
+    return or_(
+        FiberSegment.route_min_longitude.is_(None),
+        and_(
+            FiberSegment.route_min_longitude <= max_lon,
+            FiberSegment.route_max_longitude >= min_lon,
+            FiberSegment.route_min_latitude <= max_lat,
+            FiberSegment.route_max_latitude >= min_lat,
+        ),
+    )
+
+
+def _python_segment_lines(db: Session, bounds) -> list[tuple[list[tuple[float, float]], Any]]:
+    """Segment polylines in lon/lat, filtered to ``bounds`` in SQL; stored routes are decoded here."""
+    min_lon, min_lat, max_lon, max_lat = bounds
+    columns = (
+        FiberSegment.id,
+        FiberSegment.name,
+        FiberSegment.segment_type,
+        FiberSegment.cable_type,
+        FiberSegment.fiber_count,
+        FiberSegment.length_m,
+    )
+    from_point = aliased(FiberTerminationPoint)
+    to_point = aliased(FiberTerminationPoint)
+    rows = db.execute(
+        select(
+            *columns,
+            from_point.longitude.label("from_lon"),
+            from_point.latitude.label("from_lat"),
+            to_point.longitude.label("to_lon"),
+            to_point.latitude.label("to_lat"),
+        )
+        .join(from_point, from_point.id == FiberSegment.from_point_id)
+        .join(to_point, to_point.id == FiberSegment.to_point_id)
+        .where(
+            FiberSegment.is_active.is_(True),
+            FiberSegment.route_geom.is_(None),
+            _endpoint_bbox_filter(from_point, to_point, bounds),
+            from_point.latitude.isnot(None),
+            to_point.latitude.isnot(None),
+        )
+    ).all()
+    lines = [([(row.from_lon, row.from_lat), (row.to_lon, row.to_lat)], row) for row in rows]
+
+    routed = db.execute(
+        select(*columns, FiberSegment.route_geom).where(
+            FiberSegment.is_active.is_(True),
+            FiberSegment.route_geom.isnot(None),
+            _route_bbox_filter(bounds),
+        )
+    ).all()
+    for row in routed:
+        try:
+            shape = to_shape(row.route_geom)
+        except Exception:
+            logger.debug("fiber_tiles_route_geom_unreadable segment_id=%s", row.id)
+            continue
+        # Re-checked for rows written before their bounds were stored.
+        seg_min_lon, seg_min_lat, seg_max_lon, seg_max_lat = shape.bounds
+        if seg_max_lon < min_lon or seg_min_lon > max_lon or seg_max_lat < min_lat or seg_min_lat > max_lat:
+            continue
+        lines.append((list(shape.coords), row))
+    return lines
+
+
+def _build_tile_python(db: Session, z: int, x: int, y: int, layers: Iterable[str]) -> bytes:
+    project = _projector(z, x, y)
+    bounds = tile_bounds(z, x, y, buffer=BUFFER)
+    chunks: list[bytes] = []
+    for layer in layers:
+        encoder = _LayerEncoder(layer)
+        if layer == "fiber_segment":
+            for coords, row in _python_segment_lines(db, bounds):
+                parts = _line_parts([project(lon, lat) for lon, lat in coords])
+                if parts:
+                    encoder.add(_LINESTRING, parts, {"id": str(row.id), **_segment_properties(row)})
+        else:
+            for lon, lat, row_id, properties in _python_point_features(db, layer, bounds):
+                px, py = project(lon, lat)
+                encoder.add(_POINT, [[(round(px), round(py))]], {"id": str(row_id), **properties})
+        chunks.append(encoder.encode())
+    return b"".join(chunks)
+
+
+# ---------------------------------------------------------------------------
+# PostGIS tile builder
+# ---------------------------------------------------------------------------
+
+
+def _mvt_point(model, envelope):
+    point = func.ST_Transform(func.ST_SetSRID(func.ST_MakePoint(model.longitude, model.latitude), 4326), 3857)
+    return func.ST_AsMVTGeom(point, envelope, EXTENT, BUFFER, True).label("geom")
+
+
+def _count_subquery(column, parent_id):
+    return select(func.count()).where(column == parent_id).correlate_except(column.class_).scalar_subquery()
+
+
+def _postgis_layer_query(layer: str, z: int, x: int, y: int):
+    envelope = func.ST_TileEnvelope(z, x, y)
+    min_lon, min_lat, max_lon, max_lat = tile_bounds(z, x, y, buffer=BUFFER)
+
+    def _points(model, *columns):
+        return select(_mvt_point(model, envelope), cast(model.id, String).label("id"), *columns).where(
+            model.is_active.is_(True),
+            model.latitude.between(min_lat, max_lat),
+            model.longitude.between(min_lon, max_lon),
+        )
+
+    if layer == "olt_device":
+        rows = _points(OLTDevice, OLTDevice.name, func.coalesce(OLTDevice.site_role, "olt").label("site_role"))
+    elif layer == "fdh_cabinet":
+        rows = _points(
+            FdhCabinet,
+            FdhCabinet.name,
+            FdhCabinet.code,
+            _count_subquery(Splitter.fdh_id, FdhCabinet.id).label("splitter_count"),
+        )
+    elif layer == "splice_closure":
+        rows = _points(
+            FiberSpliceClosure,
+            FiberSpliceClosure.name,
+            _count_subquery(FiberSplice.closure_id, FiberSpliceClosure.id).label("splice_count"),
+            _count_subquery(FiberSpliceTray.closure_id, FiberSpliceClosure.id).label("tray_count"),
+        )
+    elif layer == "access_point":
+        rows = _points(
+            FiberAccessPoint,
+            FiberAccessPoint.name,
+            FiberAccessPoint.code,
+            FiberAccessPoint.access_point_type.label("ap_type"),
+            FiberAccessPoint.placement,
+        )
+    elif layer == "service_building":
+        rows = _points(ServiceBuilding, ServiceBuilding.name, ServiceBuilding.code, ServiceBuilding.city)
+    else:
+        from_point = aliased(FiberTerminationPoint)
+        to_point = aliased(FiberTerminationPoint)
+        endpoint_line = func.ST_MakeLine(
+            func.ST_SetSRID(func.ST_MakePoint(from_point.longitude, from_point.latitude), 4326),
+            func.ST_SetSRID(func.ST_MakePoint(to_point.longitude, to_point.latitude), 4326),
+        )
+        line = func.ST_Transform(func.coalesce(FiberSegment.route_geom, endpoint_line), 3857)
+        meters_per_pixel = _meters_per_pixel(z)
+        envelope_4326 = func.ST_MakeEnvelope(min_lon, min_lat, max_lon, max_lat, 4326)
+        rows = (
+            select(
+                func.ST_AsMVTGeom(
+                    func.ST_Simplify(line, meters_per_pixel * SIMPLIFY_PIXELS), envelope, EXTENT, BUFFER, True
+                ).label("geom"),
+                cast(FiberSegment.id, String).label("id"),
+                FiberSegment.name,
+                cast(FiberSegment.segment_type, String).label("segment_type"),
+                cast(FiberSegment.cable_type, String).label("cable_type"),
+                FiberSegment.fiber_count,
+                FiberSegment.length_m,
+            )
+            .outerjoin(from_point, from_point.id == FiberSegment.from_point_id)
+            .outerjoin(to_point, to_point.id == FiberSegment.to_point_id)
+            .where(
+                FiberSegment.is_active.is_(True),
+                or_(
+                    FiberSegment.route_geom.op("&&")(envelope_4326),
+                    and_(
+                        FiberSegment.route_geom.is_(None),
+                        _endpoint_bbox_filter(from_point, to_point, (min_lon, min_lat, max_lon, max_lat)),
+                    ),
+                ),
+                func.ST_Length(line) >= meters_per_pixel * MIN_FEATURE_PIXELS,
+            )
+        )
+    tile_rows = rows.subquery("t")
+    return select(
+        func.ST_AsMVT(tile_rows.table_valued(), cast(literal(layer), String), EXTENT, cast(literal("geom"), String))
+    ).where(tile_rows.c.geom.isnot(None))
+
+
+def _build_tile_postgis(db: Session, z: int, x: int, y: int, layers: Iterable[str]) -> bytes:
+    chunks = []
+    for layer in layers:
+        data = db.execute(_postgis_layer_query(layer, z, x, y)).scalar()
+        if data:
+            chunks.append(bytes(data))
+    return b"".join(chunks)
+
+
+# ---------------------------------------------------------------------------
+# Tile cache
+# ---------------------------------------------------------------------------
+
+
+class _TileCache:
+    def __init__(
+        self,
+        *,
+        max_entries: int = LOCAL_MAX_TILES,
+        client_factory: Callable[[], redis.Redis | None] | None = None,
+    ) -> None:
+        self._max_entries = max(int(max_entries), 1)
+        self._client_factory = client_factory
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._local_generation = 0
+        self._guard = threading.Lock()
+        self._client: redis.Redis | None = None
+        self._retry_at = 0.0
+
+    def _get_client(self) -> redis.Redis | None:
+        if self._client is not None:
+            return self._client
+        if time.monotonic() < self._retry_at:
+            return None
+        try:
+            if self._client_factory is not None:
+                client = self._client_factory()
+            else:
+                client = redis.Redis.from_url(
+                    os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+                    socket_connect_timeout=_REDIS_TIMEOUT_SECONDS,
+                    socket_timeout=_REDIS_TIMEOUT_SECONDS,
+                )
+                client.ping()
+        except redis.RedisError as exc:
+            self._retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+            logger.debug("fiber_tiles_redis_unavailable error=%s", exc)
+            return None
+        self._client = client
+        return client
+
+    def _drop_client(self, exc: Exception) -> None:
+        self._client = None
+        self._retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+        logger.debug("fiber_tiles_redis_error error=%s", exc)
+
+    def generation(self) -> str:
+        client = self._get_client()
+        if client is not None:
+            try:
+                return f"{int(client.get(_GENERATION_KEY) or 0)}.{self._local_generation}"
+            except redis.RedisError as exc:
+                self._drop_client(exc)
+        return f"-.{self._local_generation}"
+
+    def get(self, key: str) -> bytes | None:
+        with self._guard:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+        client = self._get_client()
+        if client is None:
+            return None
+        try:
+            data = client.get(f"{_SHARED_KEY_PREFIX}{key}")
+        except redis.RedisError as exc:
+            self._drop_client(exc)
+            return None
+        if data is not None:
+            self._set_local(key, bytes(data))
+        return data
+
+    def _set_local(self, key: str, data: bytes) -> None:
+        with self._guard:
+            self._entries[key] = (time.monotonic() + TILE_TTL_SECONDS, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def set(self, key: str, data: bytes) -> None:
+        self._set_local(key, data)
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            client.setex(f"{_SHARED_KEY_PREFIX}{key}", TILE_TTL_SECONDS, data)
+        except redis.RedisError as exc:
+            self._drop_client(exc)
+
+    def invalidate(self) -> None:
+        with self._guard:
+            self._local_generation += 1
+            self._entries.clear()
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            client.incr(_GENERATION_KEY)
+        except redis.RedisError as exc:
+            self._drop_client(exc)
+
+
+_cache = _TileCache()
+
+
+def invalidate_tiles() -> None:
+    """Drop cached tiles in every worker (the next request rebuilds them)."""
+    _cache.invalidate()
+
+
+def _postgis_available(db: Session) -> bool:
+    from app.services.fiber_plant import fiber_plant
+
+    return fiber_plant._postgis_available(db)
+
+
+def get_tile(db: Session, z: int, x: int, y: int, layers: Iterable[str] | None = None) -> bytes:
+    """Encoded MVT for tile z/x/y with the requested layers (all by default)."""
+    validate_tile(z, x, y)
+    requested = set(layers) if layers else set(LAYER_NAMES)
+    unknown = requested - set(LAYER_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown layers: {', '.join(sorted(unknown))}")
+    visible = [layer.name for layer in LAYERS if layer.name in requested and z >= layer.min_zoom]
+    if not visible:
+        return b""
+
+    key = f"{_cache.generation()}:{z}/{x}/{y}:{','.join(visible)}"
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+    if _postgis_available(db):
+        data = _build_tile_postgis(db, z, x, y, visible)
+    else:
+        data = _build_tile_python(db, z, x, y, visible)
+    _cache.set(key, data)
+    return data
+
+
+# ---------------------------------------------------------------------------
+# Invalidation on edits
+# ---------------------------------------------------------------------------
+
+_DIRTY_KEY = "_fiber_tiles_dirty"
+_TILED_MODELS = (
+    FdhCabinet,
+    FiberSpliceClosure,
+    OLTDevice,
+    FiberSegment,
+    FiberAccessPoint,
+    ServiceBuilding,
+    FiberTerminationPoint,
+    Splitter,
+    FiberSplice,
+    FiberSpliceTray,
+)
+
+
+_ROUTE_BOUND_COLUMNS = (
+    ("route_min_longitude", func.ST_XMin),
+    ("route_min_latitude", func.ST_YMin),
+    ("route_max_longitude", func.ST_XMax),
+    ("route_max_latitude", func.ST_YMax),
+)
+
+
+def _store_route_bounds(_mapper, _connection, target: FiberSegment) -> None:
+    """Keep the stored route bounds in step with ``route_geom``."""
+    if not inspect(target).attrs.route_geom.history.has_changes():
+        return
+    geom = target.route_geom
+    if geom is None:
+        values: tuple = (None, None, None, None)
+    elif isinstance(geom, ClauseElement):
+        # Built in SQL (e.g. ST_GeomFromGeoJSON): the database measures it on write.
+        values = tuple(function(geom) for _, function in _ROUTE_BOUND_COLUMNS)
+    else:
+        try:
+            values = to_shape(geom).bounds
+        except Exception:
+            values = (None, None, None, None)
+    for (column, _), value in zip(_ROUTE_BOUND_COLUMNS, values, strict=True):
+        setattr(target, column, value)
+
+
+event.listen(FiberSegment, "before_insert", _store_route_bounds)
+event.listen(FiberSegment, "before_update", _store_route_bounds)
+
+
+def _mark_dirty(_mapper, _connection, target) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    # Savepoint releases fire after_commit too; other workers cannot see the edit yet.
+    if session.in_nested_transaction():
+        return
+    if session.info.pop(_DIRTY_KEY, False):
+        invalidate_tiles()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _reset_dirty(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_DIRTY_KEY, None)
+
+
+for _model in _TILED_MODELS:
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _mark_dirty)
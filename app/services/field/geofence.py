@@ -32,6 +32,7 @@ logger = logging.getLogger(__name__)
 # Fixed namespace so geofence-issued client_event_ids are stable across pings.
 _GEOFENCE_NS = uuid.UUID("9f1c0d2e-7b3a-4c6e-9a8d-1e2f3a4b5c6d")
 DEFAULT_ARRIVAL_RADIUS_M = 120.0
+METRES_PER_DEGREE = 111_195.0  # one degree of latitude on the haversine sphere
 _ARRIVABLE_STATUSES = {WorkOrderStatus.scheduled, WorkOrderStatus.dispatched}
 
 
@@ -75,6 +76,19 @@ def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
     return 2 * r * math.asin(min(1.0, math.sqrt(a)))
 
 
+def bbox_around(latitude: float, longitude: float, radius_m: float) -> tuple[float, float, float, float]:
+    """``(south, west, north, east)`` of a box containing the circle of ``radius_m`` around a point."""
+    dlat = radius_m / METRES_PER_DEGREE
+    cos_lat = max(math.cos(math.radians(min(abs(latitude) + dlat, 89.9))), 1e-6)
+    dlng = min(radius_m / (METRES_PER_DEGREE * cos_lat), 180.0)
+    return latitude - dlat, longitude - dlng, latitude + dlat, longitude + dlng
+
+
+def in_bbox(latitude: float, longitude: float, bbox: tuple[float, float, float, float]) -> bool:
+    south, west, north, east = bbox
+    return south <= latitude <= north and west <= longitude <= east
+
+
 def _arrivable_jobs(db: Session, person_uuid) -> list[WorkOrder]:
     return (
         db.query(WorkOrder)
@@ -96,6 +110,8 @@ def evaluate(db: Session, person_id: str, latitude: float, longitude: float) ->
     if person_uuid is None:
         return []
     radius = arrival_radius_m(db)
+    # Cheap box test first: most pings are nowhere near any assigned job.
+    bbox = bbox_around(latitude, longitude, radius)
     fired: list[dict] = []
     for work_order in _arrivable_jobs(db, person_uuid):
         try:
@@ -105,7 +121,10 @@ def evaluate(db: Session, person_id: str, latitude: float, longitude: float) ->
             continue
         if loc.get("latitude") is None or loc.get("longitude") is None:
             continue
-        distance = haversine_m(latitude, longitude, float(loc["latitude"]), float(loc["longitude"]))
+        job_lat, job_lng = float(loc["latitude"]), float(loc["longitude"])
+        if not in_bbox(job_lat, job_lng, bbox):
+            continue
+        distance = haversine_m(latitude, longitude, job_lat, job_lng)
         if distance > radius:
             continue
         client_event_id = str(uuid.uuid5(_GEOFENCE_NS, f"start:{work_order.id}"))
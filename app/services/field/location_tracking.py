@@ -56,6 +56,16 @@ def _validate_coords(latitude: float, longitude: float) -> None:
         raise HTTPException(status_code=422, detail="longitude out of range")
 
 
+def _index_presence(presence: FieldTechPresence) -> None:
+    """Feed a committed presence snapshot to the dispatch spatial index (best effort)."""
+    try:
+        from app.services.field import spatial_index
+
+        spatial_index.observe(presence)
+    except Exception:
+        logger.exception("presence_index_update_failed person_id=%s", presence.person_id)
+
+
 def _person_label(person: Person | None) -> str:
     if person is None:
         return "Technician"
@@ -93,6 +103,7 @@ class FieldLocationTracking:
         presence.last_seen_at = _now()
         db.commit()
         db.refresh(presence)
+        _index_presence(presence)
         return presence
 
     @staticmethod
@@ -151,6 +162,7 @@ class FieldLocationTracking:
             db.commit()
             db.refresh(ping)
             db.refresh(presence)
+            _index_presence(presence)
         else:
             db.flush()
         return {"ping": ping, "presence": presence}
@@ -186,6 +198,7 @@ class FieldLocationTracking:
         db.commit()
         presence = last["presence"] if last else FieldLocationTracking.get_or_create_presence(db, person_id)
         db.refresh(presence)
+        _index_presence(presence)
 
         # Geofence auto-status (task #46): a best-effort convenience over ingest —
         # never let it break the upload.
@@ -0,0 +1,143 @@
+"""Open-route optimisation for a technician's day (task #47 follow-up).
+
+Pure functions over a distance matrix so they are fast to test and free of DB
+or HTTP concerns. Node 0 is the fixed start (the tech's position); the route
+visits every other node once and does not return.
+
+The greedy nearest-neighbour tour is improved by local search until no move
+helps or the time budget runs out, whichever comes first:
+
+- 2-opt reverses a segment when that shortens the path;
+- Or-opt relocates a run of 1-3 consecutive stops to a better position.
+
+Both moves are evaluated in O(1) from the matrix, so a day of a few dozen jobs
+converges in well under the default budget.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Sequence
+
+EARTH_RADIUS_KM = 6371.0
+DEFAULT_TIME_BUDGET_SECONDS = 0.2
+_EPSILON = 1e-9
+
+
+def distance_matrix_km(points: Sequence[tuple[float, float]]) -> list[list[float]]:
+    """Symmetric great-circle distance matrix (km) for ``(lat, lng)`` points.
+
+    Trig terms are computed once per point, so each pair costs a few
+    multiplications instead of a full haversine call.
+    """
+    lat_rad = [math.radians(lat) for lat, _ in points]
+    lng_rad = [math.radians(lng) for _, lng in points]
+    cos_lat = [math.cos(value) for value in lat_rad]
+    n = len(points)
+    matrix = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        row = matrix[i]
+        for j in range(i + 1, n):
+            sin_dlat = math.sin((lat_rad[j] - lat_rad[i]) / 2)
+            sin_dlng = math.sin((lng_rad[j] - lng_rad[i]) / 2)
+            a = sin_dlat * sin_dlat + cos_lat[i] * cos_lat[j] * sin_dlng * sin_dlng
+            distance = 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+            row[j] = distance
+            matrix[j][i] = distance
+    return matrix
+
+
+def route_length(route: Sequence[int], matrix: Sequence[Sequence[float]]) -> float:
+    """Length of the open path ``0 -> route[0] -> ... -> route[-1]``."""
+    total = 0.0
+    previous = 0
+    for node in route:
+        total += matrix[previous][node]
+        previous = node
+    return total
+
+
+def nearest_neighbour_route(matrix: Sequence[Sequence[float]]) -> list[int]:
+    """Greedy order of nodes ``1..n-1`` starting from node 0."""
+    remaining = set(range(1, len(matrix)))
+    route: list[int] = []
+    current = 0
+    while remaining:
+        row = matrix[current]
+        current = min(remaining, key=lambda node: (row[node], node))
+        remaining.remove(current)
+        route.append(current)
+    return route
+
+
+def _two_opt_pass(path: list[int], matrix: Sequence[Sequence[float]], deadline: float) -> bool:
+    """One first-improvement sweep of open-path 2-opt; ``path[0]`` is the fixed start."""
+    n = len(path)
+    for i in range(n - 2):
+        if time.monotonic() > deadline:
+            return False
+        a, b = path[i], path[i + 1]
+        for j in range(i + 2, n):
+            c = path[j]
+            d = path[j + 1] if j + 1 < n else None
+            # Reverse path[i+1 .. j]: edges (a,b) and (c,d) become (a,c) and (b,d).
+            before = matrix[a][b] + (matrix[c][d] if d is not None else 0.0)
+            after = matrix[a][c] + (matrix[b][d] if d is not None else 0.0)
+            if after < before - _EPSILON:
+                path[i + 1 : j + 1] = reversed(path[i + 1 : j + 1])
+                return True
+    return False
+
+
+def _or_opt_pass(path: list[int], matrix: Sequence[Sequence[float]], deadline: float) -> bool:
+    """Move one run of 1-3 stops to a cheaper position; ``path[0]`` stays fixed."""
+    n = len(path)
+    for length in (1, 2, 3):
+        for start in range(1, n - length + 1):
+            if time.monotonic() > deadline:
+                return False
+            end = start + length - 1
+            prev, first, last = path[start - 1], path[start], path[end]
+            nxt = path[end + 1] if end + 1 < n else None
+            removed_gain = matrix[prev][first] + (matrix[last][nxt] if nxt is not None else 0.0)
+            removed_gain -= matrix[prev][nxt] if nxt is not None else 0.0
+            segment = path[start : end + 1]
+            rest = path[:start] + path[end + 1 :]
+            for k in range(len(rest)):
+                if k == start - 1:
+                    continue
+                left = rest[k]
+                right = rest[k + 1] if k + 1 < len(rest) else None
+                for ordered in (segment, segment[::-1]) if length > 1 else (segment,):
+                    added = matrix[left][ordered[0]] + (matrix[ordered[-1]][right] if right is not None else 0.0)
+                    added -= matrix[left][right] if right is not None else 0.0
+                    if added < removed_gain - _EPSILON:
+                        path[:] = rest[: k + 1] + list(ordered) + rest[k + 1 :]
+                        return True
+    return False
+
+
+def optimize_route(
+    matrix: Sequence[Sequence[float]],
+    *,
+    time_budget_seconds: float = DEFAULT_TIME_BUDGET_SECONDS,
+) -> list[int]:
+    """Order nodes ``1..n-1`` into a short open path from node 0.
+
+    Starts from the nearest-neighbour route and applies 2-opt and Or-opt moves
+    until neither improves it or ``time_budget_seconds`` elapses. The result is
+    never longer than the greedy route.
+    """
+    route = nearest_neighbour_route(matrix)
+    if len(route) < 3:
+        return route
+    deadline = time.monotonic() + max(time_budget_seconds, 0.0)
+    path = [0, *route]
+    while time.monotonic() <= deadline:
+        if _two_opt_pass(path, matrix, deadline):
+            continue
+        if _or_opt_pass(path, matrix, deadline):
+            continue
+        break
+    return path[1:]
@@ -1,28 +1,37 @@
 """Proximity-aware dispatch helpers: nearest available tech + day routing.
 
-Built on the field-tech presence store (task #42). Distance is computed in
-Python (haversine) over the small set of on-shift, sharing-enabled techs, so the
-path is DB-agnostic and unit-testable; a PostGIS spatial index can replace it if
-the active-tech set ever grows large.
+Built on the field-tech presence store (task #42). Candidate techs come from
+the live presence spatial index (``spatial_index``), so a job only looks at the
+techs nearest to it; their presence rows are then re-checked and measured
+(haversine) in Python, keeping the path DB-agnostic and unit-testable.
 
 These compose with the existing dispatch scorer rather than replacing it: pass
 ``candidate_person_ids`` (e.g. the skill-matched, available set from
 ``app/services/dispatch.py``) to rank only eligible techs by distance.
+
+Day routes are optimised over a distance matrix built once per route
+(``route_optimizer``), for one tech or a whole team in a single pass.
 """
 
 from __future__ import annotations
 
-from datetime import timedelta
+import threading
+import time
+import uuid
+from collections.abc import Iterable
+from datetime import datetime, timedelta
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+from app.models.dispatch import TechnicianProfile
 from app.models.field_location import FieldPresenceStatus, FieldTechPresence
 from app.models.person import Person
 from app.models.workforce import WorkOrder, WorkOrderStatus
 from app.services.common import coerce_uuid
+from app.services.field import route_optimizer, spatial_index
 from app.services.field.geofence import haversine_m
-from app.services.field.location import resolve_job_location
+from app.services.field.location import cached_job_location, resolve_job_location
 from app.services.field.location_tracking import _now, _person_label
 
 DEFAULT_ASSIGN_STALE_SECONDS = 600  # a tech's fix must be < 10 min old to be "live"
@@ -32,12 +41,28 @@ _ROUTABLE_STATUSES = {
     WorkOrderStatus.in_progress,
     WorkOrderStatus.paused,
 }
+# Geocoding failures are not cached on the job, so remember them briefly rather
+# than re-trying the geocoder for every unlocated job on every re-plan.
+_UNLOCATED_TTL_SECONDS = 600
+_UNLOCATED_MAX_ENTRIES = 5000
+_unlocated_until: dict[str, float] = {}
+_unlocated_lock = threading.Lock()
 
 
 def _job_coords(db: Session, work_order: WorkOrder) -> tuple[float, float] | None:
-    loc = resolve_job_location(db, work_order)
-    if loc.get("latitude") is None or loc.get("longitude") is None:
-        return None
+    loc = cached_job_location(work_order)
+    if loc is None:
+        key = str(work_order.id)
+        with _unlocated_lock:
+            if _unlocated_until.get(key, 0.0) > time.monotonic():
+                return None
+        loc = resolve_job_location(db, work_order)
+        if loc.get("latitude") is None or loc.get("longitude") is None:
+            with _unlocated_lock:
+                if len(_unlocated_until) >= _UNLOCATED_MAX_ENTRIES:
+                    _unlocated_until.pop(next(iter(_unlocated_until)))
+                _unlocated_until[key] = time.monotonic() + _UNLOCATED_TTL_SECONDS
+            return None
     return float(loc["latitude"]), float(loc["longitude"])
 
 
@@ -65,22 +90,54 @@ def nearest_techs_for_job(
     job_lat, job_lng = coords
 
     cutoff = _now() - timedelta(seconds=max(int(stale_after_seconds or DEFAULT_ASSIGN_STALE_SECONDS), 30))
-    query = (
+    wanted: set[str] | None = None
+    if candidate_person_ids is not None:
+        wanted = {str(coerce_uuid(pid)) for pid in candidate_person_ids}
+        if not wanted:
+            return []
+    limit = max(1, int(limit or 5))
+    max_m = max_km * 1000.0 if max_km is not None else None
+
+    spatial_index.ensure_fresh(db)
+    # The index only proposes candidates; eligibility and distance come from the
+    # presence rows. Widen the window when stale/ineligible entries crowd it.
+    fetch = max(limit * 2, 8)
+    while True:
+        hits = spatial_index.nearest(
+            job_lat,
+            job_lng,
+            k=fetch,
+            max_m=max_m,
+            accept=wanted.__contains__ if wanted is not None else None,
+        )
+        ranked = _rank_presence(db, [coerce_uuid(pid) for pid, _ in hits], job_lat, job_lng, cutoff, max_km)
+        if len(ranked) >= limit or len(hits) < fetch:
+            return ranked[:limit]
+        fetch *= 4
+
+
+def _rank_presence(
+    db: Session,
+    person_ids: list[uuid.UUID | None],
+    job_lat: float,
+    job_lng: float,
+    cutoff: datetime,
+    max_km: float | None,
+) -> list[dict]:
+    if not person_ids:
+        return []
+    rows = (
         db.query(FieldTechPresence, Person)
         .join(Person, Person.id == FieldTechPresence.person_id)
+        .filter(FieldTechPresence.person_id.in_(person_ids))
         .filter(FieldTechPresence.location_sharing_enabled.is_(True))
         .filter(FieldTechPresence.status == FieldPresenceStatus.on_shift)
         .filter(FieldTechPresence.last_location_at.isnot(None))
         .filter(FieldTechPresence.last_location_at >= cutoff)
+        .all()
     )
-    if candidate_person_ids is not None:
-        wanted = [coerce_uuid(pid) for pid in candidate_person_ids]
-        if not wanted:
-            return []
-        query = query.filter(FieldTechPresence.person_id.in_(wanted))
-
     ranked: list[dict] = []
-    for presence, person in query.all():
+    for presence, person in rows:
         distance_km = haversine_m(job_lat, job_lng, presence.last_latitude, presence.last_longitude) / 1000.0
         if max_km is not None and distance_km > max_km:
             continue
@@ -93,7 +150,7 @@ def nearest_techs_for_job(
             }
         )
     ranked.sort(key=lambda r: r["distance_km"])
-    return ranked[: max(1, int(limit or 5))]
+    return ranked
 
 
 def suggest_nearest_tech(
@@ -114,26 +171,18 @@ def suggest_nearest_tech(
     return ranked[0] if ranked else None
 
 
-def order_day_route(
+def _route_jobs(
     db: Session,
-    person_id: str,
+    jobs: Iterable[WorkOrder],
+    start: tuple[float, float] | None,
     *,
-    start_latitude: float,
-    start_longitude: float,
+    time_budget_seconds: float,
 ) -> list[dict]:
-    """Greedy nearest-neighbour ordering of a tech's open jobs from a start point.
+    """Order jobs into a short open route from ``start`` (or from any job when None).
 
     Jobs without a resolvable location sort last (in their original order) so the
-    route never silently drops work. Returns
-    ``[{sequence, work_order_id, distance_km, leg_km}]``.
+    route never silently drops work.
     """
-    person_uuid = coerce_uuid(person_id)
-    jobs = (
-        db.query(WorkOrder)
-        .filter(WorkOrder.assigned_to_person_id == person_uuid)
-        .filter(WorkOrder.status.in_(_ROUTABLE_STATUSES))
-        .all()
-    )
     located: list[tuple[WorkOrder, float, float]] = []
     unlocated: list[WorkOrder] = []
     for job in jobs:
@@ -143,38 +192,140 @@ def order_day_route(
         else:
             located.append((job, coords[0], coords[1]))
 
+    points = [(lat, lng) for _job, lat, lng in located]
+    matrix = route_optimizer.distance_matrix_km([start or (0.0, 0.0), *points])
+    if start is None:
+        # A free start is a virtual node at zero distance from every job.
+        for i in range(len(matrix)):
+            matrix[0][i] = matrix[i][0] = 0.0
+    order = route_optimizer.optimize_route(matrix, time_budget_seconds=time_budget_seconds)
+
     route: list[dict] = []
-    cur_lat, cur_lng = float(start_latitude), float(start_longitude)
     total_km = 0.0
-    seq = 0
-    remaining = located[:]
-    while remaining:
-        best_i = min(
-            range(len(remaining)),
-            key=lambda i: haversine_m(cur_lat, cur_lng, remaining[i][1], remaining[i][2]),
-        )
-        job, jlat, jlng = remaining.pop(best_i)
-        leg_km = haversine_m(cur_lat, cur_lng, jlat, jlng) / 1000.0
+    previous = 0
+    for seq, node in enumerate(order, start=1):
+        leg_km = matrix[previous][node]
         total_km += leg_km
-        seq += 1
         route.append(
             {
                 "sequence": seq,
-                "work_order_id": str(job.id),
+                "work_order_id": str(located[node - 1][0].id),
                 "distance_km": round(total_km, 3),
                 "leg_km": round(leg_km, 3),
             }
         )
-        cur_lat, cur_lng = jlat, jlng
+        previous = node
 
     for job in unlocated:
-        seq += 1
         route.append(
             {
-                "sequence": seq,
+                "sequence": len(route) + 1,
                 "work_order_id": str(job.id),
                 "distance_km": None,
                 "leg_km": None,
             }
         )
     return route
+
+
+def order_day_route(
+    db: Session,
+    person_id: str,
+    *,
+    start_latitude: float,
+    start_longitude: float,
+    time_budget_seconds: float = route_optimizer.DEFAULT_TIME_BUDGET_SECONDS,
+) -> list[dict]:
+    """Shortest-drive ordering of a tech's open jobs from a start point.
+
+    A nearest-neighbour route improved with 2-opt / Or-opt within
+    ``time_budget_seconds``. Jobs without a resolvable location sort last (in
+    their original order) so the route never silently drops work. Returns
+    ``[{sequence, work_order_id, distance_km, leg_km}]``.
+    """
+    person_uuid = coerce_uuid(person_id)
+    jobs = (
+        db.query(WorkOrder)
+        .filter(WorkOrder.assigned_to_person_id == person_uuid)
+        .filter(WorkOrder.status.in_(_ROUTABLE_STATUSES))
+        .all()
+    )
+    return _route_jobs(
+        db,
+        jobs,
+        (float(start_latitude), float(start_longitude)),
+        time_budget_seconds=time_budget_seconds,
+    )
+
+
+def plan_day_routes(
+    db: Session,
+    person_ids: list[str],
+    *,
+    starts: dict[str, tuple[float, float]] | None = None,
+    stale_after_seconds: int = DEFAULT_ASSIGN_STALE_SECONDS,
+    time_budget_seconds: float = route_optimizer.DEFAULT_TIME_BUDGET_SECONDS,
+) -> dict[str, list[dict]]:
+    """Optimised day routes for several techs at once, keyed by person id.
+
+    Each tech starts from ``starts[person_id]`` when given, else from their live
+    presence fix (sharing enabled and fresher than ``stale_after_seconds``, as
+    for ``nearest_techs_for_job``), else from the base location on their
+    technician profile, else from whichever job makes the route shortest. Jobs
+    for the whole team are loaded in one query and the time budget is shared.
+    """
+    person_uuids = {str(coerce_uuid(pid)): coerce_uuid(pid) for pid in person_ids}
+    if not person_uuids:
+        return {}
+    jobs_by_person: dict[str, list[WorkOrder]] = {pid: [] for pid in person_uuids}
+    for job in (
+        db.query(WorkOrder)
+        .filter(WorkOrder.assigned_to_person_id.in_(list(person_uuids.values())))
+        .filter(WorkOrder.status.in_(_ROUTABLE_STATUSES))
+        .all()
+    ):
+        jobs_by_person[str(job.assigned_to_person_id)].append(job)
+
+    resolved_starts = {str(coerce_uuid(pid)): coords for pid, coords in (starts or {}).items()}
+    missing = [uuid_ for pid, uuid_ in person_uuids.items() if pid not in resolved_starts]
+    if missing:
+        cutoff = _now() - timedelta(seconds=max(int(stale_after_seconds or DEFAULT_ASSIGN_STALE_SECONDS), 30))
+        for presence in (
+            db.query(FieldTechPresence)
+            .filter(FieldTechPresence.person_id.in_(missing))
+            .filter(FieldTechPresence.location_sharing_enabled.is_(True))
+            .filter(FieldTechPresence.last_latitude.isnot(None))
+            .filter(FieldTechPresence.last_longitude.isnot(None))
+            .filter(FieldTechPresence.last_location_at >= cutoff)
+            .all()
+        ):
+            resolved_starts[str(presence.person_id)] = (
+                float(presence.last_latitude),
+                float(presence.last_longitude),
+            )
+        missing = [uuid_ for pid, uuid_ in person_uuids.items() if pid not in resolved_starts]
+    if missing:
+        resolved_starts.update(_base_locations(db, missing))
+
+    budget = time_budget_seconds / len(person_uuids)
+    return {
+        pid: _route_jobs(db, jobs_by_person[pid], resolved_starts.get(pid), time_budget_seconds=budget)
+        for pid in person_uuids
+    }
+
+
+def _base_locations(db: Session, person_ids: list[uuid.UUID]) -> dict[str, tuple[float, float]]:
+    """Home/base coordinates from active technician profiles (``base_latitude``/``base_longitude`` metadata)."""
+    bases: dict[str, tuple[float, float]] = {}
+    for profile in (
+        db.query(TechnicianProfile)
+        .filter(TechnicianProfile.person_id.in_(person_ids))
+        .filter(TechnicianProfile.is_active.is_(True))
+        .all()
+    ):
+        meta = profile.metadata_ or {}
+        try:
+            bases[str(profile.person_id)] = (float(meta["base_latitude"]), float(meta["base_longitude"]))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return bases
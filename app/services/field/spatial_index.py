@@ -0,0 +1,372 @@
+"""Live spatial index over field-tech presence for proximity dispatch.
+
+Ranking techs by distance used to load every on-shift presence row and compute
+haversine for each one. This index prunes that to the few techs near a point:
+
+- An in-process uniform grid (``PresenceGrid``) answers bounding-box and
+  k-nearest queries by expanding rings of cells outward from the query point and
+  stopping once no unvisited cell can hold anything closer.
+- A Redis GEO set mirrors it so every API/worker process sees pings ingested
+  elsewhere; when Redis is reachable, nearest queries use ``GEOSEARCH`` (a
+  geohash radius search) instead of the local grid.
+
+Both are fed from location ingest (``observe``) and rebuilt from the presence
+table every ``FIELD_PRESENCE_INDEX_REFRESH_SECONDS`` so they never drift far
+from the database. The index only proposes candidates: callers re-check
+eligibility (sharing, on-shift, freshness) against the database for those few
+rows, so a stale entry can cost a wasted lookup but never a wrong dispatch.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+import redis
+from sqlalchemy.orm import Session
+
+from app.models.field_location import FieldPresenceStatus, FieldTechPresence
+from app.services.field.geofence import METRES_PER_DEGREE, haversine_m
+
+logger = logging.getLogger(__name__)
+
+# ~5.5 km cells: a metro area spans a few dozen, and a typical nearest query
+# touches one ring of neighbours.
+DEFAULT_CELL_DEGREES = 0.05
+DEFAULT_REFRESH_SECONDS = 30
+_REDIS_KEY = "field:presence:geo"
+# Filtered nearest queries fetch this many candidates per wanted result.
+CANDIDATE_OVERSAMPLE = 4
+_REDIS_TIMEOUT_SECONDS = 0.25
+_REDIS_RETRY_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class _Entry:
+    latitude: float
+    longitude: float
+    cell: tuple[int, int]
+
+
+class PresenceGrid:
+    """Thread-safe uniform lat/lng grid of live tech positions keyed by person id."""
+
+    def __init__(self, cell_degrees: float = DEFAULT_CELL_DEGREES) -> None:
+        self.cell_degrees = cell_degrees
+        self._lock = threading.RLock()
+        self._entries: dict[str, _Entry] = {}
+        self._cells: dict[tuple[int, int], set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        return (math.floor(latitude / self.cell_degrees), math.floor(longitude / self.cell_degrees))
+
+    def upsert(self, person_id: str, latitude: float, longitude: float) -> None:
+        cell = self._cell(latitude, longitude)
+        with self._lock:
+            self._discard_locked(person_id)
+            self._entries[person_id] = _Entry(float(latitude), float(longitude), cell)
+            self._cells.setdefault(cell, set()).add(person_id)
+
+    def discard(self, person_id: str) -> None:
+        with self._lock:
+            self._discard_locked(person_id)
+
+    def _discard_locked(self, person_id: str) -> None:
+        entry = self._entries.pop(person_id, None)
+        if entry is None:
+            return
+        members = self._cells.get(entry.cell)
+        if members is not None:
+            members.discard(person_id)
+            if not members:
+                del self._cells[entry.cell]
+
+    def replace(self, rows: Iterable[tuple[str, float, float]]) -> None:
+        """Swap the whole grid for ``(person_id, latitude, longitude)`` rows."""
+        fresh = PresenceGrid(self.cell_degrees)
+        for person_id, latitude, longitude in rows:
+            fresh.upsert(person_id, latitude, longitude)
+        with self._lock:
+            self._entries = fresh._entries
+            self._cells = fresh._cells
+
+    def within_bbox(self, south: float, west: float, north: float, east: float) -> list[str]:
+        """Person ids whose position lies inside the box (no antimeridian wrap)."""
+        lo_row, lo_col = self._cell(south, west)
+        hi_row, hi_col = self._cell(north, east)
+        found: list[str] = []
+        with self._lock:
+            if (hi_row - lo_row + 1) * (hi_col - lo_col + 1) > len(self._cells):
+                cells = [cell for cell in self._cells if lo_row <= cell[0] <= hi_row and lo_col <= cell[1] <= hi_col]
+            else:
+                cells = [(row, col) for row in range(lo_row, hi_row + 1) for col in range(lo_col, hi_col + 1)]
+            for cell in cells:
+                for person_id in self._cells.get(cell, ()):
+                    entry = self._entries[person_id]
+                    if south <= entry.latitude <= north and west <= entry.longitude <= east:
+                        found.append(person_id)
+        return found
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        *,
+        k: int,
+        max_m: float | None = None,
+        accept: Callable[[str], bool] | None = None,
+    ) -> list[tuple[str, float]]:
+        """Up to ``k`` ``(person_id, distance_m)`` pairs nearest the point, closest first."""
+        k = max(int(k), 1)
+        center_row, center_col = self._cell(latitude, longitude)
+        # Anything in ring r is at least (r - 1) whole cells away along one axis;
+        # use the narrower (longitude) cell side so the bound never overshoots.
+        cos_lat = max(math.cos(math.radians(min(abs(latitude) + self.cell_degrees, 89.9))), 1e-6)
+        ring_step_m = self.cell_degrees * METRES_PER_DEGREE * cos_lat
+        best: list[tuple[float, str]] = []
+        with self._lock:
+            if not self._cells:
+                return []
+            rows = [cell[0] for cell in self._cells]
+            cols = [cell[1] for cell in self._cells]
+            max_ring = max(
+                abs(center_row - min(rows)),
+                abs(center_row - max(rows)),
+                abs(center_col - min(cols)),
+                abs(center_col - max(cols)),
+            )
+            for ring in range(max_ring + 1):
+                floor_m = max(ring - 1, 0) * ring_step_m
+                if max_m is not None and floor_m > max_m:
+                    break
+                if len(best) >= k and floor_m > best[k - 1][0]:
+                    break
+                if 8 * ring > len(self._cells):
+                    # Sparse grid: sweeping occupied cells beats walking empty rings.
+                    cells: Iterable[tuple[int, int]] = [
+                        cell
+                        for cell in self._cells
+                        if max(abs(cell[0] - center_row), abs(cell[1] - center_col)) >= ring
+                    ]
+                else:
+                    cells = _ring_cells(center_row, center_col, ring)
+                for cell in cells:
+                    for person_id in self._cells.get(cell, ()):
+                        if accept is not None and not accept(person_id):
+                            continue
+                        entry = self._entries[person_id]
+                        distance = haversine_m(latitude, longitude, entry.latitude, entry.longitude)
+                        if max_m is not None and distance > max_m:
+                            continue
+                        best.append((distance, person_id))
+                best.sort()
+                del best[k:]
+                if 8 * ring > len(self._cells):
+                    break
+        return [(person_id, distance) for distance, person_id in best]
+
+
+def _ring_cells(row: int, col: int, ring: int) -> Iterable[tuple[int, int]]:
+    if ring == 0:
+        yield (row, col)
+        return
+    for dc in range(-ring, ring + 1):
+        yield (row - ring, col + dc)
+        yield (row + ring, col + dc)
+    for dr in range(-ring + 1, ring):
+        yield (row + dr, col - ring)
+        yield (row + dr, col + ring)
+
+
+def _refresh_seconds() -> float:
+    try:
+        return max(float(os.getenv("FIELD_PRESENCE_INDEX_REFRESH_SECONDS", str(DEFAULT_REFRESH_SECONDS))), 1.0)
+    except (TypeError, ValueError):
+        return float(DEFAULT_REFRESH_SECONDS)
+
+
+_grid = PresenceGrid()
+_loaded_at = 0.0
+_load_lock = threading.Lock()
+_redis_client: redis.Redis | None = None
+_redis_retry_at = 0.0
+_redis_guard = threading.Lock()
+
+
+def _get_redis() -> redis.Redis | None:
+    """Return the shared index client, or None while Redis is unreachable."""
+    global _redis_client, _redis_retry_at
+    if _redis_client is not None:
+        return _redis_client
+    if time.monotonic() < _redis_retry_at:
+        return None
+    with _redis_guard:
+        if _redis_client is not None:
+            return _redis_client
+        try:
+            client = redis.Redis.from_url(
+                os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+                decode_responses=True,
+                socket_connect_timeout=_REDIS_TIMEOUT_SECONDS,
+                socket_timeout=_REDIS_TIMEOUT_SECONDS,
+            )
+            client.ping()
+        except redis.RedisError as exc:
+            _redis_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+            logger.debug("presence_index_redis_unavailable error=%s", exc)
+            return None
+        _redis_client = client
+        return client
+
+
+def _redis_failed(exc: Exception) -> None:
+    global _redis_client, _redis_retry_at
+    _redis_client = None
+    _redis_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+    logger.warning("presence_index_redis_failed error=%s", exc)
+
+
+def _is_live(presence: FieldTechPresence) -> bool:
+    return bool(
+        presence.location_sharing_enabled
+        and presence.status == FieldPresenceStatus.on_shift
+        and presence.last_latitude is not None
+        and presence.last_longitude is not None
+    )
+
+
+def observe(presence: FieldTechPresence) -> None:
+    """Apply one tech's committed presence snapshot to the index (ingest hook)."""
+    person_id = str(presence.person_id)
+    live = _is_live(presence)
+    if live:
+        _grid.upsert(person_id, float(presence.last_latitude), float(presence.last_longitude))
+    else:
+        _grid.discard(person_id)
+    client = _get_redis()
+    if client is None:
+        return
+    try:
+        if live:
+            client.geoadd(_REDIS_KEY, (float(presence.last_longitude), float(presence.last_latitude), person_id))
+        else:
+            client.zrem(_REDIS_KEY, person_id)
+    except redis.RedisError as exc:
+        _redis_failed(exc)
+
+
+def rebuild(db: Session) -> int:
+    """Reload the index from the presence table; returns the live tech count."""
+    global _loaded_at
+    rows = [
+        (str(person_id), float(latitude), float(longitude))
+        for person_id, latitude, longitude in db.query(
+            FieldTechPresence.person_id,
+            FieldTechPresence.last_latitude,
+            FieldTechPresence.last_longitude,
+        )
+        .filter(FieldTechPresence.location_sharing_enabled.is_(True))
+        .filter(FieldTechPresence.status == FieldPresenceStatus.on_shift)
+        .filter(FieldTechPresence.last_latitude.isnot(None))
+        .filter(FieldTechPresence.last_longitude.isnot(None))
+        .all()
+    ]
+    _grid.replace(rows)
+    _loaded_at = time.monotonic()
+    client = _get_redis()
+    if client is not None:
+        staging = f"{_REDIS_KEY}:rebuild"
+        try:
+            pipe = client.pipeline(transaction=True)
+            pipe.delete(staging)
+            if rows:
+                values: list[float | str] = []
+                for person_id, latitude, longitude in rows:
+                    values.extend((longitude, latitude, person_id))
+                pipe.geoadd(staging, values)
+                pipe.rename(staging, _REDIS_KEY)
+            else:
+                pipe.delete(_REDIS_KEY)
+            pipe.execute()
+        except redis.RedisError as exc:
+            _redis_failed(exc)
+    return len(rows)
+
+
+def ensure_fresh(db: Session) -> None:
+    """Rebuild the index if it has not been loaded within the refresh interval."""
+    if time.monotonic() - _loaded_at < _refresh_seconds():
+        return
+    with _load_lock:
+        if time.monotonic() - _loaded_at < _refresh_seconds():
+            return
+        rebuild(db)
+
+
+def _redis_nearest(
+    client: redis.Redis,
+    latitude: float,
+    longitude: float,
+    *,
+    k: int,
+    max_m: float | None,
+    accept: Callable[[str], bool] | None,
+) -> list[tuple[str, float]]:
+    k = max(int(k), 1)
+    # With a filter, fetch a bounded oversample and widen only when too few
+    # candidates survive it, rather than pulling every member in range.
+    count = k if accept is None else k * CANDIDATE_OVERSAMPLE
+    while True:
+        # Radius searches need a bound; 20,040 km (half the equator) covers the globe.
+        hits = client.geosearch(
+            _REDIS_KEY,
+            longitude=longitude,
+            latitude=latitude,
+            radius=max_m if max_m is not None else 20_040_000,
+            unit="m",
+            sort="ASC",
+            count=count,
+            withdist=True,
+        )
+        pairs = [(str(member), float(distance)) for member, distance in hits]
+        if accept is not None:
+            pairs = [pair for pair in pairs if accept(pair[0])]
+        if len(pairs) >= k or len(hits) < count:
+            return pairs[:k]
+        count *= CANDIDATE_OVERSAMPLE
+
+
+def nearest(
+    latitude: float,
+    longitude: float,
+    *,
+    k: int,
+    max_m: float | None = None,
+    accept: Callable[[str], bool] | None = None,
+) -> list[tuple[str, float]]:
+    """Up to ``k`` candidate ``(person_id, distance_m)`` pairs nearest a point.
+
+    Uses the shared Redis GEO set when reachable and the local grid otherwise.
+    """
+    client = _get_redis()
+    if client is not None:
+        try:
+            return _redis_nearest(client, latitude, longitude, k=k, max_m=max_m, accept=accept)
+        except redis.RedisError as exc:
+            _redis_failed(exc)
+    return _grid.nearest(latitude, longitude, k=k, max_m=max_m, accept=accept)
+
+
+def reset() -> None:
+    """Forget the local index (tests, or after bulk presence changes)."""
+    global _loaded_at
+    _grid.replace(())
+    _loaded_at = 0.0
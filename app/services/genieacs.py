@@ -2,10 +2,21 @@
 
 This module provides a client for interacting with the GenieACS NBI
 (Northbound Interface) to manage TR-069/CWMP devices.
+
+Both clients keep one pooled HTTP connection set for their lifetime, so
+fleet-wide jobs reuse keep-alive connections instead of paying a TCP/TLS
+handshake per device. ``iter_devices`` pages through large device sets by
+``_id`` and the ``bulk_*`` helpers fan tasks out over many devices with
+bounded concurrency, collecting per-device failures instead of aborting.
 """
 
+import asyncio
 import json
 import logging
+import threading
+from collections.abc import AsyncIterator, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Any
 from urllib.parse import quote
 
@@ -13,6 +24,10 @@ import httpx
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_BULK_CONCURRENCY = 16
+
 
 class GenieACSError(Exception):
     """Base exception for GenieACS client errors."""
@@ -20,6 +35,69 @@ class GenieACSError(Exception):
     pass
 
 
+@dataclass
+class GenieACSBulkResult:
+    """Outcome of a bulk operation, keyed by device ID."""
+
+    succeeded: dict[str, Any] = field(default_factory=dict)
+    failed: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return len(self.succeeded) + len(self.failed)
+
+
+def _device_path(device_id: str, suffix: str = "") -> str:
+    return f"/devices/{quote(device_id, safe='')}{suffix}"
+
+
+def _device_query_params(
+    query: dict | None,
+    projection: dict | None,
+    limit: int | None = None,
+    skip: int | None = None,
+    sort: dict | None = None,
+) -> dict:
+    params: dict[str, Any] = {}
+    if query:
+        params["query"] = json.dumps(query)
+    if projection:
+        params["projection"] = json.dumps(projection)
+    if sort:
+        params["sort"] = json.dumps(sort)
+    if limit is not None:
+        params["limit"] = limit
+    if skip:
+        params["skip"] = skip
+    return params
+
+
+def _page_query(query: dict | None, after_id: str | None) -> dict | None:
+    if after_id is None:
+        return query
+    cursor = {"_id": {"$gt": after_id}}
+    return {"$and": [query, cursor]} if query else cursor
+
+
+def _page_projection(projection: dict | None) -> dict | None:
+    # Inclusion projections must keep _id, which the next page's cursor needs.
+    if projection and any(value for key, value in projection.items() if key != "_id"):
+        return {**projection, "_id": 1}
+    return projection
+
+
+def _task_params(connection_request: bool) -> dict:
+    return {"connection_request": str(connection_request).lower()}
+
+
+def _parameter_values_task(parameters: list[str]) -> dict:
+    return {"name": "getParameterValues", "parameterNames": parameters}
+
+
+def _limits(max_connections: int) -> httpx.Limits:
+    return httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+
+
 class GenieACSClient:
     """HTTP client for GenieACS NBI (Northbound Interface).
 
@@ -32,16 +110,46 @@ class GenieACSClient:
         base_url: str,
         timeout: float = 30.0,
         headers: dict | None = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
     ):
         """Initialize GenieACS client.
 
         Args:
             base_url: GenieACS NBI base URL (e.g., http://genieacs:7557)
             timeout: Request timeout in seconds
+            max_connections: Size of the pooled connection set
         """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.headers = headers or {}
+        self.max_connections = max_connections
+        self._http: httpx.Client | None = None
+        self._http_lock = threading.Lock()
+
+    def _get_http(self) -> httpx.Client:
+        """Return the pooled HTTP client, creating it on first use."""
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    self._http = httpx.Client(
+                        timeout=self.timeout,
+                        headers=self.headers,
+                        limits=_limits(self.max_connections),
+                    )
+        return self._http
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+
+    def __enter__(self) -> "GenieACSClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def _request(
         self,
@@ -68,10 +176,9 @@ class GenieACSClient:
         """
         url = f"{self.base_url}{path}"
         try:
-            with httpx.Client(timeout=self.timeout, headers=self.headers) as client:
-                response = client.request(method, url, params=params, json=json_data, **kwargs)
-                response.raise_for_status()
-                return response
+            response = self._get_http().request(method, url, params=params, json=json_data, **kwargs)
+            response.raise_for_status()
+            return response
         except httpx.HTTPStatusError as e:
             logger.error(f"GenieACS API error: {e.response.status_code} - {e.response.text}")
             raise GenieACSError(f"API error: {e.response.status_code}") from e
@@ -83,25 +190,57 @@ class GenieACSClient:
     # Device Operations
     # -------------------------------------------------------------------------
 
-    def list_devices(self, query: dict | None = None, projection: dict | None = None) -> list[dict]:
+    def list_devices(
+        self,
+        query: dict | None = None,
+        projection: dict | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+    ) -> list[dict]:
         """List devices with optional filtering.
 
         Args:
             query: MongoDB-style query filter
             projection: Fields to include/exclude
+            limit: Maximum number of devices to return
+            skip: Number of matching devices to skip
 
         Returns:
             List of device documents
         """
-        params = {}
-        if query:
-            params["query"] = json.dumps(query)
-        if projection:
-            params["projection"] = json.dumps(projection)
-
+        params = _device_query_params(query, projection, limit=limit, skip=skip)
         response = self._request("GET", "/devices", params=params)
         return response.json()
 
+    def iter_devices(
+        self,
+        query: dict | None = None,
+        projection: dict | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[dict]:
+        """Stream devices page by page instead of in one response.
+
+        Pages are keyed on ``_id`` (sorted ascending) rather than ``skip``,
+        so deep pages cost the same as the first one.
+
+        Args:
+            query: MongoDB-style query filter
+            projection: Fields to include (``_id`` is always kept)
+            page_size: Devices per request
+
+        Yields:
+            Device documents
+        """
+        after_id: str | None = None
+        projection = _page_projection(projection)
+        while True:
+            params = _device_query_params(_page_query(query, after_id), projection, limit=page_size, sort={"_id": 1})
+            page = self._request("GET", "/devices", params=params).json()
+            yield from page
+            if len(page) < page_size:
+                return
+            after_id = page[-1]["_id"]
+
     def get_device(self, device_id: str) -> dict:
         """Get device by ID.
 
@@ -160,13 +299,10 @@ class GenieACSClient:
         Returns:
             Task result
         """
-        encoded_id = quote(device_id, safe="")
-        params = {"connection_request": str(connection_request).lower()}
-
         response = self._request(
             "POST",
-            f"/devices/{encoded_id}/tasks",
-            params=params,
+            _device_path(device_id, "/tasks"),
+            params=_task_params(connection_request),
             json_data=task,
         )
         return response.json() if response.text else {}
@@ -187,8 +323,68 @@ class GenieACSClient:
         Returns:
             Task result
         """
-        task = {"name": "getParameterValues", "parameterNames": parameters}
-        return self.create_task(device_id, task, connection_request)
+        return self.create_task(device_id, _parameter_values_task(parameters), connection_request)
+
+    def _fan_out(self, device_ids: Iterable[str], call, concurrency: int) -> GenieACSBulkResult:
+        result = GenieACSBulkResult()
+
+        def _one(device_id: str) -> None:
+            try:
+                result.succeeded[device_id] = call(device_id)
+            except GenieACSError as e:
+                result.failed[device_id] = str(e)
+
+        workers = max(1, min(concurrency, self.max_connections))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="genieacs-bulk") as executor:
+            list(executor.map(_one, dict.fromkeys(device_ids)))
+        return result
+
+    def bulk_create_task(
+        self,
+        device_ids: Iterable[str],
+        task: dict,
+        connection_request: bool = True,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    ) -> GenieACSBulkResult:
+        """Create the same task on many devices.
+
+        Requests share the pooled connections and run ``concurrency`` at a
+        time; a failing device is recorded in ``failed`` and the rest carry on.
+
+        Args:
+            device_ids: Device IDs
+            task: Task definition
+            connection_request: Whether to trigger connection requests
+            concurrency: Maximum requests in flight
+
+        Returns:
+            Per-device results and errors
+        """
+        return self._fan_out(
+            device_ids,
+            lambda device_id: self.create_task(device_id, task, connection_request),
+            concurrency,
+        )
+
+    def bulk_get_parameter_values(
+        self,
+        device_ids: Iterable[str],
+        parameters: list[str],
+        connection_request: bool = True,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    ) -> GenieACSBulkResult:
+        """Queue a getParameterValues task on many devices.
+
+        Args:
+            device_ids: Device IDs
+            parameters: List of parameter paths
+            connection_request: Whether to trigger connection requests
+            concurrency: Maximum requests in flight
+
+        Returns:
+            Per-device results and errors
+        """
+        return self.bulk_create_task(device_ids, _parameter_values_task(parameters), connection_request, concurrency)
 
     def set_parameter_values(
         self,
@@ -484,6 +680,24 @@ class GenieACSClient:
         encoded_id = quote(device_id, safe="")
         self._request("POST", f"/devices/{encoded_id}/tags/{tag}")
 
+    def bulk_add_tag(
+        self,
+        device_ids: Iterable[str],
+        tag: str,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    ) -> GenieACSBulkResult:
+        """Add a tag to many devices.
+
+        Args:
+            device_ids: Device IDs
+            tag: Tag name
+            concurrency: Maximum requests in flight
+
+        Returns:
+            Per-device results and errors
+        """
+        return self._fan_out(device_ids, lambda device_id: self.add_tag(device_id, tag), concurrency)
+
     def remove_tag(self, device_id: str, tag: str) -> None:
         """Remove tag from device.
 
@@ -556,3 +770,158 @@ class GenieACSClient:
             return current["_value"]
 
         return current
+
+
+class AsyncGenieACSClient:
+    """Asyncio variant of ``GenieACSClient`` for fleet-wide operations.
+
+    Covers device listing and task creation; use ``GenieACSClient`` for
+    presets, provisions and faults.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 30.0,
+        headers: dict | None = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    ):
+        """Initialize async GenieACS client.
+
+        Args:
+            base_url: GenieACS NBI base URL (e.g., http://genieacs:7557)
+            timeout: Request timeout in seconds
+            max_connections: Size of the pooled connection set
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.max_connections = max_connections
+        self._http: httpx.AsyncClient | None = None
+
+    def _get_http(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers=self.headers,
+                limits=_limits(self.max_connections),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def __aenter__(self) -> "AsyncGenieACSClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: dict | None = None,
+        json_data: dict | None = None,
+    ) -> httpx.Response:
+        """Make HTTP request to GenieACS NBI.
+
+        Raises:
+            GenieACSError: On request failure
+        """
+        url = f"{self.base_url}{path}"
+        try:
+            response = await self._get_http().request(method, url, params=params, json=json_data)
+            response.raise_for_status()
+            return response
+        except httpx.HTTPStatusError as e:
+            logger.error(f"GenieACS API error: {e.response.status_code} - {e.response.text}")
+            raise GenieACSError(f"API error: {e.response.status_code}") from e
+        except httpx.RequestError as e:
+            logger.error(f"GenieACS request error: {e}")
+            raise GenieACSError(f"Request error: {e}") from e
+
+    async def list_devices(
+        self,
+        query: dict | None = None,
+        projection: dict | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+    ) -> list[dict]:
+        """List devices with optional filtering (see ``GenieACSClient.list_devices``)."""
+        params = _device_query_params(query, projection, limit=limit, skip=skip)
+        response = await self._request("GET", "/devices", params=params)
+        return response.json()
+
+    async def iter_devices(
+        self,
+        query: dict | None = None,
+        projection: dict | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncIterator[dict]:
+        """Stream devices page by page (see ``GenieACSClient.iter_devices``)."""
+        after_id: str | None = None
+        projection = _page_projection(projection)
+        while True:
+            params = _device_query_params(_page_query(query, after_id), projection, limit=page_size, sort={"_id": 1})
+            page = (await self._request("GET", "/devices", params=params)).json()
+            for device in page:
+                yield device
+            if len(page) < page_size:
+                return
+            after_id = page[-1]["_id"]
+
+    async def create_task(self, device_id: str, task: dict, connection_request: bool = True) -> dict:
+        """Create a task for a device."""
+        response = await self._request(
+            "POST",
+            _device_path(device_id, "/tasks"),
+            params=_task_params(connection_request),
+            json_data=task,
+        )
+        return response.json() if response.text else {}
+
+    async def get_parameter_values(
+        self,
+        device_id: str,
+        parameters: list[str],
+        connection_request: bool = True,
+    ) -> dict:
+        """Get parameter values from device."""
+        return await self.create_task(device_id, _parameter_values_task(parameters), connection_request)
+
+    async def bulk_create_task(
+        self,
+        device_ids: Iterable[str],
+        task: dict,
+        connection_request: bool = True,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    ) -> GenieACSBulkResult:
+        """Create the same task on many devices with at most ``concurrency`` in flight."""
+        result = GenieACSBulkResult()
+        semaphore = asyncio.Semaphore(max(1, min(concurrency, self.max_connections)))
+
+        async def _one(device_id: str) -> None:
+            async with semaphore:
+                try:
+                    result.succeeded[device_id] = await self.create_task(device_id, task, connection_request)
+                except GenieACSError as e:
+                    result.failed[device_id] = str(e)
+
+        await asyncio.gather(*(_one(device_id) for device_id in dict.fromkeys(device_ids)))
+        return result
+
+    async def bulk_get_parameter_values(
+        self,
+        device_ids: Iterable[str],
+        parameters: list[str],
+        connection_request: bool = True,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    ) -> GenieACSBulkResult:
+        """Queue a getParameterValues task on many devices."""
+        return await self.bulk_create_task(
+            device_ids, _parameter_values_task(parameters), connection_request, concurrency
+        )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import time
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Any, cast
@@ -380,9 +381,9 @@ def _external_integrations_check(db: Session) -> HealthCheckResult:
             target_url="/admin/integrations/connectors",
         )
     try:
-        from app.services import zabbix as zabbix_service
+        from app.services import zabbix_snapshot
 
-        rows = zabbix_service.fetch_monitoring_devices(db)
+        snapshot = zabbix_snapshot.get_monitoring_snapshot(db)
     except Exception as exc:
         return _result(
             category=InfrastructureAlertCategory.external_integrations,
@@ -395,16 +396,29 @@ def _external_integrations_check(db: Session) -> HealthCheckResult:
             source="zabbix",
             target_url="/admin/integrations/connectors",
         )
+    snapshot_age = max(int(time.time() - snapshot.refreshed_at), 0)
+    if snapshot_age >= zabbix_snapshot.STALE_AFTER_SECONDS:
+        return _result(
+            category=InfrastructureAlertCategory.external_integrations,
+            component="zabbix",
+            check_key="zabbix_connector",
+            status="degraded",
+            severity=InfrastructureAlertSeverity.warning,
+            summary=f"Zabbix monitoring snapshot has not refreshed for {snapshot_age // 60} minutes.",
+            source="zabbix",
+            target_url="/admin/integrations/connectors",
+            metadata={"host_count": len(snapshot.rows), "snapshot_age_seconds": snapshot_age},
+        )
     return _result(
         category=InfrastructureAlertCategory.external_integrations,
         component="zabbix",
         check_key="zabbix_connector",
         status="healthy",
         severity=InfrastructureAlertSeverity.info,
-        summary=f"Zabbix connector returned {len(rows)} monitored hosts.",
+        summary=f"Zabbix connector returned {len(snapshot.rows)} monitored hosts.",
         source="zabbix",
         target_url="/admin/integrations/connectors",
-        metadata={"host_count": len(rows)},
+        metadata={"host_count": len(snapshot.rows), "snapshot_age_seconds": snapshot_age},
     )
 
 
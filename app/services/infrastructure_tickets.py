@@ -2,9 +2,11 @@
 affects many customers.
 
 Resolves the affected customers from the sub app's Zabbix-linked topology (via
-``selfcare.fetch_affected_subscribers``) — with a manual-selection override and
-augmentation, because the topology impact is only complete where the e2e chain
-(subscriber → ONT → OLT → device-graph → core) is established. The parent
+``selfcare.fetch_affected_subscribers``) and/or, for a fiber plant asset (cut
+segment, closure, splitter, PON port), from the local fiber connectivity graph
+— with a manual-selection override and augmentation, because the topology
+impact is only complete where the e2e chain (subscriber → ONT → OLT →
+device-graph → core) is established. The parent
 ticket records the asset, the affected set, and the impact coverage; each
 affected customer is notified on open and again on resolve, deduped and logged
 via ``SubscriberNotificationLog``.
@@ -24,6 +26,7 @@ from app.models.tickets import TicketPriority, TicketStatus
 from app.schemas.tickets import TicketCreate, TicketUpdate
 from app.services import selfcare
 from app.services.common import coerce_uuid
+from app.services.fiber_graph import affected_by
 from app.services.subscriber_notifications import queue_bulk_subscriber_notifications
 from app.services.tickets import tickets as tickets_service
 
@@ -52,11 +55,15 @@ class InfrastructureTickets:
         basestation_id: str | None = None,
         olt_id: str | None = None,
         pon_port_id: str | None = None,
+        fiber_asset_type: str | None = None,
+        fiber_asset_id: str | None = None,
         manual_subscriber_ids: list[str | UUID] | None = None,
     ) -> dict[str, Any]:
         """Affected CRM subscriber ids = topology impact (mapped by subscriber
-        number) combined with manual selections. Never trusts topology blindly:
-        returns the coverage block and topology subscribers not matched in the CRM."""
+        number) plus the fiber graph impact of ``fiber_asset_type``/``fiber_asset_id``
+        (already CRM subscriber ids, via ONT assignments), combined with manual
+        selections. Never trusts topology blindly: returns the coverage block
+        and topology subscribers not matched in the CRM."""
         crm_ids: list[UUID] = []
         coverage: dict[str, Any] = {}
         unmatched: list[str] = []
@@ -82,6 +89,22 @@ class InfrastructureTickets:
                 else:
                     unmatched.append(number or row.get("id"))
 
+        if fiber_asset_type and fiber_asset_id:
+            try:
+                fiber_impact = affected_by(db, fiber_asset_type, coerce_uuid(fiber_asset_id))
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=str(exc)) from exc
+            crm_ids.extend(fiber_impact.subscriber_ids)
+            topology_count += len(fiber_impact.ont_unit_ids)
+            coverage = {
+                **coverage,
+                "fiber_graph": {
+                    "ont_count": len(fiber_impact.ont_unit_ids),
+                    "pon_port_count": len(fiber_impact.pon_port_ids),
+                    "unassigned_ont_count": fiber_impact.unassigned_ont_count,
+                },
+            }
+
         for sid in manual_subscriber_ids or []:
             with_uuid = coerce_uuid(str(sid))
             if with_uuid is not None:
@@ -113,6 +136,8 @@ class InfrastructureTickets:
         basestation_id: str | None = None,
         olt_id: str | None = None,
         pon_port_id: str | None = None,
+        fiber_asset_type: str | None = None,
+        fiber_asset_id: str | None = None,
         manual_subscriber_ids: list[str | UUID] | None = None,
         asset_label: str | None = None,
         priority: TicketPriority = TicketPriority.high,
@@ -131,6 +156,8 @@ class InfrastructureTickets:
             basestation_id=basestation_id,
             olt_id=olt_id,
             pon_port_id=pon_port_id,
+            fiber_asset_type=fiber_asset_type,
+            fiber_asset_id=fiber_asset_id,
             manual_subscriber_ids=manual_subscriber_ids,
         )
         ids = affected["crm_subscriber_ids"]
@@ -162,6 +189,8 @@ class InfrastructureTickets:
                         "basestation_id": basestation_id,
                         "olt_id": olt_id,
                         "pon_port_id": pon_port_id,
+                        "fiber_asset_type": fiber_asset_type,
+                        "fiber_asset_id": fiber_asset_id,
                         "label": asset_label,
                     },
                     "affected_subscriber_ids": [str(i) for i in ids],
@@ -363,7 +363,7 @@ def run_scheduled_ncc_report_email(db: Session, *, now_utc: datetime | None = No
     start_dt = end_dt - timedelta(days=config.lookback_days)
     from app.web.admin import reports as ncc_reports
 
-    records = ncc_reports._ncc_export_rows(ncc_reports._build_ncc_records(db, start_dt, end_dt))
+    records = list(ncc_reports._ncc_export_rows(ncc_reports._build_ncc_records(db, start_dt, end_dt)))
     workbook = ncc_reports._build_ncc_workbook(records, ncc_reports._NCC_COLUMNS)
     attachment = {
         "file_name": ncc_reports._ncc_export_filename(local_now),
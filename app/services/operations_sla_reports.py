@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from datetime import UTC, datetime
 from typing import Literal
 
@@ -10,6 +11,7 @@ from app.models.projects import Project, ProjectTask
 from app.models.tickets import Ticket, TicketStatus
 from app.models.workflow import SlaBreach, SlaBreachStatus, SlaClock, WorkflowEntityType
 from app.services.regions import REGION_OPTIONS
+from app.services.report_export import DEFAULT_YIELD_PER
 from app.services.sla_assignment import smart_duration_label
 
 SlaReportType = Literal["ticket", "project", "project_task"]
@@ -35,6 +37,76 @@ def _duration_minutes(started_at: datetime | None, ended_at: datetime | None = N
     return max(int((end_value - started_at).total_seconds() // 60), 0)
 
 
+def _ticket_record(breach: SlaBreach, clock: SlaClock, ticket: Ticket) -> dict:
+    ended_at = clock.completed_at if breach.status == SlaBreachStatus.resolved else None
+    ref = ticket.number or str(ticket.id)
+    return {
+        "id": ref,
+        "reference": ref,
+        "title": ticket.title,
+        "project": "",
+        "region": ticket.region or "Unassigned",
+        "sla_type": "Ticket",
+        "entity_type": "ticket",
+        "status": breach.status.value,
+        "sla_status": breach.status.value,
+        "ticket_status": ticket.status.value if ticket.status else "",
+        "ticket_id": str(ticket.id),
+        "ticket_reference": ref,
+        "ticket_url": f"/admin/support/tickets/{ref}",
+        "created_at": ticket.created_at,
+        "sla_deadline": clock.due_at,
+        "breached_at": breach.breached_at,
+        "breach_minutes": _duration_minutes(breach.breached_at, ended_at),
+        "breach_duration": _duration_label(breach.breached_at, ended_at),
+        "time_over_target": _duration_label(breach.breached_at, ended_at),
+        "time_remaining": None,
+        "detail_url": f"/admin/support/tickets/{ref}",
+    }
+
+
+def _project_record(breach: SlaBreach, clock: SlaClock, project: Project) -> dict:
+    ended_at = clock.completed_at if breach.status == SlaBreachStatus.resolved else None
+    ref = project.number or str(project.id)
+    return {
+        "id": ref,
+        "reference": ref,
+        "title": project.name,
+        "project": "",
+        "region": project.region or "Unassigned",
+        "sla_type": "Project",
+        "entity_type": "project",
+        "status": breach.status.value,
+        "sla_status": breach.status.value,
+        "breached_at": breach.breached_at,
+        "breach_minutes": _duration_minutes(breach.breached_at, ended_at),
+        "breach_duration": _duration_label(breach.breached_at, ended_at),
+        "time_over_target": _duration_label(breach.breached_at, ended_at),
+        "detail_url": f"/admin/projects/{ref}",
+    }
+
+
+def _project_task_record(breach: SlaBreach, clock: SlaClock, task: ProjectTask, project: Project) -> dict:
+    ended_at = clock.completed_at if breach.status == SlaBreachStatus.resolved else None
+    ref = task.number or str(task.id)
+    return {
+        "id": ref,
+        "reference": ref,
+        "title": task.title,
+        "project": project.name,
+        "region": project.region or "Unassigned",
+        "sla_type": "Project Task",
+        "entity_type": "project_task",
+        "status": breach.status.value,
+        "sla_status": breach.status.value,
+        "breached_at": breach.breached_at,
+        "breach_minutes": _duration_minutes(breach.breached_at, ended_at),
+        "breach_duration": _duration_label(breach.breached_at, ended_at),
+        "time_over_target": _duration_label(breach.breached_at, ended_at),
+        "detail_url": f"/admin/projects/tasks/{ref}",
+    }
+
+
 class OperationsSlaViolationsReport:
     def region_options(self, db: Session, entity_type: SlaReportType) -> list[str]:
         configured_regions = {region.strip() for region in REGION_OPTIONS if region and region.strip()}
@@ -66,6 +138,33 @@ class OperationsSlaViolationsReport:
         limit: int = 200,
         open_only: bool = False,
     ) -> list[dict]:
+        return list(
+            self.iter_records(
+                db,
+                entity_type=entity_type,
+                region=region,
+                start_at=start_at,
+                end_at=end_at,
+                ticket_status=ticket_status,
+                limit=limit,
+                open_only=open_only,
+            )
+        )
+
+    def iter_records(
+        self,
+        db: Session,
+        *,
+        entity_type: SlaReportType,
+        region: str | None,
+        start_at: datetime | None,
+        end_at: datetime | None,
+        ticket_status: TicketStatus | None = None,
+        limit: int | None = None,
+        open_only: bool = False,
+        batch_size: int = DEFAULT_YIELD_PER,
+    ) -> Iterator[dict]:
+        """Yield violation records newest first, reading rows in ``batch_size`` chunks."""
         query = _base_query(db, entity_type)
         if start_at:
             query = query.filter(SlaBreach.breached_at >= start_at)
@@ -74,7 +173,6 @@ class OperationsSlaViolationsReport:
         if open_only:
             query = query.filter(SlaBreach.status != SlaBreachStatus.resolved)
 
-        records: list[dict] = []
         if entity_type == "ticket":
             rows = query.join(Ticket, Ticket.id == SlaClock.entity_id)
             if open_only:
@@ -87,38 +185,12 @@ class OperationsSlaViolationsReport:
                 rows.filter(Ticket.region == region if region else True)
                 .with_entities(SlaBreach, SlaClock, Ticket)
                 .order_by(SlaBreach.breached_at.desc())
-                .limit(limit)
-                .all()
             )
-            for breach, clock, ticket in rows:
-                ended_at = clock.completed_at if breach.status == SlaBreachStatus.resolved else None
-                ref = ticket.number or str(ticket.id)
-                records.append(
-                    {
-                        "id": ref,
-                        "reference": ref,
-                        "title": ticket.title,
-                        "project": "",
-                        "region": ticket.region or "Unassigned",
-                        "sla_type": "Ticket",
-                        "entity_type": "ticket",
-                        "status": breach.status.value,
-                        "sla_status": breach.status.value,
-                        "ticket_status": ticket.status.value if ticket.status else "",
-                        "ticket_id": str(ticket.id),
-                        "ticket_reference": ref,
-                        "ticket_url": f"/admin/support/tickets/{ref}",
-                        "created_at": ticket.created_at,
-                        "sla_deadline": clock.due_at,
-                        "breached_at": breach.breached_at,
-                        "breach_minutes": _duration_minutes(breach.breached_at, ended_at),
-                        "breach_duration": _duration_label(breach.breached_at, ended_at),
-                        "time_over_target": _duration_label(breach.breached_at, ended_at),
-                        "time_remaining": None,
-                        "detail_url": f"/admin/support/tickets/{ref}",
-                    }
-                )
-            return records
+            if limit is not None:
+                rows = rows.limit(limit)
+            for breach, clock, ticket in rows.yield_per(batch_size):
+                yield _ticket_record(breach, clock, ticket)
+            return
 
         if entity_type == "project":
             rows = (
@@ -126,31 +198,12 @@ class OperationsSlaViolationsReport:
                 .filter(Project.region == region if region else True)
                 .with_entities(SlaBreach, SlaClock, Project)
                 .order_by(SlaBreach.breached_at.desc())
-                .limit(limit)
-                .all()
             )
-            for breach, clock, project in rows:
-                ended_at = clock.completed_at if breach.status == SlaBreachStatus.resolved else None
-                ref = project.number or str(project.id)
-                records.append(
-                    {
-                        "id": ref,
-                        "reference": ref,
-                        "title": project.name,
-                        "project": "",
-                        "region": project.region or "Unassigned",
-                        "sla_type": "Project",
-                        "entity_type": "project",
-                        "status": breach.status.value,
-                        "sla_status": breach.status.value,
-                        "breached_at": breach.breached_at,
-                        "breach_minutes": _duration_minutes(breach.breached_at, ended_at),
-                        "breach_duration": _duration_label(breach.breached_at, ended_at),
-                        "time_over_target": _duration_label(breach.breached_at, ended_at),
-                        "detail_url": f"/admin/projects/{ref}",
-                    }
-                )
-            return records
+            if limit is not None:
+                rows = rows.limit(limit)
+            for breach, clock, project in rows.yield_per(batch_size):
+                yield _project_record(breach, clock, project)
+            return
 
         rows = (
             query.join(ProjectTask, ProjectTask.id == SlaClock.entity_id)
@@ -158,31 +211,11 @@ class OperationsSlaViolationsReport:
             .filter(Project.region == region if region else True)
             .with_entities(SlaBreach, SlaClock, ProjectTask, Project)
             .order_by(SlaBreach.breached_at.desc())
-            .limit(limit)
-            .all()
         )
-        for breach, clock, task, project in rows:
-            ended_at = clock.completed_at if breach.status == SlaBreachStatus.resolved else None
-            ref = task.number or str(task.id)
-            records.append(
-                {
-                    "id": ref,
-                    "reference": ref,
-                    "title": task.title,
-                    "project": project.name,
-                    "region": project.region or "Unassigned",
-                    "sla_type": "Project Task",
-                    "entity_type": "project_task",
-                    "status": breach.status.value,
-                    "sla_status": breach.status.value,
-                    "breached_at": breach.breached_at,
-                    "breach_minutes": _duration_minutes(breach.breached_at, ended_at),
-                    "breach_duration": _duration_label(breach.breached_at, ended_at),
-                    "time_over_target": _duration_label(breach.breached_at, ended_at),
-                    "detail_url": f"/admin/projects/tasks/{ref}",
-                }
-            )
-        return records
+        if limit is not None:
+            rows = rows.limit(limit)
+        for breach, clock, task, project in rows.yield_per(batch_size):
+            yield _project_task_record(breach, clock, task, project)
 
     def summary(
         self,
@@ -515,44 +515,78 @@ def _notify_customer_project_completed(db: Session, project: Project) -> None:
 
 
 def notify_project_task_sla_breach(db: Session, clock: SlaClock) -> None:
-    if clock.entity_type != WorkflowEntityType.project_task:
-        return
-    task = db.get(ProjectTask, clock.entity_id)
-    if not task:
-        return
-    project = db.get(Project, task.project_id)
-    if not project:
-        return
+    notify_project_task_sla_breaches(db, [clock])
 
-    metadata = dict(task.metadata_) if isinstance(task.metadata_, dict) else {}
-    metadata["sla_breached"] = True
-    metadata["sla_breached_at"] = (clock.breached_at or datetime.now(UTC)).isoformat()
-    task.metadata_ = metadata
 
-    role_person_ids = [
-        project.project_manager_person_id,
-        project.assistant_manager_person_id,
-        project.manager_person_id,
-    ]
-    person_ids = [person_id for person_id in role_person_ids if person_id]
-    if not person_ids:
-        return
+def notify_project_task_sla_breaches(db: Session, clocks: list[SlaClock]) -> None:
+    """Flag breached tasks and notify their project roles.
 
-    people = db.query(Person).filter(Person.id.in_(person_ids)).all()
-    recipients = {person.email.strip() for person in people if isinstance(person.email, str) and person.email.strip()}
-    if not recipients:
+    Tasks, projects and role people are loaded with one query each, so the
+    breach detector can fan out a whole batch of clocks at once.
+    """
+    task_clocks = [clock for clock in clocks if clock.entity_type == WorkflowEntityType.project_task]
+    if not task_clocks:
         return
-
-    task_ref = task.number or str(task.id)
-    project_ref = project.number or str(project.id)
-    subject = f"SLA breach: {task.title}"
-    body = (
-        f"Task {task_ref} in project {project_ref} breached its SLA timeline.\n"
-        "Action required by PM / Assistant PM / SPC. PM supervisor has been tagged."
+    task_ids = {clock.entity_id for clock in task_clocks}
+    tasks = {task.id: task for task in db.query(ProjectTask).filter(ProjectTask.id.in_(task_ids)).all()}
+    project_ids = {task.project_id for task in tasks.values()}
+    projects = (
+        {project.id: project for project in db.query(Project).filter(Project.id.in_(project_ids)).all()}
+        if project_ids
+        else {}
     )
-    for recipient in recipients:
-        _queue_in_app_notification(db, recipient, subject, body)
-        _queue_email_notification(db, recipient, subject, body)
+    person_ids = {
+        person_id
+        for project in projects.values()
+        for person_id in (
+            project.project_manager_person_id,
+            project.assistant_manager_person_id,
+            project.manager_person_id,
+        )
+        if person_id
+    }
+    emails_by_person = (
+        {
+            person.id: person.email.strip()
+            for person in db.query(Person).filter(Person.id.in_(person_ids)).all()
+            if isinstance(person.email, str) and person.email.strip()
+        }
+        if person_ids
+        else {}
+    )
+
+    for clock in task_clocks:
+        task = tasks.get(clock.entity_id)
+        if not task:
+            continue
+        project = projects.get(task.project_id)
+        if not project:
+            continue
+
+        metadata = dict(task.metadata_) if isinstance(task.metadata_, dict) else {}
+        metadata["sla_breached"] = True
+        metadata["sla_breached_at"] = (clock.breached_at or datetime.now(UTC)).isoformat()
+        task.metadata_ = metadata
+
+        role_person_ids = [
+            project.project_manager_person_id,
+            project.assistant_manager_person_id,
+            project.manager_person_id,
+        ]
+        recipients = {emails_by_person[person_id] for person_id in role_person_ids if person_id in emails_by_person}
+        if not recipients:
+            continue
+
+        task_ref = task.number or str(task.id)
+        project_ref = project.number or str(project.id)
+        subject = f"SLA breach: {task.title}"
+        body = (
+            f"Task {task_ref} in project {project_ref} breached its SLA timeline.\n"
+            "Action required by PM / Assistant PM / SPC. PM supervisor has been tagged."
+        )
+        for recipient in recipients:
+            _queue_in_app_notification(db, recipient, subject, body)
+            _queue_email_notification(db, recipient, subject, body)
 
 
 def _seed_fiber_installation_tasks(db: Session, project: Project) -> None:
@@ -0,0 +1,368 @@
+"""Shared sliding-window rate limiter.
+
+Each key holds three integers — the current fixed window's index and count,
+plus the previous window's count — and the estimate of requests in the last
+``window`` is ``previous * overlap + current``. That keeps memory O(1) per key
+where the sorted-set limiters it replaces stored one member per request.
+
+In Redis the whole check-and-increment is one Lua script (a single round trip,
+atomic across processes). ``hit_async`` runs it on ``redis.asyncio`` so the
+event loop is never blocked; ``hit`` runs it on a sync client for code already
+in a worker thread. When Redis is unreachable the same arithmetic runs against
+a process-local dict, and Redis is retried after ``REDIS_RETRY_SECONDS``.
+
+With ``lease_size`` set, a process takes up to that many tokens from Redis in
+one call and spends them locally, so Redis is consulted roughly once per
+``lease_size`` requests. Leased tokens count as used in Redis whether or not
+they are spent, and a lease expires after ``LEASE_MAX_AGE_FRACTION`` of the
+window, so it trades a little accuracy for far fewer round trips.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from app.logging import get_logger
+
+logger = get_logger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_RETRY_SECONDS = 30.0
+REDIS_SOCKET_TIMEOUT_SECONDS = 1.0
+LEASE_MAX_AGE_FRACTION = 0.1
+# Never lease more than this share of a key's limit to one process.
+LEASE_MAX_LIMIT_FRACTION = 0.1
+_MEMORY_PRUNE_EVERY = 1024
+
+# KEYS[1] = state hash; ARGV = limit, window_ms, now_ms, tokens wanted.
+# Returns {granted, remaining, retry_after_ms}. Must stay in step with _apply.
+SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local want = tonumber(ARGV[4])
+local idx = math.floor(now / window)
+local state = redis.call('HMGET', KEYS[1], 'w', 'c', 'p')
+local w = tonumber(state[1]) or idx
+local curr = tonumber(state[2]) or 0
+local prev = tonumber(state[3]) or 0
+if w ~= idx then
+  if w == idx - 1 then prev = curr else prev = 0 end
+  curr = 0
+end
+local elapsed = now - idx * window
+local weighted = prev * (window - elapsed) / window
+local granted = math.min(want, math.max(math.floor(limit - weighted - curr), 0))
+curr = curr + granted
+redis.call('HSET', KEYS[1], 'w', idx, 'c', curr, 'p', prev)
+redis.call('PEXPIRE', KEYS[1], window * 2)
+local remaining = math.max(math.floor(limit - weighted - curr), 0)
+local retry = 0
+if granted == 0 then
+  if curr < limit then
+    retry = math.ceil(window * (1 - (limit - curr - 1) / prev)) - elapsed
+  else
+    retry = (window - elapsed) + math.ceil(window * (1 - (limit - 1) / curr))
+  end
+  retry = math.max(retry, 1)
+end
+return {granted, remaining, retry}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    remaining: int
+    # Seconds until a request would be allowed again; 0 when allowed.
+    retry_after: int
+    # Seconds until the current fixed window rolls over.
+    reset_in: int
+
+
+def _apply(
+    state: tuple[int, int, int] | None,
+    limit: int,
+    window_ms: int,
+    now_ms: int,
+    want: int,
+) -> tuple[tuple[int, int, int], int, int, int]:
+    """Python twin of ``SLIDING_WINDOW_LUA``: (new state, granted, remaining, retry_ms)."""
+    idx = now_ms // window_ms
+    w, curr, prev = state if state is not None else (idx, 0, 0)
+    if w != idx:
+        prev = curr if w == idx - 1 else 0
+        curr = 0
+    elapsed = now_ms - idx * window_ms
+    weighted = prev * (window_ms - elapsed) / window_ms
+    granted = min(want, max(math.floor(limit - weighted - curr), 0))
+    curr += granted
+    remaining = max(math.floor(limit - weighted - curr), 0)
+    retry = 0
+    if granted == 0:
+        if curr < limit:
+            retry = math.ceil(window_ms * (1 - (limit - curr - 1) / prev)) - elapsed
+        else:
+            retry = (window_ms - elapsed) + math.ceil(window_ms * (1 - (limit - 1) / curr))
+        retry = max(retry, 1)
+    return (idx, curr, prev), granted, remaining, retry
+
+
+@dataclass
+class _Lease:
+    tokens: int
+    remaining: int
+    expires_at: float
+    denied: bool = False
+    retry_at: float = 0.0
+
+
+class SlidingWindowLimiter:
+    """Sliding-window-counter limiter over Redis with an in-memory fallback.
+
+    ``client_factory`` supplies the sync Redis client (default: a lazily
+    created client for ``REDIS_URL``); ``memory_store`` lets a caller own the
+    fallback dict. ``lease_size`` > 1 enables local token leases.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        *,
+        lease_size: int = 0,
+        client_factory: Callable[[], Any] | None = None,
+        memory_store: dict | None = None,
+        redis_url: str = REDIS_URL,
+    ):
+        self.prefix = prefix
+        self.lease_size = max(0, int(lease_size))
+        self._client_factory = client_factory
+        self._redis_url = redis_url
+        self._memory = memory_store if memory_store is not None else {}
+        self._memory_lock = threading.Lock()
+        self._memory_hits = 0
+        self._leases: dict[str, _Lease] = {}
+        self._lease_lock = threading.Lock()
+        self._sync_client = None
+        self._async_client = None
+        self._async_loop = None
+        self._closing: set[asyncio.Task] = set()
+        self._scripts: dict[int, tuple[Any, Any]] = {}
+        self._redis_retry_at = 0.0
+
+    def _full_key(self, key: str) -> str:
+        # "sw:" keeps the hash clear of the sorted sets older limiters left under ``prefix``.
+        return f"{self.prefix}sw:{key}"
+
+    # ── Redis clients ────────────────────────────────────────────────────
+
+    def _redis_down(self, exc: Exception) -> None:
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+        self._sync_client = None
+        self._drop_async_client()
+        logger.warning("rate_limiter_redis_unavailable prefix=%s error=%s", self.prefix, exc)
+
+    def _get_sync_client(self):
+        if self._client_factory is not None:
+            return self._client_factory()
+        if time.monotonic() < self._redis_retry_at:
+            return None
+        if self._sync_client is None:
+            try:
+                import redis
+
+                self._sync_client = redis.from_url(
+                    self._redis_url,
+                    decode_responses=True,
+                    socket_connect_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+                    socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+                )
+            except Exception as exc:
+                self._redis_down(exc)
+                return None
+        return self._sync_client
+
+    def _get_async_client(self):
+        if time.monotonic() < self._redis_retry_at:
+            return None
+        loop = asyncio.get_running_loop()
+        # redis.asyncio connections are bound to the loop that opened them.
+        if self._async_client is None or self._async_loop is not loop:
+            self._drop_async_client()
+            try:
+                import redis.asyncio as aioredis
+
+                self._async_client = aioredis.from_url(
+                    self._redis_url,
+                    decode_responses=True,
+                    socket_connect_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+                    socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+                )
+                self._async_loop = loop
+            except Exception as exc:
+                self._redis_down(exc)
+                return None
+        return self._async_client
+
+    def _drop_async_client(self) -> None:
+        """Forget the async client, closing its pool on the loop that owns it."""
+        client, loop = self._async_client, self._async_loop
+        self._async_client = None
+        self._async_loop = None
+        if client is None or loop is None or loop.is_closed():
+            # A closed loop can no longer run the disconnect; the sockets are
+            # released when the client is collected.
+            return
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        if loop is current:
+            task = loop.create_task(client.aclose())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+    def _script_for(self, client):
+        cached = self._scripts.get(id(client))
+        if cached is not None and cached[0] is client:
+            return cached[1]
+        script = client.register_script(SLIDING_WINDOW_LUA)
+        self._scripts = {id(client): (client, script)}
+        return script
+
+    # ── Leases ───────────────────────────────────────────────────────────
+
+    def _lease_want(self, limit: int) -> int:
+        if self.lease_size <= 1:
+            return 1
+        return max(1, min(self.lease_size, int(limit * LEASE_MAX_LIMIT_FRACTION)))
+
+    def _take_leased(self, full_key: str, reset_in: int) -> RateLimitResult | None:
+        now = time.monotonic()
+        with self._lease_lock:
+            lease = self._leases.get(full_key)
+            if lease is None or now >= lease.expires_at:
+                return None
+            if lease.tokens > 0:
+                lease.tokens -= 1
+                return RateLimitResult(True, lease.remaining + lease.tokens, 0, reset_in)
+            if not lease.denied:
+                return None
+            return RateLimitResult(False, 0, max(1, math.ceil(lease.retry_at - now)), reset_in)
+
+    def _store_lease(self, full_key: str, granted: int, remaining: int, retry_ms: int, window_ms: int) -> None:
+        now = time.monotonic()
+        max_age = window_ms / 1000 * LEASE_MAX_AGE_FRACTION
+        retry_at = now + retry_ms / 1000
+        expires_at = now + max_age if granted else min(retry_at, now + max_age)
+        with self._lease_lock:
+            if len(self._leases) >= _MEMORY_PRUNE_EVERY:
+                self._leases = {k: v for k, v in self._leases.items() if v.expires_at > now}
+            self._leases[full_key] = _Lease(
+                tokens=max(granted - 1, 0),
+                remaining=remaining,
+                expires_at=expires_at,
+                denied=granted == 0,
+                retry_at=retry_at,
+            )
+
+    # ── Checks ───────────────────────────────────────────────────────────
+
+    def hit(self, key: str, limit: int, window_seconds: float, *, now: float | None = None) -> RateLimitResult:
+        """Count one request for ``key`` using the sync Redis client."""
+        now = time.time() if now is None else now
+        full_key, window_ms, now_ms, reset_in = self._prepare(key, window_seconds, now)
+        if limit <= 0:
+            return RateLimitResult(True, 0, 0, reset_in)
+        want = self._lease_want(limit)
+        if want > 1:
+            leased = self._take_leased(full_key, reset_in)
+            if leased is not None:
+                return leased
+        client = self._get_sync_client()
+        if client is not None:
+            try:
+                reply = self._script_for(client)(keys=[full_key], args=[limit, window_ms, now_ms, want])
+                return self._from_redis(full_key, reply, want, window_ms, reset_in)
+            except Exception as exc:
+                if self._client_factory is None:
+                    self._redis_down(exc)
+                else:
+                    logger.warning("rate_limiter_redis_error key=%s error=%s", full_key, exc)
+        return self._hit_memory(full_key, limit, window_ms, now_ms, reset_in)
+
+    async def hit_async(
+        self, key: str, limit: int, window_seconds: float, *, now: float | None = None
+    ) -> RateLimitResult:
+        """Count one request for ``key`` without blocking the event loop."""
+        now = time.time() if now is None else now
+        full_key, window_ms, now_ms, reset_in = self._prepare(key, window_seconds, now)
+        if limit <= 0:
+            return RateLimitResult(True, 0, 0, reset_in)
+        want = self._lease_want(limit)
+        if want > 1:
+            leased = self._take_leased(full_key, reset_in)
+            if leased is not None:
+                return leased
+        client = self._get_async_client()
+        if client is not None:
+            try:
+                reply = await self._script_for(client)(keys=[full_key], args=[limit, window_ms, now_ms, want])
+                return self._from_redis(full_key, reply, want, window_ms, reset_in)
+            except Exception as exc:
+                self._redis_down(exc)
+        return self._hit_memory(full_key, limit, window_ms, now_ms, reset_in)
+
+    def _prepare(self, key: str, window_seconds: float, now: float) -> tuple[str, int, int, int]:
+        window_ms = max(1, int(window_seconds * 1000))
+        now_ms = int(now * 1000)
+        reset_in = max(1, math.ceil((window_ms - now_ms % window_ms) / 1000))
+        return self._full_key(key), window_ms, now_ms, reset_in
+
+    def _from_redis(self, full_key: str, reply, want: int, window_ms: int, reset_in: int) -> RateLimitResult:
+        granted, remaining, retry_ms = (int(value) for value in reply)
+        if want > 1:
+            self._store_lease(full_key, granted, remaining, retry_ms, window_ms)
+        if granted == 0:
+            return RateLimitResult(False, 0, max(1, math.ceil(retry_ms / 1000)), reset_in)
+        return RateLimitResult(True, remaining + granted - 1, 0, reset_in)
+
+    def _hit_memory(self, full_key: str, limit: int, window_ms: int, now_ms: int, reset_in: int) -> RateLimitResult:
+        with self._memory_lock:
+            self._memory_hits += 1
+            if self._memory_hits % _MEMORY_PRUNE_EVERY == 0:
+                self._prune_memory(now_ms)
+            entry = self._memory.get(full_key)
+            state, granted, remaining, retry_ms = _apply(entry[0] if entry else None, limit, window_ms, now_ms, 1)
+            self._memory[full_key] = (state, now_ms + window_ms * 2)
+        if granted == 0:
+            return RateLimitResult(False, 0, max(1, math.ceil(retry_ms / 1000)), reset_in)
+        return RateLimitResult(True, remaining, 0, reset_in)
+
+    def _prune_memory(self, now_ms: int) -> None:
+        expired = [key for key, (_, expires_at) in self._memory.items() if expires_at <= now_ms]
+        for key in expired:
+            self._memory.pop(key, None)
+
+    def reset(self, key: str) -> None:
+        """Forget all state for ``key`` (Redis, memory fallback and any lease)."""
+        full_key = self._full_key(key)
+        client = self._get_sync_client()
+        if client is not None:
+            try:
+                client.delete(full_key)
+            except Exception as exc:
+                logger.debug("rate_limiter_reset_failed key=%s error=%s", full_key, exc)
+        with self._memory_lock:
+            self._memory.pop(full_key, None)
+        with self._lease_lock:
+            self._leases.pop(full_key, None)
@@ -0,0 +1,130 @@
+"""Streaming building blocks for report downloads.
+
+Exports are produced as generators so a ``StreamingResponse`` can send the
+first bytes while later rows are still being read:
+
+- ``iter_with_session`` runs a row producer on its own session, because the
+  request session is closed once the endpoint returns and before the body is
+  streamed.  Producers should read with ``Query.yield_per(DEFAULT_YIELD_PER)``
+  so rows come from a server-side cursor instead of one ``.all()`` list.
+- ``iter_csv`` encodes rows incrementally, a few hundred at a time.
+- ``iter_zip`` writes a ZIP archive (XLSX is one) to a non-seekable buffer,
+  so a worksheet can be emitted row by row with bounded memory.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from typing import Any, TypeVar
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+
+T = TypeVar("T")
+
+DEFAULT_YIELD_PER = 1000
+CSV_FLUSH_ROWS = 500
+ZIP_FLUSH_BYTES = 64 * 1024
+NO_DATA_TEXT = "No data available\n"
+
+
+def iter_with_session(produce: Callable[[Session], Iterable[T]]) -> Iterator[T]:
+    """Yield from ``produce(db)`` with a dedicated session held open for the whole stream."""
+    db = SessionLocal()
+    try:
+        yield from produce(db)
+    finally:
+        db.close()
+
+
+def iter_csv(
+    rows: Iterable[Mapping[str, Any]],
+    *,
+    fieldnames: Sequence[str] | None = None,
+    empty_text: str = NO_DATA_TEXT,
+    flush_rows: int = CSV_FLUSH_ROWS,
+) -> Iterator[str]:
+    """Encode ``rows`` as CSV text chunks.
+
+    The header comes from ``fieldnames`` or the first row's keys. When there
+    are no rows and no explicit header, ``empty_text`` is emitted instead.
+    """
+    iterator = iter(rows)
+    first = next(iterator, None)
+    if first is None and fieldnames is None:
+        yield empty_text
+        return
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(fieldnames) if fieldnames is not None else list(first or {}))
+    writer.writeheader()
+    pending = 0
+    if first is not None:
+        writer.writerow(first)
+        pending = 1
+    for row in iterator:
+        writer.writerow(row)
+        pending += 1
+        if pending >= flush_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    tail = buffer.getvalue()
+    if tail:
+        yield tail
+
+
+class _ChunkBuffer:
+    """Write-only sink for ``ZipFile``; drained by the generator after each write burst."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+            self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        return None
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self.size = 0
+        return data
+
+
+def iter_zip(
+    entries: Iterable[tuple[str, str | Iterable[str]]],
+    *,
+    flush_bytes: int = ZIP_FLUSH_BYTES,
+) -> Iterator[bytes]:
+    """Stream a deflated ZIP archive built from ``(name, content)`` entries.
+
+    ``content`` is either a whole string or an iterable of string parts; parts
+    are compressed as they arrive and output is yielded every ``flush_bytes``.
+    """
+    buffer = _ChunkBuffer()
+    with ZipFile(buffer, "w", compression=ZIP_DEFLATED) as archive:
+        for name, content in entries:
+            if isinstance(content, str):
+                archive.writestr(name, content)
+            else:
+                with archive.open(name, "w") as handle:
+                    for part in content:
+                        handle.write(part.encode("utf-8"))
+                        if buffer.size >= flush_bytes:
+                            yield buffer.drain()
+            if buffer.size >= flush_bytes:
+                yield buffer.drain()
+    tail = buffer.drain()
+    if tail:
+        yield tail
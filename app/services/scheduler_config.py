@@ -342,6 +342,28 @@ def build_beat_schedule(*, scheduler_timezone: str | None = None) -> dict:
             interval_seconds=max(infrastructure_health_interval, 60),
         )
 
+        zabbix_snapshot_enabled = _effective_bool(
+            session,
+            SettingDomain.scheduler,
+            "zabbix_monitoring_snapshot_enabled",
+            "ZABBIX_MONITORING_SNAPSHOT_ENABLED",
+            True,
+        )
+        zabbix_snapshot_interval = _effective_int(
+            session,
+            SettingDomain.scheduler,
+            "zabbix_monitoring_snapshot_interval_seconds",
+            "ZABBIX_MONITORING_SNAPSHOT_INTERVAL_SECONDS",
+            120,
+        )
+        _sync_scheduled_task(
+            session,
+            name="zabbix_monitoring_snapshot",
+            task_name="app.tasks.infrastructure_health.refresh_zabbix_monitoring_snapshot",
+            enabled=zabbix_snapshot_enabled,
+            interval_seconds=max(zabbix_snapshot_interval, 30),
+        )
+
         offline_outreach_enabled = _effective_bool(
             session,
             SettingDomain.notification,
@@ -753,6 +775,32 @@ def build_beat_schedule(*, scheduler_timezone: str | None = None) -> dict:
             enabled=response_obligations_enabled,
             interval_seconds=60,
         )
+        _sync_scheduled_task(
+            session,
+            name="crm_inbox_counters_reconcile",
+            task_name="app.tasks.crm_inbox.reconcile_inbox_counters",
+            enabled=True,
+            interval_seconds=_effective_int(
+                session,
+                SettingDomain.notification,
+                "crm_inbox_counters_reconcile_interval_seconds",
+                "CRM_INBOX_COUNTERS_RECONCILE_INTERVAL_SECONDS",
+                300,
+            ),
+        )
+        _sync_scheduled_task(
+            session,
+            name="crm_metric_rollups_refresh",
+            task_name="app.tasks.crm_inbox.refresh_crm_metric_rollups",
+            enabled=True,
+            interval_seconds=_effective_int(
+                session,
+                SettingDomain.notification,
+                "crm_metric_rollups_refresh_interval_seconds",
+                "CRM_METRIC_ROLLUPS_REFRESH_INTERVAL_SECONDS",
+                60,
+            ),
+        )
         _sync_scheduled_task(
             session,
             name="crm_inbox_reopen_due_snoozed",
@@ -881,6 +929,22 @@ def build_beat_schedule(*, scheduler_timezone: str | None = None) -> dict:
             interval_seconds=86400,
         )
 
+        # Event outbox consumer - runs handlers for events queued in outbox mode.
+        # Emitting a request also queues a consumer on commit; this is the sweep.
+        event_outbox_enabled = _env_bool("EVENT_OUTBOX_ENABLED") or False
+        event_outbox_interval = _coerce_int(
+            resolve_value(session, SettingDomain.scheduler, "event_outbox_interval_seconds"),
+            30,
+        )
+        event_outbox_interval = max(event_outbox_interval, 5)
+        _sync_scheduled_task(
+            session,
+            name="event_outbox_consumer",
+            task_name="app.tasks.events.process_event_outbox",
+            enabled=event_outbox_enabled,
+            interval_seconds=event_outbox_interval,
+        )
+
         # Event retry - retries failed event handlers
         event_retry_enabled = _effective_bool(
             session,
@@ -1165,6 +1229,30 @@ def build_beat_schedule(*, scheduler_timezone: str | None = None) -> dict:
             enabled=selfcare_sync_enabled,
             interval_seconds=selfcare_sync_interval_seconds,
         )
+        # Customer uptime polling (Selfcare online status -> snapshots/periods).
+        # Runs as a leader-locked Celery job rather than a thread in every web
+        # replica; see app.services.customer_uptime.run_uptime_poll.
+        customer_uptime_enabled = _effective_bool(
+            session,
+            SettingDomain.integration,
+            "customer_uptime_polling_enabled",
+            "CUSTOMER_UPTIME_POLLING_ENABLED",
+            True,
+        )
+        customer_uptime_interval_seconds = _effective_int(
+            session,
+            SettingDomain.integration,
+            "customer_uptime_poll_interval_seconds",
+            "CUSTOMER_UPTIME_POLL_INTERVAL_SECONDS",
+            300,
+        )
+        _sync_scheduled_task(
+            session,
+            name="customer_uptime_poll",
+            task_name="app.tasks.subscribers.poll_customer_uptime",
+            enabled=customer_uptime_enabled,
+            interval_seconds=max(customer_uptime_interval_seconds, 60),
+        )
         # Person↔subscriber identity linking + party-status normalization. Runs on
         # the same cadence as the sync so newly-synced subscribers get linked to
         # people instead of only when triggered manually.
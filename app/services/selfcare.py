@@ -12,8 +12,10 @@ import random
 import re
 import threading
 import time
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import UTC, date, datetime
+from datetime import UTC, date, datetime, timedelta
 from decimal import Decimal, InvalidOperation
 from typing import TYPE_CHECKING, Any, cast
 from urllib.parse import quote, urlparse
@@ -44,6 +46,11 @@ _CUSTOMER_LAST_SYNC_KEY = "selfcare_sync:customer:last"
 _CUSTOMER_HISTORY_KEY = "selfcare_sync:customer:history"
 _CUSTOMER_DAILY_STATS_PREFIX = "selfcare_sync:customer:stats:"
 _HISTORY_MAX_SIZE = 30
+_SUBSCRIBER_SYNC_WATERMARK_KEY = "selfcare_sync:subscribers:watermark"
+# Delta windows overlap the previous run so rows updated while it was reading
+# are fetched again rather than missed.
+_DELTA_SYNC_OVERLAP = timedelta(minutes=10)
+_FULL_SYNC_DEFAULT_INTERVAL_HOURS = 24
 
 # Retry policy for transient upstream failures (connection errors, read
 # timeouts, 429, 5xx). 4xx are caller errors and never retried.
@@ -398,6 +405,7 @@ def _request_json(
     params: dict[str, Any] | None = None,
     json_body: dict[str, Any] | None = None,
     idempotent: bool = False,
+    config: dict[str, Any] | None = None,
 ) -> Any:
     """Issue one logical request via the shared integration engine.
 
@@ -407,8 +415,12 @@ def _request_json(
     x-request-id propagation. This wrapper owns the selfcare policy: which
     methods retry, the sanitized ``SelfcareProviderError`` messages, and the
     request log lines.
+
+    A pre-resolved ``config`` skips the settings lookup, so the call does not
+    touch ``db`` and is safe to issue from a worker thread.
     """
-    config = _get_api_config(db)
+    if config is None:
+        config = _get_api_config(db)
     url = _crm_url(config, path)
     read_timeout = int(config.get("timeout_seconds") or 30)
     method_u = method.upper()
@@ -695,99 +707,294 @@ _FINANCE_SCAN_MAX_ROWS = 5_000
 # reads as "short" and the short-page heuristic stops early — silently dropping
 # every row past 500. Clamp to sub's real cap so requested == effective.
 _SUB_MAX_PER_PAGE = 500
+# Pages requested in flight once ``meta.last_page`` is known. Kept small: every
+# in-flight page is a bulk query on sub's pool.
+_PAGINATION_DEFAULT_CONCURRENCY = 4
+_PAGINATION_CHECKPOINT_PREFIX = "selfcare_sync:pagination:"
+_PAGINATION_CHECKPOINT_TTL_SECONDS = 6 * 60 * 60
+# A resumed listing skips the pages before its checkpoint, so rows changed there
+# since the listing began are missed. Past this age a full listing starts over.
+_PAGINATION_CHECKPOINT_DEFAULT_MAX_AGE_SECONDS = 2 * 60 * 60
 
 
-def _list_paginated(
+def _pagination_concurrency() -> int:
+    try:
+        value = int(os.getenv("SELFCARE_PAGINATION_CONCURRENCY", str(_PAGINATION_DEFAULT_CONCURRENCY)))
+    except (TypeError, ValueError):
+        value = _PAGINATION_DEFAULT_CONCURRENCY
+    return max(1, value)
+
+
+def _pagination_checkpoint_max_age() -> int:
+    try:
+        value = int(
+            os.getenv(
+                "SELFCARE_PAGINATION_CHECKPOINT_MAX_AGE_SECONDS",
+                str(_PAGINATION_CHECKPOINT_DEFAULT_MAX_AGE_SECONDS),
+            )
+        )
+    except (TypeError, ValueError):
+        value = _PAGINATION_CHECKPOINT_DEFAULT_MAX_AGE_SECONDS
+    return max(0, value)
+
+
+class PaginationCheckpoint:
+    """Redis-backed resume point for a long Selfcare listing.
+
+    The paginator saves the last page whose rows the consumer has fully
+    processed; a later listing of the same path and params resumes after it.
+    The checkpoint is cleared once the listing completes. A checkpoint whose
+    listing began more than ``SELFCARE_PAGINATION_CHECKPOINT_MAX_AGE_SECONDS``
+    ago is ignored, so a run that keeps failing cannot keep resuming a stale
+    listing. Without Redis it is a no-op and every listing starts at page 1.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.key = f"{_PAGINATION_CHECKPOINT_PREFIX}{name}"
+        self.resumed_from: int | None = None
+        self._started_at: float | None = None
+
+    @staticmethod
+    def _scope(path: str, params: dict[str, Any]) -> str:
+        return json.dumps({"path": path, "params": params}, sort_keys=True, default=str)
+
+    def load(self, path: str, params: dict[str, Any]) -> int:
+        """Return the first page still to fetch for this listing."""
+        self._started_at = time.time()
+        redis = _get_redis()
+        if not redis:
+            return 1
+        try:
+            data = cast(str | None, redis.get(self.key))
+            state = json.loads(data) if data else None
+        except Exception as exc:
+            logger.warning("selfcare_pagination_checkpoint_load_failed key=%s error=%s", self.key, exc)
+            return 1
+        if not isinstance(state, dict) or state.get("scope") != self._scope(path, params):
+            return 1
+        completed = int(state.get("page") or 0)
+        if completed < 1:
+            return 1
+        started_at = float(state.get("started_at") or 0)
+        age = self._started_at - started_at
+        if age > _pagination_checkpoint_max_age():
+            logger.info("SELFCARE_API_PAGINATION_CHECKPOINT_STALE path=%s page=%d age=%ds", path, completed, age)
+            return 1
+        self._started_at = started_at
+        self.resumed_from = completed + 1
+        logger.info("SELFCARE_API_PAGINATION_RESUME path=%s page=%d", path, self.resumed_from)
+        return self.resumed_from
+
+    def save(self, path: str, params: dict[str, Any], page: int) -> None:
+        redis = _get_redis()
+        if not redis:
+            return
+        try:
+            state = {
+                "scope": self._scope(path, params),
+                "page": page,
+                "started_at": self._started_at or time.time(),
+            }
+            redis.set(self.key, json.dumps(state), ex=_PAGINATION_CHECKPOINT_TTL_SECONDS)
+        except Exception as exc:
+            logger.warning("selfcare_pagination_checkpoint_save_failed key=%s error=%s", self.key, exc)
+
+    def clear(self) -> None:
+        redis = _get_redis()
+        if not redis:
+            return
+        try:
+            redis.delete(self.key)
+        except Exception as exc:
+            logger.warning("selfcare_pagination_checkpoint_clear_failed key=%s error=%s", self.key, exc)
+
+
+def _page_fingerprint(batch: list[dict[str, Any]]) -> tuple[Any, ...]:
+    """Cheap identity for a page: its size plus the first and last row ids.
+
+    A server that ignores ``page`` returns the same rows again, so the boundary
+    rows are enough to spot it without serialising the whole page.
+    """
+    first, last = batch[0], batch[-1]
+    if first.get("id") is not None and last.get("id") is not None:
+        return (len(batch), str(first["id"]), str(last["id"]))
+    return (
+        len(batch),
+        json.dumps(first, sort_keys=True, default=str),
+        json.dumps(last, sort_keys=True, default=str),
+    )
+
+
+def _iter_paginated(
     db: Session,
     path: str,
     params: dict[str, Any] | None = None,
     *,
     max_rows: int | None = None,
-) -> list[dict[str, Any]]:
-    """Page through a Selfcare list endpoint.
+    checkpoint: PaginationCheckpoint | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Stream the rows of a Selfcare list endpoint, page by page.
 
     Termination is driven off response metadata (``meta.total`` / ``meta.last_page``)
     when present; without metadata it stops on a short page (the last page).
-    Hard caps on pages and accumulated rows prevent a misbehaving upstream from
-    causing an unbounded loop / memory blow-up.
+    Hard caps on pages and rows prevent a misbehaving upstream from causing an
+    unbounded loop.
+
+    Once ``meta.last_page`` is known the following pages are requested ahead on
+    a small thread pool (``SELFCARE_PAGINATION_CONCURRENCY``) while rows are
+    still yielded in page order. Worker requests use the config resolved here,
+    never ``db``.
     """
-    page = 1
-    rows: list[dict[str, Any]] = []
-    seen_page_fingerprints: set[str] = set()
     base_params = dict(params or {})
     per_page = int(base_params.get("per_page") or _SUB_MAX_PER_PAGE)
     # Never request more than sub honors, or the short-page heuristic below
     # (len(batch) < per_page) would trip on a full-but-clamped page and drop data.
     per_page = max(1, min(per_page, _SUB_MAX_PER_PAGE))
     base_params["per_page"] = per_page
-    while True:
-        payload = _request_json(db, "GET", path, params={**base_params, "page": page})
-        batch = _rows(payload)
-        meta = payload.get("meta") if isinstance(payload, dict) else {}
-        meta = meta if isinstance(meta, dict) else {}
-        total = int(meta.get("total") or 0)
-        last_page = meta.get("last_page")
-        response_page = meta.get("page", meta.get("current_page"))
-        if response_page is not None and int(response_page) != page:
-            raise SelfcareProviderError(
-                f"Selfcare pagination did not advance for {path}: requested page {page}, received page {response_page}"
+    page = checkpoint.load(path, base_params) if checkpoint else 1
+    accumulated = (page - 1) * per_page
+    yielded = 0
+    seen_page_fingerprints: set[tuple[Any, ...]] = set()
+    concurrency = _pagination_concurrency()
+    executor: ThreadPoolExecutor | None = None
+    pending: dict[int, Future[Any]] = {}
+    scheduled_through = page
+    config: dict[str, Any] | None = None
+    try:
+        while True:
+            future = pending.pop(page, None)
+            if future is not None:
+                payload = future.result()
+            else:
+                payload = _request_json(db, "GET", path, params={**base_params, "page": page})
+            batch = _rows(payload)
+            meta = payload.get("meta") if isinstance(payload, dict) else {}
+            meta = meta if isinstance(meta, dict) else {}
+            total = int(meta.get("total") or 0)
+            last_page = meta.get("last_page")
+            response_page = meta.get("page", meta.get("current_page"))
+            if response_page is not None and int(response_page) != page:
+                raise SelfcareProviderError(
+                    f"Selfcare pagination did not advance for {path}: "
+                    f"requested page {page}, received page {response_page}"
+                )
+            if batch:
+                fingerprint = _page_fingerprint(batch)
+                if fingerprint in seen_page_fingerprints:
+                    logger.error(
+                        "SELFCARE_API_PAGINATION_REPEATED_PAGE path=%s page=%d batch=%d",
+                        path,
+                        page,
+                        len(batch),
+                    )
+                    raise SelfcareProviderError(f"Selfcare pagination repeated data on page {page} for {path}")
+                seen_page_fingerprints.add(fingerprint)
+
+            if last_page is not None and concurrency > 1:
+                upper = min(int(last_page), _PAGINATION_MAX_PAGES)
+                if executor is None and scheduled_through < upper:
+                    config = _get_api_config(db)
+                    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="selfcare-page")
+                while executor is not None and scheduled_through < min(upper, page + concurrency):
+                    scheduled_through += 1
+                    pending[scheduled_through] = executor.submit(
+                        _request_json,
+                        None,
+                        "GET",
+                        path,
+                        params={**base_params, "page": scheduled_through},
+                        config=config,
+                    )
+
+            accumulated += len(batch)
+            if max_rows is not None:
+                batch = batch[: max(max_rows - yielded, 0)]
+            yield from batch
+            yielded += len(batch)
+            if max_rows is not None and yielded >= max_rows:
+                logger.info("SELFCARE_API_PAGE_BOUND_REACHED path=%s rows=%d bound=%d", path, yielded, max_rows)
+                return
+            logger.info(
+                "SELFCARE_API_PAGE path=%s page=%d batch=%d accumulated=%d total=%d last_page=%s",
+                path,
+                page,
+                len(batch),
+                accumulated,
+                total,
+                last_page,
             )
-        if batch:
-            fingerprint = hashlib.sha256(
-                json.dumps(batch, sort_keys=True, default=str, separators=(",", ":")).encode("utf-8")
-            ).hexdigest()
-            if fingerprint in seen_page_fingerprints:
+            if not batch:
+                break
+            if total and accumulated >= total:
+                break
+            if last_page is not None and page >= int(last_page):
+                break
+            # No trustworthy metadata: a short page is the last page. (Replaces the old
+            # len(batch)==1 heuristic, which silently dropped data on a legit 1-row page.)
+            if not total and last_page is None and per_page and len(batch) < per_page:
+                break
+            if accumulated >= _PAGINATION_MAX_ROWS:
                 logger.error(
-                    "SELFCARE_API_PAGINATION_REPEATED_PAGE path=%s page=%d batch=%d",
-                    path,
-                    page,
-                    len(batch),
+                    "SELFCARE_API_PAGINATION_ROW_CAP path=%s rows=%d cap=%d", path, accumulated, _PAGINATION_MAX_ROWS
                 )
-                raise SelfcareProviderError(f"Selfcare pagination repeated data on page {page} for {path}")
-            seen_page_fingerprints.add(fingerprint)
-        rows.extend(batch)
-        if max_rows is not None and len(rows) >= max_rows:
-            logger.info("SELFCARE_API_PAGE_BOUND_REACHED path=%s rows=%d bound=%d", path, len(rows), max_rows)
-            return rows[:max_rows]
-        logger.info(
-            "SELFCARE_API_PAGE path=%s page=%d batch=%d accumulated=%d total=%d last_page=%s",
-            path,
-            page,
-            len(batch),
-            len(rows),
-            total,
-            last_page,
-        )
-        if not batch:
-            break
-        if total and len(rows) >= total:
-            break
-        if last_page is not None and page >= int(last_page):
-            break
-        # No trustworthy metadata: a short page is the last page. (Replaces the old
-        # len(batch)==1 heuristic, which silently dropped data on a legit 1-row page.)
-        if not total and last_page is None and per_page and len(batch) < per_page:
-            break
-        if len(rows) >= _PAGINATION_MAX_ROWS:
-            logger.error(
-                "SELFCARE_API_PAGINATION_ROW_CAP path=%s rows=%d cap=%d", path, len(rows), _PAGINATION_MAX_ROWS
-            )
-            raise SelfcareProviderError(f"Selfcare pagination exceeded {_PAGINATION_MAX_ROWS} rows for {path}")
-        if page >= _PAGINATION_MAX_PAGES:
-            raise SelfcareProviderError(f"Selfcare pagination exceeded {_PAGINATION_MAX_PAGES} pages for {path}")
-        page += 1
-    logger.info("SELFCARE_API_PAGINATION_COMPLETE path=%s pages=%d rows=%d", path, page, len(rows))
-    return rows
+                raise SelfcareProviderError(f"Selfcare pagination exceeded {_PAGINATION_MAX_ROWS} rows for {path}")
+            if page >= _PAGINATION_MAX_PAGES:
+                raise SelfcareProviderError(f"Selfcare pagination exceeded {_PAGINATION_MAX_PAGES} pages for {path}")
+            if checkpoint is not None:
+                checkpoint.save(path, base_params, page)
+            page += 1
+            scheduled_through = max(scheduled_through, page)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    if checkpoint is not None:
+        checkpoint.clear()
+    logger.info("SELFCARE_API_PAGINATION_COMPLETE path=%s pages=%d rows=%d", path, page, accumulated)
 
 
-def fetch_customers(
-    db: Session, *, include: str | None = "services,billing", per_page: int = 500
+def _list_paginated(
+    db: Session,
+    path: str,
+    params: dict[str, Any] | None = None,
+    *,
+    max_rows: int | None = None,
 ) -> list[dict[str, Any]]:
-    """Fetch all Selfcare subscribers using the CRM API envelope."""
+    """Page through a Selfcare list endpoint. See :func:`_iter_paginated`."""
+    return list(_iter_paginated(db, path, params, max_rows=max_rows))
+
+
+def _customer_params(include: str | None, per_page: int, updated_since: datetime | None) -> dict[str, Any]:
     params: dict[str, Any] = {"per_page": max(1, min(int(per_page or _SUB_MAX_PER_PAGE), _SUB_MAX_PER_PAGE))}
     if include:
         params["include"] = include
-    return _list_paginated(db, "/subscribers", params)
+    if updated_since is not None:
+        params["updated_since"] = updated_since.astimezone(UTC).isoformat()
+    return params
+
+
+def iter_customers(
+    db: Session,
+    *,
+    include: str | None = "services,billing",
+    per_page: int = 500,
+    updated_since: datetime | None = None,
+    checkpoint: PaginationCheckpoint | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Stream Selfcare subscribers; ``updated_since`` limits them to recent changes."""
+    return _iter_paginated(
+        db, "/subscribers", _customer_params(include, per_page, updated_since), checkpoint=checkpoint
+    )
+
+
+def fetch_customers(
+    db: Session,
+    *,
+    include: str | None = "services,billing",
+    per_page: int = 500,
+    updated_since: datetime | None = None,
+) -> list[dict[str, Any]]:
+    """Fetch all Selfcare subscribers using the CRM API envelope."""
+    return list(iter_customers(db, include=include, per_page=per_page, updated_since=updated_since))
 
 
 def _enc(value: str) -> str:
@@ -1590,8 +1797,16 @@ def sync_subscribers_from_selfcare_data(
     *,
     include_remote_details: bool = False,
     logger: logging.Logger | None = None,
+    updated_since: datetime | None = None,
+    resume: bool = False,
 ) -> dict[str, Any]:
-    """Pull Selfcare subscribers and upsert local Subscriber records."""
+    """Pull Selfcare subscribers and upsert local Subscriber records.
+
+    Rows are processed as pages arrive. ``updated_since`` runs a delta sync of
+    recently changed subscribers; ``resume`` continues a full sync interrupted
+    mid-listing from its last completed page. Orphan reconciliation needs the
+    complete subscriber list, so it only runs for a full, unresumed listing.
+    """
     sync_logger = logger or globals()["logger"]
     from app.services.subscriber import subscriber as subscriber_service
 
@@ -1599,11 +1814,14 @@ def sync_subscribers_from_selfcare_data(
     ping(db)
     sync_logger.info("SELFCARE_SYNC_STEP_COMPLETE step=ping_selfcare")
 
-    sync_logger.info("SELFCARE_SYNC_STEP step=fetch_subscribers include=services,billing")
-    customers_data = fetch_customers(db, include="services,billing")
-    if not isinstance(customers_data, list):
-        raise TypeError(f"Selfcare subscribers response must be a list, got {type(customers_data).__name__}")
-    sync_logger.info("SELFCARE_SYNC_STEP_COMPLETE step=fetch_subscribers count=%d", len(customers_data))
+    delta = updated_since is not None
+    checkpoint = PaginationCheckpoint("subscribers") if resume and not delta else None
+    sync_logger.info(
+        "SELFCARE_SYNC_STEP step=fetch_subscribers include=services,billing mode=%s updated_since=%s",
+        "delta" if delta else "full",
+        updated_since.isoformat() if updated_since else "",
+    )
+    customers = iter_customers(db, include="services,billing", updated_since=updated_since, checkpoint=checkpoint)
 
     results: dict[str, Any] = {
         "created": 0,
@@ -1613,30 +1831,28 @@ def sync_subscribers_from_selfcare_data(
         "person_profile_updated": 0,
         "person_profile_conflicted": 0,
         "person_profile_unmatched": 0,
+        "mode": "delta" if delta else "full",
     }
     # Orphan detection must key off what upstream RETURNED, not what synced
     # successfully — otherwise a per-row sync failure (mapping/DB error) would make
     # a still-live subscriber look deleted and eligible for termination.
-    seen_external_ids: set[str] = {
-        str(customer.get("id") or customer.get("uuid") or customer.get("subscriber_id") or "").strip()
-        for customer in customers_data
-        if isinstance(customer, dict)
-    }
-    seen_external_ids.discard("")
-    if not customers_data:
-        sync_logger.info("selfcare_sync_no_data")
-        return results
-
-    for index, customer in enumerate(customers_data, start=1):
+    seen_external_ids: set[str] = set()
+    fetched_count = 0
+
+    for index, customer in enumerate(customers, start=1):
+        fetched_count = index
+        if isinstance(customer, dict):
+            seen_external_ids.add(
+                str(customer.get("id") or customer.get("uuid") or customer.get("subscriber_id") or "").strip()
+            )
         external_id = ""
         try:
             if not isinstance(customer, dict):
                 raise TypeError(f"Selfcare subscriber row must be a dict, got {type(customer).__name__}")
             external_id = str(customer.get("id") or customer.get("uuid") or customer.get("subscriber_id") or "").strip()
             sync_logger.info(
-                "SELFCARE_SYNC_ITEM_START index=%d count=%d external_id=%s subscriber_number=%s",
+                "SELFCARE_SYNC_ITEM_START index=%d external_id=%s subscriber_number=%s",
                 index,
-                len(customers_data),
                 external_id or "<missing>",
                 customer.get("subscriber_number") or customer.get("login") or "",
             )
@@ -1751,8 +1967,22 @@ def sync_subscribers_from_selfcare_data(
                 exc,
             )
 
+    sync_logger.info("SELFCARE_SYNC_STEP_COMPLETE step=fetch_subscribers count=%d", fetched_count)
+    if not fetched_count:
+        sync_logger.info("selfcare_sync_no_data")
+        return results
+    if delta or (checkpoint is not None and checkpoint.resumed_from is not None):
+        results["mode"] = "delta" if delta else "resumed"
+        sync_logger.info(
+            "SELFCARE_ORPHAN_RECONCILE_SKIPPED reason=%s fetched=%d",
+            "delta" if delta else "resumed",
+            fetched_count,
+        )
+        return results
+    seen_external_ids.discard("")
+    results["mode"] = "full"
     results["orphaned"] = _reconcile_selfcare_orphans(
-        db, seen_external_ids, fetched_count=len(customers_data), logger=sync_logger
+        db, seen_external_ids, fetched_count=fetched_count, logger=sync_logger
     )
     return results
 
@@ -2280,6 +2510,57 @@ def record_customer_sync_result(
         logger.warning("selfcare_customer_sync_stats_failed error=%s", exc)
 
 
+def _full_sync_interval() -> timedelta:
+    try:
+        hours = float(os.getenv("SELFCARE_FULL_SYNC_INTERVAL_HOURS", str(_FULL_SYNC_DEFAULT_INTERVAL_HOURS)))
+    except (TypeError, ValueError):
+        hours = _FULL_SYNC_DEFAULT_INTERVAL_HOURS
+    return timedelta(hours=max(hours, 0))
+
+
+def plan_subscriber_sync(now: datetime | None = None) -> datetime | None:
+    """Return ``updated_since`` for the next scheduled subscriber sync, or None for a full one.
+
+    A full reconciliation runs when none has succeeded within
+    ``SELFCARE_FULL_SYNC_INTERVAL_HOURS`` (0 disables delta syncs); otherwise
+    only subscribers changed since the last successful run are fetched.
+    """
+    now = now or datetime.now(UTC)
+    interval = _full_sync_interval()
+    redis = _get_redis()
+    if not redis or not interval:
+        return None
+    try:
+        data = cast(str | None, redis.get(_SUBSCRIBER_SYNC_WATERMARK_KEY))
+        state = json.loads(data) if data else {}
+        full_at = datetime.fromisoformat(state["full_at"])
+        synced_at = datetime.fromisoformat(state["synced_at"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    except Exception as exc:
+        logger.warning("selfcare_subscriber_sync_watermark_failed error=%s", exc)
+        return None
+    if now - full_at >= interval:
+        return None
+    return synced_at - _DELTA_SYNC_OVERLAP
+
+
+def record_subscriber_sync(started_at: datetime, *, full: bool) -> None:
+    """Advance the subscriber sync watermark to the start of a successful run."""
+    redis = _get_redis()
+    if not redis:
+        return
+    try:
+        data = cast(str | None, redis.get(_SUBSCRIBER_SYNC_WATERMARK_KEY))
+        state = json.loads(data) if data else {}
+        state["synced_at"] = started_at.isoformat()
+        if full:
+            state["full_at"] = started_at.isoformat()
+        redis.set(_SUBSCRIBER_SYNC_WATERMARK_KEY, json.dumps(state))
+    except Exception as exc:
+        logger.warning("selfcare_subscriber_sync_watermark_save_failed error=%s", exc)
+
+
 def get_customer_sync_history(limit: int = 10) -> list[dict[str, Any]]:
     """Return recent selfcare customer sync history, most recent first."""
     redis = _get_redis()
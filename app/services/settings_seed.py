@@ -685,6 +685,20 @@ def seed_scheduler_settings(db: Session) -> None:
         value_type=SettingValueType.integer,
         value_text=os.getenv("INFRASTRUCTURE_HEALTH_CHECK_INTERVAL_SECONDS", "300"),
     )
+    scheduler_settings.ensure_by_key(
+        db,
+        key="zabbix_monitoring_snapshot_enabled",
+        value_type=SettingValueType.boolean,
+        value_text=os.getenv("ZABBIX_MONITORING_SNAPSHOT_ENABLED", "true"),
+        value_json=os.getenv("ZABBIX_MONITORING_SNAPSHOT_ENABLED", "true").strip().lower()
+        in {"1", "true", "yes", "on"},
+    )
+    scheduler_settings.ensure_by_key(
+        db,
+        key="zabbix_monitoring_snapshot_interval_seconds",
+        value_type=SettingValueType.integer,
+        value_text=os.getenv("ZABBIX_MONITORING_SNAPSHOT_INTERVAL_SECONDS", "120"),
+    )
 
 
 def seed_auth_policy_settings(db: Session) -> None:
@@ -1161,6 +1175,18 @@ def seed_integration_settings(db: Session) -> None:
         value_type=SettingValueType.integer,
         value_text=os.getenv("INTELLIGENCE_DAILY_TOKEN_BUDGET", "0"),
     )
+    integration_settings.ensure_by_key(
+        db,
+        key="ai_response_cache_ttl_seconds",
+        value_type=SettingValueType.integer,
+        value_text=os.getenv("AI_RESPONSE_CACHE_TTL_SECONDS", "600"),
+    )
+    integration_settings.ensure_by_key(
+        db,
+        key="intelligence_batch_concurrency",
+        value_type=SettingValueType.integer,
+        value_text=os.getenv("INTELLIGENCE_BATCH_CONCURRENCY", "4"),
+    )
     integration_settings.ensure_by_key(
         db,
         key="intelligence_max_insights_per_run",
@@ -1245,6 +1271,12 @@ def seed_integration_settings(db: Session) -> None:
         value_type=SettingValueType.integer,
         value_text=os.getenv("VLLM_MAX_TOKENS", "2048"),
     )
+    integration_settings.ensure_by_key(
+        db,
+        key="vllm_max_concurrency",
+        value_type=SettingValueType.integer,
+        value_text=os.getenv("VLLM_MAX_CONCURRENCY", "4"),
+    )
     integration_settings.ensure_by_key(
         db,
         key="voice_transcription_model",
@@ -1297,6 +1329,12 @@ def seed_integration_settings(db: Session) -> None:
         value_type=SettingValueType.integer,
         value_text=os.getenv("VLLM_SECONDARY_MAX_TOKENS", "2048"),
     )
+    integration_settings.ensure_by_key(
+        db,
+        key="vllm_secondary_max_concurrency",
+        value_type=SettingValueType.integer,
+        value_text=os.getenv("VLLM_SECONDARY_MAX_CONCURRENCY", "2"),
+    )
     secondary_require_key_raw = os.getenv("VLLM_SECONDARY_REQUIRE_API_KEY", "false")
     integration_settings.ensure_by_key(
         db,
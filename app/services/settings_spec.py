@@ -3230,6 +3230,30 @@ SETTINGS_SPECS: list[SettingSpec] = [
         section="AI & Intelligence",
         help_text="Set to 0 for unlimited. Controls total LLM tokens consumed per day.",
     ),
+    SettingSpec(
+        domain=SettingDomain.integration,
+        key="ai_response_cache_ttl_seconds",
+        env_var="AI_RESPONSE_CACHE_TTL_SECONDS",
+        value_type=SettingValueType.integer,
+        default=600,
+        min_value=0,
+        max_value=86400,
+        label="AI Response Cache TTL (seconds)",
+        section="AI & Intelligence",
+        help_text="Reuse identical AI completions for this long. Set to 0 to disable the cache.",
+    ),
+    SettingSpec(
+        domain=SettingDomain.integration,
+        key="intelligence_batch_concurrency",
+        env_var="INTELLIGENCE_BATCH_CONCURRENCY",
+        value_type=SettingValueType.integer,
+        default=4,
+        min_value=1,
+        max_value=32,
+        label="Scheduled Analysis Concurrency",
+        section="AI & Intelligence",
+        help_text="Entities analysed in parallel by scheduled persona runs. Set to 1 to run them one at a time.",
+    ),
     SettingSpec(
         domain=SettingDomain.integration,
         key="intelligence_max_insights_per_run",
@@ -3323,6 +3347,18 @@ SETTINGS_SPECS: list[SettingSpec] = [
         label="Max Tokens",
         section="LLM Primary",
     ),
+    SettingSpec(
+        domain=SettingDomain.integration,
+        key="vllm_max_concurrency",
+        env_var="VLLM_MAX_CONCURRENCY",
+        value_type=SettingValueType.integer,
+        default=4,
+        min_value=1,
+        max_value=64,
+        label="Max Concurrent Requests",
+        section="LLM Primary",
+        help_text="Upper bound on simultaneous requests this worker sends to the endpoint.",
+    ),
     # ============== Integration Domain: Voice Transcription ==============
     SettingSpec(
         domain=SettingDomain.integration,
@@ -3457,6 +3493,18 @@ SETTINGS_SPECS: list[SettingSpec] = [
         label="Max Tokens",
         section="LLM Secondary",
     ),
+    SettingSpec(
+        domain=SettingDomain.integration,
+        key="vllm_secondary_max_concurrency",
+        env_var="VLLM_SECONDARY_MAX_CONCURRENCY",
+        value_type=SettingValueType.integer,
+        default=2,
+        min_value=1,
+        max_value=64,
+        label="Max Concurrent Requests",
+        section="LLM Secondary",
+        help_text="Upper bound on simultaneous requests this worker sends to the endpoint.",
+    ),
     # ============== Performance Domain ==============
     SettingSpec(
         domain=SettingDomain.performance,
@@ -0,0 +1,192 @@
+"""Set-based SLA breach detection.
+
+The periodic detector works through overdue clocks in keyset-paginated
+batches ordered by clock id.  Each batch is claimed with one conditional
+``UPDATE ... RETURNING`` (only clocks still running and unbreached are
+returned, so overlapping runs never breach a clock twice), its breach rows
+are written with one multi-row INSERT, and notifications fan out per entity
+type with one lookup query per type.
+
+Clocks record ``escalated_at`` once notified.  The escalation pass only
+visits breached ticket clocks without it (clocks breached synchronously
+during a ticket update), instead of every breached clock ever recorded.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from datetime import UTC, datetime
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.domain_settings import SettingDomain
+from app.models.workflow import SlaBreach, SlaBreachStatus, SlaClock, SlaClockStatus, WorkflowEntityType
+from app.services import projects as projects_service
+from app.services import settings_spec
+from app.services import tickets as tickets_service
+from app.services.common import validate_enum
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def _default_breach_status(db: Session) -> SlaBreachStatus:
+    default_status = settings_spec.resolve_value(db, SettingDomain.workflow, "default_sla_breach_status")
+    return validate_enum(default_status, SlaBreachStatus, "status") if default_status else SlaBreachStatus.open
+
+
+def _notify_breached(db: Session, clocks: list[SlaClock]) -> None:
+    projects_service.notify_project_task_sla_breaches(db, clocks)
+    tickets_service.notify_ticket_sla_breaches(db, clocks)
+
+
+def _breach_clocks(
+    db: Session,
+    clock_ids: list[uuid.UUID],
+    *,
+    now: datetime,
+    status: SlaBreachStatus,
+) -> int:
+    """Claim, record and notify one batch of overdue clocks; the caller commits."""
+    claimed_ids = (
+        db.execute(
+            update(SlaClock)
+            .where(SlaClock.id.in_(clock_ids))
+            .where(SlaClock.status == SlaClockStatus.running)
+            .where(SlaClock.breached_at.is_(None))
+            .values(status=SlaClockStatus.breached, breached_at=now, escalated_at=now)
+            .returning(SlaClock.id)
+            .execution_options(synchronize_session=False)
+        )
+        .scalars()
+        .all()
+    )
+    if not claimed_ids:
+        return 0
+
+    notes = f"Auto-detected SLA breach at {now.isoformat()}"
+    db.execute(
+        insert(SlaBreach),
+        [
+            {
+                "id": uuid.uuid4(),
+                "clock_id": clock_id,
+                "status": status,
+                "breached_at": now,
+                "notes": notes,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for clock_id in claimed_ids
+        ],
+    )
+    clocks = db.query(SlaClock).filter(SlaClock.id.in_(claimed_ids)).execution_options(populate_existing=True).all()
+    _notify_breached(db, clocks)
+    return len(claimed_ids)
+
+
+def breach_overdue_clocks(
+    db: Session,
+    *,
+    now: datetime | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict[str, int]:
+    """Breach every running clock past its due time, one committed batch at a time."""
+    now = now or datetime.now(UTC)
+    status = _default_breach_status(db)
+    checked = 0
+    breached = 0
+    errors = 0
+    last_id: uuid.UUID | None = None
+    while True:
+        stmt = (
+            select(SlaClock.id)
+            .where(SlaClock.status == SlaClockStatus.running)
+            .where(SlaClock.due_at < now)
+            .where(SlaClock.breached_at.is_(None))
+            .order_by(SlaClock.id)
+            .limit(batch_size)
+        )
+        if last_id is not None:
+            stmt = stmt.where(SlaClock.id > last_id)
+        clock_ids = list(db.scalars(stmt).all())
+        if not clock_ids:
+            break
+        last_id = clock_ids[-1]
+        checked += len(clock_ids)
+        try:
+            breached += _breach_clocks(db, clock_ids, now=now, status=status)
+            db.commit()
+            continue
+        except Exception:
+            db.rollback()
+            logger.exception("SLA breach batch failed; retrying clocks individually count=%d", len(clock_ids))
+        # Isolate the failing clock so one bad record does not hold back its batch.
+        for clock_id in clock_ids:
+            try:
+                breached += _breach_clocks(db, [clock_id], now=now, status=status)
+                db.commit()
+            except Exception:
+                db.rollback()
+                errors += 1
+                logger.exception("Failed to create SLA breach for clock %s", clock_id)
+    return {"checked": checked, "breached": breached, "errors": errors}
+
+
+def escalate_breached_ticket_clocks(
+    db: Session,
+    *,
+    now: datetime | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict[str, int]:
+    """Escalate breached ticket clocks that have not been escalated yet.
+
+    Covers clocks marked breached synchronously during a ticket update, which
+    the overdue pass never sees. ``notify_ticket_sla_breaches`` stays
+    idempotent through the ticket's ``sla_breach_notified`` flag.
+    """
+    now = now or datetime.now(UTC)
+    escalated = 0
+    errors = 0
+    last_id: uuid.UUID | None = None
+    while True:
+        query = (
+            db.query(SlaClock)
+            .filter(SlaClock.entity_type == WorkflowEntityType.ticket)
+            .filter(SlaClock.status == SlaClockStatus.breached)
+            .filter(SlaClock.escalated_at.is_(None))
+        )
+        if last_id is not None:
+            query = query.filter(SlaClock.id > last_id)
+        clocks = query.order_by(SlaClock.id).limit(batch_size).all()
+        if not clocks:
+            break
+        clock_ids = [clock.id for clock in clocks]
+        last_id = clock_ids[-1]
+        try:
+            tickets_service.notify_ticket_sla_breaches(db, clocks)
+            for clock in clocks:
+                clock.escalated_at = now
+            db.commit()
+            escalated += len(clocks)
+            continue
+        except Exception:
+            db.rollback()
+            logger.exception("SLA escalation batch failed; retrying clocks individually count=%d", len(clock_ids))
+        for clock_id in clock_ids:
+            try:
+                clock = db.get(SlaClock, clock_id)
+                if clock is None or clock.escalated_at is not None:
+                    continue
+                tickets_service.notify_ticket_sla_breaches(db, [clock])
+                clock.escalated_at = now
+                db.commit()
+                escalated += 1
+            except Exception:
+                db.rollback()
+                errors += 1
+                logger.exception("Failed to escalate breached ticket clock %s", clock_id)
+    return {"escalated": escalated, "errors": errors}
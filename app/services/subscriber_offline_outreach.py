@@ -26,12 +26,12 @@ from app.models.tickets import Ticket, TicketStatus
 from app.schemas.crm.conversation import ConversationCreate
 from app.schemas.crm.inbox import InboxSendRequest
 from app.schemas.settings import DomainSettingUpdate
-from app.services import selfcare, settings_spec, subscriber_reports, zabbix
+from app.services import selfcare, settings_spec, subscriber_reports, zabbix, zabbix_snapshot
 from app.services.common import coerce_uuid
 from app.services.crm import inbox as inbox_service
 from app.services.crm.conversations.service import Conversations, resolve_open_conversation
 from app.services.crm.inbox import cache as inbox_cache
-from app.services.crm.inbox.summaries import recompute_conversation_summary
+from app.services.crm.inbox.summaries import recompute_conversation_summaries, recompute_conversation_summary
 from app.services.crm.inbox.whatsapp_templates import list_whatsapp_templates
 from app.services.domain_settings import notification_settings
 from app.services.person_identity import ensure_person_channel
@@ -134,27 +134,8 @@ def _coerce_text(value: object | None) -> str | None:
     return text or None
 
 
-def _normalize_station_key(value: str | None) -> str:
-    text = str(value or "").strip().lower()
-    if not text:
-        return ""
-    compact = re.sub(r"[^a-z0-9]+", "", text)
-    return compact
-
-
-def _extract_station_code(value: str | None) -> str | None:
-    text = str(value or "").upper()
-    compound = re.search(r"\b([A-Z]+(?:-[A-Z]+)+)\s*-?(\d+)\b", text)
-    if compound:
-        prefix = compound.group(1).replace("-", "")
-        return f"{prefix}{compound.group(2)}".lower()
-    match = re.search(r"\b([A-Z]{1,8})\s*-\s*(\d+)\b", text)
-    if match:
-        return f"{match.group(1)}{match.group(2)}".lower()
-    alt = re.search(r"\b([A-Z]{1,8}\d+)\b", re.sub(r"[^A-Z0-9]+", " ", text))
-    if alt:
-        return alt.group(1).lower()
-    return None
+_normalize_station_key = zabbix_snapshot.normalize_station_key
+_extract_station_code = zabbix_snapshot.extract_station_code
 
 
 def _extract_site_tokens(value: str | None) -> list[str]:
@@ -314,22 +295,7 @@ def _classify_station_status(ping_state: str | None, snmp_state: str | None) ->
     return "unknown"
 
 
-def _build_monitoring_indexes(
-    rows: list[dict[str, Any]],
-) -> tuple[dict[str, dict[str, Any]], dict[str, list[dict[str, Any]]]]:
-    by_normalized: dict[str, dict[str, Any]] = {}
-    by_code: dict[str, list[dict[str, Any]]] = {}
-    for row in rows:
-        title = _coerce_text(row.get("title") or row.get("name"))
-        if not title:
-            continue
-        normalized = _normalize_station_key(title)
-        if normalized and normalized not in by_normalized:
-            by_normalized[normalized] = row
-        code = _extract_station_code(title)
-        if code:
-            by_code.setdefault(code, []).append(row)
-    return by_normalized, by_code
+_build_monitoring_indexes = zabbix_snapshot.build_station_indexes
 
 
 def _monitoring_match_from_row(row: dict[str, Any], *, method: str, confidence: str) -> MonitoringMatch:
@@ -355,6 +321,17 @@ def _fetch_monitoring_rows(db: Session) -> list[dict[str, Any]]:
     return splynx.fetch_monitoring_devices(db)
 
 
+def _load_monitoring_indexes(
+    db: Session,
+) -> tuple[list[dict[str, Any]], dict[str, dict[str, Any]], dict[str, list[dict[str, Any]]]]:
+    if splynx.fetch_monitoring_devices is zabbix.fetch_monitoring_devices:
+        snapshot = zabbix_snapshot.get_monitoring_snapshot(db)
+        return snapshot.rows, snapshot.by_normalized, snapshot.by_code
+    # A substituted monitoring source has no shared snapshot; index it per run.
+    monitoring_rows = _fetch_monitoring_rows(db)
+    return monitoring_rows, *_build_monitoring_indexes(monitoring_rows)
+
+
 def _resolve_monitoring_match(
     db: Session,
     *,
@@ -933,8 +910,7 @@ def resolve_stale_offline_outreach_conversations(
             try:
                 db.commit()
                 resolved += len(batch_resolved_conversation_ids)
-                for conversation_id in batch_resolved_conversation_ids:
-                    recompute_conversation_summary(db, conversation_id)
+                recompute_conversation_summaries(db, batch_resolved_conversation_ids)
                 db.commit()
                 inbox_cache.invalidate_inbox_list()
             except Exception as exc:
@@ -1340,8 +1316,7 @@ def enrich_rows_with_station_status(
         for customer in customers
         if isinstance(customer, dict) and str(customer.get("login") or "").strip()
     }
-    monitoring_rows = _fetch_monitoring_rows(db)
-    by_normalized, by_code = _build_monitoring_indexes(monitoring_rows)
+    monitoring_rows, by_normalized, by_code = _load_monitoring_indexes(db)
 
     for row in rows:
         row.setdefault("base_station", "")
@@ -1441,8 +1416,7 @@ def run_daily_offline_outreach(
         for customer in customers
         if isinstance(customer, dict) and str(customer.get("login") or "").strip()
     }
-    monitoring_rows = _fetch_monitoring_rows(db)
-    by_normalized, by_code = _build_monitoring_indexes(monitoring_rows)
+    monitoring_rows, by_normalized, by_code = _load_monitoring_indexes(db)
 
     subscriber_uuid_ids: list[UUID] = []
     for row in offline_rows:
@@ -1168,48 +1168,80 @@ def notify_ticket_sla_breach(db: Session, clock: SlaClock) -> None:
     a metadata flag ensures one escalation per breach. Does not commit; the
     caller (the detector task) owns the transaction.
     """
-    if clock.entity_type != WorkflowEntityType.ticket:
-        return
-    ticket = db.get(Ticket, clock.entity_id)
-    if not ticket or not ticket.is_active:
-        return
+    notify_ticket_sla_breaches(db, [clock])
 
-    metadata = dict(ticket.metadata_) if isinstance(ticket.metadata_, dict) else {}
-    if metadata.get("sla_breach_notified"):
-        return  # already escalated for this breach
 
-    now = datetime.now(UTC)
-    breached_at = clock.breached_at or now
-    metadata["sla_breached"] = True
-    metadata["sla_breached_at"] = breached_at.isoformat()
-    metadata["sla_breach_notified"] = True
-    ticket.metadata_ = metadata
+def notify_ticket_sla_breaches(db: Session, clocks: list[SlaClock]) -> None:
+    """Batch form of ``notify_ticket_sla_breach``.
+
+    Tickets and role people are loaded with one query each; each ticket still
+    gets its own notifications and ``ticket_escalated`` event.
+    """
+    ticket_clocks = [clock for clock in clocks if clock.entity_type == WorkflowEntityType.ticket]
+    if not ticket_clocks:
+        return
+    ticket_ids = {clock.entity_id for clock in ticket_clocks}
+    tickets_by_id = {ticket.id: ticket for ticket in db.query(Ticket).filter(Ticket.id.in_(ticket_ids)).all()}
+    person_ids = {
+        person_id
+        for ticket in tickets_by_id.values()
+        for person_id in (
+            ticket.ticket_manager_person_id,
+            ticket.assistant_manager_person_id,
+            ticket.assigned_to_person_id,
+        )
+        if person_id
+    }
+    emails_by_person = (
+        {
+            person.id: person.email.strip()
+            for person in db.query(Person).filter(Person.id.in_(person_ids)).all()
+            if isinstance(person.email, str) and person.email.strip()
+        }
+        if person_ids
+        else {}
+    )
 
     from app.services import email as email_service
 
-    base_url = (email_service.get_app_url(db) or "").rstrip("/")
-    ticket_ref = ticket.number or str(ticket.id)
-    ticket_url = (
-        f"{base_url}/admin/support/tickets/{ticket_ref}" if base_url else f"/admin/support/tickets/{ticket_ref}"
-    )
-    priority_label = ticket.priority.value.replace("_", " ") if ticket.priority else "n/a"
-    subject = f"SLA breach: {ticket.title}"
-    body = (
-        f"Ticket {ticket_ref} has breached its SLA resolution timeline.\n"
-        f"Priority: {priority_label}.\n"
-        f"Action required by the Ticket Manager / SPC.\n"
-        f"Open: {ticket_url}"
-    )
+    base_url: str | None = None
+    for clock in ticket_clocks:
+        ticket = tickets_by_id.get(clock.entity_id)
+        if not ticket or not ticket.is_active:
+            continue
 
-    role_person_ids = [
-        ticket.ticket_manager_person_id,
-        ticket.assistant_manager_person_id,
-        ticket.assigned_to_person_id,
-    ]
-    person_ids = [pid for pid in role_person_ids if pid]
-    if person_ids:
-        people = db.query(Person).filter(Person.id.in_(person_ids)).all()
-        recipients = {p.email.strip() for p in people if isinstance(p.email, str) and p.email.strip()}
+        metadata = dict(ticket.metadata_) if isinstance(ticket.metadata_, dict) else {}
+        if metadata.get("sla_breach_notified"):
+            continue  # already escalated for this breach
+
+        now = datetime.now(UTC)
+        breached_at = clock.breached_at or now
+        metadata["sla_breached"] = True
+        metadata["sla_breached_at"] = breached_at.isoformat()
+        metadata["sla_breach_notified"] = True
+        ticket.metadata_ = metadata
+
+        if base_url is None:
+            base_url = (email_service.get_app_url(db) or "").rstrip("/")
+        ticket_ref = ticket.number or str(ticket.id)
+        ticket_url = (
+            f"{base_url}/admin/support/tickets/{ticket_ref}" if base_url else f"/admin/support/tickets/{ticket_ref}"
+        )
+        priority_label = ticket.priority.value.replace("_", " ") if ticket.priority else "n/a"
+        subject = f"SLA breach: {ticket.title}"
+        body = (
+            f"Ticket {ticket_ref} has breached its SLA resolution timeline.\n"
+            f"Priority: {priority_label}.\n"
+            f"Action required by the Ticket Manager / SPC.\n"
+            f"Open: {ticket_url}"
+        )
+
+        role_person_ids = [
+            ticket.ticket_manager_person_id,
+            ticket.assistant_manager_person_id,
+            ticket.assigned_to_person_id,
+        ]
+        recipients = {emails_by_person[person_id] for person_id in role_person_ids if person_id in emails_by_person}
         for recipient in recipients:
             db.add(
                 Notification(
@@ -1231,23 +1263,23 @@ def notify_ticket_sla_breach(db: Session, clock: SlaClock) -> None:
                 )
             )
 
-    # Fire the escalation event even with no role recipients so webhook/ERP sync
-    # still react to the breach.
-    emit_event(
-        db,
-        EventType.ticket_escalated,
-        {
-            "ticket_id": str(ticket.id),
-            "title": ticket.title,
-            "subject": ticket.title,
-            "status": ticket.status.value if ticket.status else None,
-            "priority": ticket.priority.value if ticket.priority else None,
-            "reason": "sla_breach",
-            "breached_at": breached_at.isoformat(),
-        },
-        subscriber_id=ticket.subscriber_id,
-        ticket_id=ticket.id,
-    )
+        # Fire the escalation event even with no role recipients so webhook/ERP sync
+        # still react to the breach.
+        emit_event(
+            db,
+            EventType.ticket_escalated,
+            {
+                "ticket_id": str(ticket.id),
+                "title": ticket.title,
+                "subject": ticket.title,
+                "status": ticket.status.value if ticket.status else None,
+                "priority": ticket.priority.value if ticket.priority else None,
+                "reason": "sla_breach",
+                "breached_at": breached_at.isoformat(),
+            },
+            subscriber_id=ticket.subscriber_id,
+            ticket_id=ticket.id,
+        )
 
 
 def _resolve_ticket_sla_breaches(db: Session, clock: SlaClock) -> None:
@@ -1342,6 +1374,7 @@ def _sync_ticket_sla_clock(db: Session, ticket: Ticket, *, reset_started_at: boo
             _reopen_ticket_sla_breaches(db, clock)
             _clear_ticket_sla_breach_flags(ticket)
             clock.breached_at = None
+            clock.escalated_at = None
             clock.status = SlaClockStatus.running
             clock.paused_at = None
         else:
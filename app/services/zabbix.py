@@ -226,84 +226,120 @@ def _availability_state(value: object | None) -> str | None:
     return None
 
 
-def fetch_monitoring_devices(db: Session) -> list[dict[str, Any]]:
-    """Fetch monitoring device rows from Zabbix and normalize them for station matching."""
+_HOST_OUTPUT = ["hostid", "host", "name", "status", "available", "snmp_available"]
+_INTERFACE_OUTPUT = ["interfaceid", "type", "available"]
+
+
+def _api_result(db: Session, method: str, params: dict[str, Any]) -> list[Any] | None:
+    """Call the active connector's API, refreshing the token once; None means unavailable."""
     config = _active_connector(db)
     if config is None:
-        return []
+        return None
 
     api_url = _resolve_api_url(config.base_url)
     if not api_url:
         logger.warning("zabbix_config_incomplete reason=missing_base_url")
-        return []
+        return None
 
     timeout = _resolve_timeout(config)
     auth_token = ensure_api_token(db, config)
     if not auth_token:
         logger.warning("zabbix_config_incomplete reason=missing_auth")
-        return []
+        return None
 
     result = None
     for attempt in range(2):
         try:
-            result = _rpc_call(
-                api_url,
-                method="host.get",
-                params={
-                    "output": ["hostid", "host", "name", "status", "available", "snmp_available"],
-                    "selectInterfaces": ["interfaceid", "type", "available"],
-                },
-                timeout=timeout,
-                auth_token=auth_token,
-            )
+            result = _rpc_call(api_url, method=method, params=params, timeout=timeout, auth_token=auth_token)
             break
         except ZabbixApiError as exc:
             if exc.unauthorized and attempt == 0:
                 auth_token = refresh_api_token(db, config)
                 if auth_token:
                     continue
-            logger.error("zabbix_fetch_monitoring_failed error=%s", str(exc))
-            return []
+            logger.error("zabbix_api_call_failed method=%s error=%s", method, str(exc))
+            return None
         except Exception as exc:
-            logger.error("zabbix_fetch_monitoring_failed error=%s", str(exc))
-            return []
+            logger.error("zabbix_api_call_failed method=%s error=%s", method, str(exc))
+            return None
 
     if result is None:
-        return []
-    hosts = result.get("result")
-    if not isinstance(hosts, list):
-        return []
-
-    rows: list[dict[str, Any]] = []
-    for host in hosts:
-        if not isinstance(host, dict):
-            continue
-        title = str(host.get("name") or host.get("host") or "").strip()
-        if not title:
+        return None
+    items = result.get("result")
+    if not isinstance(items, list):
+        return None
+    return items
+
+
+def _normalize_host(host: object) -> dict[str, Any] | None:
+    if not isinstance(host, dict):
+        return None
+    title = str(host.get("name") or host.get("host") or "").strip()
+    if not title:
+        return None
+
+    ping_state = _availability_state(host.get("available"))
+    snmp_state = _availability_state(host.get("snmp_available"))
+    if snmp_state is None:
+        interfaces = host.get("interfaces")
+        if isinstance(interfaces, list):
+            for interface in interfaces:
+                if not isinstance(interface, dict):
+                    continue
+                if str(interface.get("type") or "").strip() == "2":
+                    snmp_state = _availability_state(interface.get("available"))
+                    if snmp_state is not None:
+                        break
+
+    return {
+        "id": str(host.get("hostid") or "").strip(),
+        "title": title,
+        "name": title,
+        "ping_state": ping_state or "unknown",
+        "snmp_state": snmp_state or "unknown",
+        "status": str(host.get("status") or "").strip(),
+        "source": "zabbix",
+    }
+
+
+def fetch_host_rows(db: Session, *, host_ids: list[str] | None = None) -> list[dict[str, Any]] | None:
+    """Normalized host rows, optionally limited to ``host_ids``; None if Zabbix can't be queried."""
+    params: dict[str, Any] = {"output": _HOST_OUTPUT, "selectInterfaces": _INTERFACE_OUTPUT}
+    if host_ids is not None:
+        params["hostids"] = host_ids
+    hosts = _api_result(db, "host.get", params)
+    if hosts is None:
+        return None
+    return [row for row in (_normalize_host(host) for host in hosts) if row is not None]
+
+
+def fetch_host_ids(db: Session) -> set[str] | None:
+    """Ids of every host, without interfaces; cheap enough to poll for added/removed hosts."""
+    hosts = _api_result(db, "host.get", {"output": ["hostid"]})
+    if hosts is None:
+        return None
+    return {str(host.get("hostid") or "").strip() for host in hosts if isinstance(host, dict) and host.get("hostid")}
+
+
+def fetch_changed_host_ids(db: Session, *, since: int) -> set[str] | None:
+    """Hosts with a trigger whose state changed at or after the unix time ``since``."""
+    triggers = _api_result(
+        db,
+        "trigger.get",
+        {"output": ["triggerid", "lastchange", "value"], "selectHosts": ["hostid"], "lastChangeSince": since},
+    )
+    if triggers is None:
+        return None
+    host_ids: set[str] = set()
+    for trigger in triggers:
+        if not isinstance(trigger, dict) or not isinstance(trigger.get("hosts"), list):
             continue
+        for host in trigger["hosts"]:
+            if isinstance(host, dict) and host.get("hostid"):
+                host_ids.add(str(host["hostid"]).strip())
+    return host_ids
 
-        ping_state = _availability_state(host.get("available"))
-        snmp_state = _availability_state(host.get("snmp_available"))
-        if snmp_state is None:
-            interfaces = host.get("interfaces")
-            if isinstance(interfaces, list):
-                for interface in interfaces:
-                    if not isinstance(interface, dict):
-                        continue
-                    if str(interface.get("type") or "").strip() == "2":
-                        snmp_state = _availability_state(interface.get("available"))
-                        if snmp_state is not None:
-                            break
-
-        rows.append(
-            {
-                "id": str(host.get("hostid") or "").strip(),
-                "title": title,
-                "name": title,
-                "ping_state": ping_state or "unknown",
-                "snmp_state": snmp_state or "unknown",
-                "status": str(host.get("status") or "").strip(),
-                "source": "zabbix",
-            }
-        )
-    return rows
+
+def fetch_monitoring_devices(db: Session) -> list[dict[str, Any]]:
+    """Fetch monitoring device rows from Zabbix and normalize them for station matching."""
+    return fetch_host_rows(db) or []
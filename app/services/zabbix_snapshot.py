@@ -0,0 +1,363 @@
+"""Shared, incrementally refreshed snapshot of Zabbix monitoring hosts.
+
+Outreach, infrastructure health and the network views all need the same
+normalized host rows, and outreach additionally indexes them by normalized
+station key and station code. Rather than each caller running a full
+``host.get`` with interfaces and rebuilding those indexes, a scheduled task
+keeps one snapshot in Redis:
+
+* a full ``host.get`` runs when there is no snapshot or the last full pull is
+  older than ``FULL_REFRESH_SECONDS`` (this also picks up renames and
+  enable/disable changes, which don't fire triggers);
+* otherwise only hosts with a trigger whose ``lastchange`` moved since the
+  previous poll, plus hosts that appeared, are re-read, and hosts that
+  disappeared are dropped.
+
+Readers get the rows and prebuilt indexes from a per-process copy that is
+reloaded only when the shared version moves. With no snapshot at all (Redis
+down, beat not running) they fall back to a live pull.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import redis
+from sqlalchemy.orm import Session
+
+from app.services import zabbix
+
+logger = logging.getLogger(__name__)
+
+FULL_REFRESH_SECONDS = 3600
+STALE_AFTER_SECONDS = 900
+# Re-ask for trigger changes slightly before the previous poll started so
+# clock skew between us and the Zabbix server can't drop a change.
+_CHANGE_OVERLAP_SECONDS = 60
+_LOCK_TTL_SECONDS = 120
+
+_SNAPSHOT_KEY = "zabbix:monitoring_snapshot"
+_VERSION_KEY = "zabbix:monitoring_snapshot:version"
+_LOCK_KEY = "zabbix:monitoring_snapshot:lock"
+_REDIS_TIMEOUT_SECONDS = 0.25
+_REDIS_RETRY_SECONDS = 30
+
+# KEYS[1] = lock key; ARGV[1] = our token. Deletes the lock only while we still
+# hold it, so a release after the TTL lapsed can't drop another worker's lock.
+RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def normalize_station_key(value: str | None) -> str:
+    text = str(value or "").strip().lower()
+    if not text:
+        return ""
+    compact = re.sub(r"[^a-z0-9]+", "", text)
+    return compact
+
+
+def extract_station_code(value: str | None) -> str | None:
+    text = str(value or "").upper()
+    compound = re.search(r"\b([A-Z]+(?:-[A-Z]+)+)\s*-?(\d+)\b", text)
+    if compound:
+        prefix = compound.group(1).replace("-", "")
+        return f"{prefix}{compound.group(2)}".lower()
+    match = re.search(r"\b([A-Z]{1,8})\s*-\s*(\d+)\b", text)
+    if match:
+        return f"{match.group(1)}{match.group(2)}".lower()
+    alt = re.search(r"\b([A-Z]{1,8}\d+)\b", re.sub(r"[^A-Z0-9]+", " ", text))
+    if alt:
+        return alt.group(1).lower()
+    return None
+
+
+def _row_title(row: dict[str, Any]) -> str:
+    return str(row.get("title") or row.get("name") or "").strip()
+
+
+def _index_positions(rows: list[dict[str, Any]]) -> tuple[dict[str, int], dict[str, list[int]]]:
+    by_normalized: dict[str, int] = {}
+    by_code: dict[str, list[int]] = {}
+    for position, row in enumerate(rows):
+        title = _row_title(row)
+        if not title:
+            continue
+        normalized = normalize_station_key(title)
+        if normalized and normalized not in by_normalized:
+            by_normalized[normalized] = position
+        code = extract_station_code(title)
+        if code:
+            by_code.setdefault(code, []).append(position)
+    return by_normalized, by_code
+
+
+def build_station_indexes(
+    rows: list[dict[str, Any]],
+) -> tuple[dict[str, dict[str, Any]], dict[str, list[dict[str, Any]]]]:
+    """Rows keyed by normalized title (first wins) and by extracted station code."""
+    by_normalized, by_code = _index_positions(rows)
+    return (
+        {key: rows[position] for key, position in by_normalized.items()},
+        {code: [rows[position] for position in positions] for code, positions in by_code.items()},
+    )
+
+
+@dataclass(frozen=True)
+class MonitoringSnapshot:
+    rows: list[dict[str, Any]]
+    by_normalized: dict[str, dict[str, Any]] = field(repr=False)
+    by_code: dict[str, list[dict[str, Any]]] = field(repr=False)
+    # Unix time the poll that produced this snapshot started; the next
+    # incremental poll asks for trigger changes from here.
+    changes_since: int
+    full_refreshed_at: float
+    refreshed_at: float
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: list[dict[str, Any]],
+        *,
+        changes_since: int,
+        full_refreshed_at: float,
+        refreshed_at: float,
+    ) -> MonitoringSnapshot:
+        by_normalized, by_code = build_station_indexes(rows)
+        return cls(
+            rows=rows,
+            by_normalized=by_normalized,
+            by_code=by_code,
+            changes_since=changes_since,
+            full_refreshed_at=full_refreshed_at,
+            refreshed_at=refreshed_at,
+        )
+
+    def to_payload(self) -> dict[str, Any]:
+        by_normalized, by_code = _index_positions(self.rows)
+        return {
+            "rows": self.rows,
+            "by_normalized": by_normalized,
+            "by_code": by_code,
+            "changes_since": self.changes_since,
+            "full_refreshed_at": self.full_refreshed_at,
+            "refreshed_at": self.refreshed_at,
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> MonitoringSnapshot:
+        rows = list(payload["rows"])
+        return cls(
+            rows=rows,
+            by_normalized={key: rows[position] for key, position in payload["by_normalized"].items()},
+            by_code={
+                code: [rows[position] for position in positions] for code, positions in payload["by_code"].items()
+            },
+            changes_since=int(payload["changes_since"]),
+            full_refreshed_at=float(payload["full_refreshed_at"]),
+            refreshed_at=float(payload["refreshed_at"]),
+        )
+
+
+class MonitoringSnapshotCache:
+    """Per-process copy of the snapshot, reloaded when the shared version changes."""
+
+    def __init__(self, *, client_factory: Callable[[], redis.Redis | None] | None = None) -> None:
+        self._client_factory = client_factory
+        self._client: redis.Redis | None = None
+        self._release_script: Any = None
+        self._retry_at = 0.0
+        self._snapshot: MonitoringSnapshot | None = None
+        self._version: int | None = None
+        self._guard = threading.Lock()
+
+    def _get_client(self) -> redis.Redis | None:
+        if self._client is not None:
+            return self._client
+        if time.monotonic() < self._retry_at:
+            return None
+        try:
+            if self._client_factory is not None:
+                client = self._client_factory()
+            else:
+                client = redis.Redis.from_url(
+                    os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+                    socket_connect_timeout=_REDIS_TIMEOUT_SECONDS,
+                    socket_timeout=_REDIS_TIMEOUT_SECONDS,
+                )
+                client.ping()
+        except redis.RedisError as exc:
+            self._retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+            logger.debug("zabbix_snapshot_redis_unavailable error=%s", exc)
+            return None
+        self._client = client
+        if client is not None:
+            self._release_script = client.register_script(RELEASE_LOCK_LUA)
+        return client
+
+    def _drop_client(self, exc: Exception) -> None:
+        self._client = None
+        self._release_script = None
+        self._retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+        logger.debug("zabbix_snapshot_redis_error error=%s", exc)
+
+    def _load(self) -> MonitoringSnapshot | None:
+        client = self._get_client()
+        if client is None:
+            return self._snapshot
+        try:
+            version = int(client.get(_VERSION_KEY) or 0)
+            if version == self._version and self._snapshot is not None:
+                return self._snapshot
+            raw = client.get(_SNAPSHOT_KEY)
+        except redis.RedisError as exc:
+            self._drop_client(exc)
+            return self._snapshot
+        if raw is None:
+            return self._snapshot
+        try:
+            snapshot = MonitoringSnapshot.from_payload(json.loads(raw))
+        except (ValueError, KeyError, TypeError, IndexError) as exc:
+            logger.warning("zabbix_snapshot_corrupt error=%s", exc)
+            return self._snapshot
+        self._snapshot, self._version = snapshot, version
+        return snapshot
+
+    def _store(self, snapshot: MonitoringSnapshot) -> None:
+        self._snapshot = snapshot
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline()
+            pipe.set(_SNAPSHOT_KEY, json.dumps(snapshot.to_payload()), ex=FULL_REFRESH_SECONDS * 2)
+            pipe.incr(_VERSION_KEY)
+            _, version = pipe.execute()
+        except redis.RedisError as exc:
+            self._drop_client(exc)
+            return
+        self._version = int(version)
+
+    def _acquire(self) -> str | None:
+        """Cross-worker refresh lock; without Redis the local guard is enough."""
+        token = uuid.uuid4().hex
+        client = self._get_client()
+        if client is None:
+            return token
+        try:
+            if client.set(_LOCK_KEY, token, nx=True, ex=_LOCK_TTL_SECONDS):
+                return token
+            return None
+        except redis.RedisError as exc:
+            self._drop_client(exc)
+            return token
+
+    def _release(self, token: str) -> None:
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            self._release_script(keys=[_LOCK_KEY], args=[token])
+        except redis.RedisError as exc:
+            self._drop_client(exc)
+
+    def refresh(self, db: Session, *, full: bool = False) -> MonitoringSnapshot | None:
+        """Poll Zabbix and publish a new snapshot.
+
+        Returns None when another worker holds the refresh lock or Zabbix
+        can't be queried; the previous snapshot is left in place.
+        """
+        with self._guard:
+            token = self._acquire()
+            if token is None:
+                return None
+            try:
+                return self._refresh(db, full=full)
+            finally:
+                self._release(token)
+
+    def _refresh(self, db: Session, *, full: bool) -> MonitoringSnapshot | None:
+        started = time.time()
+        current = self._load()
+        if full or current is None or started - current.full_refreshed_at >= FULL_REFRESH_SECONDS:
+            rows = zabbix.fetch_host_rows(db)
+            if rows is None:
+                return None
+            snapshot = MonitoringSnapshot.from_rows(
+                rows,
+                changes_since=int(started),
+                full_refreshed_at=started,
+                refreshed_at=started,
+            )
+            refreshed = len(rows)
+            kind = "full"
+        else:
+            host_ids = zabbix.fetch_host_ids(db)
+            changed = zabbix.fetch_changed_host_ids(db, since=current.changes_since - _CHANGE_OVERLAP_SECONDS)
+            if host_ids is None or changed is None:
+                return None
+            rows_by_id = {row["id"]: row for row in current.rows if row["id"] in host_ids}
+            stale = (changed & host_ids) | (host_ids - rows_by_id.keys())
+            if stale:
+                fresh = zabbix.fetch_host_rows(db, host_ids=sorted(stale))
+                if fresh is None:
+                    return None
+                for host_id in stale:
+                    rows_by_id.pop(host_id, None)
+                rows_by_id.update((row["id"], row) for row in fresh)
+            snapshot = MonitoringSnapshot.from_rows(
+                list(rows_by_id.values()),
+                changes_since=int(started),
+                full_refreshed_at=current.full_refreshed_at,
+                refreshed_at=started,
+            )
+            refreshed = len(stale)
+            kind = "incremental"
+        self._store(snapshot)
+        logger.info(
+            "zabbix_snapshot_refreshed kind=%s hosts=%d refreshed=%d duration_ms=%.1f",
+            kind,
+            len(snapshot.rows),
+            refreshed,
+            (time.time() - started) * 1000,
+        )
+        return snapshot
+
+    def get(self, db: Session) -> MonitoringSnapshot:
+        snapshot = self._load()
+        if snapshot is not None and time.time() - snapshot.refreshed_at < STALE_AFTER_SECONDS:
+            return snapshot
+        refreshed = self.refresh(db)
+        if refreshed is not None:
+            return refreshed
+        if snapshot is not None:
+            return snapshot
+        # Another worker is building the first snapshot, or Zabbix is down:
+        # answer from a live pull without publishing it.
+        rows = zabbix.fetch_host_rows(db) or []
+        now = time.time()
+        return MonitoringSnapshot.from_rows(rows, changes_since=int(now), full_refreshed_at=now, refreshed_at=now)
+
+
+_cache = MonitoringSnapshotCache()
+
+
+def get_monitoring_snapshot(db: Session) -> MonitoringSnapshot:
+    """Current monitoring rows and station indexes, refreshing inline only if missing or stale."""
+    return _cache.get(db)
+
+
+def refresh_monitoring_snapshot(db: Session, *, full: bool = False) -> MonitoringSnapshot | None:
+    return _cache.refresh(db, full=full)
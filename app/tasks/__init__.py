@@ -17,12 +17,15 @@ from app.tasks.campaigns import (
     process_scheduled_campaigns,
 )
 from app.tasks.crm_inbox import (
+    backfill_crm_metric_rollups_task,
     backfill_two_queue_dispatch_task,
     check_two_queue_cutover_readiness_task,
     cleanup_old_outbox_task,
     process_outbox_queue_task,
     reassign_stale_ai_handoffs_task,
+    reconcile_inbox_counters_task,
     reconcile_response_obligations_task,
+    refresh_crm_metric_rollups_task,
     reopen_due_snoozed_conversations_task,
     run_two_queue_dispatch_task,
     send_outbound_message_task,
@@ -35,7 +38,7 @@ from app.tasks.customer_retention import (
 )
 from app.tasks.field import prune_field_location_pings
 from app.tasks.gis import sync_gis_sources
-from app.tasks.infrastructure_health import run_infrastructure_health_checks
+from app.tasks.infrastructure_health import refresh_zabbix_monitoring_snapshot, run_infrastructure_health_checks
 from app.tasks.integrations import (
     detect_dotmac_erp_identity_drift,
     redrive_failed_erp_pushes,
@@ -68,6 +71,7 @@ from app.tasks.subscriber_outreach import (
     run_daily_offline_outreach_task,
 )
 from app.tasks.subscribers import (
+    poll_customer_uptime,
     reconcile_subscriber_identity,
     refresh_billing_risk_cache,
     refresh_retention_churn_detail_cache,
@@ -88,6 +92,7 @@ from app.tasks.workflow import detect_sla_breaches, send_daily_sla_violation_rep
 
 __all__ = [
     "aggregate_bandwidth_to_metrics",
+    "backfill_crm_metric_rollups_task",
     "backfill_two_queue_dispatch_task",
     "capture_data_health_baseline",
     "check_token_health",
@@ -104,6 +109,7 @@ __all__ = [
     "expire_stale_insights",
     "generate_flagged_reviews",
     "invoke_persona_async",
+    "poll_customer_uptime",
     "process_bandwidth_stream",
     "process_email_webhook",
     "process_meta_webhook",
@@ -116,14 +122,17 @@ __all__ = [
     "prune_snoozes",
     "reassign_stale_ai_handoffs_task",
     "reconcile_churning_retention_customers_to_selfcare",
+    "reconcile_inbox_counters_task",
     "reconcile_response_obligations_task",
     "reconcile_subscriber_identity",
     "redrive_failed_erp_pushes",
     "refresh_billing_risk_cache",
+    "refresh_crm_metric_rollups_task",
     "refresh_expiring_tokens",
     "refresh_material_request_erp_status",
     "refresh_pending_material_request_erp_statuses",
     "refresh_retention_churn_detail_cache",
+    "refresh_zabbix_monitoring_snapshot",
     "reopen_due_snoozed_conversations_task",
     "requeue_stale_pending_deliveries",
     "resolve_stale_offline_outreach_conversations_task",
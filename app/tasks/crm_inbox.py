@@ -128,6 +128,92 @@ def reconcile_response_obligations_task(limit: int = 200):
         observe_job("crm_response_obligations_reconcile", status, time.monotonic() - start)
 
 
+@celery_app.task(name="app.tasks.crm_inbox.reconcile_inbox_counters")
+def reconcile_inbox_counters_task():
+    """Correct drift between the inbox counters and the conversation summaries."""
+    import logging
+    import time
+
+    from app.metrics import observe_job
+    from app.services.crm.inbox.counters import reconcile_counters
+
+    logger = logging.getLogger(__name__)
+    start = time.monotonic()
+    status = "success"
+    session = SessionLocal()
+    try:
+        result = reconcile_counters(session)
+        session.commit()
+        logger.info(
+            "CRM_INBOX_COUNTERS_RECONCILED buckets=%s corrected=%s removed=%s",
+            result["buckets"],
+            result["corrected"],
+            result["removed"],
+        )
+        return result
+    except Exception:
+        status = "error"
+        session.rollback()
+        raise
+    finally:
+        session.close()
+        observe_job("crm_inbox_counters_reconcile", status, time.monotonic() - start)
+
+
+@celery_app.task(name="app.tasks.crm_inbox.refresh_crm_metric_rollups")
+def refresh_crm_metric_rollups_task():
+    """Rebuild dirty and missing hours of the CRM reporting rollups."""
+    import logging
+    import time
+
+    from app.metrics import observe_job
+    from app.services.crm.metric_rollups import refresh_rollups
+
+    logger = logging.getLogger(__name__)
+    start = time.monotonic()
+    status = "success"
+    session = SessionLocal()
+    try:
+        result = refresh_rollups(session)
+        logger.info("CRM_METRIC_ROLLUPS_REFRESHED dirty=%s built=%s", result["dirty"], result["built"])
+        return result
+    except Exception:
+        status = "error"
+        session.rollback()
+        raise
+    finally:
+        session.close()
+        observe_job("crm_metric_rollups_refresh", status, time.monotonic() - start)
+
+
+@celery_app.task(name="app.tasks.crm_inbox.backfill_crm_metric_rollups")
+def backfill_crm_metric_rollups_task(days: int = 90):
+    """Recompute the last ``days`` of CRM reporting rollups in one go."""
+    import logging
+    import time
+    from datetime import UTC, datetime, timedelta
+
+    from app.metrics import observe_job
+    from app.services.crm.metric_rollups import backfill_rollups
+
+    logger = logging.getLogger(__name__)
+    start = time.monotonic()
+    status = "success"
+    session = SessionLocal()
+    try:
+        end_at = datetime.now(UTC)
+        hours = backfill_rollups(session, end_at - timedelta(days=days), end_at)
+        logger.info("CRM_METRIC_ROLLUPS_BACKFILLED days=%s hours=%s", days, hours)
+        return {"hours": hours}
+    except Exception:
+        status = "error"
+        session.rollback()
+        raise
+    finally:
+        session.close()
+        observe_job("crm_metric_rollups_backfill", status, time.monotonic() - start)
+
+
 @celery_app.task(name="app.tasks.crm_inbox.escalate_expired_ai_intake_conversations")
 def escalate_expired_ai_intake_conversations_task(limit: int = 200):
     import logging
@@ -1,6 +1,7 @@
 """Celery tasks for event system maintenance.
 
-Handles retry of failed events and cleanup of old event records.
+Handles outbox consumption, retry of failed events and cleanup of old event
+records.
 """
 
 import logging
@@ -15,6 +16,38 @@ logger = logging.getLogger(__name__)
 MAX_RETRIES = 3
 MAX_EVENT_AGE_HOURS = 24
 BATCH_SIZE = 100
+OUTBOX_MAX_BATCHES_PER_RUN = 50
+
+
+@celery_app.task(name="app.tasks.events.process_event_outbox")
+def process_event_outbox(batch_size: int = BATCH_SIZE, max_batches: int = OUTBOX_MAX_BATCHES_PER_RUN):
+    """Run handlers for pending outbox events.
+
+    Drains the outbox a batch at a time until it is empty or ``max_batches``
+    have been processed. Any number of workers can run this concurrently;
+    rows are claimed with SKIP LOCKED so each event is handled once.
+    """
+    from app.services.events.dispatcher import get_dispatcher
+
+    session = SessionLocal()
+    try:
+        dispatcher = get_dispatcher()
+        totals = {"claimed": 0, "completed": 0, "failed": 0}
+        for _ in range(max(max_batches, 1)):
+            result = dispatcher.process_outbox(session, batch_size=batch_size)
+            for key in totals:
+                totals[key] += result[key]
+            if result["claimed"] < batch_size:
+                break
+        if totals["claimed"]:
+            logger.info(f"Event outbox batch completed: {totals}")
+        return totals
+
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
 
 
 @celery_app.task(name="app.tasks.events.retry_failed_events")
@@ -30,3 +30,29 @@ def run_infrastructure_health_checks() -> dict:
     finally:
         session.close()
         observe_job("run_infrastructure_health_checks", status, time.monotonic() - start)
+
+
+@celery_app.task(
+    name="app.tasks.infrastructure_health.refresh_zabbix_monitoring_snapshot",
+    soft_time_limit=100,
+    time_limit=110,
+)
+def refresh_zabbix_monitoring_snapshot() -> dict:
+    start = time.monotonic()
+    status = "success"
+    session = SessionLocal()
+    try:
+        from app.services import zabbix_snapshot
+
+        snapshot = zabbix_snapshot.refresh_monitoring_snapshot(session)
+        if snapshot is None:
+            status = "skipped"
+            return {"refreshed": False}
+        return {"refreshed": True, "hosts": len(snapshot.rows)}
+    except Exception:
+        status = "error"
+        session.rollback()
+        raise
+    finally:
+        session.close()
+        observe_job("refresh_zabbix_monitoring_snapshot", status, time.monotonic() - start)
@@ -29,6 +29,17 @@ def _bool(value: object | None, default: bool = False) -> bool:
     return default
 
 
+def _int(value: object | None, default: int) -> int:
+    try:
+        if isinstance(value, bool | int | float):
+            return int(value)
+        if isinstance(value, str):
+            return int(value.strip())
+    except (TypeError, ValueError):
+        pass
+    return default
+
+
 @celery_app.task(name="app.tasks.intelligence.run_scheduled_analysis")
 def run_scheduled_analysis(persona_key: str | None = None) -> dict:
     session = SessionLocal()
@@ -39,18 +50,9 @@ def run_scheduled_analysis(persona_key: str | None = None) -> dict:
             return {"enabled": False, "reason": "intelligence_disabled"}
 
         max_per_run = resolve_value(session, SettingDomain.integration, "intelligence_max_insights_per_run")
-        try:
-            if max_per_run is None:
-                max_per_run_int = 50
-            elif isinstance(max_per_run, bool | int | float):
-                max_per_run_int = int(max_per_run)
-            elif isinstance(max_per_run, str):
-                max_per_run_int = int(max_per_run.strip())
-            else:
-                max_per_run_int = 50
-        except (TypeError, ValueError):
-            max_per_run_int = 50
-        max_per_run_int = max(1, min(max_per_run_int, 500))
+        max_per_run_int = max(1, min(_int(max_per_run, 50), 500))
+        concurrency = _int(resolve_value(session, SettingDomain.integration, "intelligence_batch_concurrency"), 4)
+        concurrency = max(1, min(concurrency, 32))
 
         if persona_key:
             specs = [persona_registry.get(persona_key)]
@@ -73,20 +75,20 @@ def run_scheduled_analysis(persona_key: str | None = None) -> dict:
                     continue
 
                 entity_params_list = scanner(session, spec.key, limit=max_per_run_int - generated_total)
-                count = 0
-                for entity_type, entity_id, params in entity_params_list:
-                    intelligence_engine.invoke(
-                        session,
-                        persona_key=spec.key,
-                        params=params,
-                        entity_type=entity_type,
-                        entity_id=entity_id,
-                        trigger="scheduled",
-                        triggered_by_person_id=None,
-                    )
-                    count += 1
-                    generated_total += 1
+                stats = intelligence_engine.invoke_batch(
+                    session,
+                    persona_key=spec.key,
+                    items=entity_params_list,
+                    trigger="scheduled",
+                    concurrency=concurrency,
+                )
+                count = stats["generated"] + stats["skipped"]
+                generated_total += count
                 results[spec.key] = {"generated": count}
+                if stats["failed"]:
+                    results[spec.key]["failed"] = stats["failed"]
+                if stats["budget_exhausted"]:
+                    results[spec.key]["budget_exhausted"] = stats["budget_exhausted"]
             except Exception:
                 session.rollback()
                 logger.exception("Scheduled analysis failed for persona=%s", spec.key)
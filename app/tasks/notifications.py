@@ -1,3 +1,5 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import UTC, datetime, timedelta
 
 import httpx
@@ -23,6 +25,143 @@ from app.services.branding import get_branding
 # Timeout for stuck "sending" notifications (5 minutes)
 SENDING_TIMEOUT_MINUTES = 5
 
+# Parallel SMTP submissions per queue run; each worker reuses pooled connections.
+DEFAULT_EMAIL_DELIVERY_CONCURRENCY = 4
+
+
+def _email_delivery_concurrency() -> int:
+    try:
+        value = int(os.getenv("EMAIL_DELIVERY_CONCURRENCY", DEFAULT_EMAIL_DELIVERY_CONCURRENCY))
+    except ValueError:
+        value = DEFAULT_EMAIL_DELIVERY_CONCURRENCY
+    return max(value, 1)
+
+
+def _resolve_email_configs(db, notifications: list[Notification]) -> dict:
+    """Resolve the SMTP config for each notification in the main thread.
+
+    Returns ``{notification_id: config | Exception}``. Campaign SMTP profiles
+    and the default config are looked up once per batch instead of per message.
+    """
+    missing_ids = [n.id for n in notifications if not n.smtp_config_id]
+    if missing_ids:
+        campaign_smtp_ids = dict(
+            db.query(CampaignRecipient.notification_id, Campaign.campaign_smtp_config_id)
+            .join(Campaign, CampaignRecipient.campaign_id == Campaign.id)
+            .filter(CampaignRecipient.notification_id.in_(missing_ids))
+            .filter(Campaign.campaign_smtp_config_id.isnot(None))
+            .all()
+        )
+        changed = False
+        for notification in notifications:
+            campaign_smtp_id = campaign_smtp_ids.get(notification.id)
+            if not notification.smtp_config_id and campaign_smtp_id:
+                notification.smtp_config_id = campaign_smtp_id
+                changed = True
+        if changed:
+            db.commit()
+
+    profiles: dict = {}
+    default_config: dict | None = None
+    company_name: str | None = None
+    configs: dict = {}
+    for notification in notifications:
+        try:
+            if notification.smtp_config_id:
+                if notification.smtp_config_id not in profiles:
+                    profiles[notification.smtp_config_id] = db.get(CampaignSmtpConfig, notification.smtp_config_id)
+                smtp_profile = profiles[notification.smtp_config_id]
+                if not smtp_profile or not smtp_profile.is_active:
+                    raise ValueError("SMTP profile not found or inactive")
+                if company_name is None and not notification.from_name:
+                    company_name = get_branding(db)["company_name"]
+                configs[notification.id] = {
+                    "host": smtp_profile.host,
+                    "port": smtp_profile.port,
+                    "username": smtp_profile.username,
+                    "password": smtp_profile.password,
+                    "use_tls": smtp_profile.use_tls,
+                    "use_ssl": smtp_profile.use_ssl,
+                    "from_name": notification.from_name or company_name,
+                    "from_email": notification.from_email or "noreply@example.com",
+                    "from_addr": notification.from_email or "noreply@example.com",
+                }
+            else:
+                if default_config is None:
+                    default_config = email_service._get_smtp_config(db)
+                config = dict(default_config)
+                if notification.from_name:
+                    config["from_name"] = notification.from_name
+                if notification.from_email:
+                    config["from_email"] = notification.from_email
+                    config["from_addr"] = notification.from_email
+                configs[notification.id] = config
+        except Exception as exc:
+            configs[notification.id] = exc
+    return configs
+
+
+def _deliver_email_notifications(db, notifications: list[Notification]) -> int:
+    """Send queued email notifications over pooled SMTP connections.
+
+    Sends run on a bounded thread pool; the session is only touched from the
+    calling thread, and each result is committed as soon as it arrives.
+    """
+    if not notifications:
+        return 0
+    # Claim the whole batch before sending - updated_at auto-updates
+    for notification in notifications:
+        notification.status = NotificationStatus.sending
+    db.commit()
+
+    configs = _resolve_email_configs(db, notifications)
+    pool = email_service.get_smtp_pool()
+    by_id = {notification.id: notification for notification in notifications}
+    delivered = 0
+
+    with ThreadPoolExecutor(
+        max_workers=min(_email_delivery_concurrency(), len(notifications)),
+        thread_name_prefix="email-delivery",
+    ) as executor:
+        futures = {}
+        for notification in notifications:
+            config = configs.get(notification.id)
+            if isinstance(config, Exception):
+                notification.status = NotificationStatus.failed
+                notification.last_error = str(config)
+                continue
+            future = executor.submit(
+                email_service.send_email_with_config,
+                config,
+                notification.recipient,
+                notification.subject or "Notification",
+                notification.body or "",
+                body_text=None,
+                reply_to=notification.reply_to,
+                pool=pool,
+            )
+            futures[future] = notification.id
+        db.commit()
+
+        for future in as_completed(futures):
+            notification = by_id[futures[future]]
+            try:
+                success, _ = future.result()
+            except Exception as exc:
+                success = False
+                notification.last_error = str(exc)
+            if success:
+                notification.status = NotificationStatus.delivered
+                notification.sent_at = datetime.now(UTC)
+                notification.last_error = None
+                delivered += 1
+            else:
+                notification.status = NotificationStatus.failed
+                if not notification.last_error:
+                    notification.last_error = "send_email_failed"
+            db.commit()
+    return delivered
+
 
 def _deliver_notification_queue(db, batch_size: int = 50) -> int:
     now = datetime.now(UTC)
@@ -47,77 +186,7 @@ def _deliver_notification_queue(db, batch_size: int = 50) -> int:
         .limit(batch_size)
         .all()
     )
-    delivered = 0
-    for notification in notifications:
-        # Update status before sending - updated_at auto-updates
-        notification.status = NotificationStatus.sending
-        db.commit()
-
-        subject = notification.subject or "Notification"
-        body = notification.body or ""
-        try:
-            if not notification.smtp_config_id:
-                campaign_smtp_id = (
-                    db.query(Campaign.campaign_smtp_config_id)
-                    .join(
-                        CampaignRecipient,
-                        CampaignRecipient.campaign_id == Campaign.id,
-                    )
-                    .filter(CampaignRecipient.notification_id == notification.id)
-                    .scalar()
-                )
-                if campaign_smtp_id:
-                    notification.smtp_config_id = campaign_smtp_id
-                    db.commit()
-
-            if notification.smtp_config_id:
-                smtp_profile = db.get(CampaignSmtpConfig, notification.smtp_config_id)
-                if not smtp_profile or not smtp_profile.is_active:
-                    raise ValueError("SMTP profile not found or inactive")
-                smtp_config = {
-                    "host": smtp_profile.host,
-                    "port": smtp_profile.port,
-                    "username": smtp_profile.username,
-                    "password": smtp_profile.password,
-                    "use_tls": smtp_profile.use_tls,
-                    "use_ssl": smtp_profile.use_ssl,
-                    "from_name": notification.from_name or get_branding(db)["company_name"],
-                    "from_email": notification.from_email or "noreply@example.com",
-                    "from_addr": notification.from_email or "noreply@example.com",
-                }
-                success, _ = email_service.send_email_with_config(
-                    smtp_config,
-                    notification.recipient,
-                    subject,
-                    body,
-                    body_text=None,
-                    reply_to=notification.reply_to,
-                )
-            else:
-                success, _ = email_service.send_email(
-                    db=db,
-                    to_email=notification.recipient,
-                    subject=subject,
-                    body_html=body,
-                    body_text=None,
-                    track=False,
-                    from_name=notification.from_name,
-                    from_email=notification.from_email,
-                    reply_to=notification.reply_to,
-                )
-        except Exception as exc:
-            success = False
-            notification.last_error = str(exc)
-        if success:
-            notification.status = NotificationStatus.delivered
-            notification.sent_at = datetime.now(UTC)
-            notification.last_error = None
-            delivered += 1
-        else:
-            notification.status = NotificationStatus.failed
-            if not notification.last_error:
-                notification.last_error = "send_email_failed"
-        db.commit()
+    delivered = _deliver_email_notifications(db, notifications)
 
     sms_notifications = (
         db.query(Notification)
@@ -2,6 +2,7 @@
 
 import logging
 import time
+from datetime import UTC, datetime
 from typing import Any
 
 from app.celery_app import celery_app
@@ -15,8 +16,13 @@ logger = get_logger(__name__)
 
 
 @celery_app.task(name="app.tasks.subscribers.sync_subscribers_from_selfcare")
-def sync_subscribers_from_selfcare() -> dict[str, Any]:
-    """Reconciliation sync: pull all subscribers from Selfcare and upsert local Subscriber records."""
+def sync_subscribers_from_selfcare(full: bool = False) -> dict[str, Any]:
+    """Reconciliation sync: pull subscribers from Selfcare and upsert local Subscriber records.
+
+    Runs a delta sync of recently changed subscribers between periodic full
+    reconciliations (see ``plan_subscriber_sync``); ``full`` forces a full one.
+    An interrupted full listing resumes from its last completed page.
+    """
     start = time.monotonic()
     status = "success"
     session = SessionLocal()
@@ -26,13 +32,30 @@ def sync_subscribers_from_selfcare() -> dict[str, Any]:
 
     try:
         current_step = "sync_subscribers"
-        from app.services.selfcare import sync_subscribers_from_selfcare_data
+        from app.services.selfcare import (
+            plan_subscriber_sync,
+            record_subscriber_sync,
+            sync_subscribers_from_selfcare_data,
+        )
 
-        results = sync_subscribers_from_selfcare_data(session, include_remote_details=False, logger=logger)
+        started_at = datetime.now(UTC)
+        updated_since = None if full else plan_subscriber_sync(started_at)
+        results = sync_subscribers_from_selfcare_data(
+            session,
+            include_remote_details=False,
+            logger=logger,
+            updated_since=updated_since,
+            resume=True,
+        )
+        # A delta with failed rows keeps its window so they are fetched again; a
+        # resumed listing did not see every row, so it does not advance either.
+        if results["mode"] == "full" or (results["mode"] == "delta" and not results["errors"]):
+            record_subscriber_sync(started_at, full=results["mode"] == "full")
 
         current_step = "complete"
         logger.info(
-            "SELFCARE_SYNC_COMPLETE created=%d updated=%d errors=%d",
+            "SELFCARE_SYNC_COMPLETE mode=%s created=%d updated=%d errors=%d",
+            results["mode"],
             results["created"],
             results["updated"],
             len(results["errors"]),
@@ -202,6 +225,33 @@ def refresh_billing_risk_cache() -> dict[str, Any]:
         observe_job("billing_risk_cache_refresh", status, time.monotonic() - start)
 
 
+@celery_app.task(name="app.tasks.subscribers.poll_customer_uptime")
+def poll_customer_uptime() -> dict[str, Any]:
+    """Record one Selfcare online/offline observation per tracked service.
+
+    Guarded by a Redis leader lock so only one poll runs per interval however
+    many workers or web replicas schedule it.
+    """
+    start = time.monotonic()
+    status = "success"
+    session = SessionLocal()
+    logger = get_logger(__name__)
+    try:
+        from app.services.customer_uptime import run_uptime_poll
+
+        result = run_uptime_poll(session)
+        logger.info("CUSTOMER_UPTIME_POLL_COMPLETE result=%s", result)
+        return result
+    except Exception:
+        status = "error"
+        session.rollback()
+        logger.exception("CUSTOMER_UPTIME_POLL_ERROR")
+        raise
+    finally:
+        session.close()
+        observe_job("customer_uptime_poll", status, time.monotonic() - start)
+
+
 @celery_app.task(name="app.tasks.subscribers.refresh_retention_churn_detail_cache")
 def refresh_retention_churn_detail_cache() -> dict[str, Any]:
     """Refresh cached live details for retention-sourced churn report rows."""
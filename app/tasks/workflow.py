@@ -6,12 +6,8 @@ from zoneinfo import ZoneInfo
 
 from app.celery_app import celery_app
 from app.db import SessionLocal
-from app.models.workflow import SlaClock, SlaClockStatus, WorkflowEntityType
-from app.schemas.workflow import SlaBreachCreate
-from app.services import projects as projects_service
+from app.services import sla_breach_detector
 from app.services import sla_violation_daily_report as sla_violation_daily_report_service
-from app.services import tickets as tickets_service
-from app.services import workflow as workflow_service
 
 logger = logging.getLogger(__name__)
 
@@ -22,78 +18,18 @@ def detect_sla_breaches() -> dict[str, int]:
     Detect SLA breaches by checking all running SLA clocks.
 
     Runs every 30 minutes to identify SLA clocks that have exceeded their due_at
-    time and creates SlaBreach records for them.
+    time and creates SlaBreach records for them in keyset-paginated batches,
+    then escalates breached ticket clocks that have not been escalated yet.
 
     Returns:
-        dict with counts of checked clocks and breaches created
+        dict with counts of checked clocks, breaches created and escalations
     """
     session = SessionLocal()
-    checked = 0
-    breached = 0
-    errors = 0
     try:
         now = datetime.now(UTC)
-
-        # Find all running SLA clocks that are past due
-        overdue_clocks = (
-            session.query(SlaClock)
-            .filter(SlaClock.status == SlaClockStatus.running)
-            .filter(SlaClock.due_at < now)
-            .filter(SlaClock.breached_at.is_(None))
-            .all()
-        )
-
-        checked = len(overdue_clocks)
-        logger.info("SLA breach detection: found %d overdue clocks", checked)
-
-        for clock in overdue_clocks:
-            try:
-                payload = SlaBreachCreate(
-                    clock_id=clock.id,
-                    breached_at=now,
-                    notes=f"Auto-detected SLA breach at {now.isoformat()}",
-                )
-                workflow_service.sla_breaches.create(session, payload)
-                session.refresh(clock)
-                projects_service.notify_project_task_sla_breach(session, clock)
-                tickets_service.notify_ticket_sla_breach(session, clock)
-                session.commit()
-                breached += 1
-                logger.debug(
-                    "Created SLA breach for clock %s (entity: %s/%s)",
-                    clock.id,
-                    clock.entity_type.value,
-                    clock.entity_id,
-                )
-            except Exception as exc:
-                errors += 1
-                logger.exception(
-                    "Failed to create SLA breach for clock %s: %s",
-                    clock.id,
-                    exc,
-                )
-                session.rollback()
-                continue
-
-        # Escalate breached *ticket* clocks the loop above skips — those marked
-        # breached synchronously during a ticket update (breached_at already set,
-        # so excluded from the overdue query). notify_ticket_sla_breach is
-        # idempotent, so tickets already escalated are no-ops.
-        breached_ticket_clocks = (
-            session.query(SlaClock)
-            .filter(SlaClock.entity_type == WorkflowEntityType.ticket)
-            .filter(SlaClock.status == SlaClockStatus.breached)
-            .all()
-        )
-        for clock in breached_ticket_clocks:
-            try:
-                tickets_service.notify_ticket_sla_breach(session, clock)
-                session.commit()
-            except Exception:
-                errors += 1
-                session.rollback()
-                logger.exception("Failed to escalate breached ticket clock %s", clock.id)
-
+        detection = sla_breach_detector.breach_overdue_clocks(session, now=now)
+        logger.info("SLA breach detection: found %d overdue clocks", detection["checked"])
+        escalation = sla_breach_detector.escalate_breached_ticket_clocks(session, now=now)
     except Exception:
         session.rollback()
         logger.exception("SLA breach detection task failed")
@@ -101,13 +37,20 @@ def detect_sla_breaches() -> dict[str, int]:
     finally:
         session.close()
 
+    result = {
+        "checked": detection["checked"],
+        "breached": detection["breached"],
+        "escalated": escalation["escalated"],
+        "errors": detection["errors"] + escalation["errors"],
+    }
     logger.info(
-        "SLA breach detection complete: checked=%d, breached=%d, errors=%d",
-        checked,
-        breached,
-        errors,
+        "SLA breach detection complete: checked=%d, breached=%d, escalated=%d, errors=%d",
+        result["checked"],
+        result["breached"],
+        result["escalated"],
+        result["errors"],
     )
-    return {"checked": checked, "breached": breached, "errors": errors}
+    return result
 
 
 @celery_app.task(name="app.tasks.workflow.send_daily_sla_violation_report")
@@ -1,19 +1,16 @@
 """Admin reports web routes."""
 
-import csv
-import io
 import json
 import logging
 import re
 import threading
 import time
-from collections.abc import Callable, Mapping
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence, Sized
 from datetime import UTC, datetime, timedelta
 from typing import Any, Literal, TypedDict
 from urllib.parse import quote, urlencode
 from uuid import UUID
 from xml.sax.saxutils import escape  # nosec B406 - only XML-escapes generated workbook values
-from zipfile import ZIP_DEFLATED, ZipFile
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request, Response
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse
@@ -35,6 +32,7 @@ from app.services.crm import reports as crm_reports_service
 from app.services.crm import team as crm_team_service
 from app.services.person_identity import is_placeholder_email
 from app.services.quarterly_reports import build_quarterly_report
+from app.services.report_export import iter_csv, iter_with_session, iter_zip
 from app.tasks.subscribers import sync_subscribers_from_selfcare
 from app.web.admin._auth_helpers import get_current_user, get_sidebar_stats
 from app.web.templates import Jinja2Templates
@@ -1883,26 +1881,10 @@ def _resolve_crm_performance_date_range(
     }
 
 
-def _csv_response(data: list[dict], filename: str) -> StreamingResponse:
-    """Create a CSV streaming response."""
-    if not data:
-        output = io.StringIO()
-        output.write("No data available\n")
-        output.seek(0)
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
-
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=data[0].keys())
-    writer.writeheader()
-    writer.writerows(data)
-    output.seek(0)
-
+def _csv_response(data: Iterable[dict], filename: str) -> StreamingResponse:
+    """Create a CSV streaming response; rows are encoded as the client reads them."""
     return StreamingResponse(
-        iter([output.getvalue()]),
+        iter_csv(data),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
@@ -1933,9 +1915,9 @@ def _excel_serial_from_display_timestamp(value: str) -> float | None:
     return delta.days + (delta.seconds / 86400)
 
 
-def _xlsx_response(content: bytes, filename: str) -> Response:
-    return Response(
-        content=content,
+def _xlsx_response(content: Iterable[bytes], filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        content,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
@@ -2084,10 +2066,15 @@ def _ncc_validation_status(record: dict[str, str]) -> str:
 
 
 def _build_ncc_workbook(records: list[dict[str, str]], columns: list[str]) -> bytes:
+    return b"".join(_iter_ncc_workbook(records, columns))
+
+
+def _iter_ncc_workbook(records: Iterable[dict[str, str]], columns: list[str]) -> Iterator[bytes]:
+    """Stream the NCC workbook; worksheet rows are encoded and compressed one at a time."""
     long_text_columns = {"Description (auto)", "Resolution Note", "User Note"}
-    widths = _ncc_export_column_widths(records, columns)
+    # Width sampling only reads rows for columns without a fixed width; never consume a one-shot iterator for it.
+    widths = _ncc_export_column_widths(records if isinstance(records, Sequence) else [], columns)
     dropdown_lists = _ncc_workbook_dropdown_lists()
-    output = io.BytesIO()
 
     def cell_xml(ref: str, value: str, style_id: int) -> str:
         return (
@@ -2158,10 +2145,65 @@ def _build_ncc_workbook(records: list[dict[str, str]], columns: list[str]) -> by
             return ""
         return f'<dataValidations count="{len(validations)}">{"".join(validations)}</dataValidations>'
 
-    with ZipFile(output, "w", compression=ZIP_DEFLATED) as archive:
-        archive.writestr(
-            "[Content_Types].xml",
-            """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+    def sheet_xml() -> Iterator[str]:
+        last_column_letter = _excel_column_letter(len(columns))
+        cols_xml = "".join(
+            f'<col min="{index}" max="{index}" width="{width}" customWidth="1"/>'
+            for index, width in enumerate(widths, start=1)
+        )
+        dimension_xml = (
+            f'<dimension ref="A1:{last_column_letter}{len(records) + 1}"/>' if isinstance(records, Sized) else ""
+        )
+        yield f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+  {dimension_xml}
+  <sheetViews>
+    <sheetView workbookViewId="0">
+      <pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>
+      <selection pane="bottomLeft" activeCell="A2" sqref="A2"/>
+    </sheetView>
+  </sheetViews>
+  <sheetFormatPr defaultRowHeight="18"/>
+  <cols>{cols_xml}</cols>
+  <sheetData>"""
+        header_cells = [
+            cell_xml(f"{_excel_column_letter(index)}1", column, 1) for index, column in enumerate(columns, start=1)
+        ]
+        yield f'<row r="1" ht="24" customHeight="1">{"".join(header_cells)}</row>'
+        last_row_number = 1
+        for row_number, row in enumerate(records, start=2):
+            last_row_number = row_number
+            cells: list[str] = []
+            validation_status = _clean_text(row.get("VALIDATION STATUS"))
+            row_style_id = (
+                10 if validation_status.startswith("[OK]") else 11 if validation_status.startswith("[FAIL]") else None
+            )
+            for column_index, column in enumerate(columns, start=1):
+                value = " ".join(str(row.get(column) or "").strip().split())
+                if not value:
+                    continue
+                cell_ref = f"{_excel_column_letter(column_index)}{row_number}"
+                if row_style_id is not None:
+                    style_id = row_style_id
+                elif column == "Status":
+                    style_id = _ncc_status_style_id(str(row.get("_status_variant") or ""))
+                elif column in long_text_columns:
+                    style_id = 3
+                else:
+                    style_id = 2
+                cells.append(cell_xml(cell_ref, value, style_id))
+            yield f'<row r="{row_number}">{"".join(cells)}</row>'
+        yield f"""</sheetData>
+  <autoFilter ref="A1:{last_column_letter}{last_row_number}"/>
+  {data_validations_xml(max(last_row_number, 1000))}
+</worksheet>"""
+
+    generated_at = datetime.now(UTC).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+    yield from iter_zip(
+        [
+            (
+                "[Content_Types].xml",
+                """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
   <Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
   <Default Extension="xml" ContentType="application/xml"/>
@@ -2172,20 +2214,19 @@ def _build_ncc_workbook(records: list[dict[str, str]], columns: list[str]) -> by
   <Override PartName="/docProps/core.xml" ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>
   <Override PartName="/docProps/app.xml" ContentType="application/vnd.openxmlformats-officedocument.extended-properties+xml"/>
 </Types>""",
-        )
-        archive.writestr(
-            "_rels/.rels",
-            """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+            ),
+            (
+                "_rels/.rels",
+                """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
   <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
   <Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" Target="docProps/core.xml"/>
   <Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/extended-properties" Target="docProps/app.xml"/>
 </Relationships>""",
-        )
-        generated_at = datetime.now(UTC).replace(microsecond=0).isoformat().replace("+00:00", "Z")
-        archive.writestr(
-            "docProps/core.xml",
-            f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+            ),
+            (
+                "docProps/core.xml",
+                f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" xmlns:dcmitype="http://purl.org/dc/dcmitype/" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
   <dc:title>{escape(_NCC_EXPORT_TITLE)}</dc:title>
   <dc:creator>Dotmac CRM</dc:creator>
@@ -2193,36 +2234,36 @@ def _build_ncc_workbook(records: list[dict[str, str]], columns: list[str]) -> by
   <dcterms:created xsi:type="dcterms:W3CDTF">{generated_at}</dcterms:created>
   <dcterms:modified xsi:type="dcterms:W3CDTF">{generated_at}</dcterms:modified>
 </cp:coreProperties>""",
-        )
-        archive.writestr(
-            "docProps/app.xml",
-            """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+            ),
+            (
+                "docProps/app.xml",
+                """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties" xmlns:vt="http://schemas.openxmlformats.org/officeDocument/2006/docPropsVTypes">
   <Application>Dotmac CRM</Application>
 </Properties>""",
-        )
-        archive.writestr(
-            "xl/_rels/workbook.xml.rels",
-            """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+            ),
+            (
+                "xl/_rels/workbook.xml.rels",
+                """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
   <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
   <Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet2.xml"/>
   <Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
 </Relationships>""",
-        )
-        archive.writestr(
-            "xl/workbook.xml",
-            """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+            ),
+            (
+                "xl/workbook.xml",
+                """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
   <sheets>
     <sheet name="NCC Reports" sheetId="1" r:id="rId1"/>
     <sheet name="_NCC_Dropdowns" sheetId="2" state="hidden" r:id="rId2"/>
   </sheets>
 </workbook>""",
-        )
-        archive.writestr(
-            "xl/styles.xml",
-            """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+            ),
+            (
+                "xl/styles.xml",
+                """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
   <numFmts count="1">
     <numFmt numFmtId="164" formatCode="yyyy-mm-dd hh:mm:ss"/>
@@ -2284,63 +2325,11 @@ def _build_ncc_workbook(records: list[dict[str, str]], columns: list[str]) -> by
     <cellStyle name="Normal" xfId="0" builtinId="0"/>
   </cellStyles>
 </styleSheet>""",
-        )
-
-        last_column_letter = _excel_column_letter(len(columns))
-        last_row_number = len(records) + 1
-        validation_max_row = max(last_row_number, 1000)
-        cols_xml = "".join(
-            f'<col min="{index}" max="{index}" width="{width}" customWidth="1"/>'
-            for index, width in enumerate(widths, start=1)
-        )
-        rows_xml: list[str] = []
-        header_cells = [
-            cell_xml(f"{_excel_column_letter(index)}1", column, 1) for index, column in enumerate(columns, start=1)
+            ),
+            ("xl/worksheets/sheet1.xml", sheet_xml()),
+            ("xl/worksheets/sheet2.xml", dropdown_sheet_xml()),
         ]
-        rows_xml.append(f'<row r="1" ht="24" customHeight="1">{"".join(header_cells)}</row>')
-        for row_number, row in enumerate(records, start=2):
-            cells: list[str] = []
-            validation_status = _clean_text(row.get("VALIDATION STATUS"))
-            row_style_id = (
-                10 if validation_status.startswith("[OK]") else 11 if validation_status.startswith("[FAIL]") else None
-            )
-            for column_index, column in enumerate(columns, start=1):
-                value = " ".join(str(row.get(column) or "").strip().split())
-                if not value:
-                    continue
-                cell_ref = f"{_excel_column_letter(column_index)}{row_number}"
-                if row_style_id is not None:
-                    style_id = row_style_id
-                elif column == "Status":
-                    style_id = _ncc_status_style_id(str(row.get("_status_variant") or ""))
-                elif column in long_text_columns:
-                    style_id = 3
-                else:
-                    style_id = 2
-                cells.append(cell_xml(cell_ref, value, style_id))
-            rows_xml.append(f'<row r="{row_number}">{"".join(cells)}</row>')
-
-        archive.writestr(
-            "xl/worksheets/sheet1.xml",
-            f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
-<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
-  <dimension ref="A1:{last_column_letter}{last_row_number}"/>
-  <sheetViews>
-    <sheetView workbookViewId="0">
-      <pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>
-      <selection pane="bottomLeft" activeCell="A2" sqref="A2"/>
-    </sheetView>
-  </sheetViews>
-  <sheetFormatPr defaultRowHeight="18"/>
-  <cols>{cols_xml}</cols>
-  <sheetData>{"".join(rows_xml)}</sheetData>
-  <autoFilter ref="A1:{last_column_letter}{last_row_number}"/>
-  {data_validations_xml(validation_max_row)}
-</worksheet>""",
-        )
-        archive.writestr("xl/worksheets/sheet2.xml", dropdown_sheet_xml())
-
-    return output.getvalue()
+    )
 
 
 def _append_query_flag(url: str, key: str, value: str) -> str:
@@ -4051,25 +4040,43 @@ def _parse_ncc_window(start_date: str | None, end_date: str | None) -> tuple[dat
     return start_dt, end_dt, start_value, end_value
 
 
-def _build_ncc_records(db: Session, start_dt: datetime, end_dt: datetime) -> list[dict[str, str]]:
-    tickets = (
-        db.scalars(
-            select(Ticket)
-            .options(
-                joinedload(Ticket.customer),
-                joinedload(Ticket.created_by),
-                joinedload(Ticket.subscriber).joinedload(Subscriber.person),
-                joinedload(Ticket.subscriber).joinedload(Subscriber.organization),
-                joinedload(Ticket.comments).joinedload(TicketComment.author),
-                selectinload(Ticket.assignees),
+_NCC_RECORD_CHUNK_SIZE = 500
+
+
+def _build_ncc_records(db: Session, start_dt: datetime, end_dt: datetime) -> Iterator[dict[str, str]]:
+    """Yield NCC records for tickets created in the window, oldest first.
+
+    Tickets are loaded ``_NCC_RECORD_CHUNK_SIZE`` at a time with their comments,
+    contacts and fallback-person lookups, so memory stays bounded by one chunk
+    rather than the whole window.
+    """
+    ticket_ids = db.scalars(
+        select(Ticket.id)
+        .where(Ticket.created_at >= start_dt, Ticket.created_at <= end_dt)
+        .order_by(Ticket.created_at.asc(), Ticket.id.asc())
+    ).all()
+    for offset in range(0, len(ticket_ids), _NCC_RECORD_CHUNK_SIZE):
+        tickets = (
+            db.scalars(
+                select(Ticket)
+                .options(
+                    joinedload(Ticket.customer),
+                    joinedload(Ticket.created_by),
+                    joinedload(Ticket.subscriber).joinedload(Subscriber.person),
+                    joinedload(Ticket.subscriber).joinedload(Subscriber.organization),
+                    joinedload(Ticket.comments).joinedload(TicketComment.author),
+                    selectinload(Ticket.assignees),
+                )
+                .where(Ticket.id.in_(ticket_ids[offset : offset + _NCC_RECORD_CHUNK_SIZE]))
+                .order_by(Ticket.created_at.asc(), Ticket.id.asc())
             )
-            .where(Ticket.created_at >= start_dt, Ticket.created_at <= end_dt)
-            .order_by(Ticket.created_at.asc())
+            .unique()
+            .all()
         )
-        .unique()
-        .all()
-    )
+        yield from _ncc_records_for_tickets(db, tickets)
+
 
+def _ncc_records_for_tickets(db: Session, tickets: Sequence[Ticket]) -> Iterator[dict[str, str]]:
     ticket_ids = [ticket.id for ticket in tickets]
     conversation_subjects: dict[UUID, str] = {}
     if ticket_ids:
@@ -4148,7 +4155,6 @@ def _build_ncc_records(db: Session, start_dt: datetime, end_dt: datetime) -> lis
         for channel in person_channels:
             channels_by_person.setdefault(channel.person_id, []).append(channel)
 
-    records: list[dict[str, str]] = []
     for ticket in tickets:
         status_value = str(getattr(ticket.status, "value", ticket.status) or "").strip().lower()
         ticket_type = _clean_text(ticket.ticket_type)
@@ -4224,26 +4230,22 @@ def _build_ncc_records(db: Session, start_dt: datetime, end_dt: datetime) -> lis
             continue
         if _ncc_name_contains_test(record["First Name"]) or _ncc_name_contains_test(record["Last Name"]):
             continue
-        records.append(record)
-    return records
+        yield record
 
 
-def _ncc_export_rows(records: list[dict[str, str]]) -> list[dict[str, str]]:
-    export_rows: list[dict[str, str]] = []
+def _ncc_export_rows(records: Iterable[dict[str, str]]) -> Iterator[dict[str, str]]:
     for record in records:
-        export_rows.append({key: value for key, value in record.items() if not key.startswith("_")})
-    return export_rows
+        yield {key: value for key, value in record.items() if not key.startswith("_")}
 
 
-def _filter_ncc_records(records: list[dict[str, str]], query: str | None) -> list[dict[str, str]]:
+def _filter_ncc_records(records: Iterable[dict[str, str]], query: str | None) -> Iterator[dict[str, str]]:
     normalized_query = _clean_text(query).lower()
-    if not normalized_query:
-        return records
-    return [
-        record
-        for record in records
-        if normalized_query in " ".join(str(record.get(column, "")) for column in _NCC_COLUMNS).lower()
-    ]
+    for record in records:
+        if (
+            not normalized_query
+            or normalized_query in " ".join(str(record.get(column, "")) for column in _NCC_COLUMNS).lower()
+        ):
+            yield record
 
 
 @router.get("/operations")
@@ -4306,8 +4308,8 @@ def ncc_reports_page(
     user = get_current_user(request)
     start_dt, end_dt, start_value, end_value = _parse_ncc_window(start_date, end_date)
     search_query = _clean_text(q)
-    all_records = _build_ncc_records(db, start_dt, end_dt)
-    records = _filter_ncc_records(all_records, search_query)
+    all_records = list(_build_ncc_records(db, start_dt, end_dt))
+    records = list(_filter_ncc_records(all_records, search_query))
     ncc_email_settings = ncc_report_email_service.get_settings_snapshot(db)
     export_params = {"start_date": start_value, "end_date": end_value}
     if search_query:
@@ -4572,14 +4574,16 @@ def ncc_reports_save_email_settings(
     dependencies=[Depends(require_any_permission("reports:operations", "reports"))],
 )
 def ncc_reports_export(
-    db: Session = Depends(get_db),
     start_date: str | None = Query(None),
     end_date: str | None = Query(None),
     q: str | None = Query(None),
 ):
     start_dt, end_dt, _start_value, _end_value = _parse_ncc_window(start_date, end_date)
-    records = _ncc_export_rows(_filter_ncc_records(_build_ncc_records(db, start_dt, end_dt), q))
-    workbook = _build_ncc_workbook(records, _NCC_COLUMNS)
+
+    def _export_rows(export_db: Session) -> Iterator[dict[str, str]]:
+        return _ncc_export_rows(_filter_ncc_records(_build_ncc_records(export_db, start_dt, end_dt), q))
+
+    workbook = _iter_ncc_workbook(iter_with_session(_export_rows), _NCC_COLUMNS)
     return _xlsx_response(workbook, _ncc_export_filename(start_dt))
 
 
@@ -4720,30 +4724,29 @@ def operations_sla_violations_export(
             selected_ticket_status = TicketStatus(ticket_status)
         except ValueError:
             selected_ticket_status = None
-    records = report.list_records(
-        db,
-        entity_type=selected_type,
-        region=selected_region,
-        start_at=start_dt,
-        end_at=end_dt,
-        ticket_status=selected_ticket_status,
-        open_only=True,
-        limit=10000,
-    )
-    export_data = [
-        {
-            "ID": record.get("id", ""),
-            "Title": record.get("title", ""),
-            "Project": record.get("project", "") or "",
-            "Region": record.get("region", ""),
-            "SLA Type": record.get("sla_type", ""),
-            "Status": str(record.get("ticket_status") or record.get("status") or "").replace("_", " ").title(),
-            "Breach Duration": record.get("breach_duration", ""),
-        }
-        for record in records
-    ]
+
+    def _export_rows(export_db: Session):
+        for record in report.iter_records(
+            export_db,
+            entity_type=selected_type,
+            region=selected_region,
+            start_at=start_dt,
+            end_at=end_dt,
+            ticket_status=selected_ticket_status,
+            open_only=True,
+        ):
+            yield {
+                "ID": record.get("id", ""),
+                "Title": record.get("title", ""),
+                "Project": record.get("project", "") or "",
+                "Region": record.get("region", ""),
+                "SLA Type": record.get("sla_type", ""),
+                "Status": str(record.get("ticket_status") or record.get("status") or "").replace("_", " ").title(),
+                "Breach Duration": record.get("breach_duration", ""),
+            }
+
     filename = f"operations_sla_violations_{selected_type}_{datetime.now(UTC).strftime('%Y%m%d_%H%M%S')}.csv"
-    return _csv_response(export_data, filename)
+    return _csv_response(iter_with_session(_export_rows), filename)
 
 
 # Legacy redirects point to new subscriber overview
@@ -5612,7 +5615,7 @@ def subscriber_lifecycle_export(
     start_dt, end_dt = _resolve_lifecycle_date_range(db, days, start_date, end_date)
     recent_churns = sr.lifecycle_recent_churns(db, limit=100)
 
-    export_data = [
+    export_data = (
         {
             "Name": c["name"],
             "Subscriber #": c["subscriber_number"],
@@ -5623,7 +5626,7 @@ def subscriber_lifecycle_export(
             "Tenure (days)": c["tenure_days"],
         }
         for c in recent_churns
-    ]
+    )
     filename = f"subscriber_lifecycle_{start_dt.strftime('%Y%m%d')}_{end_dt.strftime('%Y%m%d')}.csv"
     return _csv_response(export_data, filename)
 
@@ -5697,7 +5700,7 @@ def churned_subscribers_export(
     start_dt, end_dt = _resolve_lifecycle_date_range(db, days, start_date, end_date)
     churned_rows = sr.churned_subscribers_rows(db, start_dt, end_dt, limit=1000, behavioral_days=behavioral_days)
 
-    export_data = [
+    export_data = (
         {
             "Name": row["name"],
             "Subscriber #": row["subscriber_number"],
@@ -5708,7 +5711,7 @@ def churned_subscribers_export(
             "Tenure (days)": row["tenure_days"],
         }
         for row in churned_rows
-    ]
+    )
     filename = f"subscriber_churned_{start_dt.strftime('%Y%m%d')}_{end_dt.strftime('%Y%m%d')}.csv"
     return _csv_response(export_data, filename)
 
@@ -6001,7 +6004,7 @@ def subscriber_billing_risk_export(
         churn_rows.sort(key=lambda row: (-float(row.get("mrr_total") or 0), str(row.get("name") or "").casefold()))
     elif normalized_mrr_sort == "asc":
         churn_rows.sort(key=lambda row: (float(row.get("mrr_total") or 0), str(row.get("name") or "").casefold()))
-    export_data = [
+    export_data = (
         {
             "Name": row["name"],
             "Email": row["email"],
@@ -6021,7 +6024,7 @@ def subscriber_billing_risk_export(
             "High Balance Risk": "Yes" if row["is_high_balance_risk"] else "No",
         }
         for row in churn_rows
-    ]
+    )
     filename = f"subscriber_billing_risk_{datetime.now(UTC).strftime('%Y%m%d')}.csv"
     return _csv_response(export_data, filename)
 
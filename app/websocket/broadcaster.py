@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
 import json
 import os
-from typing import TYPE_CHECKING
+import threading
+from typing import TYPE_CHECKING, Any
 
 from app.db import SessionLocal
 from app.logging import get_logger
@@ -157,6 +159,119 @@ def _broadcast_event_to_user(user_id: str, event: WebSocketEvent) -> None:
     _run_async(manager.broadcast_to_user(user_id, event))
 
 
+# ── Coalescing ─────────────────────────────────────────────────
+# Status/metadata refreshes arrive in bursts (bulk actions, WhatsApp delivery
+# receipts). They are held for a short window, repeated updates for the same
+# item are merged (later fields win), and each target gets one frame: the event
+# itself, or an EventType.BATCH envelope when several are pending.
+
+COALESCE_WINDOW_SECONDS = float(os.getenv("WS_COALESCE_WINDOW_MS", "50")) / 1000
+COALESCE_MAX_PENDING = 1000
+_CONVERSATION_TARGET = "conversation"
+_USER_TARGET = "user"
+
+
+def _publish_target_events(target_kind: str, target_id: str, events: list[WebSocketEvent]) -> None:
+    if len(events) == 1:
+        event = events[0]
+    else:
+        event = WebSocketEvent(
+            event=EventType.BATCH,
+            data={"events": [item.model_dump(mode="json") for item in events]},
+        )
+    if target_kind == _USER_TARGET:
+        _broadcast_event_to_user(target_id, event)
+    else:
+        _broadcast_event_to_conversation(target_id, event)
+
+
+def _publish_groups(groups: dict[tuple[str, str], list[WebSocketEvent]]) -> None:
+    for (target_kind, target_id), events in groups.items():
+        try:
+            _publish_target_events(target_kind, target_id, events)
+        except Exception as exc:
+            logger.warning("websocket_coalesced_publish_error target=%s error=%s", target_id, exc)
+
+
+class _BroadcastCoalescer:
+    """Merge coalescible events per target for ``window_seconds``, then publish."""
+
+    def __init__(self, window_seconds: float, max_pending: int) -> None:
+        self.window_seconds = window_seconds
+        self.max_pending = max_pending
+        self._pending: dict[tuple[str, str, str, str], WebSocketEvent] = {}
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def add(
+        self,
+        target_kind: str,
+        target_id: str,
+        event_type: EventType,
+        item_key: str,
+        data: dict[str, Any],
+    ) -> None:
+        if self.window_seconds <= 0:
+            _publish_target_events(target_kind, target_id, [WebSocketEvent(event=event_type, data=data)])
+            return
+        key = (target_kind, target_id, event_type.value, item_key)
+        with self._lock:
+            previous = self._pending.get(key)
+            merged = {**previous.data, **data} if previous is not None else data
+            # Assigning an existing key keeps its first position, so order is stable.
+            self._pending[key] = WebSocketEvent(event=event_type, data=merged)
+            if self._timer is None:
+                try:
+                    self._loop = asyncio.get_running_loop()
+                except RuntimeError:
+                    self._loop = None
+                self._timer = threading.Timer(self.window_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+            flush_now = len(self._pending) >= self.max_pending
+        if flush_now:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            timer, self._timer = self._timer, None
+            loop, self._loop = self._loop, None
+        if timer is not None:
+            timer.cancel()
+        if not pending:
+            return
+
+        groups: dict[tuple[str, str], list[WebSocketEvent]] = {}
+        for (target_kind, target_id, _event_type, _item_key), event in pending.items():
+            groups.setdefault((target_kind, target_id), []).append(event)
+        logger.debug("websocket_coalesced_flush events=%d targets=%d", len(pending), len(groups))
+
+        # Events queued from the web process's event loop are published back on
+        # that loop so the ConnectionManager fallback runs where it lives.
+        if loop is not None and loop.is_running() and not _is_loop_thread(loop):
+            loop.call_soon_threadsafe(_publish_groups, groups)
+        else:
+            _publish_groups(groups)
+
+
+def _is_loop_thread(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+_coalescer = _BroadcastCoalescer(COALESCE_WINDOW_SECONDS, COALESCE_MAX_PENDING)
+atexit.register(_coalescer.flush)
+
+
+def flush_coalesced_broadcasts() -> None:
+    """Publish anything still held in the coalescing window immediately."""
+    _coalescer.flush()
+
+
 def broadcast_new_message(message: Message, conversation: Conversation):
     """
     Broadcast a new message event to conversation subscribers.
@@ -198,15 +313,17 @@ def broadcast_message_status(message_id: str, conversation_id: str, status: str)
     Called from inbox.py after updating message status.
     """
     try:
-        event = WebSocketEvent(
-            event=EventType.MESSAGE_STATUS_CHANGED,
-            data={
+        _coalescer.add(
+            _CONVERSATION_TARGET,
+            str(conversation_id),
+            EventType.MESSAGE_STATUS_CHANGED,
+            str(message_id),
+            {
                 "message_id": str(message_id),
                 "conversation_id": str(conversation_id),
                 "status": status,
             },
         )
-        _broadcast_event_to_conversation(str(conversation_id), event)
         logger.debug(
             "broadcast_message_status conversation_id=%s message_id=%s status=%s",
             conversation_id,
@@ -224,16 +341,18 @@ def broadcast_conversation_updated(conversation: Conversation):
     Called when conversation metadata changes (status, assignee, etc).
     """
     try:
-        event = WebSocketEvent(
-            event=EventType.CONVERSATION_UPDATED,
-            data={
+        _coalescer.add(
+            _CONVERSATION_TARGET,
+            str(conversation.id),
+            EventType.CONVERSATION_UPDATED,
+            str(conversation.id),
+            {
                 "conversation_id": str(conversation.id),
                 "status": conversation.status.value if conversation.status else None,
                 "is_active": conversation.is_active,
                 "person_id": str(conversation.person_id) if conversation.person_id else None,
             },
         )
-        _broadcast_event_to_conversation(str(conversation.id), event)
         logger.debug("broadcast_conversation_updated conversation_id=%s", conversation.id)
     except Exception as exc:
         logger.warning("broadcast_conversation_updated_error error=%s", exc)
@@ -244,11 +363,13 @@ def broadcast_conversation_summary(conversation_id: str, summary: dict):
     try:
         summary_payload = dict(summary)
         summary_payload["conversation_id"] = str(conversation_id)
-        event = WebSocketEvent(
-            event=EventType.CONVERSATION_SUMMARY,
-            data=summary_payload,
+        _coalescer.add(
+            _CONVERSATION_TARGET,
+            str(conversation_id),
+            EventType.CONVERSATION_SUMMARY,
+            str(conversation_id),
+            summary_payload,
         )
-        _broadcast_event_to_conversation(str(conversation_id), event)
     except Exception as exc:
         logger.warning("broadcast_conversation_summary_error error=%s", exc)
 
@@ -371,12 +492,14 @@ def broadcast_agent_notification(user_id: str, payload: dict):
 def broadcast_inbox_updated(user_id: str, payload: dict):
     """Send a lightweight inbox refresh event to a specific user."""
     try:
-        event = WebSocketEvent(
-            event=EventType.INBOX_UPDATED,
-            data=payload,
+        _coalescer.add(
+            _USER_TARGET,
+            str(user_id),
+            EventType.INBOX_UPDATED,
+            str(payload.get("conversation_id") or ""),
+            dict(payload),
         )
-        _broadcast_event_to_user(str(user_id), event)
-        logger.info("broadcast_inbox_updated user_id=%s", user_id)
+        logger.debug("broadcast_inbox_updated user_id=%s", user_id)
     except Exception as exc:
         logger.warning("broadcast_inbox_updated_error error=%s", exc)
 
@@ -22,6 +22,9 @@ class EventType(StrEnum):
     HEARTBEAT = "heartbeat"
     AGENT_NOTIFICATION = "agent_notification"
     INBOX_UPDATED = "inbox_updated"
+    # Envelope for coalesced events: data = {"events": [<WebSocketEvent>, ...]},
+    # to be applied in order in one pass.
+    BATCH = "batch"
 
 
 class WebSocketEvent(BaseModel):
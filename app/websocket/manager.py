@@ -4,6 +4,7 @@ import asyncio
 import contextlib
 import json
 import os
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from fastapi import WebSocket
@@ -16,6 +17,66 @@ logger = get_logger(__name__)
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 CHANNEL_PREFIX = "inbox_ws:"
+USER_CHANNEL_PREFIX = f"{CHANNEL_PREFIX}user:"
+
+# Per-connection outbound queue. When a client falls this far behind, the
+# oldest queued events are dropped; if it stays behind for another full queue
+# the connection is closed and the client reconnects and refetches.
+SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+SEND_TIMEOUT_SECONDS = float(os.getenv("WS_SEND_TIMEOUT_SECONDS", "10"))
+SLOW_CONSUMER_CLOSE_CODE = 1013  # "try again later"
+
+
+def _user_channel(user_id: str) -> str:
+    return f"{USER_CHANNEL_PREFIX}{user_id}"
+
+
+def _conversation_channel(conversation_id: str) -> str:
+    return f"{CHANNEL_PREFIX}{conversation_id}"
+
+
+class _ConnectionSender:
+    """Bounded send queue drained by a writer task for one WebSocket.
+
+    Fan-out only enqueues, so a slow browser delays nobody but itself.
+    """
+
+    def __init__(self, websocket: WebSocket, on_failure: Callable[[], Awaitable[None]]) -> None:
+        self.websocket = websocket
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self.dropped = 0
+        self._on_failure = on_failure
+        self.task = asyncio.create_task(self._run())
+
+    def enqueue(self, event_data: dict) -> bool:
+        """Queue an event; returns False once the consumer should be disconnected."""
+        if self.queue.full():
+            with contextlib.suppress(asyncio.QueueEmpty):
+                self.queue.get_nowait()
+            self.dropped += 1
+            if self.dropped >= SEND_QUEUE_SIZE:
+                return False
+        self.queue.put_nowait(event_data)
+        return True
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                event_data = await self.queue.get()
+                if self.websocket.client_state != WebSocketState.CONNECTED:
+                    break
+                await asyncio.wait_for(self.websocket.send_json(event_data), SEND_TIMEOUT_SECONDS)
+                if self.queue.empty():
+                    self.dropped = 0
+        except asyncio.CancelledError:
+            return
+        except Exception as exc:
+            logger.debug("websocket_send_failed error=%s", exc)
+        await self._on_failure()
+
+    def stop(self) -> None:
+        if self.task is not asyncio.current_task():
+            self.task.cancel()
 
 
 class ConnectionManager:
@@ -24,15 +85,23 @@ class ConnectionManager:
 
     Local connection pool: user_id -> [WebSocket]
     Conversation subscriptions: conversation_id -> set[user_id]
+
+    Each instance subscribes only to the Redis channels of the users and
+    conversations it has local interest in (``inbox_ws:user:{id}`` and
+    ``inbox_ws:{conversation_id}``), so it never decodes events nobody here
+    will receive. Delivery goes through a per-connection ``_ConnectionSender``.
     """
 
     def __init__(self) -> None:
         self._connections: dict[str, list[WebSocket]] = {}
         self._subscriptions: dict[str, set[str]] = {}
+        self._senders: dict[int, _ConnectionSender] = {}
         self._redis_client: Any | None = None
         self._pubsub: Any | None = None
+        self._pubsub_lock = asyncio.Lock()
         self._listener_task: asyncio.Task | None = None
         self._heartbeat_tasks: dict[tuple[str, int], asyncio.Task] = {}
+        self._background_tasks: set[asyncio.Task] = set()
         self._running = False
 
     async def connect(self) -> None:
@@ -42,7 +111,10 @@ class ConnectionManager:
 
             self._redis_client = aioredis.from_url(REDIS_URL, decode_responses=True)
             self._pubsub = self._redis_client.pubsub()
-            await self._pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+            channels = [_user_channel(user_id) for user_id in self._connections]
+            channels += [_conversation_channel(conversation_id) for conversation_id in self._subscriptions]
+            if channels:
+                await self._pubsub.subscribe(*channels)
             self._running = True
             self._listener_task = asyncio.create_task(self._redis_listener())
             logger.info("websocket_manager_connected redis=%s", REDIS_URL)
@@ -56,13 +128,36 @@ class ConnectionManager:
             self._listener_task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
                 await self._listener_task
+        for sender in list(self._senders.values()):
+            sender.stop()
+        self._senders.clear()
         if self._pubsub:
-            await self._pubsub.punsubscribe()
+            await self._pubsub.unsubscribe()
             await self._pubsub.close()
         if self._redis_client:
             await self._redis_client.close()
         logger.info("websocket_manager_disconnected")
 
+    async def _watch(self, channel: str) -> None:
+        """Subscribe this instance to a Redis channel it now has local interest in."""
+        if not self._pubsub:
+            return
+        async with self._pubsub_lock:
+            try:
+                await self._pubsub.subscribe(channel)
+            except Exception as exc:
+                logger.warning("websocket_redis_subscribe_error channel=%s error=%s", channel, exc)
+
+    async def _unwatch(self, channel: str) -> None:
+        """Drop a Redis channel once no local connection cares about it."""
+        if not self._pubsub:
+            return
+        async with self._pubsub_lock:
+            try:
+                await self._pubsub.unsubscribe(channel)
+            except Exception as exc:
+                logger.warning("websocket_redis_unsubscribe_error channel=%s error=%s", channel, exc)
+
     async def _redis_listener(self) -> None:
         """Listen for messages from Redis pub/sub and dispatch to local connections."""
         try:
@@ -70,8 +165,12 @@ class ConnectionManager:
                 return
             pubsub = self._pubsub
             while self._running:
+                if not getattr(pubsub, "subscribed", True):
+                    # Nothing local to listen for yet; get_message needs a subscription.
+                    await asyncio.sleep(1.0)
+                    continue
                 message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
-                if message and message["type"] == "pmessage":
+                if message and message["type"] in ("message", "pmessage"):
                     channel = message["channel"]
                     data = message["data"]
                     await self._handle_redis_message(channel, data)
@@ -80,10 +179,20 @@ class ConnectionManager:
         except Exception as exc:
             logger.error("websocket_redis_listener_error error=%s", exc)
 
+    def _has_local_interest(self, channel: str) -> bool:
+        if channel.startswith(USER_CHANNEL_PREFIX):
+            return channel[len(USER_CHANNEL_PREFIX) :] in self._connections
+        if channel.startswith(CHANNEL_PREFIX):
+            return channel[len(CHANNEL_PREFIX) :] in self._subscriptions
+        return True
+
     async def _handle_redis_message(self, channel: str, data: str) -> None:
         """Process incoming Redis message and dispatch to local connections."""
         try:
-            logger.info("websocket_redis_message_received channel=%s", channel)
+            # A message can still arrive just after the last local listener left.
+            if not self._has_local_interest(channel):
+                return
+            logger.debug("websocket_redis_message_received channel=%s", channel)
             payload = json.loads(data)
             conversation_id = payload.get("conversation_id")
             user_id = payload.get("user_id")
@@ -98,25 +207,39 @@ class ConnectionManager:
         except Exception as exc:
             logger.warning("websocket_redis_message_error error=%s", exc)
 
+    def _deliver(self, user_id: str, websocket: WebSocket, event_data: dict) -> None:
+        """Queue an event for one connection, dropping it if it has fallen too far behind."""
+        sender = self._senders.get(id(websocket))
+        if sender is None or websocket.client_state != WebSocketState.CONNECTED:
+            return
+        if not sender.enqueue(event_data):
+            logger.warning("websocket_slow_consumer_dropped user_id=%s", user_id)
+            task = asyncio.create_task(self._drop_connection(user_id, websocket, code=SLOW_CONSUMER_CLOSE_CODE))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
+    async def _drop_connection(self, user_id: str, websocket: WebSocket, *, code: int = 1011) -> None:
+        await self._remove_connection(user_id, websocket)
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(websocket.close(code=code), SEND_TIMEOUT_SECONDS)
+
     async def _dispatch_to_subscribers(self, conversation_id: str, event_data: dict) -> None:
         """Send event to all users subscribed to a conversation."""
         user_ids = self._subscriptions.get(conversation_id, set())
 
         for user_id in list(user_ids):
-            websockets = self._connections.get(user_id, [])
-            for ws in list(websockets):
-                try:
-                    if ws.client_state == WebSocketState.CONNECTED:
-                        await ws.send_json(event_data)
-                except Exception:
-                    await self._remove_connection(user_id, ws)
+            for ws in list(self._connections.get(user_id, [])):
+                self._deliver(user_id, ws, event_data)
 
     async def register_connection(self, user_id: str, websocket: WebSocket) -> None:
         """Register a new WebSocket connection for a user."""
-        if user_id not in self._connections:
+        first_for_user = user_id not in self._connections
+        if first_for_user:
             self._connections[user_id] = []
         self._connections[user_id].append(websocket)
         logger.debug("websocket_registered user_id=%s", user_id)
+        if first_for_user:
+            await self._watch(_user_channel(user_id))
 
         # Send connection acknowledgment
         ack_event = WebSocketEvent(
@@ -124,6 +247,11 @@ class ConnectionManager:
             data={"user_id": user_id, "status": "connected"},
         )
         await websocket.send_json(ack_event.model_dump(mode="json"))
+
+        async def _on_send_failure() -> None:
+            await self._remove_connection(user_id, websocket)
+
+        self._senders[id(websocket)] = _ConnectionSender(websocket, _on_send_failure)
         self._start_heartbeat(user_id, websocket)
 
     async def unregister_connection(self, user_id: str, websocket: WebSocket) -> None:
@@ -133,18 +261,25 @@ class ConnectionManager:
     async def _remove_connection(self, user_id: str, websocket: WebSocket) -> None:
         """Internal method to remove a connection and clean up subscriptions."""
         self._stop_heartbeat(user_id, websocket)
+        sender = self._senders.pop(id(websocket), None)
+        if sender is not None:
+            sender.stop()
+        user_gone = False
         if user_id in self._connections:
             if websocket in self._connections[user_id]:
                 self._connections[user_id].remove(websocket)
             if not self._connections[user_id]:
                 del self._connections[user_id]
+                user_gone = True
 
         # Clean up user from all subscriptions if no more connections
-        if user_id not in self._connections:
+        if user_gone:
+            await self._unwatch(_user_channel(user_id))
             for conv_id in list(self._subscriptions.keys()):
                 self._subscriptions[conv_id].discard(user_id)
                 if not self._subscriptions[conv_id]:
                     del self._subscriptions[conv_id]
+                    await self._unwatch(_conversation_channel(conv_id))
 
         logger.debug("websocket_unregistered user_id=%s", user_id)
 
@@ -171,9 +306,12 @@ class ConnectionManager:
 
     async def subscribe_conversation(self, user_id: str, conversation_id: str) -> None:
         """Subscribe a user to conversation updates."""
-        if conversation_id not in self._subscriptions:
+        first_for_conversation = conversation_id not in self._subscriptions
+        if first_for_conversation:
             self._subscriptions[conversation_id] = set()
         self._subscriptions[conversation_id].add(user_id)
+        if first_for_conversation:
+            await self._watch(_conversation_channel(conversation_id))
         logger.debug(
             "websocket_subscribed user_id=%s conversation_id=%s",
             user_id,
@@ -186,6 +324,7 @@ class ConnectionManager:
             self._subscriptions[conversation_id].discard(user_id)
             if not self._subscriptions[conversation_id]:
                 del self._subscriptions[conversation_id]
+                await self._unwatch(_conversation_channel(conversation_id))
         logger.debug(
             "websocket_unsubscribed user_id=%s conversation_id=%s",
             user_id,
@@ -201,7 +340,7 @@ class ConnectionManager:
         if self._redis_client:
             try:
                 payload = json.dumps({"conversation_id": conversation_id, "event": event_data})
-                await self._redis_client.publish(f"{CHANNEL_PREFIX}{conversation_id}", payload)
+                await self._redis_client.publish(_conversation_channel(conversation_id), payload)
                 return  # Redis will handle local delivery via listener
             except Exception as exc:
                 logger.warning("websocket_broadcast_redis_error error=%s", exc)
@@ -219,7 +358,7 @@ class ConnectionManager:
             try:
                 payload = json.dumps({"user_id": user_id, "event": event_data})
                 logger.debug("websocket_broadcast_user_redis_publish user_id=%s", user_id)
-                await self._redis_client.publish(f"{CHANNEL_PREFIX}user:{user_id}", payload)
+                await self._redis_client.publish(_user_channel(user_id), payload)
                 return  # Redis will handle local delivery via listener
             except Exception as exc:
                 logger.warning("websocket_broadcast_redis_error error=%s", exc)
@@ -229,13 +368,8 @@ class ConnectionManager:
 
     async def _dispatch_to_user(self, user_id: str, event_data: dict) -> None:
         """Send event to all local connections for a user."""
-        websockets = self._connections.get(user_id, [])
-        for ws in list(websockets):
-            try:
-                if ws.client_state == WebSocketState.CONNECTED:
-                    await ws.send_json(event_data)
-            except Exception:
-                await self._remove_connection(user_id, ws)
+        for ws in list(self._connections.get(user_id, [])):
+            self._deliver(user_id, ws, event_data)
 
     async def send_heartbeat(self, user_id: str, websocket: WebSocket) -> None:
         """Send heartbeat response to a specific connection."""
@@ -243,6 +377,10 @@ class ConnectionManager:
             event=EventType.HEARTBEAT,
             data={"status": "ok"},
         )
+        sender = self._senders.get(id(websocket))
+        if sender is not None:
+            self._deliver(user_id, websocket, heartbeat.model_dump(mode="json"))
+            return
         try:
             await websocket.send_json(heartbeat.model_dump(mode="json"))
         except Exception:
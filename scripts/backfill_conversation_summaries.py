@@ -7,6 +7,7 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import logging
 import sys
 from pathlib import Path
 
@@ -20,15 +21,32 @@ load_dotenv()
 from app.db import SessionLocal
 from app.models.crm.conversation import Conversation
 from app.services.crm.inbox import cache as inbox_cache
-from app.services.crm.inbox.summaries import recompute_conversation_summary
+from app.services.crm.inbox.summaries import recompute_conversation_summaries, recompute_conversation_summary
+
+logger = logging.getLogger(__name__)
 
 
 def _process_batch(db, conversation_ids: list[str], stats: dict[str, int], errors: list[str]) -> None:
+    # Each attempt runs in a savepoint; rolling one back also discards the
+    # inbox counter deltas it recorded, so the per-row retry can't double count.
+    try:
+        with db.begin_nested():
+            stats["updated"] += recompute_conversation_summaries(db, conversation_ids, batch_size=len(conversation_ids))
+        return
+    except Exception:
+        logger.exception(
+            "summary_backfill_batch_failed first=%s size=%s; retrying row by row",
+            conversation_ids[0],
+            len(conversation_ids),
+        )
     for conversation_id in conversation_ids:
         try:
-            if recompute_conversation_summary(db, conversation_id) is not None:
+            with db.begin_nested():
+                updated = recompute_conversation_summary(db, conversation_id) is not None
+            if updated:
                 stats["updated"] += 1
         except Exception as exc:  # pragma: no cover - one-time migration safety net
+            logger.warning("summary_backfill_row_failed conversation_id=%s error=%s", conversation_id, exc)
             stats["errors"] += 1
             if len(errors) < 10:
                 errors.append(f"{conversation_id}: {exc}")
@@ -111,6 +129,7 @@ def _parse_args() -> argparse.Namespace:
 
 
 def main() -> dict:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
     args = _parse_args()
     result = backfill(
         dry_run=args.dry_run,
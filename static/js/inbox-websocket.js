@@ -99,6 +99,20 @@ class InboxWebSocket {
     _handleMessage(data) {
         try {
             const message = JSON.parse(data);
+            if (message.event === 'batch') {
+                // Coalesced server-side events, applied in order in one pass.
+                const events = (message.data && message.data.events) || [];
+                events.forEach((item) => this._handleEvent(item));
+                return;
+            }
+            this._handleEvent(message);
+        } catch (error) {
+            console.error('[InboxWS] Failed to parse message:', error);
+        }
+    }
+
+    _handleEvent(message) {
+        try {
             const eventType = message.event;
             const eventData = message.data || {};
             const hasConversationId =
@@ -149,7 +163,7 @@ class InboxWebSocket {
                     console.log('[InboxWS] Unknown event:', eventType, eventData);
             }
         } catch (error) {
-            console.error('[InboxWS] Failed to parse message:', error);
+            console.error('[InboxWS] Failed to handle event:', error);
         }
     }
 
@@ -1,10 +1,14 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import httpx
 import pytest
 
-from app.services.ai.client import AIClientError, VllmClient, build_ai_client
-from app.services.ai.gateway import AIEndpointConfig, AIGateway
+from app.services.ai.client import AIClientError, AIResponse, VllmClient, build_ai_client
+from app.services.ai.gateway import AIEndpointConfig, AIGateway, AIRoute
+from app.services.ai.response_cache import AIResponseCache
 from app.services.ai.security import redact_secret_text, validate_deepseek_startup_env
 
 
@@ -211,3 +215,39 @@ def test_gateway_circuit_breaker_opens_after_repeated_transient_failures():
         gateway._before_request(cfg, "primary")
 
     assert exc_info.value.failure_type == "circuit_open"
+
+
+def test_gateway_limits_concurrent_requests_per_endpoint(monkeypatch):
+    gateway = AIGateway(response_cache=AIResponseCache(client_factory=lambda: None))
+    cfg = AIEndpointConfig(
+        label="primary",
+        base_url="https://llm.example",
+        model="m",
+        api_key="secret",
+        require_api_key=False,
+        timeout_seconds=5.0,
+        max_retries=0,
+        max_tokens=256,
+        max_concurrency=2,
+    )
+    route = AIRoute(primary="primary", primary_cfg=cfg, fallback="secondary", fallback_cfg=None, cache_ttl_seconds=0)
+    active = {"now": 0, "peak": 0}
+    guard = threading.Lock()
+
+    class _Client:
+        def generate(self, system, prompt, max_tokens):
+            with guard:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.02)
+            with guard:
+                active["now"] -= 1
+            return AIResponse(content=prompt, tokens_in=1, tokens_out=1, model="m", provider="primary")
+
+    monkeypatch.setattr(gateway, "_client_for", lambda cfg: _Client())
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(pool.map(lambda i: gateway.generate_routed(route, system="s", prompt=str(i)), range(6)))
+
+    assert [meta["endpoint"] for _, meta in results] == ["primary"] * 6
+    assert active["peak"] == 2
@@ -0,0 +1,131 @@
+"""Content-addressed AI response cache and request coalescing."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from app.services.ai import gateway as gateway_module
+from app.services.ai.client import AIClientError, AIResponse
+from app.services.ai.gateway import AIEndpointConfig, AIGateway
+from app.services.ai.response_cache import AIResponseCache, cache_key
+
+
+def _response(content: str = "ok") -> AIResponse:
+    return AIResponse(content=content, tokens_in=100, tokens_out=20, model="m", provider="p")
+
+
+def _key(prompt: str = "prompt") -> str:
+    return cache_key(provider="p", model="m", system="sys", prompt=prompt, max_tokens=256)
+
+
+def test_cache_key_depends_on_every_input():
+    base = _key()
+    assert base == _key()
+    assert base != _key("other prompt")
+    assert base != cache_key(provider="p", model="m", system="sys", prompt="prompt", max_tokens=512)
+    assert base != cache_key(provider="p", model="m2", system="sys", prompt="prompt", max_tokens=256)
+
+
+def test_hit_skips_loader_and_reports_zero_tokens():
+    cache = AIResponseCache(client_factory=lambda: None)
+    calls = []
+
+    def _load():
+        calls.append(1)
+        return _response()
+
+    first = cache.get_or_generate(_key(), 60, _load)
+    second = cache.get_or_generate(_key(), 60, _load)
+
+    assert len(calls) == 1
+    assert first.cached is False and first.tokens_in == 100
+    assert second.cached is True
+    assert (second.tokens_in, second.tokens_out) == (0, 0)
+    assert second.content == "ok"
+
+
+def test_lru_evicts_oldest_entry():
+    cache = AIResponseCache(max_entries=2, client_factory=lambda: None)
+    for prompt in ("a", "b", "c"):
+        cache.set(_key(prompt), _response(prompt), 60)
+
+    assert cache.get(_key("a")) is None
+    assert cache.get(_key("c")).content == "c"
+
+
+def test_identical_in_flight_requests_are_coalesced():
+    cache = AIResponseCache(client_factory=lambda: None)
+    release = threading.Event()
+    started = threading.Event()
+    calls = []
+
+    def _load():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return _response()
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_generate(_key(), 60, _load)))
+    leader.start()
+    started.wait(5)
+    followers = [
+        threading.Thread(target=lambda: results.append(cache.get_or_generate(_key(), 60, _load))) for _ in range(3)
+    ]
+    for thread in followers:
+        thread.start()
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len(results) == 4
+    assert sum(1 for result in results if result.cached) == 3
+
+
+def test_failures_are_not_cached():
+    cache = AIResponseCache(client_factory=lambda: None)
+
+    def _fail():
+        raise AIClientError("boom", failure_type="timeout", transient=True)
+
+    with pytest.raises(AIClientError):
+        cache.get_or_generate(_key(), 60, _fail)
+    assert cache.get_or_generate(_key(), 60, _response).cached is False
+
+
+def test_gateway_serves_repeat_requests_from_cache(monkeypatch):
+    cfg = AIEndpointConfig(
+        label="primary",
+        base_url="https://llm.example",
+        model="m",
+        api_key="key",
+        require_api_key=False,
+        timeout_seconds=5.0,
+        max_retries=0,
+        max_tokens=512,
+    )
+    settings = {"ai_response_cache_ttl_seconds": 60}
+    monkeypatch.setattr(gateway_module, "_load_primary_config", lambda db: cfg)
+    monkeypatch.setattr(gateway_module, "resolve_value", lambda db, domain, key: settings.get(key))
+    gateway = AIGateway(response_cache=AIResponseCache(client_factory=lambda: None))
+    monkeypatch.setattr(gateway, "enabled", lambda db: True)
+    calls = []
+
+    class _Client:
+        def generate(self, system, prompt, max_tokens):
+            calls.append(prompt)
+            return _response(prompt)
+
+    monkeypatch.setattr(gateway, "_client_for", lambda cfg: _Client())
+
+    gateway.generate(None, endpoint="primary", system="s", prompt="hello")
+    cached = gateway.generate(None, endpoint="primary", system="s", prompt="hello")
+    gateway.generate(None, endpoint="primary", system="s", prompt="hello", use_cache=False)
+    settings["ai_response_cache_ttl_seconds"] = 0
+    gateway.generate(None, endpoint="primary", system="s", prompt="hello")
+
+    assert cached.cached is True
+    assert calls == ["hello", "hello", "hello"]
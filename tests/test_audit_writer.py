@@ -0,0 +1,140 @@
+"""Tests for the batched audit writer."""
+
+import json
+import os
+import queue
+import time
+import uuid
+from datetime import UTC, datetime
+
+from sqlalchemy.exc import OperationalError
+
+from app.models.audit import AuditActorType, AuditEvent
+from app.services import audit_writer
+
+
+class _SessionProxy:
+    def __init__(self, session):
+        self._session = session
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+    def close(self):
+        return None
+
+
+def _event(**overrides):
+    event = {
+        "id": uuid.uuid4(),
+        "actor_type": AuditActorType.system,
+        "actor_id": None,
+        "action": "POST",
+        "entity_type": "/api/v1/tickets",
+        "entity_id": None,
+        "status_code": 201,
+        "is_success": True,
+        "is_active": True,
+        "ip_address": "127.0.0.1",
+        "user_agent": "pytest",
+        "request_id": None,
+        "metadata_": {"path": "/api/v1/tickets", "query": {}},
+        "occurred_at": datetime.now(UTC),
+    }
+    event.update(overrides)
+    return event
+
+
+def test_flush_inserts_batch_and_resolves_actor_names(db_session, person, monkeypatch):
+    monkeypatch.setattr(audit_writer, "SessionLocal", lambda: _SessionProxy(db_session))
+    events = [
+        _event(actor_type=AuditActorType.user, actor_id=str(person.id)),
+        _event(),
+    ]
+
+    assert audit_writer.flush(events) is True
+
+    rows = db_session.query(AuditEvent).filter(AuditEvent.id.in_([e["id"] for e in events])).all()
+    assert len(rows) == 2
+    user_row = next(row for row in rows if row.actor_type == AuditActorType.user)
+    assert user_row.metadata_["actor_email"] == person.email
+
+
+def test_flush_spills_and_replay_writes_rows(db_session, monkeypatch, tmp_path):
+    monkeypatch.setenv("AUDIT_WRITER_SPILL_DIR", str(tmp_path))
+
+    def _broken_session():
+        raise OperationalError("INSERT", {}, Exception("database unavailable"))
+
+    monkeypatch.setattr(audit_writer, "SessionLocal", _broken_session)
+    event = _event()
+
+    assert audit_writer.flush([event]) is False
+    assert list(tmp_path.glob("audit-spill-*.jsonl"))
+
+    monkeypatch.setattr(audit_writer, "SessionLocal", lambda: _SessionProxy(db_session))
+    assert audit_writer.replay_spilled() == 1
+    assert not list(tmp_path.iterdir())
+    assert db_session.get(AuditEvent, event["id"]) is not None
+
+
+def test_replay_leaves_spill_files_of_live_workers(db_session, monkeypatch, tmp_path):
+    monkeypatch.setenv("AUDIT_WRITER_SPILL_DIR", str(tmp_path))
+    monkeypatch.setattr(audit_writer, "SessionLocal", lambda: _SessionProxy(db_session))
+    monkeypatch.setattr(audit_writer, "_pid_alive", lambda pid: pid != 999_001)
+    events = {name: _event() for name in ("live", "dead", "idle")}
+    for name, pid in (("live", 999_000), ("dead", 999_001), ("idle", 999_002)):
+        path = tmp_path / f"audit-spill-{pid}.jsonl"
+        path.write_text(json.dumps(audit_writer._encode_event(events[name]), default=str) + "\n")
+    stale = time.time() - audit_writer.DEFAULT_SPILL_STALE_SECONDS - 1
+    os.utime(tmp_path / "audit-spill-999002.jsonl", (stale, stale))
+
+    assert audit_writer.replay_spilled() == 2
+    assert [path.name for path in tmp_path.iterdir()] == ["audit-spill-999000.jsonl"]
+    assert db_session.get(AuditEvent, events["live"]["id"]) is None
+    assert db_session.get(AuditEvent, events["dead"]["id"]) is not None
+    assert db_session.get(AuditEvent, events["idle"]["id"]) is not None
+
+
+def test_replay_reclaims_files_whose_replayer_died(db_session, monkeypatch, tmp_path):
+    monkeypatch.setenv("AUDIT_WRITER_SPILL_DIR", str(tmp_path))
+    monkeypatch.setattr(audit_writer, "SessionLocal", lambda: _SessionProxy(db_session))
+    monkeypatch.setattr(audit_writer, "_pid_alive", lambda pid: pid != 999_001)
+    events = {name: _event() for name in ("orphaned", "in_progress")}
+    for name, replayer in (("orphaned", 999_001), ("in_progress", 999_000)):
+        path = tmp_path / f"audit-spill-999002.jsonl.{replayer}.replaying"
+        path.write_text(json.dumps(audit_writer._encode_event(events[name]), default=str) + "\n")
+
+    assert audit_writer.replay_spilled() == 1
+    assert [path.name for path in tmp_path.iterdir()] == ["audit-spill-999002.jsonl.999000.replaying"]
+    assert db_session.get(AuditEvent, events["orphaned"]["id"]) is not None
+    assert db_session.get(AuditEvent, events["in_progress"]["id"]) is None
+
+
+def test_enqueue_spills_when_queue_is_full(monkeypatch, tmp_path):
+    monkeypatch.setenv("AUDIT_WRITER_SPILL_DIR", str(tmp_path))
+    full_queue: queue.Queue[dict] = queue.Queue(maxsize=1)
+    full_queue.put_nowait(_event())
+    monkeypatch.setattr(audit_writer, "_queue", full_queue)
+    monkeypatch.setattr(audit_writer, "is_running", lambda: True)
+
+    audit_writer.enqueue(_event())
+
+    spilled = list(tmp_path.glob("audit-spill-*.jsonl"))
+    assert len(spilled) == 1
+    assert len(spilled[0].read_text().splitlines()) == 1
+
+
+def test_stop_flushes_queued_events(db_session, monkeypatch, tmp_path):
+    monkeypatch.setenv("AUDIT_WRITER_SPILL_DIR", str(tmp_path))
+    monkeypatch.setenv("AUDIT_WRITER_FLUSH_MS", "10")
+    monkeypatch.setattr(audit_writer, "SessionLocal", lambda: _SessionProxy(db_session))
+    audit_writer.start_audit_writer()
+    event = _event()
+    try:
+        audit_writer.enqueue(event)
+    finally:
+        audit_writer.stop_audit_writer()
+
+    assert db_session.get(AuditEvent, event["id"]) is not None
+    assert not audit_writer.is_running()
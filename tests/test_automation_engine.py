@@ -0,0 +1,79 @@
+"""Compiled automation rule sets: equality index, ordering and invalidation."""
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.automation_rule import AutomationRuleCreate, AutomationRuleUpdate
+from app.services import automation_engine
+from app.services.automation_conditions import compile_conditions, evaluate_conditions
+from app.services.automation_rules import automation_rules_service
+
+
+@pytest.fixture(autouse=True)
+def _local_cache_only(monkeypatch):
+    monkeypatch.setattr(automation_engine, "_get_redis", lambda: None)
+    automation_engine.invalidate()
+    yield
+    automation_engine.invalidate()
+
+
+def _rule(name, conditions):
+    return SimpleNamespace(id=uuid.uuid4(), name=name, conditions=conditions)
+
+
+def test_compiled_conditions_match_interpreter():
+    conditions = [
+        {"field": " payload.channel ", "op": "eq", "value": " email "},
+        {"field": "payload.count", "op": "gte", "value": "3"},
+    ]
+    predicate = compile_conditions(conditions)
+    for context in (
+        {"payload": {"channel": "email", "count": 3}},
+        {"payload": {"channel": "email", "count": 2}},
+        {"payload": {"channel": "sms", "count": 9}},
+        {"payload": {}},
+    ):
+        assert predicate(context) is evaluate_conditions(conditions, context)
+
+
+def test_equality_index_skips_rules_for_other_values():
+    rules = [
+        _rule("email", [{"field": "payload.channel", "op": "eq", "value": "email"}]),
+        _rule("any", [{"field": "payload.priority", "op": "gt", "value": 1}]),
+        _rule("whatsapp", [{"field": "payload.channel", "op": "eq", "value": "whatsapp"}]),
+        _rule("level five", [{"field": "payload.level", "op": "eq", "value": "5"}]),
+    ]
+    rule_set = automation_engine.compile_rule_set(rules)
+
+    candidates = rule_set.candidates({"payload": {"channel": "email", "priority": 2, "level": 5}})
+    assert [rule.name for rule in candidates] == ["email", "any", "level five"]
+    assert [rule.name for rule in rule_set.matching({"payload": {"channel": "whatsapp"}})] == ["whatsapp"]
+
+
+def test_rule_set_is_cached_and_invalidated_on_update(db_session):
+    rule = automation_rules_service.create(
+        db_session,
+        AutomationRuleCreate(
+            name="Route email",
+            event_type="automation_engine.test",
+            conditions=[{"field": "payload.channel", "op": "eq", "value": "email"}],
+            actions=[{"action_type": "add_tag", "params": {"tag": "email"}}],
+        ),
+    )
+
+    first = automation_engine.get_rule_set(db_session, "automation_engine.test")
+    assert automation_engine.get_rule_set(db_session, "automation_engine.test") is first
+    assert [match.id for match in first.matching({"payload": {"channel": "email"}})] == [rule.id]
+
+    automation_rules_service.update(
+        db_session,
+        str(rule.id),
+        AutomationRuleUpdate(conditions=[{"field": "payload.channel", "op": "eq", "value": "sms"}]),
+    )
+
+    refreshed = automation_engine.get_rule_set(db_session, "automation_engine.test")
+    assert refreshed is not first
+    assert refreshed.matching({"payload": {"channel": "email"}}) == []
+    assert [match.id for match in refreshed.matching({"payload": {"channel": "sms"}})] == [rule.id]
@@ -0,0 +1,41 @@
+"""Tests for the conversation summary backfill script."""
+
+import uuid
+
+import scripts.backfill_conversation_summaries as backfill_script
+from sqlalchemy import func, select
+
+from app.models.crm.conversation import Conversation, ConversationCounter
+from app.models.crm.enums import ConversationStatus
+from app.models.person import Person
+from app.services.crm.inbox import counters
+
+
+def _conversation(db) -> Conversation:
+    person = Person(first_name="Backfill", last_name="Contact", email=f"backfill-{uuid.uuid4().hex[:8]}@example.com")
+    db.add(person)
+    db.flush()
+    conversation = Conversation(person_id=person.id, status=ConversationStatus.open)
+    db.add(conversation)
+    db.flush()
+    return conversation
+
+
+def test_failed_batch_falls_back_per_row_without_double_counting(db_session, monkeypatch, caplog):
+    conversations = [_conversation(db_session) for _ in range(2)]
+    ids = [str(conversation.id) for conversation in conversations]
+    real_batch = backfill_script.recompute_conversation_summaries
+
+    def failing_batch(db, conversation_ids, batch_size):
+        real_batch(db, conversation_ids, batch_size=batch_size)
+        raise RuntimeError("batch failed")
+
+    monkeypatch.setattr(backfill_script, "recompute_conversation_summaries", failing_batch)
+    stats = {"updated": 0, "errors": 0}
+
+    backfill_script._process_batch(db_session, ids, stats, [])
+
+    assert stats == {"updated": 2, "errors": 0}
+    stored = db_session.scalar(select(func.coalesce(func.sum(ConversationCounter.count), 0)))
+    assert stored + sum(counters.pending_deltas(db_session).values()) == 2
+    assert "summary_backfill_batch_failed" in caplog.text
@@ -0,0 +1,105 @@
+"""Set-based conversation summary recompute."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from app.models.crm.conversation import Conversation, ConversationSummary, Message
+from app.models.crm.enums import ChannelType, ConversationStatus, MessageDirection, MessageStatus
+from app.models.crm.outbox import OutboxMessage
+from app.models.person import Person
+from app.services.crm.inbox import counters
+from app.services.crm.inbox.summaries import recompute_conversation_summaries, recompute_conversation_summary
+
+_FIELDS = (
+    "latest_message_id",
+    "latest_message_at",
+    "latest_inbound_at",
+    "latest_outbound_at",
+    "unread_count",
+    "has_failed_outbox",
+    "primary_channel_type",
+    "needs_attention",
+    "unreplied",
+    "status",
+    "is_active",
+)
+
+
+def _conversation(db_session, messages: list[tuple[MessageDirection, int, bool]]) -> Conversation:
+    person = Person(first_name="Batch", last_name="Contact", email=f"batch-{uuid.uuid4().hex[:8]}@example.com")
+    db_session.add(person)
+    db_session.flush()
+    conversation = Conversation(person_id=person.id, status=ConversationStatus.open, subject="Batch")
+    db_session.add(conversation)
+    db_session.flush()
+    base = datetime(2026, 1, 1, tzinfo=UTC)
+    for direction, minutes, read in messages:
+        at = base + timedelta(minutes=minutes)
+        inbound = direction == MessageDirection.inbound
+        db_session.add(
+            Message(
+                conversation_id=conversation.id,
+                channel_type=ChannelType.whatsapp if inbound else ChannelType.email,
+                direction=direction,
+                status=MessageStatus.received if inbound else MessageStatus.sent,
+                body="hi",
+                received_at=at if inbound else None,
+                sent_at=None if inbound else at,
+                read_at=at if read else None,
+            )
+        )
+    db_session.flush()
+    return conversation
+
+
+def _snapshot(db_session, conversation_id) -> dict:
+    db_session.flush()
+    summary = db_session.get(ConversationSummary, conversation_id)
+    return {field: getattr(summary, field) for field in _FIELDS}
+
+
+def test_batch_matches_single_recompute(db_session):
+    inbound, outbound = MessageDirection.inbound, MessageDirection.outbound
+    conversations = [
+        _conversation(db_session, [(inbound, 1, False), (inbound, 2, False)]),
+        _conversation(db_session, [(inbound, 1, True), (outbound, 5, False), (inbound, 3, False)]),
+        _conversation(db_session, []),
+    ]
+    db_session.add(OutboxMessage(conversation_id=conversations[1].id, channel_type=ChannelType.email, status="failed"))
+    db_session.flush()
+
+    expected = {}
+    for conversation in conversations:
+        recompute_conversation_summary(db_session, str(conversation.id))
+        expected[conversation.id] = _snapshot(db_session, conversation.id)
+        db_session.delete(db_session.get(ConversationSummary, conversation.id))
+    db_session.flush()
+
+    updated = recompute_conversation_summaries(db_session, [str(c.id) for c in conversations], batch_size=2)
+
+    assert updated == 3
+    for conversation in conversations:
+        assert _snapshot(db_session, conversation.id) == expected[conversation.id]
+    assert expected[conversations[0].id]["unread_count"] == 2
+    assert expected[conversations[1].id]["has_failed_outbox"] is True
+    assert expected[conversations[1].id]["latest_outbound_at"] is not None
+
+
+def test_batch_skips_missing_ids_and_records_counter_moves(db_session):
+    conversation = _conversation(db_session, [(MessageDirection.inbound, 1, False)])
+    recompute_conversation_summaries(db_session, [str(conversation.id), None])
+    db_session.commit()
+    assert sum(counters.counter_snapshot(db_session).values()) == 1
+
+    missing = uuid.uuid4()
+    conversation.status = ConversationStatus.resolved
+
+    updated = recompute_conversation_summaries(db_session, [str(conversation.id), str(missing)])
+    db_session.commit()
+
+    assert updated == 1
+    assert db_session.get(ConversationSummary, missing) is None
+    [key] = counters.counter_snapshot(db_session)
+    assert key.status == ConversationStatus.resolved
@@ -0,0 +1,389 @@
+"""Hourly CRM reporting rollups."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.models.crm.conversation import (
+    Conversation,
+    ConversationAssignment,
+    ConversationMetricRollup,
+    ConversationMetricRollupHour,
+    Message,
+)
+from app.models.crm.enums import ChannelType, ConversationStatus, MessageDirection
+from app.models.crm.team import CrmAgent
+from app.models.person import Person
+from app.services.crm import metric_rollups, reports
+
+
+@pytest.fixture()
+def scenario(db_session):
+    """Two conversations handled by one agent, one of them queued and resolved."""
+    now = datetime.now(UTC)
+    base = metric_rollups.hour_floor(now) - timedelta(days=2)
+    contact = Person(first_name="Rollup", last_name="Contact", email=f"rollup-{uuid.uuid4().hex[:8]}@example.com")
+    agent_person = Person(first_name="Rollup", last_name="Agent", email=f"agent-{uuid.uuid4().hex[:8]}@example.com")
+    db_session.add_all([contact, agent_person])
+    db_session.flush()
+    agent = CrmAgent(person_id=agent_person.id, is_active=True)
+    db_session.add(agent)
+    db_session.flush()
+
+    conversations = []
+    for offset, response_minutes in ((0, 10), (1, 30)):
+        start = base + timedelta(hours=offset, minutes=5)
+        conversation = Conversation(
+            person_id=contact.id,
+            status=ConversationStatus.resolved if offset else ConversationStatus.open,
+            created_at=start,
+            updated_at=start + timedelta(minutes=50),
+            resolved_at=start + timedelta(minutes=50) if offset else None,
+            last_message_at=start + timedelta(minutes=response_minutes),
+            queued_at=start - timedelta(minutes=4),
+            first_assigned_at=start,
+        )
+        db_session.add(conversation)
+        db_session.flush()
+        db_session.add_all(
+            [
+                ConversationAssignment(
+                    agent_id=agent.id, conversation_id=conversation.id, assigned_at=start, is_active=True
+                ),
+                Message(
+                    conversation_id=conversation.id,
+                    channel_type=ChannelType.email,
+                    direction=MessageDirection.inbound,
+                    body="inbound",
+                    received_at=start,
+                    created_at=start,
+                ),
+                Message(
+                    conversation_id=conversation.id,
+                    channel_type=ChannelType.email,
+                    direction=MessageDirection.outbound,
+                    body="outbound",
+                    sent_at=start + timedelta(minutes=response_minutes),
+                    created_at=start + timedelta(minutes=response_minutes),
+                    author_id=agent_person.id,
+                ),
+            ]
+        )
+        conversations.append(conversation)
+    db_session.commit()
+    return {"base": base, "agent": agent, "conversations": conversations}
+
+
+def _rows(db_session, bucket_start):
+    return db_session.scalars(
+        select(ConversationMetricRollup).where(ConversationMetricRollup.bucket_start == bucket_start)
+    ).all()
+
+
+def test_sketches_merge_into_window_quantiles():
+    first, second = metric_rollups.QuantileSketch(), metric_rollups.QuantileSketch()
+    for value in range(1, 501):
+        first.add(value)
+    for value in range(501, 1001):
+        second.add(value)
+    second.add(0)
+
+    merged = metric_rollups.QuantileSketch.from_dict(first.to_dict())
+    merged.merge(metric_rollups.QuantileSketch.from_dict(second.to_dict()))
+
+    assert merged.count == 1001
+    assert merged.quantile(0.5) == pytest.approx(500, rel=metric_rollups.SKETCH_RELATIVE_ACCURACY)
+    assert merged.quantile(0.9) == pytest.approx(900, rel=metric_rollups.SKETCH_RELATIVE_ACCURACY)
+    assert merged.quantile(0) == 0.0
+    assert metric_rollups.QuantileSketch().quantile(0.5) is None
+
+
+def test_commit_marks_touched_hours_dirty(db_session, scenario):
+    dirty = set(
+        db_session.scalars(
+            select(ConversationMetricRollupHour.bucket_start).where(ConversationMetricRollupHour.dirty_at.isnot(None))
+        )
+    )
+
+    assert {metric_rollups.hour_floor(value) for value in dirty} == {
+        scenario["base"],
+        scenario["base"] + metric_rollups.HOUR,
+    }
+
+
+def test_rebuild_hour_attributes_activity_to_the_assigned_agent(db_session, scenario):
+    base, agent = scenario["base"], scenario["agent"]
+    metric_rollups.rebuild_hour(db_session, base)
+    metric_rollups.rebuild_hour(db_session, base + metric_rollups.HOUR)
+
+    [first] = _rows(db_session, base)
+    assert first.agent_id == agent.id
+    assert first.channel_type == ChannelType.email
+    assert (first.inbound_messages, first.outbound_messages, first.active_conversations) == (1, 1, 1)
+    assert (first.assignments, first.first_responses, first.first_response_seconds_sum) == (1, 1, 600)
+    assert (first.queue_waits, first.queue_wait_seconds_sum) == (1, 240)
+    assert first.resolutions == 0
+
+    [second] = _rows(db_session, base + metric_rollups.HOUR)
+    assert second.resolutions == 1
+    assert second.first_response_seconds_sum == 1800
+
+    # Rebuilding is idempotent and clears the dirty marker.
+    metric_rollups.rebuild_hour(db_session, base)
+    assert len(_rows(db_session, base)) == 1
+    hour = db_session.get(ConversationMetricRollupHour, base)
+    assert hour.dirty_at is None and hour.computed_at is not None
+
+
+def test_long_windows_are_served_from_rollups(db_session, scenario, monkeypatch):
+    from app.services.crm.presence import agent_presence
+
+    # Presence totals use Postgres-only SQL; they are the same on both paths.
+    monkeypatch.setattr(agent_presence, "seconds_by_status_bulk", lambda *_args, **_kwargs: {})
+    now = datetime.now(UTC)
+    start_at, end_at = now - timedelta(days=8), now
+    assert not metric_rollups.covers(db_session, start_at, end_at)
+
+    metric_rollups.backfill_rollups(db_session, start_at, end_at)
+    assert metric_rollups.covers(db_session, start_at, end_at)
+    assert not metric_rollups.covers(db_session, now - timedelta(days=1), now)
+
+    agent_id = str(scenario["agent"].id)
+    fast_rows = reports.agent_performance_metrics(db_session, start_at, end_at, agent_id, None, "email")
+    fast_waits = reports.queue_wait_metrics(db_session, start_at, end_at)
+    fast_kpis = reports.inbox_kpis(db_session, start_at, end_at, None, None, None)
+    fast_trend = reports.conversation_trend(db_session, start_at, end_at, None, None, None)
+    monkeypatch.setattr(metric_rollups, "covers", lambda *_args, **_kwargs: False)
+    raw_rows = reports.agent_performance_metrics(db_session, start_at, end_at, agent_id, None, "email")
+    raw_waits = reports.queue_wait_metrics(db_session, start_at, end_at)
+    raw_kpis = reports.inbox_kpis(db_session, start_at, end_at, None, None, None)
+    raw_trend = reports.conversation_trend(db_session, start_at, end_at, None, None, None)
+
+    assert fast_rows == raw_rows
+    assert fast_rows[0]["total_conversations"] == 2
+    assert fast_rows[0]["avg_first_response_minutes"] == 20.0
+    assert fast_waits["overall"]["count"] == raw_waits["overall"]["count"] == 2
+    assert fast_waits["overall"]["avg_seconds"] == raw_waits["overall"]["avg_seconds"] == 240
+    assert fast_waits["overall"]["median_seconds"] == pytest.approx(240, rel=metric_rollups.SKETCH_RELATIVE_ACCURACY)
+    assert fast_kpis["messages"] == raw_kpis["messages"]
+    assert fast_kpis["conversations"]["resolved"] == raw_kpis["conversations"]["resolved"] == 1
+    assert [day["date"] for day in fast_trend] == [day["date"] for day in raw_trend]
+    assert sum(day["total"] for day in fast_trend) == 2
+    assert sum(day["resolved"] for day in fast_trend) == 1
+
+
+@pytest.fixture()
+def handoffs(db_session):
+    """Window-relative cases: a late assignment and a conversation quiet inside the window."""
+    now = datetime.now(UTC)
+    start_at, end_at = now - timedelta(days=8), now
+    base = metric_rollups.hour_floor(now) - timedelta(days=2)
+    contact = Person(first_name="Handoff", last_name="Contact", email=f"handoff-{uuid.uuid4().hex[:8]}@example.com")
+    agent_person = Person(first_name="Handoff", last_name="Agent", email=f"hagent-{uuid.uuid4().hex[:8]}@example.com")
+    db_session.add_all([contact, agent_person])
+    db_session.flush()
+    agent = CrmAgent(person_id=agent_person.id, is_active=True)
+    db_session.add(agent)
+    db_session.flush()
+
+    # Picked up 15 minutes after the first inbound, answered 15 minutes later.
+    late = Conversation(
+        person_id=contact.id,
+        status=ConversationStatus.resolved,
+        created_at=base + timedelta(minutes=5),
+        updated_at=base + timedelta(hours=2),
+        resolved_at=base + timedelta(hours=2),
+    )
+    # Opened before the window and handed back to the same agent inside it;
+    # resolved in the window without a message in it.
+    quiet = Conversation(
+        person_id=contact.id,
+        status=ConversationStatus.resolved,
+        created_at=start_at - timedelta(hours=2),
+        updated_at=base + timedelta(hours=3),
+        resolved_at=base + timedelta(hours=3),
+    )
+    db_session.add_all([late, quiet])
+    db_session.flush()
+    db_session.add_all(
+        [
+            ConversationAssignment(
+                agent_id=agent.id, conversation_id=late.id, assigned_at=base + timedelta(minutes=20), is_active=True
+            ),
+            _message(late, base + timedelta(minutes=5)),
+            Message(
+                conversation_id=late.id,
+                channel_type=ChannelType.email,
+                direction=MessageDirection.outbound,
+                body="reply",
+                sent_at=base + timedelta(minutes=35),
+                created_at=base + timedelta(minutes=35),
+                author_id=agent_person.id,
+            ),
+            ConversationAssignment(
+                agent_id=agent.id,
+                conversation_id=quiet.id,
+                assigned_at=start_at - timedelta(hours=1),
+                ended_at=base,
+                is_active=False,
+            ),
+            ConversationAssignment(
+                agent_id=agent.id, conversation_id=quiet.id, assigned_at=base + timedelta(hours=1), is_active=True
+            ),
+            _message(quiet, start_at - timedelta(hours=2)),
+        ]
+    )
+    db_session.commit()
+    metric_rollups.backfill_rollups(db_session, start_at, end_at)
+    assert metric_rollups.covers(db_session, start_at, end_at)
+    return {"start_at": start_at, "end_at": end_at, "agent": agent, "base": base, "late": late}
+
+
+def test_inbox_conversation_kpis_match_the_raw_report(db_session, handoffs, monkeypatch):
+    start_at, end_at = handoffs["start_at"], handoffs["end_at"]
+    fast = reports.inbox_kpis(db_session, start_at, end_at, None, None, None)
+    monkeypatch.setattr(metric_rollups, "covers", lambda *_args, **_kwargs: False)
+    raw = reports.inbox_kpis(db_session, start_at, end_at, None, None, None)
+
+    assert fast == raw
+    assert fast["conversations"] == {"active": 1, "resolved": 1}
+    assert fast["avg_response_minutes"] == 30.0
+    assert fast["avg_resolution_minutes"] == 115.0
+
+
+def test_agent_conversation_counts_match_the_raw_report(db_session, handoffs, monkeypatch):
+    from app.services.crm.presence import agent_presence
+
+    monkeypatch.setattr(agent_presence, "seconds_by_status_bulk", lambda *_args, **_kwargs: {})
+    start_at, end_at = handoffs["start_at"], handoffs["end_at"]
+    agent_id = str(handoffs["agent"].id)
+    fast = reports.agent_performance_metrics(db_session, start_at, end_at, agent_id, None, None)
+    monkeypatch.setattr(metric_rollups, "covers", lambda *_args, **_kwargs: False)
+    raw = reports.agent_performance_metrics(db_session, start_at, end_at, agent_id, None, None)
+
+    assert fast == raw
+    [row] = fast
+    assert (row["total_conversations"], row["total_assignments"], row["resolved_conversations"]) == (2, 2, 2)
+    assert row["avg_first_response_minutes"] == 15.0
+    assert row["avg_resolution_minutes"] == 110.0
+
+
+def test_only_utc_windows_are_covered(db_session, handoffs):
+    offset = timezone(timedelta(hours=3))
+    start_at, end_at = handoffs["start_at"], handoffs["end_at"]
+
+    assert metric_rollups.covers(db_session, start_at, end_at)
+    assert not metric_rollups.covers(db_session, start_at.astimezone(offset), end_at.astimezone(offset))
+
+
+def test_channel_trend_counts_conversations_first_active_on_another_channel(db_session, handoffs, monkeypatch):
+    start_at, end_at = handoffs["start_at"], handoffs["end_at"]
+    # Same UTC day as the email that opened it, and after it.
+    chat_at = handoffs["base"].replace(hour=23, minute=50)
+    chat = _message(handoffs["late"], chat_at)
+    chat.channel_type = ChannelType.whatsapp
+    db_session.add(chat)
+    db_session.commit()
+    first_hour = start_at.replace(hour=0, minute=0, second=0, microsecond=0)
+    metric_rollups.backfill_rollups(db_session, first_hour, end_at)
+    metric_rollups.rebuild_hour(db_session, chat_at)
+    db_session.commit()
+    assert metric_rollups.covers(db_session, first_hour, end_at)
+
+    fast = {
+        channel: reports.conversation_trend(db_session, start_at, end_at, None, None, channel)
+        for channel in (None, "email", "whatsapp")
+    }
+    monkeypatch.setattr(metric_rollups, "covers", lambda *_args, **_kwargs: False)
+    raw = {
+        channel: reports.conversation_trend(db_session, start_at, end_at, None, None, channel)
+        for channel in (None, "email", "whatsapp")
+    }
+
+    for channel, days in fast.items():
+        assert [(day["date"], day["total"]) for day in days] == [(day["date"], day["total"]) for day in raw[channel]]
+    chat_day = {day["date"]: day["total"] for day in fast["whatsapp"]}
+    assert chat_day[chat_at.date().isoformat()] == 1
+    assert sum(chat_day.values()) == 1
+
+
+def _message(conversation, at):
+    return Message(
+        conversation_id=conversation.id,
+        channel_type=ChannelType.email,
+        direction=MessageDirection.inbound,
+        body="late",
+        received_at=at,
+        created_at=at,
+    )
+
+
+def _hour(db_session, bucket_start):
+    db_session.expire_all()
+    return db_session.get(ConversationMetricRollupHour, bucket_start)
+
+
+def test_commits_skip_hours_already_waiting_for_a_rebuild(db_session, scenario):
+    base = scenario["base"]
+    marked_at = _hour(db_session, base).dirty_at
+
+    db_session.add(_message(scenario["conversations"][0], base + timedelta(minutes=40)))
+    db_session.commit()
+
+    assert _hour(db_session, base).dirty_at == marked_at
+
+
+def test_commit_during_a_rebuild_keeps_the_hour_dirty(db_session, scenario, monkeypatch):
+    base = scenario["base"]
+    build = metric_rollups._HourBuilder.build
+
+    def build_with_concurrent_commit(self):
+        buckets = build(self)
+        db_session.add(_message(scenario["conversations"][0], base + timedelta(minutes=40)))
+        db_session.commit()
+        return buckets
+
+    monkeypatch.setattr(metric_rollups._HourBuilder, "build", build_with_concurrent_commit)
+    metric_rollups.rebuild_hour(db_session, base)
+    db_session.commit()
+    assert _hour(db_session, base).dirty_at is not None
+
+    monkeypatch.setattr(metric_rollups._HourBuilder, "build", build)
+    assert metric_rollups.refresh_rollups(db_session)["dirty"] >= 1
+    assert _hour(db_session, base).dirty_at is None
+    assert sum(row.inbound_messages for row in _rows(db_session, base)) == 2
+
+
+def test_marks_wait_for_the_outer_commit(db_session, scenario):
+    later = scenario["base"] + timedelta(hours=5)
+
+    with db_session.begin_nested():
+        db_session.add(_message(scenario["conversations"][0], later))
+    assert _hour(db_session, later) is None
+
+    db_session.commit()
+    assert _hour(db_session, later).dirty_at is not None
+
+
+def test_an_hour_holds_one_row_per_bucket_key(db_session, scenario):
+    base = scenario["base"]
+    metric_rollups.rebuild_hour(db_session, base)
+    [row] = _rows(db_session, base)
+
+    with pytest.raises(IntegrityError), db_session.begin_nested():
+        db_session.add(
+            ConversationMetricRollup(
+                bucket_start=base,
+                channel_type=row.channel_type,
+                channel_target_id=row.channel_target_id,
+                team_id=row.team_id,
+                agent_id=row.agent_id,
+            )
+        )
+        db_session.flush()
+    assert len(_rows(db_session, base)) == 1
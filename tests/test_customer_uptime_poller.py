@@ -0,0 +1,132 @@
+"""Batched customer uptime polling and its leader lock."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.models.customer_uptime import CustomerUptimePeriod, CustomerUptimeSnapshot
+from app.models.domain_settings import DomainSetting, SettingDomain
+from app.services import customer_uptime
+
+T0 = datetime(2026, 10, 1, 8, 0, tzinfo=UTC)
+
+
+def _online(monkeypatch, *customer_ids):
+    rows = [{"customer_id": cid, "service_id": f"svc-{cid}", "login": f"login-{cid}"} for cid in customer_ids]
+    monkeypatch.setattr(customer_uptime.selfcare, "fetch_online_customers", lambda db: rows)
+
+
+def _periods(db, customer_id):
+    stmt = (
+        select(CustomerUptimePeriod)
+        .where(CustomerUptimePeriod.customer_id == customer_id)
+        .order_by(CustomerUptimePeriod.started_at)
+    )
+    return list(db.execute(stmt).scalars())
+
+
+def test_poll_writes_snapshots_and_opens_periods(db_session, monkeypatch):
+    _online(monkeypatch, "uptime-a", "uptime-b")
+
+    result = customer_uptime.poll_subscriber_uptime_once(db_session, observed_at=T0)
+
+    assert result["online"] >= 2
+    assert result["period_changes"] >= 2
+    snapshots = db_session.execute(
+        select(CustomerUptimeSnapshot).where(CustomerUptimeSnapshot.customer_id.in_(["uptime-a", "uptime-b"]))
+    ).scalars()
+    assert sorted(snap.login for snap in snapshots) == ["login-uptime-a", "login-uptime-b"]
+    [period] = _periods(db_session, "uptime-a")
+    assert period.status == customer_uptime.STATUS_ONLINE
+    assert period.ended_at is None
+
+
+def test_poll_closes_period_only_on_state_change(db_session, monkeypatch):
+    _online(monkeypatch, "uptime-c")
+    customer_uptime.poll_subscriber_uptime_once(db_session, observed_at=T0)
+    # Still online: no new period.
+    customer_uptime.poll_subscriber_uptime_once(db_session, observed_at=T0 + timedelta(minutes=5))
+    assert len(_periods(db_session, "uptime-c")) == 1
+
+    # Gone from the online list: the open period closes and an offline one opens.
+    monkeypatch.setattr(
+        customer_uptime,
+        "_active_service_pairs",
+        lambda db, online: {("uptime-c", "svc-uptime-c"): {"customer_id": "uptime-c", "service_id": "svc-uptime-c"}},
+    )
+    _online(monkeypatch)
+    customer_uptime.poll_subscriber_uptime_once(db_session, observed_at=T0 + timedelta(minutes=10))
+    db_session.expire_all()
+
+    closed, opened = _periods(db_session, "uptime-c")
+    assert closed.status == customer_uptime.STATUS_ONLINE
+    assert closed.duration_seconds == 600
+    assert opened.status == customer_uptime.STATUS_OFFLINE
+    assert opened.ended_at is None
+    assert opened.login == "login-uptime-c"
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        self.ttls[key] = ex
+        return True
+
+    def eval(self, script, numkeys, key, token):
+        if self.store.get(key) == token:
+            del self.store[key]
+            return 1
+        return 0
+
+
+def test_run_uptime_poll_runs_once_per_interval(db_session, monkeypatch):
+    fake = _FakeRedis()
+    calls = []
+    monkeypatch.setattr(customer_uptime, "_leader_lock_redis", lambda: fake)
+    monkeypatch.setattr(
+        customer_uptime, "poll_subscriber_uptime_once", lambda db, observed_at=None: calls.append(1) or {"snapshots": 0}
+    )
+
+    assert customer_uptime.run_uptime_poll(db_session) == {"snapshots": 0}
+    assert customer_uptime.run_uptime_poll(db_session) == {"skipped": True}
+    assert len(calls) == 1
+
+
+def test_run_uptime_poll_releases_lock_on_failure(db_session, monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(customer_uptime, "_leader_lock_redis", lambda: fake)
+
+    def _boom(db, observed_at=None):
+        raise RuntimeError("selfcare down")
+
+    monkeypatch.setattr(customer_uptime, "poll_subscriber_uptime_once", _boom)
+    with pytest.raises(RuntimeError):
+        customer_uptime.run_uptime_poll(db_session)
+    assert customer_uptime.LEADER_LOCK_KEY not in fake.store
+
+
+def test_leader_lock_ttl_follows_the_scheduled_interval(db_session, monkeypatch):
+    monkeypatch.delenv("CUSTOMER_UPTIME_POLL_INTERVAL_SECONDS", raising=False)
+    db_session.add(
+        DomainSetting(
+            domain=SettingDomain.integration,
+            key="customer_uptime_poll_interval_seconds",
+            value_text="900",
+            is_active=True,
+        )
+    )
+    db_session.flush()
+    fake = _FakeRedis()
+    monkeypatch.setattr(customer_uptime, "_leader_lock_redis", lambda: fake)
+    monkeypatch.setattr(customer_uptime, "poll_subscriber_uptime_once", lambda db, observed_at=None: {"snapshots": 0})
+
+    customer_uptime.run_uptime_poll(db_session)
+
+    assert fake.ttls[customer_uptime.LEADER_LOCK_KEY] == 895
@@ -0,0 +1,82 @@
+"""Handler routing and concurrent execution in the event dispatcher."""
+
+import threading
+from unittest.mock import MagicMock
+
+from app.services.events import dispatcher as dispatcher_module
+from app.services.events.dispatcher import EventDispatcher
+from app.services.events.types import Event, EventType
+
+
+class _Handler:
+    def __init__(self, event_types=None, concurrent=False, action=None):
+        if event_types is not None:
+            self.event_types = frozenset(event_types)
+        self.concurrent = concurrent
+        self.action = action
+        self.calls = []
+
+    def handle(self, db, event):
+        self.calls.append((threading.current_thread().name, event.event_type))
+        if self.action:
+            self.action()
+
+
+def test_handlers_for_routes_by_declared_event_types():
+    tickets = _Handler(event_types={EventType.ticket_created})
+    everything = _Handler()
+    dispatcher = EventDispatcher()
+    dispatcher.register_handler(tickets)
+    dispatcher.register_handler(everything)
+
+    assert dispatcher.handlers_for(EventType.ticket_created) == [tickets, everything]
+    assert dispatcher.handlers_for(EventType.usage_recorded) == [everything]
+
+    late = _Handler(event_types={EventType.usage_recorded})
+    dispatcher.register_handler(late)
+    assert dispatcher.handlers_for(EventType.usage_recorded) == [everything, late]
+
+
+def test_concurrent_handler_runs_on_pool_with_own_session(db_session, monkeypatch):
+    isolated_session = MagicMock()
+    monkeypatch.setattr(dispatcher_module, "SessionLocal", lambda: isolated_session)
+    pooled = _Handler(concurrent=True)
+    inline = _Handler()
+    dispatcher = EventDispatcher()
+    dispatcher.register_handler(pooled)
+    dispatcher.register_handler(inline)
+
+    failed = dispatcher._run_handlers(db_session, Event(event_type=EventType.ticket_created, payload={}))
+
+    assert failed == []
+    assert pooled.calls[0][0].startswith("event-handler")
+    assert inline.calls[0][0] == threading.current_thread().name
+    isolated_session.commit.assert_called_once()
+    isolated_session.close.assert_called_once()
+
+
+def test_slow_concurrent_handler_is_recorded_as_timed_out(db_session, monkeypatch):
+    monkeypatch.setattr(dispatcher_module, "SessionLocal", MagicMock)
+    monkeypatch.setenv("EVENT_HANDLER_TIMEOUT_SECONDS", "0.1")
+    release = threading.Event()
+    slow = _Handler(concurrent=True, action=lambda: release.wait(5))
+    dispatcher = EventDispatcher()
+    dispatcher.register_handler(slow)
+
+    try:
+        failed = dispatcher._run_handlers(db_session, Event(event_type=EventType.ticket_created, payload={}))
+    finally:
+        release.set()
+
+    assert failed == [{"handler": "_Handler", "error": "handler timed out"}]
+
+
+def test_pool_size_zero_runs_concurrent_handlers_inline(db_session, monkeypatch):
+    monkeypatch.setenv("EVENT_HANDLER_POOL_SIZE", "0")
+    handler = _Handler(concurrent=True)
+    dispatcher = EventDispatcher()
+    dispatcher.register_handler(handler)
+
+    dispatcher._run_handlers(db_session, Event(event_type=EventType.ticket_created, payload={}))
+
+    assert handler.calls[0][0] == threading.current_thread().name
@@ -0,0 +1,135 @@
+"""Transactional-outbox mode of the event dispatcher."""
+
+from sqlalchemy import select
+
+from app.models.event_store import EventStatus, EventStore
+from app.services.events import dispatcher as dispatcher_module
+from app.services.events.dispatcher import EventDispatcher
+from app.services.events.types import Event, EventType
+
+
+class _RecordingHandler:
+    def __init__(self):
+        self.seen = []
+
+    def handle(self, db, event):
+        self.seen.append(event.event_id)
+
+
+class _FailingHandler:
+    def handle(self, db, event):
+        raise RuntimeError("downstream unavailable")
+
+
+def _outbox_on(monkeypatch):
+    monkeypatch.setenv("EVENT_OUTBOX_ENABLED", "true")
+    monkeypatch.setattr(dispatcher_module, "_kick_outbox_consumer_after_commit", lambda db: None)
+
+
+def _record(db, event):
+    return db.execute(select(EventStore).where(EventStore.event_id == event.event_id)).scalar_one()
+
+
+def test_dispatch_in_outbox_mode_defers_handlers(db_session, monkeypatch):
+    _outbox_on(monkeypatch)
+    handler = _RecordingHandler()
+    dispatcher = EventDispatcher()
+    dispatcher.register_handler(handler)
+    event = Event(event_type=EventType.ticket_created, payload={"ticket_id": "t-1"})
+
+    dispatcher.dispatch(db_session, event)
+    db_session.commit()
+
+    assert handler.seen == []
+    assert _record(db_session, event).status == EventStatus.pending
+
+
+def test_outbox_row_rolls_back_with_caller(db_session, monkeypatch):
+    _outbox_on(monkeypatch)
+    dispatcher = EventDispatcher()
+    event = Event(event_type=EventType.ticket_created, payload={})
+
+    db_session.execute(select(EventStore.id).limit(1))
+    dispatcher.dispatch(db_session, event)
+    db_session.rollback()
+
+    found = db_session.execute(select(EventStore).where(EventStore.event_id == event.event_id)).scalar_one_or_none()
+    assert found is None
+
+
+def test_enqueue_after_commit_waits_for_the_caller(db_session, monkeypatch):
+    _outbox_on(monkeypatch)
+    event = Event(event_type=EventType.ticket_created, payload={})
+    db_session.commit()
+
+    EventDispatcher().dispatch(db_session, event)
+    db_session.rollback()
+
+    found = db_session.execute(select(EventStore).where(EventStore.event_id == event.event_id)).scalar_one_or_none()
+    assert found is None
+
+
+def test_consumer_is_kicked_once_after_the_outer_commit(db_session, monkeypatch):
+    monkeypatch.setenv("EVENT_OUTBOX_ENABLED", "true")
+    kicks = []
+    monkeypatch.setattr(dispatcher_module, "_queue_outbox_consumer", lambda: kicks.append(1))
+    dispatcher = EventDispatcher()
+
+    with db_session.begin_nested():
+        dispatcher.dispatch(db_session, Event(event_type=EventType.ticket_created, payload={}))
+        dispatcher.dispatch(db_session, Event(event_type=EventType.ticket_updated, payload={}))
+    assert kicks == []
+
+    db_session.commit()
+    assert kicks == [1]
+
+    dispatcher.dispatch(db_session, Event(event_type=EventType.ticket_created, payload={}))
+    db_session.rollback()
+    db_session.commit()
+    assert kicks == [1]
+
+
+def test_process_outbox_runs_handlers_and_batches_status(db_session, monkeypatch):
+    _outbox_on(monkeypatch)
+    handler = _RecordingHandler()
+    producer = EventDispatcher()
+    ok = Event(event_type=EventType.ticket_created, payload={})
+    bad = Event(event_type=EventType.ticket_updated, payload={})
+    producer.dispatch(db_session, ok)
+    producer.dispatch(db_session, bad)
+    db_session.commit()
+
+    class _FailOnUpdate(_FailingHandler):
+        def handle(self, db, event):
+            if event.event_type == EventType.ticket_updated:
+                super().handle(db, event)
+
+    consumer = EventDispatcher()
+    consumer.register_handler(handler)
+    consumer.register_handler(_FailOnUpdate())
+    result = consumer.process_outbox(db_session, batch_size=100)
+
+    assert result["completed"] >= 1
+    assert result["failed"] >= 1
+    assert ok.event_id in handler.seen and bad.event_id in handler.seen
+    db_session.expire_all()
+    assert _record(db_session, ok).status == EventStatus.completed
+    failed = _record(db_session, bad)
+    assert failed.status == EventStatus.failed
+    assert failed.failed_handlers["handlers"][0]["handler"] == "_FailOnUpdate"
+    assert failed.processed_at is not None
+
+    # Claimed rows are not picked up again.
+    assert consumer.process_outbox(db_session, batch_size=100)["claimed"] == 0
+
+
+def test_dispatch_without_outbox_runs_handlers_inline(db_session, monkeypatch):
+    monkeypatch.delenv("EVENT_OUTBOX_ENABLED", raising=False)
+    handler = _RecordingHandler()
+    dispatcher = EventDispatcher()
+    dispatcher.register_handler(handler)
+    event = Event(event_type=EventType.ticket_created, payload={})
+
+    dispatcher.dispatch(db_session, event)
+
+    assert handler.seen == [event.event_id]
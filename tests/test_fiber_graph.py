@@ -0,0 +1,181 @@
+"""In-memory fiber connectivity graph: traces and outage impact."""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from app.models.network import (
+    FdhCabinet,
+    FiberEndpointType,
+    FiberSegment,
+    FiberSplice,
+    FiberSpliceClosure,
+    FiberStrand,
+    OLTDevice,
+    OntAssignment,
+    OntUnit,
+    PonPort,
+    PonPortSplitterLink,
+    Splitter,
+    SplitterPort,
+    SplitterPortType,
+)
+from app.models.person import Person
+from app.models.subscriber import Subscriber
+from app.services import fiber_graph
+from app.services.fiber_graph import affected_by, trace_asset
+
+
+@pytest.fixture(autouse=True)
+def _local_graph_cache(monkeypatch):
+    monkeypatch.setattr(fiber_graph, "_cache", fiber_graph.FiberGraphCache(client_factory=lambda: None))
+
+
+def _subscriber(db_session) -> Subscriber:
+    person = Person(first_name="Fiber", last_name="Customer", email=f"fiber-{uuid.uuid4().hex[:8]}@example.com")
+    db_session.add(person)
+    db_session.flush()
+    subscriber = Subscriber(person_id=person.id, subscriber_number=f"SUB-{uuid.uuid4().hex[:8]}")
+    db_session.add(subscriber)
+    db_session.flush()
+    return subscriber
+
+
+def _ont(db_session, pon: PonPort, subscriber: Subscriber | None) -> OntUnit:
+    ont = OntUnit(serial_number=f"ONT-{uuid.uuid4().hex[:8]}")
+    db_session.add(ont)
+    db_session.flush()
+    db_session.add(
+        OntAssignment(ont_unit_id=ont.id, pon_port_id=pon.id, subscriber_id=subscriber.id if subscriber else None)
+    )
+    return ont
+
+
+@pytest.fixture()
+def plant(db_session):
+    """OLT → PON → FDH splitter → feeder cable → closure → drop strand → ONT."""
+    olt = OLTDevice(name="OLT Graph", hostname="olt-graph")
+    db_session.add(olt)
+    db_session.flush()
+    pon = PonPort(olt_id=olt.id, name="0/1/1")
+    other_pon = PonPort(olt_id=olt.id, name="0/1/2")
+    fdh = FdhCabinet(name="FDH Graph")
+    closure = FiberSpliceClosure(name="Closure Graph")
+    db_session.add_all([pon, other_pon, fdh, closure])
+    db_session.flush()
+    splitter = Splitter(name="SPL-1", fdh_id=fdh.id)
+    db_session.add(splitter)
+    db_session.flush()
+    port_in = SplitterPort(splitter_id=splitter.id, port_number=0, port_type=SplitterPortType.input)
+    port_out = SplitterPort(splitter_id=splitter.id, port_number=1, port_type=SplitterPortType.output)
+    db_session.add_all([port_in, port_out])
+    db_session.flush()
+    db_session.add(PonPortSplitterLink(pon_port_id=pon.id, splitter_port_id=port_in.id))
+
+    far_subscriber, near_subscriber, other_subscriber = (_subscriber(db_session) for _ in range(3))
+    far_ont = _ont(db_session, pon, far_subscriber)
+    _ont(db_session, pon, near_subscriber)
+    _ont(db_session, other_pon, other_subscriber)
+
+    feeder = FiberStrand(
+        cable_name="CABLE-GRAPH",
+        strand_number=1,
+        upstream_type=FiberEndpointType.splitter_port,
+        upstream_id=port_out.id,
+        downstream_type=FiberEndpointType.splice_closure,
+        downstream_id=closure.id,
+    )
+    bystander = FiberStrand(
+        cable_name="CABLE-OTHER",
+        strand_number=1,
+        downstream_type=FiberEndpointType.splice_closure,
+        downstream_id=closure.id,
+    )
+    drop = FiberStrand(
+        cable_name="DROP-GRAPH",
+        strand_number=1,
+        upstream_type=FiberEndpointType.splice_closure,
+        upstream_id=closure.id,
+        downstream_type=FiberEndpointType.ont,
+        downstream_id=far_ont.id,
+    )
+    db_session.add_all([feeder, bystander, drop])
+    db_session.flush()
+    db_session.add(FiberSplice(closure_id=closure.id, from_strand_id=feeder.id, to_strand_id=drop.id))
+    segment = FiberSegment(name="CABLE-GRAPH")
+    db_session.add(segment)
+    db_session.commit()
+    return {
+        "olt": olt,
+        "pon": pon,
+        "closure": closure,
+        "segment": segment,
+        "feeder": feeder,
+        "bystander": bystander,
+        "far_ont": far_ont,
+        "far_subscriber": far_subscriber,
+        "near_subscriber": near_subscriber,
+        "other_subscriber": other_subscriber,
+    }
+
+
+def test_cut_segment_affects_only_subscribers_behind_it(db_session, plant):
+    impact = affected_by(db_session, "fiber_segment", plant["segment"].id)
+
+    assert impact.ont_unit_ids == [plant["far_ont"].id]
+    assert impact.subscriber_ids == [plant["far_subscriber"].id]
+    assert impact.pon_port_ids == []
+
+    # A strand that merely ends in the same closure doesn't reach the drop.
+    assert affected_by(db_session, "fiber_strand", plant["bystander"].id).ont_unit_ids == []
+
+
+def test_pon_and_olt_impact_include_every_assignment(db_session, plant):
+    pon_impact = affected_by(db_session, "pon_port", plant["pon"].id)
+    assert set(pon_impact.subscriber_ids) == {plant["far_subscriber"].id, plant["near_subscriber"].id}
+    assert pon_impact.pon_port_ids == [plant["pon"].id]
+
+    olt_impact = affected_by(db_session, "olt_device", plant["olt"].id)
+    assert len(olt_impact.subscriber_ids) == 3
+    assert len(olt_impact.pon_port_ids) == 2
+
+
+def test_trace_walks_upstream_to_the_olt(db_session, plant):
+    trace = trace_asset(db_session, "fiber_strand", plant["feeder"].id)
+
+    upstream = {(node["type"], node["id"]) for node in trace["upstream"]}
+    assert ("pon_port", str(plant["pon"].id)) in upstream
+    assert ("olt_device", str(plant["olt"].id)) in upstream
+    assert ("fiber_segment", str(plant["segment"].id)) in upstream
+    assert trace["downstream"][-1] == {"type": "ont_unit", "id": str(plant["far_ont"].id)}
+
+    with pytest.raises(ValueError):
+        trace_asset(db_session, "pop_site", plant["olt"].id)
+
+
+def test_committed_changes_rebuild_the_graph(db_session, plant):
+    assert affected_by(db_session, "splice_closure", plant["closure"].id).subscriber_ids == [plant["far_subscriber"].id]
+
+    assignment = db_session.query(OntAssignment).filter_by(ont_unit_id=plant["far_ont"].id).one()
+    assignment.subscriber_id = plant["other_subscriber"].id
+    db_session.commit()
+
+    assert affected_by(db_session, "splice_closure", plant["closure"].id).subscriber_ids == [
+        plant["other_subscriber"].id
+    ]
+
+
+def test_savepoint_edits_rebuild_the_graph_on_the_outer_commit(db_session, plant, monkeypatch):
+    rebuilds = []
+    monkeypatch.setattr(fiber_graph, "invalidate_fiber_graph", lambda: rebuilds.append(1))
+    assignment = db_session.query(OntAssignment).filter_by(ont_unit_id=plant["far_ont"].id).one()
+
+    with db_session.begin_nested():
+        assignment.subscriber_id = plant["other_subscriber"].id
+    assert rebuilds == []
+
+    db_session.commit()
+    db_session.commit()
+    assert rebuilds == [1]
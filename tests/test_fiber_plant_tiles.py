@@ -0,0 +1,208 @@
+"""Fiber plant vector tiles (pure-Python encoder path)."""
+
+from __future__ import annotations
+
+import math
+
+import pytest
+from geoalchemy2.elements import WKTElement
+from sqlalchemy import select
+from sqlalchemy.orm import defer
+
+from app.models.network import FdhCabinet, FiberSegment, FiberTerminationPoint, OLTDevice
+from app.services import fiber_plant_tiles
+from app.services.fiber_plant_tiles import get_tile
+
+
+@pytest.fixture(autouse=True)
+def _local_tile_cache(monkeypatch):
+    monkeypatch.setattr(fiber_plant_tiles, "_cache", fiber_plant_tiles._TileCache(client_factory=lambda: None))
+
+
+def _tile_for(lat: float, lon: float, z: int) -> tuple[int, int, int]:
+    n = 2**z
+    rad = math.radians(lat)
+    return z, int((lon + 180.0) / 360.0 * n), int((1.0 - math.asinh(math.tan(rad)) / math.pi) / 2.0 * n)
+
+
+def _read_varint(buf: bytes, pos: int) -> tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _fields(buf: bytes) -> list[tuple[int, object]]:
+    pos, out = 0, []
+    while pos < len(buf):
+        key, pos = _read_varint(buf, pos)
+        number, wire_type = key >> 3, key & 0x7
+        if wire_type == 0:
+            value, pos = _read_varint(buf, pos)
+        elif wire_type == 2:
+            length, pos = _read_varint(buf, pos)
+            value, pos = buf[pos : pos + length], pos + length
+        elif wire_type == 1:
+            value, pos = buf[pos : pos + 8], pos + 8
+        else:
+            raise AssertionError(f"unexpected wire type {wire_type}")
+        out.append((number, value))
+    return out
+
+
+def _decode(tile: bytes) -> dict[str, list[dict]]:
+    """Layer name -> features as {"type", "properties", "geometry"} (raw command ints)."""
+    layers = {}
+    for number, layer_bytes in _fields(tile):
+        assert number == 3
+        fields = _fields(layer_bytes)
+        name = next(value.decode() for n, value in fields if n == 1)
+        keys = [value.decode() for n, value in fields if n == 3]
+        values = []
+        for n, value in fields:
+            if n == 4:
+                (kind, raw), *_ = _fields(value)
+                values.append(raw.decode() if kind == 1 else raw)
+        assert dict(fields)[15] == 2 and dict(fields)[5] == fiber_plant_tiles.EXTENT
+        features = []
+        for n, feature_bytes in fields:
+            if n != 2:
+                continue
+            feature = dict(_fields(feature_bytes))
+            tags = _packed_ints(feature[2])
+            properties = {keys[tags[i]]: values[tags[i + 1]] for i in range(0, len(tags), 2)}
+            features.append({"type": feature[3], "properties": properties, "geometry": _packed_ints(feature[4])})
+        layers[name] = features
+    return layers
+
+
+def _packed_ints(buf: bytes) -> list[int]:
+    pos, out = 0, []
+    while pos < len(buf):
+        value, pos = _read_varint(buf, pos)
+        out.append(value)
+    return out
+
+
+def _segment(db_session, name: str, start: tuple[float, float], end: tuple[float, float]) -> FiberSegment:
+    from_point = FiberTerminationPoint(name=f"{name}-A", latitude=start[0], longitude=start[1])
+    to_point = FiberTerminationPoint(name=f"{name}-B", latitude=end[0], longitude=end[1])
+    db_session.add_all([from_point, to_point])
+    db_session.flush()
+    segment = FiberSegment(name=name, from_point_id=from_point.id, to_point_id=to_point.id, fiber_count=48)
+    db_session.add(segment)
+    return segment
+
+
+def test_tile_contains_assets_in_view_by_layer(db_session):
+    olt = OLTDevice(name="OLT Tile", hostname="olt-tile", latitude=9.0815, longitude=7.4005)
+    db_session.add_all(
+        [
+            olt,
+            FdhCabinet(name="FDH Tile", code="FDH-T", latitude=9.0810, longitude=7.4010),
+            FdhCabinet(name="FDH Far", code="FDH-F", latitude=6.5, longitude=3.3),
+        ]
+    )
+    _segment(db_session, "Long", (9.0800, 7.4000), (9.0820, 7.4030))
+    _segment(db_session, "Stub", (9.0801, 7.4001), (9.0801, 7.400101))
+    db_session.commit()
+
+    layers = _decode(get_tile(db_session, *_tile_for(9.0810, 7.4010, 14)))
+
+    assert set(layers) == {"olt_device", "fiber_segment", "fdh_cabinet"}
+    [olt_feature] = layers["olt_device"]
+    assert olt_feature["type"] == 1
+    assert olt_feature["properties"] == {"id": str(olt.id), "name": "OLT Tile", "site_role": "olt"}
+    assert [f["properties"]["code"] for f in layers["fdh_cabinet"]] == ["FDH-T"]
+    # The sub-pixel stub is dropped; the real segment is a line with a MoveTo and one LineTo.
+    [segment_feature] = layers["fiber_segment"]
+    assert segment_feature["properties"]["name"] == "Long"
+    assert segment_feature["properties"]["segment_type"] == "distribution"
+    assert segment_feature["type"] == 2
+    assert segment_feature["geometry"][0] == (1 | 1 << 3) and segment_feature["geometry"][3] == (2 | 1 << 3)
+
+    # Cabinets are hidden below their minimum zoom; an explicit layer filter is honoured.
+    low = _decode(get_tile(db_session, *_tile_for(9.0810, 7.4010, 8)))
+    assert "fdh_cabinet" not in low and "olt_device" in low
+    only_olt = _decode(get_tile(db_session, *_tile_for(9.0810, 7.4010, 14), layers=["olt_device"]))
+    assert set(only_olt) == {"olt_device"}
+
+
+def test_tile_arguments_are_validated(db_session):
+    with pytest.raises(ValueError):
+        get_tile(db_session, 3, 8, 0)
+    with pytest.raises(ValueError):
+        get_tile(db_session, 14, 0, 0, layers=["pop_site"])
+    assert get_tile(db_session, *_tile_for(-33.9, 18.4, 14)) == b""
+
+
+def test_committed_edits_invalidate_cached_tiles(db_session):
+    cabinet = FdhCabinet(name="FDH Cache", code="FDH-C", latitude=9.0810, longitude=7.4010)
+    db_session.add(cabinet)
+    db_session.commit()
+    tile = _tile_for(9.0810, 7.4010, 14)
+    assert len(_decode(get_tile(db_session, *tile))["fdh_cabinet"]) == 1
+
+    cabinet.is_active = False
+    db_session.flush()
+    # Not committed yet: other readers still get the cached tile.
+    assert len(_decode(get_tile(db_session, *tile))["fdh_cabinet"]) == 1
+    db_session.commit()
+
+    assert "fdh_cabinet" not in _decode(get_tile(db_session, *tile))
+
+    # Savepoint releases wait for the outer commit.
+    with db_session.begin_nested():
+        cabinet.is_active = True
+    assert "fdh_cabinet" not in _decode(get_tile(db_session, *tile))
+    db_session.commit()
+    assert len(_decode(get_tile(db_session, *tile))["fdh_cabinet"]) == 1
+
+
+def _routed_segment(db_session, name: str, *points: tuple[float, float]) -> FiberSegment:
+    wkt = "LINESTRING(" + ", ".join(f"{lon} {lat}" for lat, lon in points) + ")"
+    segment = FiberSegment(name=name, route_geom=WKTElement(wkt, srid=4326))
+    db_session.add(segment)
+    return segment
+
+
+def _stored_bounds(db_session, segment_id) -> tuple:
+    return tuple(
+        db_session.execute(
+            select(
+                FiberSegment.route_min_longitude,
+                FiberSegment.route_min_latitude,
+                FiberSegment.route_max_longitude,
+                FiberSegment.route_max_latitude,
+            ).where(FiberSegment.id == segment_id)
+        ).one()
+    )
+
+
+def test_routed_segments_are_filtered_by_stored_bounds(db_session):
+    near = _routed_segment(db_session, "Routed Near", (9.0800, 7.4000), (9.0815, 7.4012), (9.0820, 7.4030))
+    far = _routed_segment(db_session, "Routed Far", (6.5000, 3.3000), (6.5010, 3.3020))
+    db_session.flush()
+    near_id, far_id = near.id, far.id
+    db_session.commit()
+    assert _stored_bounds(db_session, near_id) == (7.4000, 9.0800, 7.4030, 9.0820)
+
+    bounds = fiber_plant_tiles.tile_bounds(*_tile_for(9.0810, 7.4010, 14), buffer=fiber_plant_tiles.BUFFER)
+    in_tile = select(FiberSegment.id).where(
+        FiberSegment.id.in_([near_id, far_id]), fiber_plant_tiles._route_bbox_filter(bounds)
+    )
+    assert db_session.scalars(in_tile).all() == [near_id]
+
+    # Rerouting keeps the stored bounds current.
+    db_session.expunge_all()
+    rerouted = db_session.get(FiberSegment, far_id, options=[defer(FiberSegment.route_geom)])
+    rerouted.route_geom = WKTElement("LINESTRING(7.4005 9.0805, 7.4025 9.0818)", srid=4326)
+    db_session.commit()
+    assert set(db_session.scalars(in_tile)) == {near_id, far_id}
+    rerouted.route_geom = None
+    db_session.commit()
+    assert _stored_bounds(db_session, far_id) == (None, None, None, None)
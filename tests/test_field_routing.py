@@ -2,6 +2,8 @@
 
 import uuid
 
+from app.models.dispatch import TechnicianProfile
+from app.models.field_location import FieldTechPresence
 from app.models.person import Person
 from app.models.workforce import WorkOrderStatus
 from app.schemas.workforce import WorkOrderCreate
@@ -122,3 +124,154 @@ def test_day_route_puts_unlocated_jobs_last(db_session, person, project, ticket)
     route = routing.order_day_route(db_session, str(person.id), start_latitude=JOB_LAT, start_longitude=JOB_LNG)
     assert route[-1]["work_order_id"] == str(unlocated.id)
     assert route[-1]["distance_km"] is None
+
+
+def test_presence_grid_nearest_matches_brute_force():
+    import random
+
+    from app.services.field.geofence import haversine_m
+    from app.services.field.spatial_index import PresenceGrid
+
+    rng = random.Random(7)
+    grid = PresenceGrid()
+    points = {f"t{i}": (6.3 + rng.random() * 0.6, 3.1 + rng.random() * 0.6) for i in range(400)}
+    for pid, (lat, lng) in points.items():
+        grid.upsert(pid, lat, lng)
+
+    hits = grid.nearest(JOB_LAT, JOB_LNG, k=5)
+    expected = sorted(points, key=lambda pid: haversine_m(JOB_LAT, JOB_LNG, *points[pid]))[:5]
+    assert [pid for pid, _ in hits] == expected
+
+    within = grid.nearest(JOB_LAT, JOB_LNG, k=50, max_m=3000, accept=lambda pid: pid.endswith("1"))
+    assert all(distance <= 3000 and pid.endswith("1") for pid, distance in within)
+
+    box = grid.within_bbox(6.5, 3.3, 6.6, 3.4)
+    assert sorted(box) == sorted(pid for pid, (lat, lng) in points.items() if 6.5 <= lat <= 6.6 and 3.3 <= lng <= 3.4)
+
+    grid.discard(expected[0])
+    assert grid.nearest(JOB_LAT, JOB_LNG, k=1)[0][0] == expected[1]
+
+
+def test_nearest_techs_uses_ingested_index_and_rechecks_presence(db_session, work_order):
+    from app.services.field import spatial_index
+
+    _locate_job(db_session, work_order)
+    moved = _make_person(db_session, "Mover")
+    _place_tech(db_session, moved, JOB_LAT + 0.3, JOB_LNG)  # ~33 km
+    assert routing.nearest_techs_for_job(db_session, str(work_order.id), max_km=1.0) == []
+
+    # A fresh ping is reflected without waiting for a rebuild.
+    loc_svc.record_ping(db_session, str(moved.id), latitude=JOB_LAT + 0.001, longitude=JOB_LNG)
+    ranked = routing.nearest_techs_for_job(db_session, str(work_order.id), max_km=1.0)
+    assert [r["person_id"] for r in ranked] == [str(moved.id)]
+
+    # Going off shift drops the tech from the index.
+    loc_svc.set_sharing(db_session, str(moved.id), enabled=True, status="on_break")
+    assert all(pid != str(moved.id) for pid, _ in spatial_index.nearest(JOB_LAT, JOB_LNG, k=10))
+
+
+def test_filtered_geosearch_fetches_bounded_counts_and_widens(monkeypatch):
+    from app.services.field import spatial_index
+
+    class _GeoRedis:
+        def __init__(self, members):
+            self.members = members
+            self.counts = []
+
+        def geosearch(self, _key, *, count, **_kwargs):
+            self.counts.append(count)
+            return self.members[:count]
+
+    fake = _GeoRedis([(f"tech-{i}", float(i * 100)) for i in range(40)])
+    monkeypatch.setattr(spatial_index, "_get_redis", lambda: fake)
+    wanted = {"tech-1", "tech-25"}
+
+    hits = spatial_index.nearest(JOB_LAT, JOB_LNG, k=2, accept=wanted.__contains__)
+
+    assert [pid for pid, _ in hits] == ["tech-1", "tech-25"]
+    assert fake.counts == [8, 32]
+    # Running out of members stops widening.
+    fake.counts.clear()
+    assert spatial_index.nearest(JOB_LAT, JOB_LNG, k=2, accept={"tech-3"}.__contains__) == [("tech-3", 300.0)]
+    assert fake.counts == [8, 32, 128]
+
+
+def test_route_optimizer_improves_on_greedy_and_keeps_every_stop():
+    import random
+
+    from app.services.field import route_optimizer
+
+    rng = random.Random(11)
+    points = [(JOB_LAT, JOB_LNG)] + [(JOB_LAT + rng.random() * 0.2, JOB_LNG + rng.random() * 0.2) for _ in range(25)]
+    matrix = route_optimizer.distance_matrix_km(points)
+
+    greedy = route_optimizer.nearest_neighbour_route(matrix)
+    optimized = route_optimizer.optimize_route(matrix, time_budget_seconds=1.0)
+
+    assert sorted(optimized) == list(range(1, len(points)))
+    assert route_optimizer.route_length(optimized, matrix) <= route_optimizer.route_length(greedy, matrix)
+
+
+def test_route_optimizer_uncrosses_greedy_detour():
+    from app.services.field import route_optimizer
+
+    # Greedy goes to the nearby stop behind the start first and doubles back.
+    points = [(0.0, 0.0), (0.0, -0.011), (0.0, 0.01), (0.0, 0.02), (0.0, 0.03)]
+    matrix = route_optimizer.distance_matrix_km(points)
+
+    assert route_optimizer.nearest_neighbour_route(matrix) == [2, 3, 4, 1]
+    optimized = route_optimizer.optimize_route(matrix)
+    assert optimized == [1, 2, 3, 4]
+
+
+def test_plan_day_routes_covers_each_tech_from_live_position(db_session, project, ticket):
+    east = _make_person(db_session, "East")
+    west = _make_person(db_session, "West")
+    _place_tech(db_session, east, JOB_LAT, JOB_LNG + 0.1)
+    expected: dict[str, list[str]] = {str(east.id): [], str(west.id): []}
+    for tech, offsets in ((east, (0.12, 0.11)), (west, (-0.2, -0.1))):
+        for offset in offsets:
+            wo = workforce_service.work_orders.create(
+                db_session, WorkOrderCreate(title=f"Job {offset}", project_id=project.id, ticket_id=ticket.id)
+            )
+            wo.assigned_to_person_id = tech.id
+            wo.status = WorkOrderStatus.scheduled
+            wo.metadata_ = {"resolved_location": {"latitude": JOB_LAT, "longitude": JOB_LNG + offset}}
+            db_session.commit()
+            expected[str(tech.id)].append(str(wo.id))
+
+    routes = routing.plan_day_routes(db_session, [str(east.id), str(west.id)])
+
+    # East starts from its live fix (+0.1), so +0.11 comes before +0.12.
+    assert [r["work_order_id"] for r in routes[str(east.id)]] == expected[str(east.id)][::-1]
+    # West has no fix: the route starts at an end of its jobs, with no initial leg.
+    assert sorted(r["work_order_id"] for r in routes[str(west.id)]) == sorted(expected[str(west.id)])
+    assert routes[str(west.id)][0]["leg_km"] == 0.0
+
+
+def test_plan_day_routes_ignores_hidden_fix_and_starts_from_base(db_session, project, ticket):
+    tech = _make_person(db_session, "Based")
+    _place_tech(db_session, tech, JOB_LAT, JOB_LNG + 0.1)
+    loc_svc.set_sharing(db_session, str(tech.id), enabled=False)
+    db_session.add(
+        TechnicianProfile(person_id=tech.id, metadata_={"base_latitude": JOB_LAT, "base_longitude": JOB_LNG + 0.13})
+    )
+    db_session.commit()
+    presence = db_session.query(FieldTechPresence).filter(FieldTechPresence.person_id == tech.id).one()
+    assert presence.last_latitude is not None and not presence.location_sharing_enabled
+    job_ids = []
+    for offset in (0.12, 0.11):
+        wo = workforce_service.work_orders.create(
+            db_session, WorkOrderCreate(title=f"Job {offset}", project_id=project.id, ticket_id=ticket.id)
+        )
+        wo.assigned_to_person_id = tech.id
+        wo.status = WorkOrderStatus.scheduled
+        wo.metadata_ = {"resolved_location": {"latitude": JOB_LAT, "longitude": JOB_LNG + offset}}
+        db_session.commit()
+        job_ids.append(str(wo.id))
+
+    [route] = routing.plan_day_routes(db_session, [str(tech.id)]).values()
+
+    # From the base (+0.13) rather than the last fix (+0.1): +0.12 comes first.
+    assert [r["work_order_id"] for r in route] == job_ids
+    assert route[0]["leg_km"] > 0
@@ -1,12 +1,13 @@
 """Tests for genieacs service."""
 
+import asyncio
 import json
 from unittest.mock import MagicMock, patch
 
 import httpx
 import pytest
 
-from app.services.genieacs import GenieACSClient, GenieACSError
+from app.services.genieacs import AsyncGenieACSClient, GenieACSClient, GenieACSError
 
 
 @pytest.fixture
@@ -77,7 +78,7 @@ class TestRequestErrorHandling:
             mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
                 "Not found", request=MagicMock(), response=mock_response
             )
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response
+            mock_client.return_value.request.return_value = mock_response
 
             with pytest.raises(GenieACSError) as exc_info:
                 client._request("GET", "/devices/test")
@@ -87,9 +88,7 @@ class TestRequestErrorHandling:
     def test_raises_on_connection_error(self, client):
         """Test raises GenieACSError on connection error."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.side_effect = httpx.RequestError(
-                "Connection refused"
-            )
+            mock_client.return_value.request.side_effect = httpx.RequestError("Connection refused")
 
             with pytest.raises(GenieACSError) as exc_info:
                 client._request("GET", "/devices")
@@ -110,32 +109,32 @@ class TestDeviceOperations:
         devices = [{"_id": "device1"}, {"_id": "device2"}]
 
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response(json_data=devices)
+            mock_client.return_value.request.return_value = mock_response(json_data=devices)
 
             result = client.list_devices()
 
             assert result == devices
-            mock_client.return_value.__enter__.return_value.request.assert_called_once()
+            mock_client.return_value.request.assert_called_once()
 
     def test_list_devices_with_query(self, client, mock_response):
         """Test list_devices with query filter."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response(json_data=[])
+            mock_client.return_value.request.return_value = mock_response(json_data=[])
 
             client.list_devices(query={"_tags": "test"})
 
-            call_args = mock_client.return_value.__enter__.return_value.request.call_args
+            call_args = mock_client.return_value.request.call_args
             assert "params" in call_args.kwargs
             assert "query" in call_args.kwargs["params"]
 
     def test_list_devices_with_projection(self, client, mock_response):
         """Test list_devices with projection."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response(json_data=[])
+            mock_client.return_value.request.return_value = mock_response(json_data=[])
 
             client.list_devices(projection={"_id": 1})
 
-            call_args = mock_client.return_value.__enter__.return_value.request.call_args
+            call_args = mock_client.return_value.request.call_args
             assert "params" in call_args.kwargs
             assert "projection" in call_args.kwargs["params"]
 
@@ -144,7 +143,7 @@ class TestDeviceOperations:
         device = {"_id": "ABC-Model-123"}
 
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response(json_data=device)
+            mock_client.return_value.request.return_value = mock_response(json_data=device)
 
             result = client.get_device("ABC-Model-123")
 
@@ -153,7 +152,7 @@ class TestDeviceOperations:
     def test_delete_device(self, client, mock_response):
         """Test delete_device succeeds."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             # Should not raise
             client.delete_device("ABC-Model-123")
@@ -161,9 +160,7 @@ class TestDeviceOperations:
     def test_count_devices(self, client, mock_response):
         """Test count_devices returns count."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response(
-                headers={"X-Total-Count": "42"}
-            )
+            mock_client.return_value.request.return_value = mock_response(headers={"X-Total-Count": "42"})
 
             result = client.count_devices()
 
@@ -172,9 +169,7 @@ class TestDeviceOperations:
     def test_count_devices_with_query(self, client, mock_response):
         """Test count_devices with query."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response(
-                headers={"X-Total-Count": "10"}
-            )
+            mock_client.return_value.request.return_value = mock_response(headers={"X-Total-Count": "10"})
 
             result = client.count_devices(query={"_tags": "test"})
 
@@ -183,7 +178,7 @@ class TestDeviceOperations:
     def test_count_devices_missing_header(self, client, mock_response):
         """Test count_devices returns 0 if header missing."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             result = client.count_devices()
 
@@ -203,7 +198,7 @@ class TestTaskOperations:
         task_result = {"_id": "task123"}
 
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response(
+            mock_client.return_value.request.return_value = mock_response(
                 json_data=task_result, text=json.dumps(task_result)
             )
 
@@ -214,7 +209,7 @@ class TestTaskOperations:
     def test_create_task_empty_response(self, client, mock_response):
         """Test create_task handles empty response."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response(text="")
+            mock_client.return_value.request.return_value = mock_response(text="")
 
             result = client.create_task("device1", {"name": "reboot"})
 
@@ -223,21 +218,21 @@ class TestTaskOperations:
     def test_create_task_with_connection_request_false(self, client, mock_response):
         """Test create_task with connection_request=False."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             client.create_task("device1", {"name": "reboot"}, connection_request=False)
 
-            call_args = mock_client.return_value.__enter__.return_value.request.call_args
+            call_args = mock_client.return_value.request.call_args
             assert call_args.kwargs["params"]["connection_request"] == "false"
 
     def test_get_parameter_values(self, client, mock_response):
         """Test get_parameter_values creates correct task."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             client.get_parameter_values("device1", ["Device.DeviceInfo.SerialNumber"])
 
-            call_args = mock_client.return_value.__enter__.return_value.request.call_args
+            call_args = mock_client.return_value.request.call_args
             task = call_args.kwargs["json"]
             assert task["name"] == "getParameterValues"
             assert "parameterNames" in task
@@ -245,11 +240,11 @@ class TestTaskOperations:
     def test_set_parameter_values(self, client, mock_response):
         """Test set_parameter_values creates correct task."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             client.set_parameter_values("device1", {"Device.WiFi.SSID": "TestNetwork"})
 
-            call_args = mock_client.return_value.__enter__.return_value.request.call_args
+            call_args = mock_client.return_value.request.call_args
             task = call_args.kwargs["json"]
             assert task["name"] == "setParameterValues"
             assert "parameterValues" in task
@@ -257,11 +252,11 @@ class TestTaskOperations:
     def test_refresh_object(self, client, mock_response):
         """Test refresh_object creates correct task."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             client.refresh_object("device1", "Device.WiFi.")
 
-            call_args = mock_client.return_value.__enter__.return_value.request.call_args
+            call_args = mock_client.return_value.request.call_args
             task = call_args.kwargs["json"]
             assert task["name"] == "refreshObject"
             assert task["objectName"] == "Device.WiFi."
@@ -269,33 +264,33 @@ class TestTaskOperations:
     def test_reboot_device(self, client, mock_response):
         """Test reboot_device creates correct task."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             client.reboot_device("device1")
 
-            call_args = mock_client.return_value.__enter__.return_value.request.call_args
+            call_args = mock_client.return_value.request.call_args
             task = call_args.kwargs["json"]
             assert task["name"] == "reboot"
 
     def test_factory_reset(self, client, mock_response):
         """Test factory_reset creates correct task."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             client.factory_reset("device1")
 
-            call_args = mock_client.return_value.__enter__.return_value.request.call_args
+            call_args = mock_client.return_value.request.call_args
             task = call_args.kwargs["json"]
             assert task["name"] == "factoryReset"
 
     def test_download(self, client, mock_response):
         """Test download creates correct task."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             client.download("device1", "1 Firmware Upgrade Image", "http://example.com/fw.bin")
 
-            call_args = mock_client.return_value.__enter__.return_value.request.call_args
+            call_args = mock_client.return_value.request.call_args
             task = call_args.kwargs["json"]
             assert task["name"] == "download"
             assert task["fileType"] == "1 Firmware Upgrade Image"
@@ -304,22 +299,22 @@ class TestTaskOperations:
     def test_download_with_filename(self, client, mock_response):
         """Test download with filename creates correct task."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             client.download("device1", "1 Firmware Upgrade Image", "http://example.com/fw.bin", filename="fw.bin")
 
-            call_args = mock_client.return_value.__enter__.return_value.request.call_args
+            call_args = mock_client.return_value.request.call_args
             task = call_args.kwargs["json"]
             assert task["filename"] == "fw.bin"
 
     def test_add_object(self, client, mock_response):
         """Test add_object creates correct task."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             client.add_object("device1", "Device.NAT.PortMapping.")
 
-            call_args = mock_client.return_value.__enter__.return_value.request.call_args
+            call_args = mock_client.return_value.request.call_args
             task = call_args.kwargs["json"]
             assert task["name"] == "addObject"
             assert task["objectName"] == "Device.NAT.PortMapping."
@@ -327,11 +322,11 @@ class TestTaskOperations:
     def test_delete_object(self, client, mock_response):
         """Test delete_object creates correct task."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             client.delete_object("device1", "Device.NAT.PortMapping.1.")
 
-            call_args = mock_client.return_value.__enter__.return_value.request.call_args
+            call_args = mock_client.return_value.request.call_args
             task = call_args.kwargs["json"]
             assert task["name"] == "deleteObject"
             assert task["objectName"] == "Device.NAT.PortMapping.1."
@@ -341,7 +336,7 @@ class TestTaskOperations:
         tasks = [{"_id": "task1"}, {"_id": "task2"}]
 
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response(json_data=tasks)
+            mock_client.return_value.request.return_value = mock_response(json_data=tasks)
 
             result = client.get_pending_tasks("device1")
 
@@ -350,7 +345,7 @@ class TestTaskOperations:
     def test_delete_task(self, client, mock_response):
         """Test delete_task succeeds."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             # Should not raise
             client.delete_task("task123")
@@ -369,7 +364,7 @@ class TestPresetOperations:
         presets = [{"_id": "preset1"}, {"_id": "preset2"}]
 
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response(json_data=presets)
+            mock_client.return_value.request.return_value = mock_response(json_data=presets)
 
             result = client.list_presets()
 
@@ -380,7 +375,7 @@ class TestPresetOperations:
         preset = {"_id": "preset1", "channel": "default"}
 
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response(json_data=preset)
+            mock_client.return_value.request.return_value = mock_response(json_data=preset)
 
             result = client.get_preset("preset1")
 
@@ -391,9 +386,7 @@ class TestPresetOperations:
         preset = {"_id": "new_preset", "channel": "bootstrap"}
 
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response(
-                json_data=preset, text=json.dumps(preset)
-            )
+            mock_client.return_value.request.return_value = mock_response(json_data=preset, text=json.dumps(preset))
 
             result = client.create_preset(preset)
 
@@ -404,7 +397,7 @@ class TestPresetOperations:
         preset = {"_id": "new_preset", "channel": "bootstrap"}
 
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response(text="")
+            mock_client.return_value.request.return_value = mock_response(text="")
 
             result = client.create_preset(preset)
 
@@ -413,7 +406,7 @@ class TestPresetOperations:
     def test_delete_preset(self, client, mock_response):
         """Test delete_preset succeeds."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             # Should not raise
             client.delete_preset("preset1")
@@ -432,7 +425,7 @@ class TestProvisionOperations:
         provisions = [{"_id": "prov1"}, {"_id": "prov2"}]
 
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response(json_data=provisions)
+            mock_client.return_value.request.return_value = mock_response(json_data=provisions)
 
             result = client.list_provisions()
 
@@ -443,7 +436,7 @@ class TestProvisionOperations:
         provision = {"_id": "prov1", "script": "const now = Date.now();"}
 
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response(json_data=provision)
+            mock_client.return_value.request.return_value = mock_response(json_data=provision)
 
             result = client.get_provision("prov1")
 
@@ -452,7 +445,7 @@ class TestProvisionOperations:
     def test_create_provision(self, client, mock_response):
         """Test create_provision succeeds."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             # Should not raise
             client.create_provision("prov1", "const now = Date.now();")
@@ -460,7 +453,7 @@ class TestProvisionOperations:
     def test_delete_provision(self, client, mock_response):
         """Test delete_provision succeeds."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             # Should not raise
             client.delete_provision("prov1")
@@ -479,7 +472,7 @@ class TestFaultOperations:
         faults = [{"_id": "fault1"}, {"_id": "fault2"}]
 
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response(json_data=faults)
+            mock_client.return_value.request.return_value = mock_response(json_data=faults)
 
             result = client.list_faults()
 
@@ -488,18 +481,18 @@ class TestFaultOperations:
     def test_list_faults_with_device_id(self, client, mock_response):
         """Test list_faults with device filter."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response(json_data=[])
+            mock_client.return_value.request.return_value = mock_response(json_data=[])
 
             client.list_faults(device_id="device1")
 
-            call_args = mock_client.return_value.__enter__.return_value.request.call_args
+            call_args = mock_client.return_value.request.call_args
             assert "params" in call_args.kwargs
             assert "query" in call_args.kwargs["params"]
 
     def test_delete_fault(self, client, mock_response):
         """Test delete_fault succeeds."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             # Should not raise
             client.delete_fault("fault1")
@@ -507,7 +500,7 @@ class TestFaultOperations:
     def test_retry_fault(self, client, mock_response):
         """Test retry_fault succeeds."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             # Should not raise
             client.retry_fault("fault1")
@@ -524,7 +517,7 @@ class TestTagOperations:
     def test_add_tag(self, client, mock_response):
         """Test add_tag succeeds."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             # Should not raise
             client.add_tag("device1", "production")
@@ -532,7 +525,7 @@ class TestTagOperations:
     def test_remove_tag(self, client, mock_response):
         """Test remove_tag succeeds."""
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.request.return_value = mock_response()
+            mock_client.return_value.request.return_value = mock_response()
 
             # Should not raise
             client.remove_tag("device1", "production")
@@ -588,3 +581,105 @@ class TestHelperMethods:
         device = {"Device": "not_a_dict"}
         value = client.extract_parameter_value(device, "Device.DeviceInfo.SerialNumber")
         assert value is None
+
+
+# =============================================================================
+# Pooling, Paging and Bulk Tests
+# =============================================================================
+
+
+def _nbi_handler(devices: list[dict], calls: list[httpx.Request]):
+    """Fake NBI: pages /devices by _id cursor and fails tasks for 'bad' devices."""
+
+    def _handle(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.url.path == "/devices":
+            query = json.loads(request.url.params.get("query", "{}"))
+            after = query.get("_id", {}).get("$gt") if "_id" in query else None
+            if "$and" in query:
+                after = query["$and"][1]["_id"]["$gt"]
+            limit = int(request.url.params.get("limit", len(devices)))
+            page = [d for d in devices if after is None or d["_id"] > after][:limit]
+            return httpx.Response(200, json=page)
+        if request.url.path.endswith("/tasks"):
+            if "bad" in request.url.path:
+                return httpx.Response(404, text="No such device")
+            return httpx.Response(200, json={"_id": "task", "name": json.loads(request.content)["name"]})
+        return httpx.Response(200, json={"_id": request.url.path.rsplit("/", 1)[-1]})
+
+    return _handle
+
+
+@pytest.fixture
+def fake_nbi():
+    devices = [{"_id": f"dev-{i:03d}"} for i in range(7)]
+    calls: list[httpx.Request] = []
+    transport = httpx.MockTransport(_nbi_handler(devices, calls))
+    real_client, real_async_client = httpx.Client, httpx.AsyncClient
+    created = []
+
+    def _client(**kwargs):
+        created.append(kwargs)
+        return real_client(transport=transport, **kwargs)
+
+    def _async_client(**kwargs):
+        created.append(kwargs)
+        return real_async_client(transport=transport, **kwargs)
+
+    with patch("httpx.Client", _client), patch("httpx.AsyncClient", _async_client):
+        yield {"devices": devices, "calls": calls, "created": created}
+
+
+class TestPooledClient:
+    """Tests for connection reuse, paging and bulk fan-out."""
+
+    def test_reuses_one_pooled_client(self, client, fake_nbi):
+        """Test repeated calls share one HTTP client."""
+        client.get_device("dev-000")
+        client.create_task("dev-001", {"name": "reboot"})
+        client.close()
+
+        assert len(fake_nbi["created"]) == 1
+        assert len(fake_nbi["calls"]) == 2
+
+    def test_iter_devices_pages_by_id(self, client, fake_nbi):
+        """Test iter_devices walks every page with an _id cursor."""
+        ids = [d["_id"] for d in client.iter_devices(query={"_tags": "fleet"}, page_size=3)]
+
+        assert ids == [d["_id"] for d in fake_nbi["devices"]]
+        assert len(fake_nbi["calls"]) == 3
+        last_query = json.loads(fake_nbi["calls"][-1].url.params["query"])
+        assert last_query == {"$and": [{"_tags": "fleet"}, {"_id": {"$gt": "dev-005"}}]}
+
+    def test_iter_devices_keeps_id_in_projection(self, client, fake_nbi):
+        """Test inclusion projections always carry _id for the cursor."""
+        list(client.iter_devices(projection={"Device.DeviceInfo.SerialNumber": 1}, page_size=10))
+
+        projection = json.loads(fake_nbi["calls"][0].url.params["projection"])
+        assert projection == {"Device.DeviceInfo.SerialNumber": 1, "_id": 1}
+
+    def test_bulk_get_parameter_values_captures_failures(self, client, fake_nbi):
+        """Test bulk reads report per-device errors without aborting."""
+        result = client.bulk_get_parameter_values(
+            ["dev-000", "bad-1", "dev-002", "dev-000"], ["Device.DeviceInfo.UpTime"], concurrency=4
+        )
+
+        assert set(result.succeeded) == {"dev-000", "dev-002"}
+        assert result.succeeded["dev-000"]["name"] == "getParameterValues"
+        assert result.failed == {"bad-1": "API error: 404"}
+        assert result.total == 3
+
+    def test_async_bulk_create_task(self, fake_nbi):
+        """Test the async client fans tasks out and pages devices."""
+
+        async def _run():
+            async with AsyncGenieACSClient("http://genieacs:7557") as client:
+                ids = [device["_id"] async for device in client.iter_devices(page_size=4)]
+                result = await client.bulk_create_task([*ids, "bad-2"], {"name": "reboot"}, concurrency=3)
+            return ids, result
+
+        ids, result = asyncio.run(_run())
+
+        assert len(ids) == 7
+        assert len(result.succeeded) == 7
+        assert list(result.failed) == ["bad-2"]
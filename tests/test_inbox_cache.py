@@ -45,3 +45,207 @@ def test_cache_get_or_set_coalesces_concurrent_loaders():
 
     assert results == [{"value": 42}, {"value": 42}]
     assert calls["count"] == 1
+
+
+class _FakeSharedRedis:
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+        self.published = []
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+        return True
+
+    def hincrby(self, name, key, amount=1):
+        bucket = self.hashes.setdefault(name, {})
+        bucket[key] = int(bucket.get(key, 0)) + amount
+        return bucket[key]
+
+    def hgetall(self, name):
+        return {key: str(value) for key, value in self.hashes.get(name, {}).items()}
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 1
+
+
+def _isolate_local_tier(monkeypatch):
+    monkeypatch.setattr(inbox_cache, "_generations", {})
+    monkeypatch.setattr(inbox_cache, "_cache", type(inbox_cache._cache)())
+    monkeypatch.setattr(inbox_cache, "_prefix_index", {})
+    monkeypatch.setattr(inbox_cache, "_expiry_heap", [])
+    monkeypatch.setattr(inbox_cache, "_bytes_held", 0)
+
+
+def _use_shared_tier(monkeypatch):
+    shared = _FakeSharedRedis()
+    monkeypatch.setattr(inbox_cache, "_redis_client", shared)
+    _isolate_local_tier(monkeypatch)
+    return shared
+
+
+def test_cache_reads_entries_written_by_another_worker(monkeypatch):
+    _use_shared_tier(monkeypatch)
+    inbox_cache.set("inbox_list:shared", {"rows": [1, 2]}, 60)
+
+    # Simulate a different worker: empty local tier, same Redis.
+    inbox_cache._cache.clear()
+
+    assert inbox_cache.get("inbox_list:shared") == {"rows": [1, 2]}
+    assert "inbox_list:shared" in inbox_cache._cache
+
+
+def test_cache_invalidation_bumps_shared_generation_and_broadcasts(monkeypatch):
+    import json
+
+    shared = _use_shared_tier(monkeypatch)
+    inbox_cache.set("inbox_list:a", 1, 60)
+    inbox_cache.set("summary_counts:b", 2, 60)
+    inbox_cache.set("comments_list:c", 3, 60)
+
+    inbox_cache.invalidate_inbox_list()
+
+    assert [json.loads(message)["namespace"] for _, message in shared.published] == [
+        "inbox_list",
+        "summary_counts",
+    ]
+    assert all(channel == inbox_cache.CACHE_INVALIDATION_CHANNEL for channel, _ in shared.published)
+    inbox_cache._cache.clear()
+    assert inbox_cache.get("inbox_list:a") is None
+    assert inbox_cache.get("summary_counts:b") is None
+    assert inbox_cache.get("comments_list:c") == 3
+
+
+def test_cache_drops_local_entries_on_remote_generation_bump(monkeypatch):
+    import json
+
+    _use_shared_tier(monkeypatch)
+    inbox_cache.set("inbox_list:remote", "stale", 60)
+
+    inbox_cache._handle_invalidation_message(json.dumps({"namespace": "inbox_list", "generation": 7}))
+
+    assert "inbox_list:remote" not in inbox_cache._cache
+    assert inbox_cache.get("inbox_list:remote") is None
+
+
+def test_inbox_list_latest_message_survives_shared_json_roundtrip():
+    import json
+    from datetime import UTC, datetime
+
+    from app.models.crm.enums import ChannelType
+    from app.services.crm.inbox import listing
+
+    sent = datetime(2026, 3, 1, 9, 30, tzinfo=UTC)
+    latest = {"body": "hi", "channel_type": ChannelType.whatsapp, "last_message_at": sent, "received_at": None}
+
+    encoded = json.loads(json.dumps(listing._serialize_latest_message(latest)))
+    decoded = listing._hydrate_latest_message(encoded)
+
+    assert decoded["channel_type"] is ChannelType.whatsapp
+    assert decoded["last_message_at"] == sent
+    assert decoded["received_at"] is None
+
+
+def test_cache_evicts_least_recently_used_when_entry_limit_reached(monkeypatch):
+    _isolate_local_tier(monkeypatch)
+    monkeypatch.setattr(inbox_cache, "LOCAL_MAX_ENTRIES", 2)
+    inbox_cache.set("lru:a", 1, 60)
+    inbox_cache.set("lru:b", 2, 60)
+    assert inbox_cache.get("lru:a") == 1  # refresh "a" so "b" is the LRU entry
+    inbox_cache.set("lru:c", 3, 60)
+
+    assert inbox_cache.get("lru:b") is None
+    assert inbox_cache.get("lru:a") == 1
+    assert inbox_cache.get("lru:c") == 3
+
+
+def test_cache_respects_byte_budget(monkeypatch):
+    _isolate_local_tier(monkeypatch)
+    monkeypatch.setattr(inbox_cache, "LOCAL_MAX_BYTES", 150)
+    inbox_cache.set("bytes:a", "x" * 80, 60)
+    inbox_cache.set("bytes:b", "y" * 80, 60)
+
+    assert inbox_cache.get("bytes:a") is None
+    assert inbox_cache.get("bytes:b") == "y" * 80
+    assert inbox_cache._bytes_held <= 150
+
+    inbox_cache.set("bytes:huge", "z" * 500, 60)
+    assert inbox_cache.get("bytes:huge") is None
+    assert inbox_cache.get("bytes:b") == "y" * 80
+
+
+def test_cache_prefix_invalidation_uses_index(monkeypatch):
+    _isolate_local_tier(monkeypatch)
+    inbox_cache.set("inbox_detail:macros:v1:agent-1", [1], 60)
+    inbox_cache.set("inbox_detail:macros:v1:agent-2", [2], 60)
+    inbox_cache.set("inbox_detail:message_templates:v1", [3], 60)
+
+    inbox_cache._drop_local("inbox_detail:macros:")
+
+    assert set(inbox_cache._prefix_index) == {"inbox_detail:", "inbox_detail:message_templates:"}
+    assert inbox_cache.get("inbox_detail:message_templates:v1") == [3]
+    assert inbox_cache.get("inbox_detail:macros:v1:agent-1") is None
+
+
+def test_cache_sweeps_expired_entries_on_write(monkeypatch):
+    _isolate_local_tier(monkeypatch)
+    clock = {"now": 1_000.0}
+    monkeypatch.setattr(inbox_cache.time, "time", lambda: clock["now"])
+    monkeypatch.setattr(inbox_cache, "_next_sweep_at", 0.0)
+    inbox_cache.set("sweep:old", "value", 5)
+    bytes_before = inbox_cache._bytes_held
+
+    clock["now"] += inbox_cache.SWEEP_INTERVAL_SECONDS + 10
+    inbox_cache.set("sweep:new", "value", 60)
+
+    assert "sweep:old" not in inbox_cache._cache
+    assert inbox_cache._bytes_held == bytes_before
+
+
+def test_cache_records_hit_and_miss_metrics(monkeypatch):
+    calls = []
+    _isolate_local_tier(monkeypatch)
+    monkeypatch.setattr(
+        inbox_cache,
+        "observe_inbox_cache_lookup",
+        lambda **kwargs: calls.append((kwargs["tier"], kwargs["outcome"])),
+    )
+
+    inbox_cache.get("metrics:key")
+    inbox_cache.set("metrics:key", 1, 60)
+    inbox_cache.get("metrics:key")
+
+    assert calls == [("local", "miss"), ("local", "hit")]
+
+
+def test_cache_records_shared_tier_lookups(monkeypatch):
+    calls = []
+    _use_shared_tier(monkeypatch)
+    monkeypatch.setattr(
+        inbox_cache,
+        "observe_inbox_cache_lookup",
+        lambda **kwargs: calls.append((kwargs["tier"], kwargs["outcome"])),
+    )
+
+    inbox_cache.get("metrics:shared")
+    inbox_cache.set("metrics:shared", 1, 60)
+    inbox_cache._cache.clear()
+    inbox_cache.get("metrics:shared")
+
+    assert calls == [("local", "miss"), ("shared", "miss"), ("local", "miss"), ("shared", "hit")]
+
+
+def test_get_or_set_does_not_cache_a_load_that_raced_an_invalidation(monkeypatch):
+    shared = _use_shared_tier(monkeypatch)
+
+    def loader():
+        inbox_cache.invalidate_prefix("inbox_list:")
+        return {"rows": ["stale"]}
+
+    assert inbox_cache.get_or_set("inbox_list:race", 60, loader) == {"rows": ["stale"]}
+    assert inbox_cache.get("inbox_list:race") is None
+    assert shared.values == {}
@@ -0,0 +1,143 @@
+"""Incrementally maintained inbox counters."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime
+
+from sqlalchemy import select
+
+from app.models.crm.conversation import Conversation, ConversationCounter, ConversationSummary, Message
+from app.models.crm.enums import ChannelType, ConversationStatus, MessageDirection, MessageStatus
+from app.models.person import Person
+from app.services.crm.inbox import counters
+from app.services.crm.inbox.queries import get_assignment_counts, get_inbox_stats
+from app.services.crm.inbox.summaries import recompute_conversation_summary
+
+
+def _conversation(db_session, *, inbound: bool = False) -> Conversation:
+    person = Person(first_name="Counter", last_name="Contact", email=f"counter-{uuid.uuid4().hex[:8]}@example.com")
+    db_session.add(person)
+    db_session.flush()
+    conversation = Conversation(person_id=person.id, status=ConversationStatus.open, subject="Counters")
+    db_session.add(conversation)
+    db_session.flush()
+    if inbound:
+        now = datetime.now(UTC)
+        db_session.add(
+            Message(
+                conversation_id=conversation.id,
+                channel_type=ChannelType.whatsapp,
+                direction=MessageDirection.inbound,
+                status=MessageStatus.received,
+                body="Hello",
+                received_at=now,
+            )
+        )
+        conversation.last_message_at = now
+        db_session.flush()
+    return conversation
+
+
+def _stored_counts(db_session) -> dict[str, int]:
+    rows = db_session.execute(select(ConversationCounter.bucket_key, ConversationCounter.count)).all()
+    return {bucket: count for bucket, count in rows if count}
+
+
+def test_recompute_records_bucket_moves_and_commit_applies_them(db_session):
+    conversation = _conversation(db_session, inbound=True)
+    recompute_conversation_summary(db_session, str(conversation.id))
+
+    [(key, delta)] = counters.pending_deltas(db_session).items()
+    assert delta == 1
+    assert key.status == ConversationStatus.open
+    assert key.unreplied is True
+    assert key.assignment_bucket == "unassigned"
+
+    db_session.commit()
+    assert counters.pending_deltas(db_session) == {}
+    assert _stored_counts(db_session) == {key.bucket_key: 1}
+
+    conversation.status = ConversationStatus.resolved
+    recompute_conversation_summary(db_session, str(conversation.id))
+    db_session.commit()
+
+    stored = _stored_counts(db_session)
+    assert key.bucket_key not in stored
+    assert sum(stored.values()) == 1
+    assert all(bucket.startswith("resolved:") for bucket in stored)
+
+
+def test_stats_read_counters_including_uncommitted_deltas(db_session):
+    first = _conversation(db_session, inbound=True)
+    _conversation(db_session)
+
+    stats = get_inbox_stats(db_session)
+    assert stats["all"] == 2
+    assert stats["open"] == 2
+    assert stats["unread"] == 1
+
+    first.status = ConversationStatus.pending
+    recompute_conversation_summary(db_session, str(first.id))
+    db_session.info.pop("_inbox_query_cache", None)
+
+    stats = get_inbox_stats(db_session)
+    assert stats["open"] == 1
+    assert stats["pending"] == 1
+    counts = get_assignment_counts(db_session, assigned_person_id=None)
+    assert counts["all"] == 2
+    assert counts["unassigned"] == 2
+    assert counts["unreplied"] == 1
+
+
+def test_reconcile_corrects_drift(db_session):
+    conversation = _conversation(db_session, inbound=True)
+    recompute_conversation_summary(db_session, str(conversation.id))
+    db_session.commit()
+    [bucket] = _stored_counts(db_session)
+
+    db_session.query(ConversationCounter).update({"count": 7})
+    db_session.add(
+        ConversationCounter(
+            bucket_key="snoozed:-:-:00",
+            status=ConversationStatus.snoozed,
+            assignment_bucket="unassigned",
+            count=3,
+        )
+    )
+    db_session.flush()
+
+    result = counters.reconcile_counters(db_session)
+
+    assert result["corrected"] == 1
+    assert result["removed"] == 1
+    assert _stored_counts(db_session) == {bucket: 1}
+
+
+def test_inactive_summaries_are_not_counted(db_session):
+    conversation = _conversation(db_session)
+    recompute_conversation_summary(db_session, str(conversation.id))
+    db_session.commit()
+
+    conversation.is_active = False
+    recompute_conversation_summary(db_session, str(conversation.id))
+    db_session.commit()
+
+    assert _stored_counts(db_session) == {}
+    assert db_session.get(ConversationSummary, conversation.id).is_active is False
+
+
+def test_deltas_from_a_rolled_back_savepoint_are_discarded(db_session):
+    kept = _conversation(db_session, inbound=True)
+    recompute_conversation_summary(db_session, str(kept.id))
+    before = counters.pending_deltas(db_session)
+
+    savepoint = db_session.begin_nested()
+    discarded = _conversation(db_session)
+    recompute_conversation_summary(db_session, str(discarded.id))
+    assert counters.pending_deltas(db_session) != before
+    savepoint.rollback()
+
+    assert counters.pending_deltas(db_session) == before
+    db_session.commit()
+    assert sum(_stored_counts(db_session).values()) == 1
@@ -49,7 +49,29 @@ def _mocked_impact(monkeypatch):
 
 def test_preview_requires_an_asset(db_session):
     with pytest.raises(HTTPException) as exc:
-        preview_infrastructure_impact(node_id=None, basestation_id=None, olt_id=None, pon_port_id=None, db=db_session)
+        preview_infrastructure_impact(
+            node_id=None,
+            basestation_id=None,
+            olt_id=None,
+            pon_port_id=None,
+            fiber_asset_type=None,
+            fiber_asset_id=None,
+            db=db_session,
+        )
+    assert exc.value.status_code == 400
+
+
+def test_preview_rejects_fiber_asset_id_without_type(db_session):
+    with pytest.raises(HTTPException) as exc:
+        preview_infrastructure_impact(
+            node_id=None,
+            basestation_id=None,
+            olt_id=None,
+            pon_port_id=None,
+            fiber_asset_type=None,
+            fiber_asset_id=str(uuid.uuid4()),
+            db=db_session,
+        )
     assert exc.value.status_code == 400
 
 
@@ -59,7 +81,13 @@ def test_preview_returns_impact_summary(db_session, _mocked_impact):
         [{"subscriber_number": "SUB-1"}, {"subscriber_number": "SUB-X"}], coverage={"has_topology_gaps": True}
     )
     out = preview_infrastructure_impact(
-        node_id="node-1", basestation_id=None, olt_id=None, pon_port_id=None, db=db_session
+        node_id="node-1",
+        basestation_id=None,
+        olt_id=None,
+        pon_port_id=None,
+        fiber_asset_type=None,
+        fiber_asset_id=None,
+        db=db_session,
     )
     assert out["affected_count"] == 1  # only SUB-1 matched in CRM
     assert out["topology_count"] == 2
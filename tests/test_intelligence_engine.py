@@ -4,6 +4,7 @@ import json
 
 import pytest
 
+from app.models.ai_insight import AIInsight
 from app.models.domain_settings import SettingValueType
 from app.models.tickets import Ticket, TicketChannel, TicketPriority, TicketStatus
 from app.services.ai.client import AIClientError, AIResponse
@@ -113,3 +114,52 @@ def test_engine_scheduled_requires_intelligence_enabled(monkeypatch, db_session)
             trigger="scheduled",
             triggered_by_person_id=None,
         )
+
+
+def test_engine_invoke_batch_persists_chunks_and_isolates_failures(monkeypatch, db_session):
+    _seed_ai_enabled(db_session)
+    tickets = [
+        Ticket(
+            title=title,
+            description="Customer reports complete outage since morning.",
+            status=TicketStatus.open,
+            priority=TicketPriority.urgent,
+            channel=TicketChannel.web,
+            is_active=True,
+        )
+        for title in ("Outage one", "Outage two", "Broken three")
+    ]
+    db_session.add_all(tickets)
+    db_session.commit()
+
+    payload = {
+        "priority_score": 80,
+        "category": "technical",
+        "sentiment": "neutral",
+        "escalation_risk": "medium",
+        "title": "Outage triage",
+        "summary": "Customer outage.",
+        "recommended_actions": ["Check upstream link status"],
+    }
+
+    def _fake_generate_routed(route, *, system, prompt, max_tokens=None):
+        if "Broken" in prompt:
+            raise AIClientError("boom", failure_type="timeout", transient=True)
+        response = AIResponse(content=json.dumps(payload), tokens_in=5, tokens_out=7, model="m", provider="p")
+        return response, {"endpoint": route.primary, "fallback_used": False}
+
+    monkeypatch.setattr(ai_gateway, "generate_routed", _fake_generate_routed)
+
+    stats = intelligence_engine.invoke_batch(
+        db_session,
+        persona_key="ticket_analyst",
+        items=[("ticket", str(t.id), {"ticket_id": str(t.id)}) for t in tickets],
+        trigger="on_demand",
+        concurrency=3,
+        chunk_size=2,
+    )
+
+    assert stats == {"generated": 2, "skipped": 0, "failed": 1, "budget_exhausted": 0}
+    stored = db_session.query(AIInsight).filter(AIInsight.persona_key == "ticket_analyst").all()
+    assert sorted(insight.entity_id for insight in stored) == sorted(str(t.id) for t in tickets[:2])
+    assert all(insight.llm_tokens_in == 5 for insight in stored)
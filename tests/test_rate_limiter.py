@@ -0,0 +1,212 @@
+"""Shared sliding-window rate limiter."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import threading
+import uuid
+
+import pytest
+
+from app.services import rate_limiter
+from app.services.rate_limiter import SlidingWindowLimiter
+
+
+class _FakeRedis:
+    """Runs the limiter's Python twin in place of the Lua script."""
+
+    def __init__(self):
+        self.state: dict[str, tuple[int, int, int]] = {}
+        self.calls = 0
+
+    def register_script(self, _source):
+        def _script(keys, args):
+            self.calls += 1
+            limit, window_ms, now_ms, want = (int(arg) for arg in args)
+            state, granted, remaining, retry = rate_limiter._apply(
+                self.state.get(keys[0]), limit, window_ms, now_ms, want
+            )
+            self.state[keys[0]] = state
+            return [granted, remaining, retry]
+
+        return _script
+
+
+class _FakeAsyncRedis(_FakeRedis):
+    def __init__(self):
+        super().__init__()
+        self.closed_on: asyncio.AbstractEventLoop | None = None
+
+    def register_script(self, source):
+        script = super().register_script(source)
+
+        async def _script(keys, args):
+            return script(keys, args)
+
+        return _script
+
+    async def aclose(self):
+        self.closed_on = asyncio.get_running_loop()
+
+
+def test_memory_fallback_enforces_limit_and_reports_retry():
+    limiter = SlidingWindowLimiter("test:", client_factory=lambda: None)
+
+    results = [limiter.hit("k", 3, 60, now=1000.0 + i * 0.1) for i in range(4)]
+
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert [r.remaining for r in results[:3]] == [2, 1, 0]
+    assert results[3].retry_after >= 1
+
+
+def test_previous_window_is_weighted_by_overlap():
+    limiter = SlidingWindowLimiter("test:", client_factory=lambda: None)
+    for i in range(10):
+        assert limiter.hit("k", 10, 100, now=1000.0 + i * 0.01).allowed
+    # 30% into the next window, 70% of the previous window's 10 hits still count.
+    allowed = [limiter.hit("k", 10, 100, now=1130.0 + i * 0.01).allowed for i in range(4)]
+    assert allowed == [True, True, True, False]
+
+
+def test_memory_state_is_constant_per_key():
+    store: dict = {}
+    limiter = SlidingWindowLimiter("test:", client_factory=lambda: None, memory_store=store)
+    for i in range(50):
+        limiter.hit("k", 1000, 60, now=1000.0 + i * 0.01)
+    assert list(store) == ["test:sw:k"]
+    (state, _expires_at) = store["test:sw:k"]
+    assert state[1] == 50
+
+
+def test_lease_mode_syncs_with_redis_once_per_lease():
+    fake = _FakeRedis()
+    limiter = SlidingWindowLimiter("test:", lease_size=10, client_factory=lambda: fake)
+
+    results = [limiter.hit("k", 100, 60, now=1000.0) for _ in range(25)]
+
+    assert all(r.allowed for r in results)
+    assert fake.calls == 3
+    assert fake.state["test:sw:k"][1] == 30
+
+
+def test_lease_size_is_capped_by_limit():
+    fake = _FakeRedis()
+    limiter = SlidingWindowLimiter("test:", lease_size=50, client_factory=lambda: fake)
+
+    for _ in range(5):
+        limiter.hit("k", 20, 60, now=1000.0)
+
+    # 10% of a limit of 20 is 2 tokens per lease.
+    assert fake.calls == 3
+
+
+def test_lease_caches_denial_until_retry():
+    fake = _FakeRedis()
+    limiter = SlidingWindowLimiter("test:", lease_size=10, client_factory=lambda: fake)
+    while limiter.hit("k", 100, 60, now=1000.0).allowed:
+        pass
+    calls = fake.calls
+
+    denied = limiter.hit("k", 100, 60, now=1000.0)
+
+    assert not denied.allowed
+    assert denied.retry_after >= 1
+    assert fake.calls == calls
+
+
+def test_hit_async_uses_async_client(monkeypatch):
+    fake = _FakeAsyncRedis()
+    limiter = SlidingWindowLimiter("test:")
+    monkeypatch.setattr(limiter, "_get_async_client", lambda: fake)
+
+    async def _run():
+        return [await limiter.hit_async("k", 2, 60, now=1000.0) for _ in range(3)]
+
+    results = asyncio.run(_run())
+
+    assert [r.allowed for r in results] == [True, True, False]
+    assert fake.calls == 3
+
+
+def test_async_client_from_another_loop_is_closed_there(monkeypatch):
+    import redis.asyncio as aioredis
+
+    clients: list[_FakeAsyncRedis] = []
+    monkeypatch.setattr(
+        aioredis, "from_url", lambda *_args, **_kwargs: clients.append(_FakeAsyncRedis()) or clients[-1]
+    )
+    limiter = SlidingWindowLimiter("test:")
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        asyncio.run_coroutine_threadsafe(limiter.hit_async("k", 5, 60, now=1000.0), other_loop).result(5)
+        asyncio.run(limiter.hit_async("k", 5, 60, now=1000.0))
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), other_loop).result(5)
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join(5)
+        other_loop.close()
+
+    assert len(clients) == 2
+    assert clients[0].closed_on is other_loop
+    assert clients[1].closed_on is None
+
+
+def test_redis_error_falls_back_to_memory():
+    class _Broken:
+        def register_script(self, _source):
+            def _script(keys, args):
+                raise ConnectionError("down")
+
+            return _script
+
+    limiter = SlidingWindowLimiter("test:", client_factory=lambda: _Broken())
+
+    assert [limiter.hit("k", 1, 60, now=1000.0).allowed for _ in range(2)] == [True, False]
+
+
+def test_reset_clears_memory_state():
+    limiter = SlidingWindowLimiter("test:", client_factory=lambda: None)
+    limiter.hit("k", 1, 60, now=1000.0)
+    limiter.reset("k")
+    assert limiter.hit("k", 1, 60, now=1000.0).allowed
+
+
+@pytest.fixture()
+def lua_redis():
+    """A Redis that runs Lua: the server at REDIS_TEST_URL/REDIS_URL, else fakeredis[lua]."""
+    import redis
+
+    client = redis.from_url(
+        os.getenv("REDIS_TEST_URL") or rate_limiter.REDIS_URL, decode_responses=True, socket_connect_timeout=0.5
+    )
+    try:
+        client.ping()
+    except redis.RedisError:
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        client = fakeredis.FakeRedis(decode_responses=True)
+    yield client
+    client.close()
+
+
+@pytest.mark.redis
+def test_lua_script_matches_python_twin(lua_redis):
+    script = lua_redis.register_script(rate_limiter.SLIDING_WINDOW_LUA)
+    rng = random.Random(7)
+    key = f"test:rate_limiter_parity:{uuid.uuid4().hex}"
+    limit, window_ms = 20, 1000
+    state = None
+    now_ms = 1_700_000_000_000
+    try:
+        for _ in range(400):
+            now_ms += rng.choice((0, 1, 7, 45, 130, 400, 1100, 2500))
+            want = rng.choice((1, 1, 1, 2, 5))
+            state, granted, remaining, retry = rate_limiter._apply(state, limit, window_ms, now_ms, want)
+            reply = script(keys=[key], args=[limit, window_ms, now_ms, want])
+            assert [int(value) for value in reply] == [granted, remaining, retry], now_ms
+    finally:
+        lua_redis.delete(key)
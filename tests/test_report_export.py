@@ -0,0 +1,187 @@
+"""Tests for streaming report exports."""
+
+import asyncio
+import csv
+import io
+from datetime import UTC, datetime, timedelta
+from zipfile import ZipFile
+
+from app.models.person import Person
+from app.models.tickets import Ticket, TicketPriority, TicketStatus
+from app.models.workflow import (
+    SlaBreach,
+    SlaBreachStatus,
+    SlaClock,
+    SlaClockStatus,
+    SlaPolicy,
+    WorkflowEntityType,
+)
+from app.services import report_export
+from app.web.admin import reports as reports_web
+
+
+class _SessionProxy:
+    def __init__(self, session):
+        self._session = session
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+    def close(self):
+        return None
+
+
+def _streaming_body(response) -> bytes:
+    async def _collect() -> bytes:
+        chunks: list[bytes] = []
+        async for chunk in response.body_iterator:
+            chunks.append(chunk if isinstance(chunk, bytes) else str(chunk).encode())
+        return b"".join(chunks)
+
+    return asyncio.run(_collect())
+
+
+def test_iter_csv_flushes_in_chunks_and_reads_lazily():
+    consumed = []
+
+    def _rows():
+        for index in range(5):
+            consumed.append(index)
+            yield {"ID": index, "Name": f"row {index}"}
+
+    chunks = report_export.iter_csv(_rows(), flush_rows=2)
+    first = next(chunks)
+
+    assert first.startswith("ID,Name\r\n")
+    assert consumed == [0, 1]
+    rows = list(csv.DictReader(io.StringIO(first + "".join(chunks))))
+    assert [row["ID"] for row in rows] == ["0", "1", "2", "3", "4"]
+
+
+def test_iter_csv_without_rows_writes_placeholder():
+    assert list(report_export.iter_csv(iter([]))) == ["No data available\n"]
+    assert list(report_export.iter_csv([], fieldnames=["ID"])) == ["ID\r\n"]
+
+
+def test_iter_zip_streams_generated_entries():
+    parts = (f"<row>{index}</row>" for index in range(2000))
+    archive_bytes = b"".join(report_export.iter_zip([("static.xml", "<a/>"), ("rows.xml", parts)], flush_bytes=512))
+
+    with ZipFile(io.BytesIO(archive_bytes)) as archive:
+        assert archive.read("static.xml") == b"<a/>"
+        assert archive.read("rows.xml").count(b"<row>") == 2000
+
+
+def test_ncc_workbook_streams_from_iterator():
+    records = iter([{"VALIDATION STATUS": "[OK] All validations passed", "First Name": f"Ada {i}"} for i in range(3)])
+
+    workbook = b"".join(reports_web._iter_ncc_workbook(records, reports_web._NCC_COLUMNS))
+
+    with ZipFile(io.BytesIO(workbook)) as archive:
+        sheet_xml = archive.read("xl/worksheets/sheet1.xml")
+        assert b"Ada 2" in sheet_xml
+        assert (
+            f'<autoFilter ref="A1:{reports_web._excel_column_letter(len(reports_web._NCC_COLUMNS))}4"/>'.encode()
+            in (sheet_xml)
+        )
+        assert "xl/worksheets/sheet2.xml" in archive.namelist()
+
+
+def test_operations_sla_export_streams_on_its_own_session(db_session, monkeypatch):
+    policy = SlaPolicy(name="Ticket Resolution SLA", entity_type=WorkflowEntityType.ticket, is_active=True)
+    db_session.add(policy)
+    db_session.flush()
+    now = datetime.now(UTC)
+    for index in range(3):
+        ticket = Ticket(
+            title=f"Breach {index}",
+            status=TicketStatus.open,
+            priority=TicketPriority.high,
+            region="Lagos",
+        )
+        db_session.add(ticket)
+        db_session.flush()
+        clock = SlaClock(
+            policy_id=policy.id,
+            entity_type=WorkflowEntityType.ticket,
+            entity_id=ticket.id,
+            priority="high",
+            status=SlaClockStatus.breached,
+            started_at=now - timedelta(hours=8),
+            due_at=now - timedelta(hours=4),
+            breached_at=now - timedelta(hours=3, minutes=index),
+        )
+        db_session.add(clock)
+        db_session.flush()
+        db_session.add(SlaBreach(clock_id=clock.id, status=SlaBreachStatus.open, breached_at=clock.breached_at))
+    db_session.commit()
+
+    opened = []
+
+    def _session_local():
+        opened.append(True)
+        return _SessionProxy(db_session)
+
+    monkeypatch.setattr(report_export, "SessionLocal", _session_local)
+
+    response = reports_web.operations_sla_violations_export(
+        db=db_session,
+        data_type="ticket",
+        region=None,
+        ticket_status=None,
+        days=30,
+        start_date=None,
+        end_date=None,
+    )
+    assert opened == []
+
+    rows = list(csv.DictReader(io.StringIO(_streaming_body(response).decode())))
+
+    assert opened == [True]
+    assert [row["Title"] for row in rows] == ["Breach 0", "Breach 1", "Breach 2"]
+    assert rows[0]["SLA Type"] == "Ticket"
+
+
+def test_ncc_export_builds_records_in_chunks_on_its_own_session(db_session, monkeypatch):
+    person = Person(first_name="Amaka", last_name="Obi", email="amaka.obi@example.com", phone="08012345678")
+    db_session.add(person)
+    db_session.flush()
+    now = datetime.now(UTC)
+    for index in range(3):
+        db_session.add(
+            Ticket(
+                title=f"Slow internet {index}",
+                status=TicketStatus.open,
+                priority=TicketPriority.normal,
+                customer_person_id=person.id,
+                created_at=now - timedelta(hours=3 - index),
+            )
+        )
+    db_session.commit()
+
+    opened = []
+
+    def _session_local():
+        opened.append(True)
+        return _SessionProxy(db_session)
+
+    chunks = []
+    records_for_tickets = reports_web._ncc_records_for_tickets
+
+    def _records_for_tickets(db, tickets):
+        chunks.append([ticket.title for ticket in tickets])
+        return records_for_tickets(db, tickets)
+
+    monkeypatch.setattr(report_export, "SessionLocal", _session_local)
+    monkeypatch.setattr(reports_web, "_NCC_RECORD_CHUNK_SIZE", 2)
+    monkeypatch.setattr(reports_web, "_ncc_records_for_tickets", _records_for_tickets)
+
+    response = reports_web.ncc_reports_export(start_date=None, end_date=None, q="slow internet")
+    assert opened == []
+
+    with ZipFile(io.BytesIO(_streaming_body(response))) as archive:
+        sheet_xml = archive.read("xl/worksheets/sheet1.xml").decode()
+
+    assert opened == [True]
+    assert chunks == [["Slow internet 0", "Slow internet 1"], ["Slow internet 2"]]
+    assert sheet_xml.count("Amaka") == 3
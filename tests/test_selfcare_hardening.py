@@ -106,9 +106,8 @@ def test_pagination_follows_last_page_meta(monkeypatch):
         2: {"data": [{"id": 2}], "meta": {"last_page": 3, "total": 3}},
         3: {"data": [{"id": 3}], "meta": {"last_page": 3, "total": 3}},
     }
-    monkeypatch.setattr(
-        selfcare, "_request_json", lambda db, m, p, *, params=None, json_body=None: pages[params["page"]]
-    )
+    monkeypatch.setattr(selfcare, "_get_api_config", lambda db: {})
+    monkeypatch.setattr(selfcare, "_request_json", lambda db, m, p, *, params=None, **_kw: pages[params["page"]])
     rows = selfcare._list_paginated(None, "/x", {"per_page": 1})
     assert [r["id"] for r in rows] == [1, 2, 3]
 
@@ -164,6 +163,154 @@ def test_pagination_row_cap_fails_instead_of_returning_partial_data(monkeypatch)
         selfcare._list_paginated(None, "/x", {"per_page": 2})
 
 
+def test_pagination_pipelines_pages_off_the_calling_thread_in_order(monkeypatch):
+    import threading
+
+    main_thread = threading.get_ident()
+    calls: list[tuple[int, bool, object]] = []
+    lock = threading.Lock()
+
+    def fake_request(db, method, path, *, params=None, config=None, **_kw):
+        with lock:
+            calls.append((params["page"], threading.get_ident() == main_thread, db))
+        return {"data": [{"id": params["page"]}], "meta": {"last_page": 6, "page": params["page"]}}
+
+    monkeypatch.setattr(selfcare, "_get_api_config", lambda db: {"base_url": "https://sub.test"})
+    monkeypatch.setattr(selfcare, "_request_json", fake_request)
+    monkeypatch.setenv("SELFCARE_PAGINATION_CONCURRENCY", "3")
+
+    rows = selfcare._list_paginated("session", "/x", {"per_page": 1})
+
+    assert [r["id"] for r in rows] == [1, 2, 3, 4, 5, 6]
+    assert sorted(page for page, _, _ in calls) == [1, 2, 3, 4, 5, 6]
+    # Only page 1 runs on the caller's thread with its session; the rest never see it.
+    assert [(page, db) for page, on_main, db in calls if on_main] == [(1, "session")]
+    assert all(db is None for page, on_main, db in calls if not on_main)
+
+
+def test_pagination_streams_rows_and_stops_fetching_when_consumer_stops(monkeypatch):
+    requested: list[int] = []
+
+    def fake_request(db, method, path, *, params=None, **_kw):
+        requested.append(params["page"])
+        return {"data": [{"id": f"{params['page']}-{i}"} for i in range(2)]}
+
+    monkeypatch.setattr(selfcare, "_request_json", fake_request)
+
+    stream = selfcare._iter_paginated(None, "/x", {"per_page": 2})
+    assert next(stream)["id"] == "1-0"
+    assert requested == [1]
+    stream.close()
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data: dict[str, str] = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def test_pagination_checkpoint_resumes_after_last_completed_page(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(selfcare, "_get_redis", lambda: redis)
+    monkeypatch.setenv("SELFCARE_PAGINATION_CONCURRENCY", "1")
+    requested: list[int] = []
+
+    def fake_request(db, method, path, *, params=None, **_kw):
+        requested.append(params["page"])
+        if params["page"] == 3 and len(requested) == 3:
+            raise selfcare.SelfcareProviderError("boom")
+        return {"data": [{"id": params["page"]}], "meta": {"last_page": 4}}
+
+    monkeypatch.setattr(selfcare, "_request_json", fake_request)
+
+    first = selfcare.PaginationCheckpoint("subscribers")
+    consumed = []
+    with pytest.raises(selfcare.SelfcareProviderError):
+        for row in selfcare._iter_paginated(None, "/x", {"per_page": 1}, checkpoint=first):
+            consumed.append(row["id"])
+    assert consumed == [1, 2]
+
+    second = selfcare.PaginationCheckpoint("subscribers")
+    rows = list(selfcare._iter_paginated(None, "/x", {"per_page": 1}, checkpoint=second))
+
+    assert [r["id"] for r in rows] == [3, 4]
+    assert second.resumed_from == 3
+    assert redis.data == {}
+
+
+def test_pagination_checkpoint_past_max_age_starts_over(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(selfcare, "_get_redis", lambda: redis)
+    monkeypatch.setenv("SELFCARE_PAGINATION_CHECKPOINT_MAX_AGE_SECONDS", "600")
+    clock = [1_000_000.0]
+    monkeypatch.setattr(selfcare.time, "time", lambda: clock[0])
+
+    selfcare.PaginationCheckpoint("subscribers").save("/x", {"per_page": 1}, 2)
+
+    clock[0] += 300
+    resumed = selfcare.PaginationCheckpoint("subscribers")
+    assert resumed.load("/x", {"per_page": 1}) == 3
+    # Saving from a resumed run keeps the original start, so the age keeps growing.
+    resumed.save("/x", {"per_page": 1}, 3)
+
+    clock[0] += 301
+    stale = selfcare.PaginationCheckpoint("subscribers")
+    assert stale.load("/x", {"per_page": 1}) == 1
+    assert stale.resumed_from is None
+
+
+def test_fetch_customers_sends_updated_since(monkeypatch):
+    from datetime import UTC, datetime
+
+    sent: list[dict] = []
+
+    def fake_request(db, method, path, *, params=None, **_kw):
+        sent.append(dict(params))
+        return {"data": [], "meta": {"total": 0}}
+
+    monkeypatch.setattr(selfcare, "_request_json", fake_request)
+    selfcare.fetch_customers(None, include=None, updated_since=datetime(2026, 10, 1, 12, 0, tzinfo=UTC))
+
+    assert sent[0]["updated_since"] == "2026-10-01T12:00:00+00:00"
+
+
+def test_delta_sync_does_not_reconcile_orphans(db_session, monkeypatch):
+    from datetime import UTC, datetime
+
+    _active_sub(db_session, "still-live")
+    db_session.commit()
+    monkeypatch.setattr(selfcare, "ping", lambda db: True)
+    monkeypatch.setattr(selfcare, "iter_customers", lambda db, **_kw: iter([{"subscriber_number": "no-id"}]))
+
+    result = selfcare.sync_subscribers_from_selfcare_data(db_session, updated_since=datetime(2026, 10, 1, tzinfo=UTC))
+
+    assert result["mode"] == "delta"
+    assert result["orphaned"] == 0
+
+
+def test_plan_subscriber_sync_uses_delta_until_full_sync_is_due(monkeypatch):
+    from datetime import UTC, datetime, timedelta
+
+    redis = _FakeRedis()
+    monkeypatch.setattr(selfcare, "_get_redis", lambda: redis)
+    now = datetime(2026, 10, 16, 12, 0, tzinfo=UTC)
+
+    assert selfcare.plan_subscriber_sync(now) is None
+    selfcare.record_subscriber_sync(now - timedelta(hours=2), full=True)
+    selfcare.record_subscriber_sync(now - timedelta(hours=1), full=False)
+
+    assert selfcare.plan_subscriber_sync(now) == now - timedelta(hours=1) - selfcare._DELTA_SYNC_OVERLAP
+    assert selfcare.plan_subscriber_sync(now + timedelta(days=1)) is None
+
+
 # ── orphan reconciliation (#14) ───────────────────────────────────────────────
 
 
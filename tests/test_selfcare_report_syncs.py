@@ -285,8 +285,8 @@ def test_sync_subscribers_from_selfcare_skips_bad_record(db_session, monkeypatch
     monkeypatch.setattr(subscriber_tasks, "SessionLocal", lambda: _SessionProxy(db_session))
     monkeypatch.setattr("app.services.selfcare.ping", lambda session: True)
     monkeypatch.setattr(
-        "app.services.selfcare.fetch_customers",
-        lambda session, include="services,billing": [
+        "app.services.selfcare.iter_customers",
+        lambda session, **_kw: [
             {"id": "sc-good", "subscriber_number": f"SUB-{uuid.uuid4().hex[:8]}", "status": "active"},
             {"subscriber_number": "missing-id", "status": "active"},
         ],
@@ -311,8 +311,8 @@ def test_sync_subscribers_from_selfcare_updates_linked_person_profile(db_session
 
     monkeypatch.setattr("app.services.selfcare.ping", lambda session: True)
     monkeypatch.setattr(
-        "app.services.selfcare.fetch_customers",
-        lambda session, include="services,billing": [
+        "app.services.selfcare.iter_customers",
+        lambda session, **_kw: [
             {
                 "id": "sc-100",
                 "subscriber_number": "SUB-100",
@@ -0,0 +1,91 @@
+"""Tests for the set-based SLA breach detector."""
+
+from datetime import UTC, datetime, timedelta
+
+from app.models.notification import Notification, NotificationChannel
+from app.models.person import Person
+from app.models.tickets import Ticket, TicketStatus
+from app.models.workflow import SlaBreach, SlaClock, SlaClockStatus, SlaPolicy, WorkflowEntityType
+from app.services import sla_breach_detector
+from app.services import tickets as tickets_service
+
+
+def _policy(db):
+    policy = SlaPolicy(name="Ticket Resolution SLA", entity_type=WorkflowEntityType.ticket, is_active=True)
+    db.add(policy)
+    db.commit()
+    return policy
+
+
+def _ticket_with_clock(db, policy, *, manager=None, status=SlaClockStatus.running, breached_at=None):
+    now = datetime.now(UTC)
+    ticket = Ticket(
+        title="Fiber cut",
+        status=TicketStatus.open,
+        ticket_manager_person_id=manager.id if manager else None,
+    )
+    db.add(ticket)
+    db.flush()
+    clock = SlaClock(
+        policy_id=policy.id,
+        entity_type=WorkflowEntityType.ticket,
+        entity_id=ticket.id,
+        status=status,
+        started_at=now - timedelta(hours=6),
+        due_at=now - timedelta(hours=1),
+        breached_at=breached_at,
+    )
+    db.add(clock)
+    db.commit()
+    return ticket, clock
+
+
+def test_breach_overdue_clocks_batches_and_notifies(db_session, monkeypatch):
+    events = []
+    monkeypatch.setattr(tickets_service, "emit_event", lambda db, et, payload, **kw: events.append(payload))
+    manager = Person(first_name="Tina", last_name="Manager", email="sla-detector-mgr@example.com")
+    db_session.add(manager)
+    db_session.commit()
+    policy = _policy(db_session)
+    clocks = [_ticket_with_clock(db_session, policy, manager=manager)[1] for _ in range(5)]
+
+    result = sla_breach_detector.breach_overdue_clocks(db_session, batch_size=2)
+
+    assert result == {"checked": 5, "breached": 5, "errors": 0}
+    clock_ids = [clock.id for clock in clocks]
+    assert db_session.query(SlaBreach).filter(SlaBreach.clock_id.in_(clock_ids)).count() == 5
+    for clock in clocks:
+        db_session.refresh(clock)
+        assert clock.status == SlaClockStatus.breached
+        assert clock.escalated_at is not None
+    emails = (
+        db_session.query(Notification)
+        .filter(Notification.recipient == manager.email, Notification.channel == NotificationChannel.email)
+        .count()
+    )
+    assert emails == 5
+    assert len(events) == 5
+
+    # A second run finds nothing left to breach and does not re-escalate.
+    assert sla_breach_detector.breach_overdue_clocks(db_session)["checked"] == 0
+    assert sla_breach_detector.escalate_breached_ticket_clocks(db_session)["escalated"] == 0
+    assert db_session.query(SlaBreach).filter(SlaBreach.clock_id.in_(clock_ids)).count() == 5
+
+
+def test_escalation_pass_only_visits_unescalated_ticket_clocks(db_session, monkeypatch):
+    events = []
+    monkeypatch.setattr(tickets_service, "emit_event", lambda db, et, payload, **kw: events.append(payload))
+    policy = _policy(db_session)
+    breached_at = datetime.now(UTC) - timedelta(minutes=30)
+    ticket, clock = _ticket_with_clock(db_session, policy, status=SlaClockStatus.breached, breached_at=breached_at)
+
+    first = sla_breach_detector.escalate_breached_ticket_clocks(db_session)
+    second = sla_breach_detector.escalate_breached_ticket_clocks(db_session)
+
+    db_session.refresh(clock)
+    db_session.refresh(ticket)
+    assert first == {"escalated": 1, "errors": 0}
+    assert second == {"escalated": 0, "errors": 0}
+    assert clock.escalated_at is not None
+    assert ticket.metadata_["sla_breach_notified"] is True
+    assert [payload["ticket_id"] for payload in events] == [str(ticket.id)]
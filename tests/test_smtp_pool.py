@@ -0,0 +1,153 @@
+"""Tests for pooled SMTP delivery."""
+
+import smtplib
+from typing import ClassVar
+
+from app.models.notification import Notification, NotificationChannel, NotificationStatus
+from app.services import email as email_service
+from app.tasks.notifications import _deliver_notification_queue
+
+_CONFIG = {
+    "host": "smtp.example.com",
+    "port": 587,
+    "username": "mailer",
+    "password": "secret",
+    "use_tls": True,
+    "use_ssl": False,
+    "from_name": "Dotmac",
+    "from_email": "noreply@example.com",
+}
+
+
+class _FakeSMTP:
+    instances: ClassVar[list["_FakeSMTP"]] = []
+
+    def __init__(self, host, port, use_ssl, timeout=None):
+        self.logins = 0
+        self.sent: list[str] = []
+        self.closed = False
+        self.drop_next: str | None = None
+        _FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        return None
+
+    def login(self, username, password):
+        self.logins += 1
+
+    def _drop(self, stage):
+        if self.drop_next == stage:
+            self.drop_next = None
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+
+    def sendmail(self, from_email, recipients, message):
+        self._drop("mail")
+        self.data(message)
+        self.sent.extend(recipients)
+        return {}
+
+    def data(self, message):
+        self._drop("data")
+        return 250, b"OK"
+
+    def noop(self):
+        return 250, b"OK"
+
+    def rset(self):
+        return 250, b"OK"
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+def _use_fake_smtp(monkeypatch):
+    _FakeSMTP.instances = []
+    monkeypatch.setattr(email_service, "_create_smtp_client", _FakeSMTP)
+
+
+def test_pool_reuses_authenticated_connection(monkeypatch):
+    _use_fake_smtp(monkeypatch)
+    pool = email_service.SmtpConnectionPool()
+
+    for index in range(3):
+        ok, _ = email_service.send_email_with_config(_CONFIG, f"user{index}@example.com", "Hi", "<p>Hi</p>", pool=pool)
+        assert ok
+
+    assert len(_FakeSMTP.instances) == 1
+    assert _FakeSMTP.instances[0].logins == 1
+    assert len(_FakeSMTP.instances[0].sent) == 3
+    pool.close()
+    assert _FakeSMTP.instances[0].closed
+
+
+def test_pool_reconnects_after_server_disconnect(monkeypatch):
+    _use_fake_smtp(monkeypatch)
+    pool = email_service.SmtpConnectionPool()
+    email_service.send_email_with_config(_CONFIG, "first@example.com", "Hi", "<p>Hi</p>", pool=pool)
+    _FakeSMTP.instances[0].drop_next = "mail"
+
+    ok, _ = email_service.send_email_with_config(_CONFIG, "second@example.com", "Hi", "<p>Hi</p>", pool=pool)
+
+    assert ok
+    assert len(_FakeSMTP.instances) == 2
+    assert _FakeSMTP.instances[0].closed
+    assert _FakeSMTP.instances[1].sent == ["second@example.com"]
+
+
+def test_pool_does_not_resend_after_disconnect_during_data(monkeypatch):
+    _use_fake_smtp(monkeypatch)
+    pool = email_service.SmtpConnectionPool()
+    email_service.send_email_with_config(_CONFIG, "first@example.com", "Hi", "<p>Hi</p>", pool=pool)
+    _FakeSMTP.instances[0].drop_next = "data"
+
+    ok, debug = email_service.send_email_with_config(_CONFIG, "second@example.com", "Hi", "<p>Hi</p>", pool=pool)
+
+    assert not ok
+    assert "closed" in debug["error"]
+    assert len(_FakeSMTP.instances) == 1
+    assert _FakeSMTP.instances[0].closed
+
+
+def test_pool_retires_connection_after_max_messages(monkeypatch):
+    _use_fake_smtp(monkeypatch)
+    pool = email_service.SmtpConnectionPool(max_messages=2)
+
+    for index in range(3):
+        email_service.send_email_with_config(_CONFIG, f"user{index}@example.com", "Hi", "<p>Hi</p>", pool=pool)
+
+    assert len(_FakeSMTP.instances) == 2
+    assert _FakeSMTP.instances[0].closed
+
+
+def test_notification_queue_sends_email_batch_over_pool(db_session, monkeypatch):
+    _use_fake_smtp(monkeypatch)
+    monkeypatch.setenv("EMAIL_DELIVERY_CONCURRENCY", "2")
+    monkeypatch.setattr(email_service, "_get_smtp_config", lambda db: dict(_CONFIG))
+    monkeypatch.setattr(email_service, "get_smtp_pool", lambda: pool)
+    pool = email_service.SmtpConnectionPool()
+    notifications = [
+        Notification(
+            channel=NotificationChannel.email,
+            recipient=f"user{index}@example.com",
+            subject="Update",
+            body="<p>Update</p>",
+            status=NotificationStatus.queued,
+        )
+        for index in range(5)
+    ]
+    db_session.add_all(notifications)
+    db_session.commit()
+
+    delivered = _deliver_notification_queue(db_session, batch_size=10)
+
+    assert delivered == 5
+    for notification in notifications:
+        db_session.refresh(notification)
+        assert notification.status == NotificationStatus.delivered
+        assert notification.sent_at is not None
+    assert len(_FakeSMTP.instances) <= 2
+    assert sum(len(instance.sent) for instance in _FakeSMTP.instances) == 5
+    pool.close()
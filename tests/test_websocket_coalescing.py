@@ -0,0 +1,68 @@
+"""Coalescing of bursty inbox WebSocket broadcasts."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.websocket import broadcaster
+from app.websocket.events import EventType
+
+
+@pytest.fixture()
+def published(monkeypatch):
+    sent: list[tuple[str, str, object]] = []
+    monkeypatch.setattr(
+        broadcaster, "_broadcast_event_to_conversation", lambda cid, event: sent.append(("conversation", cid, event))
+    )
+    monkeypatch.setattr(broadcaster, "_broadcast_event_to_user", lambda uid, event: sent.append(("user", uid, event)))
+    coalescer = broadcaster._BroadcastCoalescer(window_seconds=60, max_pending=100)
+    monkeypatch.setattr(broadcaster, "_coalescer", coalescer)
+    return sent
+
+
+def test_repeated_status_updates_merge_into_one_event(published):
+    for status in ("sent", "delivered", "read"):
+        broadcaster.broadcast_message_status("msg-1", "conv-1", status)
+    assert published == []
+
+    broadcaster.flush_coalesced_broadcasts()
+
+    [(kind, target, event)] = published
+    assert (kind, target) == ("conversation", "conv-1")
+    assert event.event == EventType.MESSAGE_STATUS_CHANGED
+    assert event.data["status"] == "read"
+
+
+def test_several_items_for_one_target_are_sent_as_a_batch(published):
+    broadcaster.broadcast_message_status("msg-1", "conv-1", "delivered")
+    broadcaster.broadcast_message_status("msg-2", "conv-1", "delivered")
+    broadcaster.broadcast_conversation_summary("conv-1", {"unread": 2})
+    broadcaster.broadcast_conversation_summary("conv-1", {"preview": "hi"})
+    broadcaster.broadcast_inbox_updated("user-1", {"conversation_id": "conv-1"})
+
+    broadcaster.flush_coalesced_broadcasts()
+
+    by_target = {(kind, target): event for kind, target, event in published}
+    batch = by_target[("conversation", "conv-1")]
+    assert batch.event == EventType.BATCH
+    inner = batch.data["events"]
+    assert [item["event"] for item in inner] == [
+        "message_status_changed",
+        "message_status_changed",
+        "conversation_summary",
+    ]
+    assert inner[2]["data"] == {"unread": 2, "preview": "hi", "conversation_id": "conv-1"}
+    assert by_target[("user", "user-1")].event == EventType.INBOX_UPDATED
+
+
+def test_zero_window_publishes_immediately(published, monkeypatch):
+    monkeypatch.setattr(broadcaster, "_coalescer", broadcaster._BroadcastCoalescer(window_seconds=0, max_pending=100))
+    broadcaster.broadcast_message_status("msg-1", "conv-1", "sent")
+    assert len(published) == 1
+
+
+def test_max_pending_forces_a_flush(published, monkeypatch):
+    monkeypatch.setattr(broadcaster, "_coalescer", broadcaster._BroadcastCoalescer(window_seconds=60, max_pending=2))
+    broadcaster.broadcast_message_status("msg-1", "conv-1", "sent")
+    broadcaster.broadcast_message_status("msg-2", "conv-2", "sent")
+    assert {target for _kind, target, _event in published} == {"conv-1", "conv-2"}
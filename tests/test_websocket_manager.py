@@ -0,0 +1,133 @@
+"""Targeted Redis subscriptions and queued fan-out in the inbox ConnectionManager."""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import json
+
+from starlette.websockets import WebSocketState
+
+from app.websocket import manager as manager_module
+from app.websocket.manager import ConnectionManager
+
+
+def _run_async(coro):
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(lambda: asyncio.run(coro)).result()
+
+
+class _FakePubSub:
+    def __init__(self):
+        self.channels: set[str] = set()
+
+    async def subscribe(self, *channels):
+        self.channels.update(channels)
+
+    async def unsubscribe(self, *channels):
+        self.channels.difference_update(channels)
+
+
+class _FakeWebSocket:
+    def __init__(self, delay: float = 0.0):
+        self.client_state = WebSocketState.CONNECTED
+        self.delay = delay
+        self.sent: list[dict] = []
+        self.closed_with: int | None = None
+
+    async def send_json(self, data):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(data)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+        self.client_state = WebSocketState.DISCONNECTED
+
+
+def _event(n: int) -> str:
+    return json.dumps({"conversation_id": "conv-1", "event": {"n": n}})
+
+
+def test_subscribes_only_to_channels_with_local_interest():
+    async def scenario():
+        manager = ConnectionManager()
+        manager._pubsub = _FakePubSub()
+        ws = _FakeWebSocket()
+
+        await manager.register_connection("user-1", ws)
+        await manager.subscribe_conversation("user-1", "conv-1")
+        assert manager._pubsub.channels == {"inbox_ws:user:user-1", "inbox_ws:conv-1"}
+
+        await manager.unsubscribe_conversation("user-1", "conv-1")
+        assert manager._pubsub.channels == {"inbox_ws:user:user-1"}
+
+        await manager.subscribe_conversation("user-1", "conv-2")
+        await manager.unregister_connection("user-1", ws)
+        assert manager._pubsub.channels == set()
+
+    _run_async(scenario())
+
+
+def test_slow_connection_does_not_delay_others():
+    async def scenario():
+        manager = ConnectionManager()
+        slow, fast = _FakeWebSocket(delay=0.5), _FakeWebSocket()
+        await manager.register_connection("slow", slow)
+        await manager.register_connection("fast", fast)
+        await manager.subscribe_conversation("slow", "conv-1")
+        await manager.subscribe_conversation("fast", "conv-1")
+
+        await manager._handle_redis_message("inbox_ws:conv-1", _event(1))
+        await asyncio.sleep(0.05)
+
+        assert {"n": 1} in fast.sent
+        assert {"n": 1} not in slow.sent
+        await manager.unregister_connection("slow", slow)
+        await manager.unregister_connection("fast", fast)
+
+    _run_async(scenario())
+
+
+def test_message_for_channel_without_local_interest_is_ignored():
+    async def scenario():
+        manager = ConnectionManager()
+        dispatched = []
+
+        async def _record(conversation_id, event_data):
+            dispatched.append(conversation_id)
+
+        manager._dispatch_to_subscribers = _record
+        await manager._handle_redis_message("inbox_ws:conv-9", "not even json")
+        assert dispatched == []
+
+    _run_async(scenario())
+
+
+def test_consumer_that_stays_behind_is_disconnected(monkeypatch):
+    monkeypatch.setattr(manager_module, "SEND_QUEUE_SIZE", 2)
+
+    async def scenario():
+        manager = ConnectionManager()
+        stuck = _FakeWebSocket(delay=5)
+        await manager.register_connection("stuck", stuck)
+        await manager.subscribe_conversation("stuck", "conv-1")
+
+        for n in range(6):
+            await manager._handle_redis_message("inbox_ws:conv-1", _event(n))
+        await asyncio.sleep(0.05)
+
+        assert stuck.closed_with == manager_module.SLOW_CONSUMER_CLOSE_CODE
+        assert "stuck" not in manager._connections
+
+    _run_async(scenario())
+
+
+def test_heartbeat_without_sender_sends_directly():
+    async def scenario():
+        manager = ConnectionManager()
+        ws = _FakeWebSocket()
+        await manager.send_heartbeat("user-1", ws)
+        assert ws.sent[0]["event"] == "heartbeat"
+
+    _run_async(scenario())
@@ -0,0 +1,127 @@
+"""Incremental Zabbix monitoring snapshot."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from app.services import zabbix, zabbix_snapshot
+
+
+class FakeZabbix:
+    def __init__(self, hosts: dict[str, dict]):
+        self.hosts = hosts
+        self.changed: set[str] = set()
+        self.calls: list[tuple] = []
+
+    def fetch_host_rows(self, db, *, host_ids=None):
+        self.calls.append(("rows", tuple(host_ids) if host_ids is not None else None))
+        ids = host_ids if host_ids is not None else list(self.hosts)
+        return [dict(self.hosts[host_id]) for host_id in ids if host_id in self.hosts]
+
+    def fetch_host_ids(self, db):
+        self.calls.append(("ids",))
+        return set(self.hosts)
+
+    def fetch_changed_host_ids(self, db, *, since):
+        self.calls.append(("changed", since))
+        return set(self.changed)
+
+
+def _host(host_id: str, title: str, ping_state: str = "up") -> dict:
+    return {"id": host_id, "title": title, "name": title, "ping_state": ping_state, "snmp_state": "up"}
+
+
+@pytest.fixture()
+def fake(monkeypatch):
+    fake = FakeZabbix({"1": _host("1", "DAFR-2"), "2": _host("2", "Gwarinpa Huawei OLT")})
+    for name in ("fetch_host_rows", "fetch_host_ids", "fetch_changed_host_ids"):
+        monkeypatch.setattr(zabbix, name, getattr(fake, name))
+    monkeypatch.setattr(zabbix_snapshot, "_cache", zabbix_snapshot.MonitoringSnapshotCache(client_factory=lambda: None))
+    return fake
+
+
+def test_snapshot_indexes_rows_and_is_reused(fake):
+    snapshot = zabbix_snapshot.get_monitoring_snapshot(None)
+
+    assert [row["id"] for row in snapshot.rows] == ["1", "2"]
+    assert snapshot.by_normalized["dafr2"]["id"] == "1"
+    assert [row["id"] for row in snapshot.by_code["dafr2"]] == ["1"]
+    assert zabbix_snapshot.get_monitoring_snapshot(None) is snapshot
+    assert fake.calls == [("rows", None)]
+
+
+def test_incremental_refresh_rereads_only_changed_and_new_hosts(fake):
+    first = zabbix_snapshot.refresh_monitoring_snapshot(None)
+    fake.calls.clear()
+    fake.hosts["1"] = _host("1", "DAFR-2", ping_state="down")
+    fake.hosts["3"] = _host("3", "KUB-7")
+    del fake.hosts["2"]
+    fake.changed = {"1"}
+
+    snapshot = zabbix_snapshot.refresh_monitoring_snapshot(None)
+
+    assert fake.calls == [
+        ("ids",),
+        ("changed", first.changes_since - zabbix_snapshot._CHANGE_OVERLAP_SECONDS),
+        ("rows", ("1", "3")),
+    ]
+    assert {row["id"]: row["ping_state"] for row in snapshot.rows} == {"1": "down", "3": "up"}
+    assert snapshot.by_normalized["dafr2"]["ping_state"] == "down"
+    assert "gwarinpahuaweiolt" not in snapshot.by_normalized
+    assert snapshot.full_refreshed_at == first.full_refreshed_at
+
+
+def test_failed_poll_keeps_previous_snapshot(fake, monkeypatch):
+    first = zabbix_snapshot.refresh_monitoring_snapshot(None)
+    monkeypatch.setattr(zabbix, "fetch_changed_host_ids", lambda db, *, since: None)
+
+    assert zabbix_snapshot.refresh_monitoring_snapshot(None) is None
+    assert zabbix_snapshot.get_monitoring_snapshot(None) is first
+
+
+def test_snapshot_round_trips_through_shared_payload(fake):
+    snapshot = zabbix_snapshot.refresh_monitoring_snapshot(None, full=True)
+
+    restored = zabbix_snapshot.MonitoringSnapshot.from_payload(snapshot.to_payload())
+
+    assert restored.rows == snapshot.rows
+    assert restored.by_normalized["dafr2"] is restored.rows[0]
+    assert restored.by_code.keys() == snapshot.by_code.keys()
+
+
+@pytest.fixture()
+def lua_redis():
+    """A Redis that runs Lua: the server at REDIS_TEST_URL/REDIS_URL, else fakeredis[lua]."""
+    import redis
+
+    client = redis.from_url(
+        os.getenv("REDIS_TEST_URL") or os.getenv("REDIS_URL", "redis://localhost:6379/0"), socket_connect_timeout=0.5
+    )
+    try:
+        client.ping()
+    except redis.RedisError:
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        client = fakeredis.FakeRedis()
+    client.delete(zabbix_snapshot._LOCK_KEY)
+    yield client
+    client.delete(zabbix_snapshot._LOCK_KEY)
+    client.close()
+
+
+@pytest.mark.redis
+def test_release_leaves_a_lock_taken_over_after_expiry(lua_redis):
+    cache = zabbix_snapshot.MonitoringSnapshotCache(client_factory=lambda: lua_redis)
+    token = cache._acquire()
+    assert token is not None and cache._acquire() is None
+
+    # Our TTL lapsed and another worker took the lock.
+    lua_redis.set(zabbix_snapshot._LOCK_KEY, "other-worker")
+    cache._release(token)
+    assert lua_redis.get(zabbix_snapshot._LOCK_KEY) == b"other-worker"
+
+    lua_redis.set(zabbix_snapshot._LOCK_KEY, token)
+    cache._release(token)
+    assert lua_redis.get(zabbix_snapshot._LOCK_KEY) is None